@@ -0,0 +1,4 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+
+# Benchmarks for the dome controller, each module can be run with
+# `python -m domehunter.benchmarks.<module>`.
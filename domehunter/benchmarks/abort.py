@@ -0,0 +1,153 @@
+"""Benchmark abort request to relay off latency and the extra rotation.
+
+A simulated dome is set rotating under a movement monitor thread, with a
+motor thread ticking the encoder at a fixed rate while the rotation relay
+is on. After a random delay `Dome.abort()` is called, and the benchmark
+records how long the relay stayed on after the request and how far the
+dome turned in that time (motor coast is not modelled).
+
+The 'legacy' mode reproduces the abort before the relay was switched off
+synchronously: abort only sets the abort event, and the monitor notices on
+its next 0.1 s wake before stopping the motor.
+
+Run with `python -m domehunter.benchmarks.abort`.
+"""
+
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from domehunter.dome_control import Dome
+from domehunter.enumerations import Direction
+
+
+class _SleepingEvent(threading.Event):
+    """Event whose wait() sleeps for the full timeout."""
+
+    def wait(self, timeout=None):
+        time.sleep(timeout)
+        return self.is_set()
+
+
+class _LegacyAbortDome(Dome):
+    """Dome with the abort path from before the synchronous relay off."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # the monitor slept rather than waiting on the abort event
+        self._abort_event = _SleepingEvent()
+
+    def abort(self, timeout=None):
+        self._abort_event.set()
+        while self.movement_thread_active:
+            time.sleep(0.1)
+        self._abort_event.clear()
+
+
+class _Motor(object):
+    """Ticks the encoder while the rotation relay is on."""
+
+    def __init__(self, dome, tick_rate):
+        self.dome = dome
+        self.period = 1 / tick_rate
+        self.ticks = []
+        self.relay_off_time = None
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+
+    def _run(self):
+        relay = self.dome._rotation_relay
+        pin = self.dome._encoder_pin
+        next_tick = time.monotonic() + self.period
+        while self._running:
+            now = time.monotonic()
+            if not relay.is_active:
+                if self.relay_off_time is None:
+                    self.relay_off_time = now
+            elif now >= next_tick:
+                pin.drive_high()
+                pin.drive_low()
+                self.ticks.append(now)
+                next_tick += self.period
+            time.sleep(0.0002)
+
+
+def run_once(dome_class, tick_rate, rng):
+    """Abort one move, returning (latency, extra ticks)."""
+    dome = dome_class(0, degrees_per_tick=1, testing=True,
+                      debug_lights=False, bounce_time=None)
+    dome._move_event.set()
+    dome._rotate_dome(Direction.CW)
+    motor = _Motor(dome, tick_rate)
+    # no tick simulation in the monitor, the home sensor never triggers
+    dome._start_monitor('benchmark-monitor', dome._find_home_complete)
+    time.sleep(rng.uniform(0.2, 0.5))
+    request_time = time.monotonic()
+    dome.abort()
+    motor.stop()
+    extra_ticks = sum(1 for t in motor.ticks if t > request_time)
+    return motor.relay_off_time - request_time, extra_ticks
+
+
+def run(num_aborts=20, tick_rate=3.0, seed=0):
+    """Run the benchmark for both abort paths.
+
+    Parameters
+    ----------
+    num_aborts : int
+        Number of aborts to time for each mode.
+    tick_rate : float
+        Encoder ticks per second while the relay is on.
+    seed : int
+        Random seed for the abort delays.
+
+    Returns
+    -------
+    list
+        List of dictionaries of results, one per mode.
+
+    """
+    results = []
+    for mode, dome_class in (('legacy', _LegacyAbortDome),
+                             ('immediate', Dome)):
+        rng = np.random.default_rng(seed)
+        latencies, extra_ticks = np.array(
+            [run_once(dome_class, tick_rate, rng)
+             for _ in range(num_aborts)]).T
+        results.append(dict(mode=mode,
+                            latency_median=np.median(latencies) * 1e3,
+                            latency_max=np.max(latencies) * 1e3,
+                            extra_degrees_mean=np.mean(latencies) * tick_rate,
+                            extra_ticks=int(extra_ticks.sum())))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Abort request to relay off latency.")
+    parser.add_argument('--aborts', type=int, default=20,
+                        help='Number of aborts per mode.')
+    parser.add_argument('--tick-rate', type=float, default=3.0,
+                        help='Encoder ticks (degrees) per second.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    results = run(args.aborts, args.tick_rate, args.seed)
+    print(f'{"mode":>10} {"latency ms":>11} {"max ms":>8} '
+          f'{"extra deg":>10} {"extra ticks":>12}')
+    for r in results:
+        print(f'{r["mode"]:>10} {r["latency_median"]:>11.2f} '
+              f'{r["latency_max"]:>8.2f} {r["extra_degrees_mean"]:>10.3f} '
+              f'{r["extra_ticks"]:>12}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark goto repeatability with a backlash in the dome drive.
+
+A `simulation.BacklashPlant` drives a simulated dome's encoder and home
+sensor from a motor with lost motion between it and the dome ring. The
+backlash is first measured with
+`calibrate_dome_encoder_counts(measure_backlash=True)`. Then, for each mode,
+the dome is sent to a reference azimuth many times, each time from a random
+position on either side, and the true ring position it stops at is
+recorded.
+
+Modes:
+- 'none' takes the shortest route with no correction.
+- 'compensated' corrects the dome azimuth for the measured backlash.
+- 'one-sided' always finishes gotos turning clockwise.
+- 'both' combines compensation and the one-sided approach.
+
+The repeatability is the standard deviation of the stopping position. The
+approach bias is the mean difference between stops approached clockwise and
+anticlockwise. Without compensation the bias is roughly the backlash plus
+the position tolerance, because gotos stop as soon as they are within
+tolerance.
+
+Run with `python -m domehunter.benchmarks.backlash`.
+"""
+
+
+import argparse
+import time
+
+import numpy as np
+
+from domehunter.dome_control import Dome
+from domehunter.simulation import BacklashPlant
+
+MODES = {'none': dict(backlash_compensation=False),
+         'compensated': dict(backlash_compensation=True),
+         'one-sided': dict(backlash_compensation=False,
+                           approach_direction='CW'),
+         'both': dict(backlash_compensation=True, approach_direction='CW')}
+
+
+def make_dome(backlash, degrees_per_tick, tick_rate, **kwargs):
+    """Return a simulated dome driven by a BacklashPlant, and the plant."""
+    dome = Dome(0, testing=True, debug_lights=False,
+                degrees_per_tick=degrees_per_tick, bounce_time=None,
+                az_position_tolerance=0.5, monitor_interval=0.0005, **kwargs)
+    plant = BacklashPlant(dome, backlash=backlash, tick_rate=tick_rate,
+                          ticks_per_rotation=round(360 / degrees_per_tick),
+                          start=-20)
+    # the plant provides the ticks from here on
+    dome.testing = False
+    return dome, plant
+
+
+def wait_for_move(dome):
+    time.sleep(0.02)
+    while dome.movement_thread_active:
+        time.sleep(0.005)
+
+
+def measure_backlash(backlash, degrees_per_tick, tick_rate):
+    """Run a calibration with backlash measurement, return the model."""
+    dome, plant = make_dome(backlash, degrees_per_tick, tick_rate)
+    dome.calibrate_dome_encoder_counts(num_cal_rotations=1,
+                                       measure_backlash=True)
+    wait_for_move(dome)
+    plant.close()
+    return dome._backlash
+
+
+def run_mode(mode, model, num_gotos=20, backlash=6.0, degrees_per_tick=0.5,
+             tick_rate=300.0, reference_az=90.0, seed=0):
+    """Repeated gotos to reference_az from random sides.
+
+    Returns
+    -------
+    dict
+        Dictionary of results for the mode.
+
+    """
+    rng = np.random.default_rng(seed)
+    # the overshoot has to exceed the backlash
+    dome, plant = make_dome(
+        backlash, degrees_per_tick, tick_rate,
+        approach_overshoot=backlash * degrees_per_tick + 3, **MODES[mode])
+    dome._backlash = model
+    dome.find_home()
+    wait_for_move(dome)
+    errors = []
+    approach = []
+    for _ in range(num_gotos):
+        side = rng.choice([-1, 1])
+        dome.goto_az(reference_az + side * rng.uniform(15, 60))
+        wait_for_move(dome)
+        dome.goto_az(reference_az)
+        wait_for_move(dome)
+        errors.append((plant.ring_degrees() - reference_az + 180) % 360 - 180)
+        # starting below the reference the shortest route is clockwise
+        approach.append(-side)
+    plant.close()
+    errors = np.array(errors)
+    approach = np.array(approach)
+    bias = np.nan
+    if np.any(approach == 1) and np.any(approach == -1):
+        bias = (np.mean(errors[approach == 1])
+                - np.mean(errors[approach == -1]))
+    return dict(mode=mode,
+                mean_error=np.mean(errors),
+                repeatability=np.std(errors),
+                max_error=np.max(np.abs(errors)),
+                approach_bias=bias)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Goto repeatability with drive backlash.")
+    parser.add_argument('--gotos', type=int, default=20,
+                        help='Number of gotos per mode.')
+    parser.add_argument('--backlash', type=float, default=6,
+                        help='Drive backlash (encoder ticks).')
+    parser.add_argument('--degrees-per-tick', type=float, default=0.5,
+                        help='Degrees per encoder tick.')
+    parser.add_argument('--tick-rate', type=float, default=300,
+                        help='Encoder ticks per second.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    model = measure_backlash(args.backlash, args.degrees_per_tick,
+                             args.tick_rate)
+    print(f'true backlash {args.backlash:.1f} ticks, measured '
+          f'{model.cw_ticks:.1f} (CW) {model.ccw_ticks:.1f} (CCW)\n')
+    print(f'{"mode":>12} {"mean err":>9} {"repeat (sd)":>12} '
+          f'{"max err":>8} {"CW-CCW bias":>12}')
+    for mode in MODES:
+        r = run_mode(mode, model, args.gotos, args.backlash,
+                     args.degrees_per_tick, args.tick_rate, seed=args.seed)
+        print(f'{r["mode"]:>12} {r["mean_error"]:>9.2f} '
+              f'{r["repeatability"]:>12.2f} {r["max_error"]:>8.2f} '
+              f'{r["approach_bias"]:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""Benchmark encoder edge latency and timestamp error for each pin factory.
+
+A square wave is driven onto the encoder input and, for every rising edge,
+the benchmark records when the edge was handed to the dome code (latency)
+and the timestamp the dome code would count it with (timestamp error, which
+is what the tick interval and sub-tick interpolation see):
+
+- mock: gpiozero MockFactory, edges are timestamped with time.monotonic() in
+  the gpiozero callback. Mock pins call back synchronously in the driving
+  thread, so this is a lower bound for the real callback factories.
+- fake-pigpio: `capture.PigpioEdgeCapture` connected to the local fake pigpio
+  daemon, edges carry daemon timestamps and are delivered in batches.
+
+On a Raspberry Pi, real factories can be added with `--loopback OUT IN`,
+with GPIO OUT wired to GPIO IN. The 'pigpio' factory then uses the capture
+against the running pigpio daemon, the others use gpiozero callbacks.
+
+`--load` runs busy Python threads alongside, to show the effect of GIL
+contention on callback scheduling.
+
+Run with `python -m domehunter.benchmarks.callback_latency`.
+"""
+
+
+import argparse
+import threading
+import time
+
+import numpy as np
+from gpiozero import Device, DigitalInputDevice, DigitalOutputDevice
+from gpiozero.pins.mock import MockFactory
+
+from domehunter.capture import PigpioEdgeCapture, make_pin_factory
+from domehunter.fake_pigpiod import FakePigpioDaemon
+
+
+class _Recorder(object):
+    """Records the arrival and timestamp of each rising edge."""
+
+    def __init__(self):
+        self.arrivals = []
+        self.timestamps = []
+        self.done = threading.Event()
+        self.expected = 0
+
+    def callback(self):
+        now = time.monotonic()
+        self._record(now, now)
+
+    def batch(self, edges):
+        now = time.monotonic()
+        for gpio, level, edge_time in edges:
+            if level == 1:
+                self._record(now, edge_time)
+
+    def _record(self, arrival, timestamp):
+        self.arrivals.append(arrival)
+        self.timestamps.append(timestamp)
+        if len(self.arrivals) >= self.expected:
+            self.done.set()
+
+
+def drive_edges(drive_high, drive_low, num_edges, rate):
+    """Drive a square wave, returning the times of the rising edges."""
+    period = 1 / rate
+    times = []
+    start = time.monotonic()
+    for i in range(num_edges):
+        delay = start + i * period - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        times.append(time.monotonic())
+        drive_high()
+        delay = start + (i + 0.5) * period - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        drive_low()
+    return times
+
+
+def summarise(factory, edge_times, recorder, num_edges):
+    """Return a dictionary of latency and timestamp statistics."""
+    received = len(recorder.arrivals)
+    n = min(received, len(edge_times))
+    edge_times = np.array(edge_times[:n])
+    latency = np.array(recorder.arrivals[:n]) - edge_times
+    error = np.array(recorder.timestamps[:n]) - edge_times
+    interval_error = np.diff(np.array(recorder.timestamps[:n])) - np.diff(
+        edge_times)
+    return dict(factory=factory,
+                received=received / num_edges,
+                latency_median=np.median(latency) * 1e6,
+                latency_p99=np.percentile(latency, 99) * 1e6,
+                timestamp_error_p99=np.percentile(np.abs(error), 99) * 1e6,
+                interval_jitter=np.std(interval_error) * 1e6)
+
+
+def run_mock(num_edges, rate, pin=26):
+    Device.pin_factory = MockFactory()
+    mock_pin = Device.pin_factory.pin(pin)
+    recorder = _Recorder()
+    recorder.expected = num_edges
+    device = DigitalInputDevice(pin)
+    device.when_activated = recorder.callback
+    edge_times = drive_edges(mock_pin.drive_high, mock_pin.drive_low,
+                             num_edges, rate)
+    recorder.done.wait(1)
+    device.close()
+    Device.pin_factory.reset()
+    return summarise('mock', edge_times, recorder, num_edges)
+
+
+def run_fake_pigpio(num_edges, rate, pin=26):
+    recorder = _Recorder()
+    recorder.expected = num_edges
+    with FakePigpioDaemon() as daemon:
+        capture = PigpioEdgeCapture([pin], recorder.batch, port=daemon.port)
+        fake_pin = daemon.pin(pin)
+        edge_times = drive_edges(fake_pin.drive_high, fake_pin.drive_low,
+                                 num_edges, rate)
+        recorder.done.wait(1)
+        capture.close()
+    return summarise('fake-pigpio', edge_times, recorder, num_edges)
+
+
+def run_loopback(factory, out_pin, in_pin, num_edges, rate,
+                 host='localhost', port=8888):  # pragma: no cover
+    kwargs = dict(host=host, port=port) if factory == 'pigpio' else dict()
+    Device.pin_factory = make_pin_factory(factory, **kwargs)
+    recorder = _Recorder()
+    recorder.expected = num_edges
+    output = DigitalOutputDevice(out_pin)
+    if factory == 'pigpio':
+        capture = PigpioEdgeCapture([in_pin], recorder.batch, host=host,
+                                    port=port)
+    else:
+        device = DigitalInputDevice(in_pin)
+        device.when_activated = recorder.callback
+    edge_times = drive_edges(output.on, output.off, num_edges, rate)
+    recorder.done.wait(1)
+    if factory == 'pigpio':
+        capture.close()
+    else:
+        device.close()
+    output.close()
+    Device.pin_factory.close()
+    return summarise(factory, edge_times, recorder, num_edges)
+
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encoder edge latency and timestamp error by factory.")
+    parser.add_argument('--edges', type=int, default=500,
+                        help='Number of rising edges to drive.')
+    parser.add_argument('--rate', type=float, default=100,
+                        help='Edge rate (rising edges per second).')
+    parser.add_argument('--load', type=int, default=0,
+                        help='Number of busy Python threads to run.')
+    parser.add_argument('--loopback', type=int, nargs=2,
+                        metavar=('OUT', 'IN'),
+                        help='Also test real factories with GPIO OUT wired '
+                             'to GPIO IN (Raspberry Pi only).')
+    parser.add_argument('--factories', nargs='+',
+                        default=['rpigpio', 'lgpio', 'pigpio', 'native'],
+                        help='Real factories to test with --loopback.')
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    for _ in range(args.load):
+        threading.Thread(target=_busy, args=(stop,), daemon=True).start()
+    results = [run_mock(args.edges, args.rate),
+               run_fake_pigpio(args.edges, args.rate)]
+    if args.loopback:  # pragma: no cover
+        for factory in args.factories:
+            try:
+                results.append(run_loopback(factory, *args.loopback,
+                                            args.edges, args.rate))
+            except Exception as e:
+                print(f'{factory}: {e}')
+    stop.set()
+
+    print(f'{"factory":>12} {"received":>9} {"latency":>9} {"p99":>9} '
+          f'{"ts err p99":>11} {"jitter":>9}   (microseconds)')
+    for r in results:
+        print(f'{r["factory"]:>12} {r["received"]:>9.3f} '
+              f'{r["latency_median"]:>9.1f} {r["latency_p99"]:>9.1f} '
+              f'{r["timestamp_error_p99"]:>11.1f} '
+              f'{r["interval_jitter"]:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark encoder count accuracy against tick rate and noise level.
+
+Streams of clean encoder edges at a range of tick rates have contact bounce
+and glitches added by `simulation.EdgeNoise`, and are then counted through
+different debounce filters:
+
+- none: every rising edge is counted.
+- bounce_time: the input must be stable for 1 ms, equivalent to the
+  gpiozero bounce_time in the dome config.
+- adaptive: the input must be stable for 0.1 ms or 0.3 of the measured
+  edge interval, whichever is longer.
+
+Run with `python -m domehunter.benchmarks.debounce`.
+"""
+
+
+import argparse
+
+import numpy as np
+
+from domehunter.encoder import EdgeDebouncer
+from domehunter.simulation import EdgeNoise
+
+NOISE_LEVELS = {
+    'clean': dict(bounce_count=0, glitch_rate=0),
+    'light': dict(bounce_count=2, bounce_duration=0.0003, glitch_rate=0.1),
+    'heavy': dict(bounce_count=6, bounce_duration=0.0005, glitch_rate=1.0),
+}
+
+FILTERS = {
+    'none': dict(),
+    'bounce_time': dict(min_interval=0.001),
+    'adaptive': dict(min_interval=0.0001, adaptive_fraction=0.3),
+}
+
+
+def count_edges(edge_times, levels, debouncer):
+    """Return the number of rising edges accepted by a debouncer."""
+    accept = debouncer.accept
+    return sum(1 for edge_time, level in zip(edge_times, levels)
+               if accept(edge_time, count=level))
+
+
+def run(tick_rates, noise_levels, num_ticks=2000, jitter=0.02, seed=0):
+    """Run the benchmark.
+
+    Parameters
+    ----------
+    tick_rates : list
+        Encoder tick rates to test, in ticks per second.
+    noise_levels : list
+        Names of noise levels from NOISE_LEVELS.
+    num_ticks : int
+        Number of clean ticks in each stream.
+    jitter : float
+        Fractional random jitter on the clean tick intervals.
+    seed : int
+        Random seed.
+
+    Returns
+    -------
+    list
+        List of dictionaries of results, one per rate/noise/filter.
+
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for tick_rate in tick_rates:
+        intervals = rng.normal(1, jitter, num_ticks) / tick_rate
+        edge_times = np.cumsum(intervals)
+        for noise_level in noise_levels:
+            noise = EdgeNoise(seed=seed, **NOISE_LEVELS[noise_level])
+            noisy_edges, levels = noise.apply(edge_times)
+            for filter_name, filter_kwargs in FILTERS.items():
+                counted = count_edges(noisy_edges, levels,
+                                      EdgeDebouncer(**filter_kwargs))
+                results.append(dict(tick_rate=tick_rate,
+                                    noise=noise_level,
+                                    filter=filter_name,
+                                    edges=int(levels.sum()),
+                                    counted=counted,
+                                    accuracy=counted / num_ticks))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encoder count accuracy against tick rate and noise.")
+    parser.add_argument('--rates', type=float, nargs='+',
+                        default=[5, 50, 250, 1000],
+                        help='Tick rates to test (ticks per second).')
+    parser.add_argument('--noise', nargs='+', default=list(NOISE_LEVELS),
+                        choices=list(NOISE_LEVELS),
+                        help='Noise levels to test.')
+    parser.add_argument('--ticks', type=int, default=2000,
+                        help='Number of clean ticks per stream.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    results = run(args.rates, args.noise, num_ticks=args.ticks,
+                  seed=args.seed)
+    print(f'{"rate (Hz)":>10} {"noise":>6} {"filter":>12} '
+          f'{"edges":>7} {"counted":>8} {"accuracy":>9}')
+    for r in results:
+        print(f'{r["tick_rate"]:>10g} {r["noise"]:>6} {r["filter"]:>12} '
+              f'{r["edges"]:>7} {r["counted"]:>8} {r["accuracy"]:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark dome azimuth solver throughput and grid accuracy.
+
+Dome azimuths for random telescope pointings are computed with
+`geometry.DomeGeometry` one request at a time, in one vectorized pass, and
+with the cached `geometry.DomeAzimuthGrid`, and the grid interpolation error
+is measured against the exact solution.
+
+Run with `python -m domehunter.benchmarks.geometry`.
+"""
+
+
+import argparse
+import time
+
+import numpy as np
+
+from domehunter.geometry import DomeGeometry
+
+
+def _time_per_request(func, num_requests, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return 1e6 * best / num_requests
+
+
+def run(num_requests=2000, step=1.0, seed=0):
+    """Run the benchmark.
+
+    Parameters
+    ----------
+    num_requests : int
+        Number of random pointings.
+    step : float
+        Grid spacing in degrees.
+    seed : int
+        Random seed.
+
+    Returns
+    -------
+    dict
+        Microseconds per request for each method, grid build time and grid
+        errors.
+
+    """
+    geometry = DomeGeometry(-31.27, 3.0, mount_offset=(0.3, -0.2, 0.5),
+                            dec_axis_offset=0.4)
+    rng = np.random.default_rng(seed)
+    ha = rng.uniform(-90, 90, num_requests)
+    dec = rng.uniform(-85, 20, num_requests)
+    start = time.perf_counter()
+    grid = geometry.grid(step)
+    build_time = time.perf_counter() - start
+    scalar_requests = min(num_requests, 200)
+
+    def exact_scalar():
+        for h, d in zip(ha[:scalar_requests], dec[:scalar_requests]):
+            geometry.dome_azimuth_hadec(h, d)
+
+    def grid_scalar():
+        for h, d in zip(ha[:scalar_requests], dec[:scalar_requests]):
+            grid(h, d)
+
+    az, el = geometry.dome_azimuth_hadec(ha, dec)
+    grid_az, grid_el = grid(ha, dec)
+    error = np.abs((grid_az - az + 180) % 360 - 180)[el < 80]
+    return dict(
+        exact_scalar=_time_per_request(exact_scalar, scalar_requests),
+        exact_vectorized=_time_per_request(
+            lambda: geometry.dome_azimuth_hadec(ha, dec), num_requests),
+        grid_scalar=_time_per_request(grid_scalar, scalar_requests),
+        grid_vectorized=_time_per_request(lambda: grid(ha, dec),
+                                          num_requests),
+        build_time=build_time,
+        error_p99=np.percentile(error, 99),
+        error_max=error.max())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dome azimuth solver throughput and grid accuracy.")
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Number of random pointings.')
+    parser.add_argument('--step', type=float, default=1.0,
+                        help='Grid spacing (degrees).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    r = run(args.requests, args.step, args.seed)
+    print(f'{"method":>18} {"us/request":>11}')
+    for method in ('exact_scalar', 'exact_vectorized', 'grid_scalar',
+                   'grid_vectorized'):
+        print(f'{method:>18} {r[method]:>11.2f}')
+    print(f'grid build {r["build_time"]:.2f}s, azimuth error below 80 deg '
+          f'elevation: p99 {r["error_p99"]:.4f} max {r["error_max"]:.4f} deg')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+"""Goto accuracy and throughput of a simulated dome over random commands.
+
+A `simulation.BacklashPlant` drives a simulated dome (testing mode, with
+the plant providing the encoder ticks and home sensor) through a random
+mix of commands:
+
+- 'goto', a goto_az to a random azimuth;
+- 'park', a park, a goto while parked (which should be rejected) and an
+  unpark;
+- 'home', a find_home;
+- 'abort', a goto, a second goto straight away (which should be rejected
+  as the dome is busy), then an abort part way through the move.
+
+For every command the time to the end of the move, the relay cycles and
+the move result are recorded, and for gotos, parks and homes the final
+error of the true ring position from the target. The overshoot is the part
+of the error past the target in the direction the dome was turning (the
+dome turns on until the movement monitor notices it has arrived, so it
+grows with `monitor_interval` times the tick rate). Commands that don't
+start a move are counted as rejected, separately for those expected to be
+rejected.
+
+A summary table is printed for each configuration. With `--output` the
+per command records and a histogram of the goto errors are written as JSON
+for each configuration, with the summaries in summary.json.
+
+Dome keyword arguments can be swept with `--set`, eg
+`--set az_position_tolerance=0.5,1,1.7 --set monitor_interval=0.001,0.005`
+runs every combination, in parallel over `--processes` processes. Times are
+simulated at `--tick-rate` ticks per second, so keep the ticks per monitor
+interval (0.3 for the defaults, about that of the real dome) in mind when
+setting monitor_interval.
+
+Run with `python -m domehunter.benchmarks.goto_accuracy`.
+"""
+
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import yaml
+
+from domehunter.dome_control import Dome
+from domehunter.simulation import BacklashPlant
+
+# relative frequency of each command
+MIX = {'goto': 0.85, 'park': 0.03, 'home': 0.05, 'abort': 0.07}
+
+
+def wrap(degrees):
+    """Wrap an angle in degrees to [-180, 180)."""
+    return (degrees + 180) % 360 - 180
+
+
+class Harness(object):
+    """
+    A simulated dome and plant, and the commands of the benchmark.
+
+    Parameters
+    ----------
+    config : dict
+        Keyword arguments for the Dome.
+    degrees_per_tick : float
+        Degrees per encoder tick.
+    tick_rate : float
+        Encoder ticks per second while the motor is on.
+    backlash : float
+        Drive backlash in encoder ticks.
+    seed : int
+        Random seed.
+
+    """
+
+    def __init__(self, config, degrees_per_tick=0.5, tick_rate=300.0,
+                 backlash=0.0, seed=None):
+        kwargs = dict(debug_lights=False, degrees_per_tick=degrees_per_tick,
+                      bounce_time=None, az_position_tolerance=1.0,
+                      monitor_interval=0.001, log_stderr_level='ERROR')
+        kwargs.update(config)
+        self.dome_kwargs = kwargs
+        self.dome = Dome(0, testing=True, **kwargs)
+        self.plant = BacklashPlant(
+            self.dome, backlash=backlash, tick_rate=tick_rate,
+            ticks_per_rotation=round(360 / degrees_per_tick), start=-20)
+        # the plant provides the ticks from here on
+        self.dome.testing = False
+        self.tick_rate = tick_rate
+        self.degrees_per_tick = degrees_per_tick
+        self.rng = np.random.default_rng(seed)
+
+    def close(self):
+        self.plant.close()
+        if self.dome.journal is not None:
+            self.dome.journal.close()
+
+    def wait_for_move(self):
+        while self.dome.movement_thread_active:
+            time.sleep(0.0005)
+
+    def _start(self, command, *args):
+        """Call a command, return whether it started a move."""
+        cycles = self.dome.relay_cycles
+        command(*args)
+        return self.dome.relay_cycles > cycles
+
+    def _record(self, op, start, cycles, target=None, rejected=0,
+                expected_rejected=0):
+        dome = self.dome
+        record = dict(op=op,
+                      time=time.monotonic() - start,
+                      relay_cycles=dome.relay_cycles - cycles,
+                      result=getattr(dome.last_move_result, 'name', None),
+                      rejected=rejected,
+                      expected_rejected=expected_rejected,
+                      target=target,
+                      error=None,
+                      dome_error=None,
+                      overshoot=None)
+        if target is not None:
+            error = wrap(self.plant.ring_degrees() - target)
+            record.update(
+                error=error,
+                dome_error=wrap(dome.dome_az.degree - target),
+                overshoot=max(0.0, dome.last_direction * error))
+        return record
+
+    def goto(self):
+        target = float(self.rng.uniform(0, 360))
+        start = time.monotonic()
+        cycles = self.dome.relay_cycles
+        started = self._start(self.dome.goto_az, target)
+        self.wait_for_move()
+        return self._record('goto', start, cycles, target,
+                            rejected=int(not started))
+
+    def park(self):
+        dome = self.dome
+        start = time.monotonic()
+        cycles = dome.relay_cycles
+        dome.park()
+        record = self._record('park', start, cycles, dome.park_az.degree,
+                              rejected=int(not dome.is_parked))
+        # a goto while parked should be rejected
+        record['expected_rejected'] = int(
+            not self._start(dome.goto_az, float(self.rng.uniform(0, 360))))
+        self.wait_for_move()
+        dome.unpark()
+        return record
+
+    def home(self):
+        start = time.monotonic()
+        cycles = self.dome.relay_cycles
+        started = self._start(self.dome.find_home)
+        self.wait_for_move()
+        return self._record('home', start, cycles, 0.0,
+                            rejected=int(not started))
+
+    def abort(self):
+        dome = self.dome
+        target = float(self.rng.uniform(0, 360))
+        start = time.monotonic()
+        cycles = dome.relay_cycles
+        started = self._start(dome.goto_az, target)
+        # a second goto while moving should be rejected
+        expected = int(not self._start(dome.goto_az, target + 90))
+        move = abs(wrap(target - dome.dome_az.degree))
+        time.sleep(self.rng.uniform(0, 0.5) * move
+                   / (self.degrees_per_tick * self.tick_rate))
+        dome.abort()
+        self.wait_for_move()
+        return self._record('abort', start, cycles,
+                            rejected=int(not started),
+                            expected_rejected=expected)
+
+
+def run_config(config, moves=200, degrees_per_tick=0.5, tick_rate=300.0,
+               backlash=0.0, seed=0):
+    """
+    Run the random commands on a dome with one configuration.
+
+    Parameters
+    ----------
+    config : dict
+        Keyword arguments for the Dome.
+    moves : int
+        Number of commands.
+    degrees_per_tick : float
+        Degrees per encoder tick.
+    tick_rate : float
+        Encoder ticks per second while the motor is on.
+    backlash : float
+        Drive backlash in encoder ticks.
+    seed : int
+        Random seed.
+
+    Returns
+    -------
+    dict
+        The configuration and a record of each command.
+
+    """
+    harness = Harness(config, degrees_per_tick, tick_rate, backlash, seed)
+    harness.dome.find_home()
+    harness.wait_for_move()
+    ops = list(MIX)
+    weights = np.array(list(MIX.values()))
+    records = []
+    for op in harness.rng.choice(ops, size=moves, p=weights / weights.sum()):
+        records.append(getattr(harness, op)())
+    harness.close()
+    return dict(config=config, records=records)
+
+
+def _run_config(args):
+    return run_config(*args)
+
+
+def summarise(run):
+    """
+    Summary of a run of run_config.
+
+    Returns
+    -------
+    dict
+        Gotos per hour and goto time, the final error of gotos, parks and
+        homes (absolute error mean, 95th percentile and maximum, and the
+        dome's own estimate), overshoot, relay cycles per goto, rejected
+        commands and results other than COMPLETE. Statistics of no moves
+        are NaN.
+
+    """
+    records = run['records']
+    gotos = [r for r in records if r['op'] == 'goto' and not r['rejected']]
+    moved = [r for r in records
+             if r['error'] is not None and not r['rejected']]
+    times = np.array([r['time'] for r in gotos])
+    errors = np.abs([r['error'] for r in moved])
+    dome_errors = np.abs([r['dome_error'] for r in moved])
+    overshoot = np.array([r['overshoot'] for r in moved])
+    results = dict()
+    for r in records:
+        if r['result'] not in (None, 'COMPLETE') and r['op'] != 'abort':
+            results[r['result']] = results.get(r['result'], 0) + 1
+    return dict(config=run['config'],
+                commands=len(records),
+                gotos=len(gotos),
+                gotos_per_hour=(3600 * len(gotos) / times.sum()
+                                if times.sum() > 0 else np.nan),
+                goto_time=_stat(np.mean, times),
+                mean_error=_stat(np.mean, errors),
+                p95_error=_stat(np.percentile, errors, 95),
+                max_error=_stat(np.max, errors),
+                mean_dome_error=_stat(np.mean, dome_errors),
+                mean_overshoot=_stat(np.mean, overshoot),
+                max_overshoot=_stat(np.max, overshoot),
+                relay_cycles=_stat(np.mean, [r['relay_cycles']
+                                             for r in gotos]),
+                rejected=sum(r['rejected'] for r in records),
+                expected_rejected=sum(r['expected_rejected']
+                                      for r in records),
+                expected_rejections=sum(r['op'] in ('park', 'abort')
+                                        for r in records),
+                failed=results)
+
+
+def _stat(function, values, *args):
+    """function(values, *args) as a float, NaN for no values."""
+    if len(values) == 0:
+        return np.nan
+    return float(function(values, *args))
+
+
+def _label(config):
+    return ','.join(f'{key}={value}' for key, value in config.items()) or \
+        'defaults'
+
+
+def _parse_set(option):
+    """'key=a,b' to (key, [a, b]), with the values parsed as YAML."""
+    key, values = option.split('=', 1)
+    return key, [yaml.safe_load(value) for value in values.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Goto accuracy and throughput over random commands.")
+    parser.add_argument('--moves', type=int, default=200,
+                        help='Random commands per configuration.')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='KEY=VALUE[,VALUE...]',
+                        help=('Dome keyword argument values to sweep, can '
+                              'be repeated.'))
+    parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                        help='Configurations to run in parallel.')
+    parser.add_argument('--degrees-per-tick', type=float, default=0.5,
+                        help='Degrees per encoder tick.')
+    parser.add_argument('--tick-rate', type=float, default=300,
+                        help='Encoder ticks per second.')
+    parser.add_argument('--backlash', type=float, default=0,
+                        help='Drive backlash (encoder ticks).')
+    parser.add_argument('--bins', type=float, default=0.1,
+                        help='Width of the error histogram bins (degrees).')
+    parser.add_argument('--output',
+                        help='Directory to write the results to as JSON.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    sweep = dict(_parse_set(option) for option in args.set)
+    configs = [dict(zip(sweep, values))
+               for values in itertools.product(*sweep.values())]
+    jobs = [(config, args.moves, args.degrees_per_tick, args.tick_rate,
+             args.backlash, args.seed) for config in configs]
+    # each process has its own mock pins
+    with multiprocessing.Pool(min(args.processes, len(jobs))) as pool:
+        runs = pool.map(_run_config, jobs)
+    summaries = [summarise(run) for run in runs]
+
+    print(f'{"config":>40} {"gotos/h":>8} {"time (s)":>9} {"|err|":>6} '
+          f'{"p95":>6} {"max":>6} {"dome":>6} {"oversht":>8} '
+          f'{"cycles":>7} {"rejected":>9} {"exp. rej.":>10} {"failed":>7}')
+    for s in summaries:
+        expected = f'{s["expected_rejected"]}/{s["expected_rejections"]}'
+        print(f'{_label(s["config"]):>40} {s["gotos_per_hour"]:>8.0f} '
+              f'{s["goto_time"]:>9.3f} {s["mean_error"]:>6.2f} '
+              f'{s["p95_error"]:>6.2f} {s["max_error"]:>6.2f} '
+              f'{s["mean_dome_error"]:>6.2f} {s["mean_overshoot"]:>8.2f} '
+              f'{s["relay_cycles"]:>7.2f} {s["rejected"]:>9} '
+              f'{expected:>10} {sum(s["failed"].values()):>7}')
+    print('\nErrors in degrees, of the true ring position from the target '
+          '(|err|, p95, max) and of the dome azimuth (dome). Rejected '
+          'commands\nthat should have moved the dome, and rejected of those '
+          'that should be rejected.')
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        bins = np.arange(-180, 180 + args.bins, args.bins)
+        for i, run in enumerate(runs):
+            errors = [r['error'] for r in run['records']
+                      if r['op'] == 'goto' and r['error'] is not None
+                      and not r['rejected']]
+            counts, edges = np.histogram(errors, bins=bins)
+            nonzero = np.flatnonzero(counts)
+            run['error_histogram'] = dict(
+                bin_width=args.bins,
+                bin_starts=edges[nonzero].round(6).tolist(),
+                counts=counts[nonzero].tolist())
+            with open(os.path.join(args.output, f'run-{i}.json'), 'w') as f:
+                json.dump(run, f, indent=1)
+        with open(os.path.join(args.output, 'summary.json'), 'w') as f:
+            json.dump(summaries, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""Replay recorded dome journals and compare the dome's decisions.
+
+Each journal file (see `journal.Journal`) is replayed into a Dome on the
+mock pin factory by `replay.JournalReplay`, one file per process, and the
+relay starts and stops, encoder zeroings and move results of the replay
+are compared with the recorded ones. Directories are searched for journal
+files. The replay uses the dome configuration file (`--config`), with
+`--set` overrides, so a motion setting or code change can be checked
+against recorded nights, eg `--set az_position_tolerance=1.0`.
+
+`--speed` is `fast` (as fast as possible, checking the edge timing logic
+but not the stall watchdog or move deadlines), 1 for real time, or a
+factor to accelerate by. A row is printed for each journal, then the
+differing decisions with their time into the journal, and the exit status
+is 1 if any journal differs.
+
+Without journals, `--simulate N` records a journal of N random commands
+on the simulated dome of `goto_accuracy` and replays that, with the
+simulated dome's configuration.
+
+Run with `python -m domehunter.benchmarks.journal_replay`.
+"""
+
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+
+import numpy as np
+import yaml
+
+from domehunter.benchmarks.goto_accuracy import MIX, Harness
+from domehunter.dome_control import load_dome_config
+from domehunter.journal import read_journal
+from domehunter.replay import JournalReplay, describe_decision
+
+
+def simulate(directory, moves=50, seed=0):
+    """
+    Record a journal of random commands on the goto_accuracy harness.
+
+    Returns
+    -------
+    dict
+        Dome configuration of the simulated dome.
+
+    """
+    harness = Harness(dict(journal_dir=directory), seed=seed)
+    harness.dome.find_home()
+    harness.wait_for_move()
+    weights = np.array(list(MIX.values()))
+    for op in harness.rng.choice(list(MIX), size=moves,
+                                 p=weights / weights.sum()):
+        getattr(harness, op)()
+    harness.close()
+    return dict(harness.dome_kwargs, home_azimuth=0)
+
+
+def run(path, config, speed=None, count_tolerance=1, decision_timeout=5.0,
+        max_idle=None):
+    """
+    Replay a journal file.
+
+    Returns
+    -------
+    dict
+        Replay statistics, decision counts and descriptions of the
+        differing decisions.
+
+    """
+    records = read_journal(path)
+    result = JournalReplay(records, config, speed=speed,
+                           count_tolerance=count_tolerance,
+                           decision_timeout=decision_timeout,
+                           max_idle=max_idle).run()
+    start = records['mono'][0] if len(records) else 0.0
+    mismatches = []
+    for recorded, replayed in result.mismatches:
+        mono = (recorded if recorded is not None else replayed)['mono']
+        mismatches.append((
+            float(mono - start),
+            describe_decision(recorded) if recorded is not None else '-',
+            describe_decision(replayed) if replayed is not None else '-'))
+    return dict(path=path,
+                journal_time=result.journal_time,
+                elapsed=result.elapsed,
+                inputs=result.inputs,
+                counts=result.counts(),
+                missed=result.missed,
+                mismatches=mismatches,
+                stopped_at=result.stopped_at)
+
+
+def _run(args):
+    return run(*args)
+
+
+def _speed(value):
+    return None if value == 'fast' else float(value)
+
+
+def _journal_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.bin'))))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay dome journals and compare the decisions.")
+    parser.add_argument('journals', nargs='*',
+                        help='Journal files or directories of them.')
+    parser.add_argument('--config',
+                        help='Dome configuration file, default the server '
+                        'one.')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='KEY=VALUE',
+                        help=('Dome keyword argument override, can be '
+                              'repeated.'))
+    parser.add_argument('--speed', type=_speed, default=None,
+                        help="'fast', 1 for real time or a speed up factor.")
+    parser.add_argument('--count-tolerance', type=int, default=1,
+                        help='Encoder count difference that still matches.')
+    parser.add_argument('--decision-timeout', type=float, default=5.0,
+                        help='Seconds to wait for the dome to decide.')
+    parser.add_argument('--max-idle', type=float,
+                        help='Shorten idle gaps to this many seconds.')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                        help='Journals to replay in parallel.')
+    parser.add_argument('--show', type=int, default=10,
+                        help='Differences to show per journal.')
+    parser.add_argument('--simulate', type=int, metavar='COMMANDS',
+                        help='Record and replay a simulated journal.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed of the simulation.')
+    args = parser.parse_args()
+
+    directory = None
+    if args.simulate:
+        directory = tempfile.mkdtemp(prefix='journal-replay-')
+        # the simulated dome needs a process of its own
+        with multiprocessing.Pool(1) as pool:
+            config = pool.apply(simulate,
+                                (directory, args.simulate, args.seed))
+        files = _journal_files([directory])
+    else:
+        config = load_dome_config(args.config)
+        files = _journal_files(args.journals)
+    if not files:
+        parser.error('no journals to replay')
+    for option in args.set:
+        key, value = option.split('=', 1)
+        config[key] = yaml.safe_load(value)
+
+    jobs = [(path, config, args.speed, args.count_tolerance,
+             args.decision_timeout, args.max_idle) for path in files]
+    # each process has its own mock pins
+    with multiprocessing.Pool(min(args.processes, len(jobs))) as pool:
+        results = pool.map(_run, jobs)
+
+    print(f'{"journal":>28} {"journal (s)":>12} {"replay (s)":>11} '
+          f'{"speed":>6} {"inputs":>8} {"starts":>9} {"stops":>9} '
+          f'{"zeroings":>9} {"moves":>9} {"missed":>7} {"differ":>7}')
+    for r in results:
+        counts = {name: f'{recorded}/{replayed}'
+                  for name, (recorded, replayed) in r['counts'].items()}
+        speed = r['journal_time'] / r['elapsed'] if r['elapsed'] else 0
+        print(f'{os.path.basename(r["path"]):>28} '
+              f'{r["journal_time"]:>12.1f} {r["elapsed"]:>11.1f} '
+              f'{speed:>6.1f} {r["inputs"]:>8} '
+              f'{counts["starts"]:>9} {counts["stops"]:>9} '
+              f'{counts["zeroings"]:>9} {counts["moves"]:>9} '
+              f'{r["missed"]:>7} {len(r["mismatches"]):>7}')
+    print('(decision counts are recorded/replayed)')
+    for r in results:
+        if r['stopped_at'] is not None:
+            print(f'\n{r["path"]}: stopped at {r["stopped_at"]}, which '
+                  "isn't replayed.")
+        if r['mismatches']:
+            print(f'\n{r["path"]}:')
+            print(f'{"time (s)":>10} {"recorded":>28} {"replayed":>28}')
+            for time, recorded, replayed in r['mismatches'][:args.show]:
+                print(f'{time:>10.3f} {recorded:>28} {replayed:>28}')
+            if len(r['mismatches']) > args.show:
+                print(f'{"":>10} ... {len(r["mismatches"]) - args.show} '
+                      'more')
+    if directory is not None:
+        print(f'\nSimulated journal in {directory}.')
+    if any(r['mismatches'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark status LED I2C writes per dome rotation.
+
+A simulated dome with debug lights enabled and `simulation.FakeSN3218`
+standing in for the AutomationHAT LED driver is driven through one rotation
+(start the motor, encoder ticks with a home pass, stop the motor). The
+number of enable_leds() I2C writes and the time spent in each encoder
+callback are recorded for each LED refresh rate. A refresh rate of 0 writes
+every LED change synchronously, as `Dome._change_led_state` used to.
+
+Writes are only merged when several LED changes fall within one refresh
+period, so the saving grows with the tick rate. At any rate the encoder
+callbacks no longer block on the I2C bus.
+
+Run with `python -m domehunter.benchmarks.leds`.
+"""
+
+
+import argparse
+import time
+
+from domehunter import dome_control
+from domehunter.dome_control import Dome
+from domehunter.enumerations import Direction
+from domehunter.simulation import FakeSN3218
+
+
+def run(refresh_rate, num_ticks=335, tick_rate=50.0, write_time=0.0005):
+    """Simulate one rotation, returning I2C writes and callback time.
+
+    Parameters
+    ----------
+    refresh_rate : float
+        LED refresh rate (writes per second), 0 for synchronous writes.
+    num_ticks : int
+        Encoder ticks per rotation.
+    tick_rate : float
+        Encoder ticks per second.
+    write_time : float
+        Time in seconds each I2C write blocks for.
+
+    Returns
+    -------
+    dict
+        Dictionary of results.
+
+    """
+    driver = FakeSN3218(write_time=write_time)
+    dome_control.sn3218 = driver
+    dome = Dome(0, degrees_per_tick=360 / num_ticks, testing=True,
+                debug_lights=True, bounce_time=None,
+                led_refresh_rate=refresh_rate)
+    dome.test_mode_delay_duration = 0.5 / tick_rate
+    # time the encoder callbacks
+    callback_time = [0.0, 0]
+    increment_count = dome._increment_count
+
+    def timed_increment_count(edge_time=None):
+        start = time.perf_counter()
+        increment_count(edge_time)
+        callback_time[0] += time.perf_counter() - start
+        callback_time[1] += 1
+    dome._encoder.when_activated = timed_increment_count
+
+    start_writes = driver.writes
+    dome._rotate_dome(Direction.CW)
+    dome._home_sensor_pin.drive_low()
+    dome._simulate_ticks(num_ticks // 2)
+    dome._home_sensor_pin.drive_high()
+    dome._home_sensor_pin.drive_low()
+    dome._simulate_ticks(num_ticks - num_ticks // 2)
+    dome._stop_moving()
+    dome._leds.close()
+    writes = driver.writes - start_writes
+    return dict(refresh_rate=refresh_rate,
+                writes=writes,
+                writes_per_tick=writes / num_ticks,
+                callback_us=1e6 * callback_time[0] / max(callback_time[1], 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Status LED I2C writes per dome rotation.")
+    parser.add_argument('--refresh-rates', type=float, nargs='+',
+                        default=[0, 50, 20, 5],
+                        help='LED refresh rates to test, 0 is synchronous.')
+    parser.add_argument('--ticks', type=int, default=335,
+                        help='Encoder ticks per rotation.')
+    parser.add_argument('--tick-rate', type=float, default=50,
+                        help='Encoder ticks per second.')
+    parser.add_argument('--write-time', type=float, default=0.0005,
+                        help='Duration of each I2C write (seconds).')
+    args = parser.parse_args()
+
+    print(f'{"refresh (Hz)":>12} {"I2C writes":>11} {"per tick":>9} '
+          f'{"callback (us)":>14}')
+    for refresh_rate in args.refresh_rates:
+        r = run(refresh_rate, num_ticks=args.ticks, tick_rate=args.tick_rate,
+                write_time=args.write_time)
+        print(f'{r["refresh_rate"]:>12g} {r["writes"]:>11} '
+              f'{r["writes_per_tick"]:>9.2f} {r["callback_us"]:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
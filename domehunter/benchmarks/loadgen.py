@@ -0,0 +1,402 @@
+"""Load test of the RPC server with the polling pattern of the X2 driver.
+
+An `HX2DomeServer` with a simulated dome (testing mode, not the dummy
+server mode, so the dome really moves) is started on a free localhost port,
+and N clients, each with its own channel, call it for a set duration:
+
+- the first client drives the dome the way TheSkyX does through
+  `x2dome.cpp`: dapiFindHome, a number of dapiGotoAzEl to random azimuths,
+  dapiPark and dapiUnpark, repeated. After each command it polls the
+  matching dapiIs*Complete and dapiGetAzEl at the poll rate until the
+  command completes.
+- the other clients poll dapiGetAzEl and the dapiIs*Complete of the command
+  in progress at the poll rate, as further copies of the driver (or other
+  status pollers) would.
+
+Polls are scheduled at fixed times, so a slow call delays the next one
+rather than every later one. The latency of every call is measured by the
+client and kept in a `rpc_stats.LatencyHistogram` per RPC. The throughput,
+p50/p99/p99.9 latency, gRPC errors (by status code) and rejected calls
+(non zero return codes) are printed per RPC and overall, along with the
+server side queue wait and handler time from GetServerStats.
+
+With `--target` the clients call an already running server instead, eg
+one started with `python huntsman_dome_server.py --simulated`.
+
+Run with `python -m domehunter.benchmarks.loadgen`.
+"""
+
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent import futures
+
+import grpc
+import logbook
+
+from domehunter.rpc_stats import LatencyHistogram, StatsInterceptor
+
+# the RPC server and generated code live in the gRPC-server directory
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'gRPC-server')
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+import hx2dome_pb2  # noqa: E402
+import hx2dome_pb2_grpc  # noqa: E402
+
+# command RPC, and the RPC polled until it completes
+COMMANDS = {'find_home': ('dapiFindHome', 'dapiIsFindHomeComplete'),
+            'goto': ('dapiGotoAzEl', 'dapiIsGotoComplete'),
+            'park': ('dapiPark', 'dapiIsParkComplete'),
+            'unpark': ('dapiUnpark', 'dapiIsUnparkComplete')}
+
+
+def start_server(workers=10, degrees_per_tick=1.075, monitor_interval=None,
+                 logger=None, **kwargs):
+    """
+    Start an RPC server with a simulated dome on a free localhost port.
+
+    Parameters
+    ----------
+    workers : int
+        Size of the server thread pool.
+    degrees_per_tick : float
+        Degrees per encoder tick of the simulated dome.
+    monitor_interval : float
+        Movement monitor interval in seconds, the simulated dome moves one
+        encoder tick per interval. None for the Dome default.
+    logger : logbook.Logger
+        Logger for the servicer, defaults to one that discards everything.
+    kwargs
+        Further keyword arguments for the Dome.
+
+    Returns
+    -------
+    grpc.Server
+        The running server.
+    HX2DomeServer
+        The servicer.
+    str
+        Address of the server.
+
+    """
+    from huntsman_dome_server import HX2DomeServer
+
+    if logger is None:
+        logger = logbook.Logger('loadgen')
+        logger.handlers.append(logbook.NullHandler())
+    if monitor_interval is not None:
+        kwargs['monitor_interval'] = monitor_interval
+    servicer = HX2DomeServer(0, logger, testing=True, server_testing=False,
+                             debug_lights=False, bounce_time=None,
+                             degrees_per_tick=degrees_per_tick,
+                             log_stderr_level='ERROR', **kwargs)
+    server = grpc.server(futures.ThreadPoolExecutor(
+                             max_workers=workers,
+                             thread_name_prefix='grpc-worker'),
+                         interceptors=[StatsInterceptor(servicer.stats)])
+    hx2dome_pb2_grpc.add_HX2DomeServicer_to_server(servicer, server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, servicer, f'localhost:{port}'
+
+
+class LoadStats(object):
+    """
+    Client side latencies, errors and rejected calls of each RPC, shared
+    by the client threads.
+    """
+
+    def __init__(self):
+        self.histograms = dict()
+        self.errors = Counter()
+        self.rejected = Counter()
+        self.commands = Counter()
+        self._lock = threading.Lock()
+
+    def histogram(self, method):
+        with self._lock:
+            if method not in self.histograms:
+                self.histograms[method] = LatencyHistogram()
+            return self.histograms[method]
+
+    def call(self, stub, method, request, timeout):
+        """
+        Make a timed call.
+
+        Returns
+        -------
+        message
+            The reply, None if the call failed.
+
+        """
+        histogram = self.histogram(method)
+        start = time.perf_counter()
+        try:
+            reply = getattr(stub, method)(request, timeout=timeout)
+        except grpc.RpcError as e:
+            histogram.record(time.perf_counter() - start)
+            with self._lock:
+                self.errors[(method, e.code().name)] += 1
+            return None
+        histogram.record(time.perf_counter() - start)
+        if reply.return_code != 0:
+            with self._lock:
+                self.rejected[method] += 1
+        return reply
+
+
+class _Phase(object):
+    """The command in progress, set by the driving client."""
+
+    def __init__(self):
+        self.poll_method = 'dapiIsGotoComplete'
+
+
+def _poll(stats, stub, method, timeout):
+    empty = hx2dome_pb2.Empty()
+    stats.call(stub, 'dapiGetAzEl', empty, timeout)
+    return stats.call(stub, method, empty, timeout)
+
+
+def _wait_until(next_time, stop):
+    delay = next_time - time.monotonic()
+    if delay > 0:
+        stop.wait(delay)
+
+
+def drive(address, stats, phase, stop, poll_interval, gotos_per_cycle=5,
+          max_move=90.0, command_timeout=300.0, timeout=10.0, seed=None):
+    """
+    Drive the dome through find home, gotos, park and unpark until stopped,
+    polling for completion like the X2 driver.
+
+    Parameters
+    ----------
+    address : str
+        Server address.
+    stats : LoadStats
+        Statistics to record the calls in.
+    phase : _Phase
+        Shared command in progress.
+    stop : threading.Event
+        Set to stop.
+    poll_interval : float
+        Time in seconds between polls.
+    gotos_per_cycle : int
+        Gotos between homing and parking.
+    max_move : float
+        Largest goto in degrees.
+    command_timeout : float
+        Time in seconds to poll a command for before giving up on it.
+    timeout : float
+        Deadline of each call in seconds.
+    seed : int
+        Random seed for the goto targets.
+
+    """
+    rng = random.Random(seed)
+    empty = hx2dome_pb2.Empty()
+    cycle = ['find_home'] + ['goto'] * gotos_per_cycle + ['park', 'unpark']
+    with grpc.insecure_channel(address) as channel:
+        stub = hx2dome_pb2_grpc.HX2DomeStub(channel)
+        while not stop.is_set():
+            for command in cycle:
+                if stop.is_set():
+                    break
+                method, poll_method = COMMANDS[command]
+                request = empty
+                if command == 'goto':
+                    reply = stats.call(stub, 'dapiGetAzEl', empty, timeout)
+                    az = reply.az if reply is not None else 0
+                    az += rng.uniform(-max_move, max_move)
+                    request = hx2dome_pb2.AzEl(az=az % 360, el=45)
+                phase.poll_method = poll_method
+                if stats.call(stub, method, request, timeout) is None:
+                    continue
+                start = time.monotonic()
+                next_time = start
+                while not stop.is_set():
+                    next_time += poll_interval
+                    _wait_until(next_time, stop)
+                    reply = _poll(stats, stub, poll_method, timeout)
+                    if reply is not None and reply.is_complete:
+                        stats.commands[command] += 1
+                        break
+                    if time.monotonic() - start > command_timeout:
+                        stats.commands[f'{command} (timed out)'] += 1
+                        break
+        # leave the dome stopped
+        stats.call(stub, 'dapiAbort', empty, timeout)
+
+
+def follow(address, stats, phase, stop, poll_interval, timeout=10.0):
+    """
+    Poll dapiGetAzEl and the completion of the command in progress until
+    stopped.
+    """
+    with grpc.insecure_channel(address) as channel:
+        stub = hx2dome_pb2_grpc.HX2DomeStub(channel)
+        # spread the clients over the poll interval
+        next_time = time.monotonic() + random.uniform(0, poll_interval)
+        while not stop.is_set():
+            _wait_until(next_time, stop)
+            _poll(stats, stub, phase.poll_method, timeout)
+            next_time = max(next_time + poll_interval, time.monotonic())
+
+
+def run(clients=4, duration=60.0, poll_rate=2.0, address=None,
+        workers=10, monitor_interval=None, gotos_per_cycle=5, max_move=90.0,
+        seed=None):
+    """
+    Run the load test.
+
+    Parameters
+    ----------
+    clients : int
+        Number of concurrent clients, each with its own channel.
+    duration : float
+        Time to run for in seconds.
+    poll_rate : float
+        Polls per second of each client.
+    address : str
+        Address of a running server, None to start one with a simulated
+        dome.
+    workers : int
+        Size of the started server's thread pool.
+    monitor_interval : float
+        Movement monitor interval of the started server's dome, None for
+        the default.
+    gotos_per_cycle : int
+        Gotos between homing and parking.
+    max_move : float
+        Largest goto in degrees.
+    seed : int
+        Random seed for the goto targets.
+
+    Returns
+    -------
+    dict
+        elapsed time, the LoadStats, and the server's ServerStats message.
+
+    """
+    server = None
+    if address is None:
+        server, _, address = start_server(
+            workers, monitor_interval=monitor_interval)
+    stats = LoadStats()
+    phase = _Phase()
+    stop = threading.Event()
+    interval = 1 / poll_rate
+    threads = [threading.Thread(
+        target=drive, name='client-0',
+        args=(address, stats, phase, stop, interval),
+        kwargs=dict(gotos_per_cycle=gotos_per_cycle, max_move=max_move,
+                    seed=seed))]
+    threads.extend(threading.Thread(target=follow, name=f'client-{i}',
+                                    args=(address, stats, phase, stop,
+                                          interval))
+                   for i in range(1, clients))
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    with grpc.insecure_channel(address) as channel:
+        stub = hx2dome_pb2_grpc.HX2DomeStub(channel)
+        server_stats = stub.GetServerStats(hx2dome_pb2.Empty())
+    if server is not None:
+        server.stop(0)
+    return dict(elapsed=elapsed, stats=stats, server_stats=server_stats)
+
+
+def _ms(seconds):
+    return '-' if seconds is None else f'{1e3 * seconds:.2f}'
+
+
+def report(result):
+    """Print the results of a run."""
+    elapsed = result['elapsed']
+    stats = result['stats']
+    errors = Counter()
+    for (method, code), count in stats.errors.items():
+        errors[method] += count
+    total = dict(calls=0, errors=0, rejected=0)
+    print(f'{"rpc":>24} {"calls":>7} {"per s":>7} {"errors":>7} '
+          f'{"rejected":>9} {"p50 (ms)":>9} {"p99 (ms)":>9} '
+          f'{"p99.9 (ms)":>11}')
+    for method, histogram in sorted(stats.histograms.items()):
+        p50, p99, p999 = histogram.percentiles([50, 99, 99.9])
+        print(f'{method:>24} {histogram.count:>7} '
+              f'{histogram.count / elapsed:>7.1f} {errors[method]:>7} '
+              f'{stats.rejected[method]:>9} {_ms(p50):>9} {_ms(p99):>9} '
+              f'{_ms(p999):>11}')
+        total['calls'] += histogram.count
+        total['errors'] += errors[method]
+        total['rejected'] += stats.rejected[method]
+    print(f'{"total":>24} {total["calls"]:>7} '
+          f'{total["calls"] / elapsed:>7.1f} {total["errors"]:>7} '
+          f'{total["rejected"]:>9}')
+
+    if stats.errors:
+        print('\nErrors by status code:')
+        for (method, code), count in sorted(stats.errors.items()):
+            print(f'  {method} {code}: {count}')
+    print('\nCommands completed: ' + ', '.join(
+        f'{command} {count}' for command, count
+        in sorted(stats.commands.items())))
+
+    print('\nServer side (queue wait / handler time, ms):')
+    print(f'{"rpc":>24} {"p50 wait":>9} {"p99 wait":>9} {"p50 handler":>12} '
+          f'{"p99 handler":>12}')
+    for rpc in result['server_stats'].rpcs:
+        print(f'{rpc.method:>24} {_ms(rpc.queue.p50):>9} '
+              f'{_ms(rpc.queue.p99):>9} {_ms(rpc.handler.p50):>12} '
+              f'{_ms(rpc.handler.p99):>12}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=("Load test of the dome RPC server with the X2 driver "
+                     "polling pattern."))
+    parser.add_argument('--clients', type=int, default=4,
+                        help='Concurrent clients, each with its own channel.')
+    parser.add_argument('--duration', type=float, default=60,
+                        help='Time to run for (seconds).')
+    parser.add_argument('--poll-rate', type=float, default=2,
+                        help='Polls per second of each client.')
+    parser.add_argument('--target',
+                        help=('Address of a running server, by default one '
+                              'with a simulated dome is started on '
+                              'localhost.'))
+    parser.add_argument('--workers', type=int, default=10,
+                        help="Size of the started server's thread pool.")
+    parser.add_argument('--monitor-interval', type=float,
+                        help=('Movement monitor interval of the simulated '
+                              'dome (seconds), it moves a tick per '
+                              'interval.'))
+    parser.add_argument('--gotos', type=int, default=5,
+                        help='Gotos between homing and parking.')
+    parser.add_argument('--max-move', type=float, default=90,
+                        help='Largest goto (degrees).')
+    parser.add_argument('--seed', type=int, help='Random seed.')
+    args = parser.parse_args()
+
+    result = run(args.clients, args.duration, args.poll_rate, args.target,
+                 args.workers, args.monitor_interval, args.gotos,
+                 args.max_move, args.seed)
+    report(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""Microbenchmarks of the Dome hot paths and RPC handlers, with a baseline.
+
+Each benchmark times single calls of one function many times on a simulated
+dome (testing mode, with `simulation.FakeSN3218` for the status LEDs) and
+reports the median and 90th percentile call time:
+
+- `_increment_count`, the encoder tick callback
+- the `dome_az` property, `_ticks_to_az` and `_az_to_ticks`
+- `_goto_az_complete`, checked every monitor loop during a goto
+- `_change_led_state`
+- the `HX2DomeServer` handlers, called in-process. Handlers that start a
+  move are followed by an abort, outside the timed call. dapiPark and
+  dapiUnpark are timed on the already parked and unparked fast paths, as
+  the full commands are dominated by the dome moving and fixed sleeps.
+  SubmitPlan is timed clearing the plan. The streaming RunSequence and the
+  diagnostics handlers aren't included.
+
+The results can be saved as JSON with `--save`. With `--baseline`, each
+median is compared to the one in a saved results file, and the run fails
+(exit status 1) if any is slower than the baseline by more than
+`--tolerance` (a fraction, 0.25 by default). Baselines are specific to the
+machine, so save one on the machine that runs the comparison, eg:
+
+    python -m domehunter.benchmarks.microbench --save baseline.json
+    python -m domehunter.benchmarks.microbench --baseline baseline.json
+
+Run with `python -m domehunter.benchmarks.microbench`.
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import astropy.units as u
+import logbook
+import numpy as np
+from astropy.coordinates import Longitude
+
+from domehunter import dome_control
+from domehunter.enumerations import Direction, LED_Lights
+from domehunter.simulation import FakeSN3218
+
+# the RPC server and generated code live in the gRPC-server directory
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'gRPC-server')
+
+
+def time_calls(function, repeats, setup=None, teardown=None):
+    """
+    Time single calls of a function.
+
+    Parameters
+    ----------
+    function : callable
+        Function to time, called with no arguments.
+    repeats : int
+        Number of calls to time.
+    setup, teardown : callable
+        Called before and after each timed call, untimed.
+
+    Returns
+    -------
+    dict
+        Median and 90th percentile call time in microseconds, and repeats.
+
+    """
+    times = np.empty(repeats)
+    # one untimed call to warm up caches
+    if setup is not None:
+        setup()
+    function()
+    if teardown is not None:
+        teardown()
+    for i in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times[i] = time.perf_counter() - start
+        if teardown is not None:
+            teardown()
+    return dict(median_us=1e6 * float(np.median(times)),
+                p90_us=1e6 * float(np.percentile(times, 90)),
+                repeats=repeats)
+
+
+def make_server():
+    """
+    Return an in-process RPC server with a homed simulated dome.
+
+    The LED driver is replaced with a FakeSN3218 in dome_control, which the
+    caller restores.
+    """
+    if SERVER_DIR not in sys.path:
+        sys.path.insert(0, SERVER_DIR)
+    from huntsman_dome_server import HX2DomeServer
+
+    logger = logbook.Logger('microbench')
+    logger.handlers.append(logbook.NullHandler())
+    dome_control.sn3218 = FakeSN3218(write_time=0)
+    server = HX2DomeServer(0, logger, testing=True, server_testing=False,
+                           debug_lights=True, bounce_time=None,
+                           degrees_per_tick=1.075, led_refresh_rate=0)
+    dome = server.dome
+    dome._home_sensor_pin.drive_high()
+    dome._home_sensor_pin.drive_low()
+    dome._encoder_count = 100
+    return server
+
+
+def dome_benchmarks(dome):
+    """(name, function, setup, teardown) of the Dome hot path benchmarks."""
+    target = Longitude(200 * u.deg)
+
+    def start_cw():
+        dome.current_direction = Direction.CW
+
+    def stop():
+        dome.current_direction = Direction.NONE
+        dome._encoder_count = 100
+
+    return [
+        ('_increment_count', dome._increment_count, start_cw, stop),
+        ('dome_az', lambda: dome.dome_az, None, None),
+        ('_ticks_to_az', lambda: dome._ticks_to_az(100), None, None),
+        ('_az_to_ticks', lambda: dome._az_to_ticks(target), None, None),
+        ('_goto_az_complete', lambda: dome._goto_az_complete(target),
+         start_cw, stop),
+        ('_change_led_state',
+         lambda: dome._change_led_state(1, [LED_Lights.INPUT_1]),
+         None, lambda: dome._change_led_state(0, [LED_Lights.INPUT_1])),
+    ]
+
+
+def server_benchmarks(server):
+    """(name, function, setup, teardown) of the RPC handler benchmarks."""
+    import hx2dome_pb2
+
+    dome = server.dome
+    empty = hx2dome_pb2.Empty()
+    goto = hx2dome_pb2.AzEl(az=200, el=45)
+    sync = hx2dome_pb2.AzEl(az=dome.dome_az.degree, el=0)
+
+    def abort():
+        dome.abort()
+        dome._encoder_count = 100
+
+    def parked():
+        dome._park_event.set()
+
+    def unparked():
+        dome._park_event.clear()
+
+    handlers = [
+        ('dapiGetAzEl', empty, None, None),
+        ('dapiGotoAzEl', goto, None, abort),
+        ('dapiAbort', empty, None, None),
+        ('dapiOpen', empty, None, None),
+        ('dapiClose', empty, None, None),
+        ('dapiPark', empty, parked, unparked),
+        ('dapiUnpark', empty, None, None),
+        ('dapiFindHome', empty, None, abort),
+        ('dapiIsGotoComplete', empty, None, None),
+        ('dapiIsOpenComplete', empty, None, None),
+        ('dapiIsCloseComplete', empty, None, None),
+        ('dapiIsParkComplete', empty, None, None),
+        ('dapiIsUnparkComplete', empty, None, None),
+        ('dapiIsFindHomeComplete', empty, None, None),
+        ('dapiSync', sync, None, None),
+        ('SubmitPlan', hx2dome_pb2.Plan(), None, None),
+        ('GetServerStats', empty, None, None),
+        ('GetTraces', hx2dome_pb2.TraceQuery(limit=10), None, None),
+    ]
+    benchmarks = []
+    for name, request, setup, teardown in handlers:
+        handler = getattr(server, name)
+        benchmarks.append((f'rpc.{name}',
+                           lambda handler=handler, request=request:
+                           handler(request, None),
+                           setup, teardown))
+    return benchmarks
+
+
+def run(repeats=1000, rpc_repeats=200, include_rpc=True):
+    """
+    Run the benchmarks.
+
+    Parameters
+    ----------
+    repeats : int
+        Number of timed calls of each Dome function.
+    rpc_repeats : int
+        Number of timed calls of each RPC handler.
+    include_rpc : bool
+        Whether to run the RPC handler benchmarks.
+
+    Returns
+    -------
+    dict
+        Results keyed by benchmark name.
+
+    """
+    # not set if sn3218 failed to import
+    sn3218 = getattr(dome_control, 'sn3218', None)
+    try:
+        server = make_server()
+        dome = server.dome
+        results = dict()
+        for name, function, setup, teardown in dome_benchmarks(dome):
+            results[name] = time_calls(function, repeats, setup, teardown)
+        if include_rpc:
+            for name, function, setup, teardown in server_benchmarks(server):
+                results[name] = time_calls(function, rpc_repeats, setup,
+                                           teardown)
+        dome._leds.close()
+    finally:
+        if sn3218 is None:
+            del dome_control.sn3218
+        else:
+            dome_control.sn3218 = sn3218
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results keyed by benchmark name.
+    baseline : dict
+        Baseline results keyed by benchmark name.
+    tolerance : float
+        Allowed fractional increase of the median call time.
+
+    Returns
+    -------
+    dict
+        Ratio of the median to the baseline median, keyed by the benchmarks
+        in both.
+    list
+        Names of the benchmarks slower than the tolerance allows.
+    list
+        Names of the benchmarks missing from the baseline.
+
+    """
+    ratios = dict()
+    regressions = []
+    missing = []
+    for name, result in results.items():
+        if name not in baseline:
+            missing.append(name)
+            continue
+        ratio = result['median_us'] / baseline[name]['median_us']
+        ratios[name] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return ratios, regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Microbenchmarks of the Dome hot paths and RPC handlers.")
+    parser.add_argument('--repeats', type=int, default=1000,
+                        help='Timed calls of each Dome function.')
+    parser.add_argument('--rpc-repeats', type=int, default=200,
+                        help='Timed calls of each RPC handler.')
+    parser.add_argument('--no-rpc', action='store_true',
+                        help="Don't benchmark the RPC handlers.")
+    parser.add_argument('--save', help='Save the results to a JSON file.')
+    parser.add_argument('--baseline',
+                        help='JSON results file to compare against.')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help=('Allowed fractional slowdown of the median '
+                              'before a benchmark fails.'))
+    args = parser.parse_args()
+
+    results = run(args.repeats, args.rpc_repeats, not args.no_rpc)
+    ratios, regressions, missing = dict(), [], []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        ratios, regressions, missing = compare(results, baseline,
+                                               args.tolerance)
+
+    print(f'{"benchmark":>36} {"median (us)":>12} {"p90 (us)":>10} '
+          f'{"vs baseline":>12}')
+    for name, result in results.items():
+        ratio = f'{ratios[name]:.2f}x' if name in ratios else '-'
+        flag = ' REGRESSION' if name in regressions else ''
+        if name in missing:
+            flag = ' NOT IN BASELINE'
+        print(f'{name:>36} {result["median_us"]:>12.1f} '
+              f'{result["p90_us"]:>10.1f} {ratio:>12}{flag}')
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(dict(python=platform.python_version(),
+                           machine=platform.machine(),
+                           node=platform.node(),
+                           time=time.strftime('%Y-%m-%d %H:%M:%S'),
+                           results=results), f, indent=2)
+    if regressions:
+        print(f'\n{len(regressions)} benchmarks slower than the baseline by '
+              f'more than {100 * args.tolerance:.0f}%.')
+    if missing:
+        print(f'\n{len(missing)} benchmarks missing from the baseline, save '
+              'a new one with --save.')
+    if regressions or missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark dome time and compute time of target ordering heuristics.
+
+Batches of random target azimuths (eg flat field positions or survey
+tiles) are visited in three orders: as given, greedy nearest neighbour
+(each move to the closest remaining target, O(n^2)), and
+`ordering.order_targets` (the best sweep with at most one reversal,
+O(n log n)). The estimated dome time of each order (shortest route per move
+as in Dome.goto_az, spin up per move and a cost per reversal) and the time
+taken to compute it are printed for each batch size.
+
+Run with `python -m domehunter.benchmarks.ordering`.
+"""
+
+
+import argparse
+import time
+
+import numpy as np
+
+from domehunter.ordering import estimate_dome_time, order_targets
+from domehunter.tracking import wrap_180
+
+
+def nearest_neighbour(azimuths, start_az):
+    """Greedy order, always moving to the nearest remaining target."""
+    remaining = np.ones(len(azimuths), dtype=bool)
+    order = []
+    az = start_az
+    for _ in range(len(azimuths)):
+        distance = np.where(remaining, np.abs(wrap_180(azimuths - az)),
+                            np.inf)
+        index = int(np.argmin(distance))
+        order.append(index)
+        remaining[index] = False
+        az = azimuths[index]
+    return np.array(order)
+
+
+def run(num_targets, slew_rate=3.0, spin_up=0.5, reversal_cost=2.0,
+        seed=0):
+    """Order one random batch with each method.
+
+    Parameters
+    ----------
+    num_targets : int
+        Number of targets in the batch.
+    slew_rate : float
+        Dome rotation rate in degrees per second.
+    spin_up : float
+        Motor spin up time per move in seconds.
+    reversal_cost : float
+        Time lost per reversal in seconds.
+    seed : int
+        Random seed for the azimuths.
+
+    Returns
+    -------
+    list
+        List of dictionaries of results, one per method.
+
+    """
+    rng = np.random.default_rng(seed)
+    azimuths = rng.uniform(0, 360, num_targets)
+    start_az = 0.0
+    methods = (
+        ('given', lambda: np.arange(num_targets)),
+        ('nearest', lambda: nearest_neighbour(azimuths, start_az)),
+        ('sweep', lambda: order_targets(azimuths, start_az=start_az,
+                                        slew_rate=slew_rate,
+                                        reversal_cost=reversal_cost)),
+    )
+    results = []
+    for name, method in methods:
+        start = time.perf_counter()
+        order = method()
+        compute_time = time.perf_counter() - start
+        estimate = estimate_dome_time(azimuths[order], start_az=start_az,
+                                      slew_rate=slew_rate, spin_up=spin_up,
+                                      reversal_cost=reversal_cost)
+        results.append(dict(method=name,
+                            targets=num_targets,
+                            compute_ms=compute_time * 1e3,
+                            **estimate))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dome time of target ordering heuristics.")
+    parser.add_argument('--targets', type=int, nargs='+',
+                        default=[10, 100, 1000, 5000],
+                        help='Batch sizes to test.')
+    parser.add_argument('--slew-rate', type=float, default=3,
+                        help='Dome rotation rate (degrees per second).')
+    parser.add_argument('--spin-up', type=float, default=0.5,
+                        help='Motor spin up time per move (seconds).')
+    parser.add_argument('--reversal-cost', type=float, default=2,
+                        help='Time lost per reversal (seconds).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    print(f'{"targets":>8} {"method":>8} {"rotation":>10} '
+          f'{"reversals":>10} {"dome time (s)":>14} {"compute (ms)":>13}')
+    for num_targets in args.targets:
+        for r in run(num_targets, args.slew_rate, args.spin_up,
+                     args.reversal_cost, args.seed):
+            print(f'{r["targets"]:>8} {r["method"]:>8} '
+                  f'{r["rotation"]:>10.0f} {r["reversals"]:>10} '
+                  f'{r["time"]:>14.0f} {r["compute_ms"]:>13.2f}')
+
+
+if __name__ == '__main__':
+    main()
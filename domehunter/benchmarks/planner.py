@@ -0,0 +1,130 @@
+"""Benchmark dome overhead per target with and without pre-positioning.
+
+A synthetic night of targets (random azimuth and elevation, a fixed time
+on each) is run through `planner.simulate_plan` twice: once with gotos
+only, and once with a `PrePositionPlanner` turning the dome towards the
+next target during each exposure, as far as the slit window of the current
+target allows. The overhead of a target is the time from its goto to the
+dome being ready. Pre-positioning saves at most the slit window (less the
+margin) of turning per target, so the saving is largest for high targets,
+where the window is widest, and for small slews that it turns into skipped
+gotos.
+
+Run with `python -m domehunter.benchmarks.planner`.
+"""
+
+
+import argparse
+
+import numpy as np
+
+from domehunter.geometry import slit_tolerance
+from domehunter.planner import (ObservationPlan, PlannedTarget,
+                                PrePositionPlanner, simulate_plan)
+
+
+def synthetic_plan(num_targets, target_time, max_slew, rng):
+    """Return a plan of targets a random walk in azimuth apart."""
+    az = 180.0
+    targets = []
+    for i in range(num_targets):
+        targets.append(PlannedTarget(az, i * target_time,
+                                     el=rng.uniform(30, 85),
+                                     name=f'target-{i}'))
+        az = (az + rng.uniform(-max_slew, max_slew)) % 360
+    return ObservationPlan(targets)
+
+
+def run(num_targets=20,
+        target_time=300.0,
+        max_slew=60.0,
+        slit_width=1.2,
+        dome_radius=3.5,
+        aperture=0.4,
+        slew_rate=3.0,
+        margin=0.5,
+        seed=0):
+    """Simulate a night with and without pre-positioning.
+
+    Parameters
+    ----------
+    num_targets : int
+        Number of targets.
+    target_time : float
+        Time from one goto to the next in seconds.
+    max_slew : float
+        Largest azimuth change between targets in degrees.
+    slit_width, dome_radius, aperture : float
+        Slit geometry, see geometry.slit_tolerance.
+    slew_rate : float
+        Dome rotation rate in degrees per second.
+    margin : float
+        PrePositionPlanner margin in degrees.
+    seed : int
+        Random seed for the targets.
+
+    Returns
+    -------
+    plan, baseline, planned
+        The plan and the simulate_plan results without and with the planner.
+
+    """
+    rng = np.random.default_rng(seed)
+    plan = synthetic_plan(num_targets, target_time, max_slew, rng)
+
+    def tolerance(el):
+        return float(slit_tolerance(el, slit_width, dome_radius, aperture))
+
+    baseline = simulate_plan(plan, None, tolerance, slew_rate=slew_rate)
+    planned = simulate_plan(plan, PrePositionPlanner(margin=margin),
+                            tolerance, slew_rate=slew_rate)
+    return plan, baseline, planned
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dome overhead per target with pre-positioning.")
+    parser.add_argument('--targets', type=int, default=20,
+                        help='Number of targets.')
+    parser.add_argument('--target-time', type=float, default=300,
+                        help='Time per target (seconds).')
+    parser.add_argument('--max-slew', type=float, default=60,
+                        help='Largest azimuth change between targets.')
+    parser.add_argument('--slit-width', type=float, default=1.2,
+                        help='Slit width (metres).')
+    parser.add_argument('--dome-radius', type=float, default=3.5,
+                        help='Dome radius (metres).')
+    parser.add_argument('--aperture', type=float, default=0.4,
+                        help='Telescope beam diameter at the slit (metres).')
+    parser.add_argument('--slew-rate', type=float, default=3,
+                        help='Dome rotation rate (degrees per second).')
+    parser.add_argument('--margin', type=float, default=0.5,
+                        help='Planner margin (degrees).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    plan, baseline, planned = run(args.targets, args.target_time,
+                                  args.max_slew, args.slit_width,
+                                  args.dome_radius, args.aperture,
+                                  args.slew_rate, args.margin, args.seed)
+    print(f'{"target":>10} {"az":>7} {"el":>5} {"slew":>7} '
+          f'{"goto (s)":>9} {"planned (s)":>12} {"saved (s)":>10}')
+    for i, (before, after) in enumerate(zip(baseline['overheads'],
+                                            planned['overheads'])):
+        target = plan[i + 1]
+        slew = (target.az - plan[i].az + 180) % 360 - 180
+        print(f'{target.name:>10} {target.az:>7.1f} {target.el:>5.1f} '
+              f'{slew:>7.1f} {before:>9.1f} {after:>12.1f} '
+              f'{before - after:>10.1f}')
+    saved = baseline['total_overhead'] - planned['total_overhead']
+    print(f'\ntotal overhead: {baseline["total_overhead"]:.1f}s gotos only, '
+          f'{planned["total_overhead"]:.1f}s pre-positioned, '
+          f'saved {saved:.1f}s '
+          f'({saved / max(len(baseline["overheads"]), 1):.1f}s per target)')
+    print(f'relay cycles: {baseline["relay_cycles"]} gotos only, '
+          f'{planned["relay_cycles"]} pre-positioned '
+          f'({planned["pre_rotations"]} pre-rotations)')
+
+
+if __name__ == '__main__':
+    main()
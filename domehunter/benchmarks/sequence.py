@@ -0,0 +1,129 @@
+"""Benchmark a waypoint scan run by the client against Dome.run_sequence.
+
+A `simulation.BacklashPlant` (with no backlash, but a motor spin up time)
+drives a simulated dome through a scan of evenly spaced waypoints, as for a
+dome flat or a drift scan. In 'client' mode each waypoint is a goto_az
+followed by polling for completion every poll interval, as a client does
+with dapiGotoAzEl and dapiIsGotoComplete, so the motor stops and restarts
+at every waypoint and each step waits for the next poll. In 'sequence' mode
+the whole scan is passed to `Dome.run_sequence`, which keeps the motor
+running through waypoints without a dwell.
+
+The total scan time, the relay cycles (motor starts) and the time per
+waypoint are printed for each mode, with and without a dwell at each
+waypoint.
+
+Run with `python -m domehunter.benchmarks.sequence`.
+"""
+
+
+import argparse
+import time
+
+from domehunter.dome_control import Dome
+from domehunter.sequence import Waypoint
+from domehunter.simulation import BacklashPlant
+
+
+def make_dome(degrees_per_tick, tick_rate, spin_up):
+    """Return a simulated dome driven by a BacklashPlant, and the plant."""
+    dome = Dome(0, testing=True, debug_lights=False,
+                degrees_per_tick=degrees_per_tick, bounce_time=None,
+                az_position_tolerance=0.5, monitor_interval=0.0005)
+    plant = BacklashPlant(dome, backlash=0, tick_rate=tick_rate,
+                          ticks_per_rotation=round(360 / degrees_per_tick),
+                          start=-20, spin_up=spin_up)
+    # the plant provides the ticks from here on
+    dome.testing = False
+    return dome, plant
+
+
+def wait_for_move(dome, poll_interval=0.005):
+    time.sleep(poll_interval)
+    while dome.movement_thread_active:
+        time.sleep(poll_interval)
+
+
+def run(mode, waypoints, dwell=0.0, poll_interval=0.1, degrees_per_tick=0.5,
+        tick_rate=300.0, spin_up=0.2):
+    """Scan through the waypoints in one mode.
+
+    Parameters
+    ----------
+    mode : str
+        'client' or 'sequence'.
+    waypoints : list
+        Waypoint azimuths in degrees.
+    dwell : float
+        Time in seconds to hold at each waypoint.
+    poll_interval : float
+        Interval in seconds the client polls for completion at.
+    degrees_per_tick : float
+        Degrees per encoder tick.
+    tick_rate : float
+        Encoder ticks per second while the motor is on.
+    spin_up : float
+        Motor spin up time in seconds.
+
+    Returns
+    -------
+    dict
+        Dictionary of results for the mode.
+
+    """
+    dome, plant = make_dome(degrees_per_tick, tick_rate, spin_up)
+    dome.find_home()
+    wait_for_move(dome)
+    dome.goto_az(waypoints[0])
+    wait_for_move(dome)
+    cycles = dome.relay_cycles
+    start = time.monotonic()
+    if mode == 'client':
+        for az in waypoints[1:]:
+            dome.goto_az(az)
+            wait_for_move(dome, poll_interval)
+            time.sleep(dwell)
+    else:
+        dome.run_sequence([Waypoint(az, dwell) for az in waypoints[1:]])
+        wait_for_move(dome)
+    total = time.monotonic() - start
+    plant.close()
+    return dict(mode=mode,
+                dwell=dwell,
+                time=total,
+                per_waypoint=total / (len(waypoints) - 1),
+                relay_cycles=dome.relay_cycles - cycles)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Client driven scan against a dome run sequence.")
+    parser.add_argument('--start', type=float, default=30,
+                        help='First waypoint azimuth (degrees).')
+    parser.add_argument('--step', type=float, default=10,
+                        help='Waypoint spacing (degrees).')
+    parser.add_argument('--waypoints', type=int, default=10,
+                        help='Number of waypoints.')
+    parser.add_argument('--dwell', type=float, nargs='+', default=[0, 0.5],
+                        help='Dwell times to test (seconds).')
+    parser.add_argument('--poll-interval', type=float, default=0.1,
+                        help='Client completion polling interval (seconds).')
+    parser.add_argument('--tick-rate', type=float, default=300,
+                        help='Encoder ticks per second.')
+    parser.add_argument('--spin-up', type=float, default=0.2,
+                        help='Motor spin up time (seconds).')
+    args = parser.parse_args()
+
+    waypoints = [args.start + i * args.step for i in range(args.waypoints)]
+    print(f'{"mode":>9} {"dwell":>6} {"time (s)":>9} {"per step (s)":>13} '
+          f'{"relay cycles":>13}')
+    for dwell in args.dwell:
+        for mode in ('client', 'sequence'):
+            r = run(mode, waypoints, dwell, args.poll_interval,
+                    tick_rate=args.tick_rate, spin_up=args.spin_up)
+            print(f'{r["mode"]:>9} {r["dwell"]:>6.1f} {r["time"]:>9.2f} '
+                  f'{r["per_waypoint"]:>13.3f} {r["relay_cycles"]:>13}')
+
+
+if __name__ == '__main__':
+    main()
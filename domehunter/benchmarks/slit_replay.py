@@ -0,0 +1,138 @@
+"""Count the dome moves avoided by the slit-aware goto tolerance.
+
+A night of dapiGotoAzEl requests is replayed and each request is counted as
+a move if the dome is outside the tolerance of the target, with the fixed
+az_position_tolerance and with the elevation dependent tolerance from the
+slit geometry (`geometry.slit_tolerance`). Moves are assumed to centre the
+slit on the target.
+
+The requests are read from the GotoAzEl lines of a server log with --log,
+or synthesised: TheSkyX tracking a series of sidereal targets at the
+Huntsman latitude, sending a goto every --interval seconds.
+
+Run with `python -m domehunter.benchmarks.slit_replay`.
+"""
+
+
+import argparse
+import re
+
+import numpy as np
+
+from domehunter.geometry import DomeGeometry, slit_tolerance
+from domehunter.tracking import wrap_180
+
+LATITUDE = -31.2733
+
+_GOTO_LINE = re.compile(r'GotoAzEl Az=([-\d.]+), El=([-\d.]+)')
+
+
+def read_log(path):
+    """Return arrays of (az, el) from the GotoAzEl lines of a server log."""
+    requests = []
+    with open(path) as f:
+        for line in f:
+            match = _GOTO_LINE.search(line)
+            if match:
+                requests.append((float(match.group(1)),
+                                 float(match.group(2))))
+    az, el = np.array(requests).T
+    return az, el
+
+
+def synthetic_night(hours=10, interval=30.0, min_alt=30.0, seed=0):
+    """Return arrays of (az, el) gotos for a night of sidereal targets."""
+    rng = np.random.default_rng(seed)
+    # a centred telescope, so the dome az/el is the target alt/az
+    sky = DomeGeometry(LATITUDE, 1.0)
+    azimuths = []
+    elevations = []
+    elapsed = 0.0
+    while elapsed < hours * 3600:
+        dwell = rng.uniform(20, 60) * 60
+        # pick a target above min_alt for the whole visit
+        while True:
+            dec = rng.uniform(-85, 10)
+            start_ha = rng.uniform(-60, 30)
+            times = np.arange(0, dwell, interval)
+            ha = start_ha + times * 15.041 / 3600
+            az, el = sky.dome_azimuth_hadec(ha, np.full_like(ha, dec))
+            if el.min() > min_alt:
+                break
+        azimuths.append(az)
+        elevations.append(el)
+        elapsed += dwell
+    return np.concatenate(azimuths), np.concatenate(elevations)
+
+
+def count_moves(az, el, tolerance):
+    """Count the requests that move the dome, for tolerance(el)."""
+    dome_az = None
+    moves = 0
+    for target_az, target_tolerance in zip(az, tolerance(el)):
+        if (dome_az is None
+                or abs(wrap_180(target_az - dome_az)) > target_tolerance):
+            moves += 1
+            dome_az = target_az
+    return moves
+
+
+def run(az, el, az_position_tolerance=1.7, slit_width=1.0, dome_radius=2.5,
+        aperture=0.4):
+    """Count moves with the fixed and slit-aware tolerances.
+
+    Returns
+    -------
+    dict
+        Number of requests, moves for each tolerance and moves avoided.
+
+    """
+    def fixed(el):
+        return np.full_like(el, az_position_tolerance)
+
+    def slit_aware(el):
+        return np.maximum(az_position_tolerance,
+                          slit_tolerance(el, slit_width, dome_radius,
+                                         aperture))
+
+    fixed_moves = count_moves(az, el, fixed)
+    slit_moves = count_moves(az, el, slit_aware)
+    return dict(requests=len(az),
+                fixed_moves=fixed_moves,
+                slit_moves=slit_moves,
+                moves_avoided=fixed_moves - slit_moves)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dome moves avoided by the slit-aware tolerance.")
+    parser.add_argument('--log', help='Server log to replay.')
+    parser.add_argument('--hours', type=float, default=10,
+                        help='Length of the synthetic night.')
+    parser.add_argument('--interval', type=float, default=30,
+                        help='Seconds between synthetic gotos.')
+    parser.add_argument('--tolerance', type=float, default=1.7,
+                        help='Fixed az_position_tolerance (degrees).')
+    parser.add_argument('--slit-width', type=float, default=1.0,
+                        help='Slit width (metres).')
+    parser.add_argument('--dome-radius', type=float, default=2.5,
+                        help='Dome radius (metres).')
+    parser.add_argument('--aperture', type=float, default=0.4,
+                        help='Telescope beam diameter at the slit (metres).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    if args.log:
+        az, el = read_log(args.log)
+    else:
+        az, el = synthetic_night(args.hours, args.interval, seed=args.seed)
+    r = run(az, el, args.tolerance, args.slit_width, args.dome_radius,
+            args.aperture)
+    print(f'requests {r["requests"]}, moves with fixed tolerance '
+          f'{r["fixed_moves"]}, with slit-aware tolerance {r["slit_moves"]}, '
+          f'avoided {r["moves_avoided"]} '
+          f'({r["moves_avoided"] / max(r["fixed_moves"], 1):.0%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,480 @@
+"""Soak test of the RPC server for leaks over a virtual week.
+
+An `HX2DomeServer` with a simulated dome is run under a compressed week of
+mixed load. The dome is driven by a `simulation.BacklashPlant` at a high
+tick rate, so moves take milliseconds. Each virtual hour is a fixed amount
+of work, run as fast as it can be:
+
+- every night (18:00 to 06:00) the dome is unparked and homed at dusk,
+  makes `--gotos-per-hour` random gotos an hour (each polled with
+  dapiIsGotoComplete and dapiGetAzEl until complete, as the X2 driver
+  does), has one goto aborted at midnight and is parked at dawn;
+- `--polls-per-hour` polls of dapiGetAzEl and the completion of the command
+  in progress are shared between the other clients, day and night;
+- every hour GetServerStats and GetTraces are called and the metrics page
+  is scraped over HTTP, and every day a thread dump is written with the
+  DumpThreads RPC.
+
+The clients keep their channels for the whole run, as TheSkyX does. The
+server logs to files in a temporary directory (or `--log-dir`), as the
+daemon does.
+
+Every `--snapshot-hours` virtual hours (and at the end) the traced memory
+(`tracemalloc`), the threads by name, the open file descriptors, the
+logbook loggers and handlers, and the state history recorded by the mock
+pins are logged. The first snapshot from the end of the first virtual day
+on is the baseline, so that caches and thread pools filled on first use
+aren't counted. The dome keeps
+`--trace-capacity` trace spans (100, rather than the configured 1000) so
+that the trace ring is full by then too. At the end any growth since the
+baseline in threads (beyond the thread pool limits), file descriptors,
+loggers or handlers, or memory growth of more than `--memory-threshold` KiB
+per virtual day, is reported with the top allocation sites by growth, and
+the exit status is 1.
+
+gpiozero's mock pins append every state change to `MockPin.states`, which
+grows by two entries per encoder tick without bound. It is a test double
+artifact (real pins keep no history), so the history is counted and then
+cleared at every snapshot. Pass `--keep-pin-history` to see it as a leak.
+
+Run with `python -m domehunter.benchmarks.soak`.
+"""
+
+
+import argparse
+import gc
+import os
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from collections import Counter
+from concurrent import futures
+
+import grpc
+import logbook
+from gpiozero import Device
+
+from domehunter.benchmarks.loadgen import start_server
+from domehunter.logging import set_up_logger
+from domehunter.metrics import MetricsServer
+from domehunter.simulation import BacklashPlant
+
+import hx2dome_pb2  # noqa: E402, on the path once loadgen is imported
+import hx2dome_pb2_grpc  # noqa: E402
+
+# poll method while a command is in progress
+POLL_METHODS = {'goto': 'dapiIsGotoComplete',
+                'find_home': 'dapiIsFindHomeComplete',
+                'park': 'dapiIsParkComplete',
+                'unpark': 'dapiIsUnparkComplete'}
+
+
+def pin_history(clear=False):
+    """
+    Number of state changes recorded by the mock pins.
+
+    Parameters
+    ----------
+    clear : bool
+        Clear the recorded states after counting them.
+
+    Returns
+    -------
+    int
+        Total states recorded.
+
+    """
+    total = 0
+    for pin in list(Device.pin_factory.pins.values()):
+        states = getattr(pin, 'states', None)
+        if states is None:
+            continue
+        total += len(states)
+        if clear:
+            pin.clear_states()
+    return total
+
+
+def open_fds():
+    """Number of open file descriptors, None if unknown."""
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def snapshot(hour, start, clear_pins=True):
+    """
+    Resource use of the process.
+
+    Returns
+    -------
+    dict
+        Virtual hour, wall time, traced memory, threads, thread names (with
+        numbers replaced by N), file descriptors, logbook loggers and
+        handlers and mock pin history.
+
+    """
+    gc.collect()
+    loggers = [obj for obj in gc.get_objects()
+               if isinstance(obj, logbook.Logger)]
+    threads = threading.enumerate()
+    return dict(hour=hour,
+                wall=time.monotonic() - start,
+                memory=tracemalloc.get_traced_memory()[0],
+                threads=len(threads),
+                thread_names=Counter(re.sub(r'\d+', 'N', thread.name)
+                                     for thread in threads),
+                fds=open_fds(),
+                loggers=len(loggers),
+                handlers=sum(len(logger.handlers) for logger in loggers),
+                pin_history=pin_history(clear=clear_pins))
+
+
+class Soak(object):
+    """
+    The server, the clients and the virtual week of load.
+
+    Parameters
+    ----------
+    clients : int
+        Number of clients, each with its own channel. The first drives the
+        dome and the rest poll.
+    log_dir : str
+        Directory for the server logs and thread dumps.
+    gotos_per_hour : int
+        Gotos per night hour.
+    polls_per_hour : int
+        Polls per hour, shared between the polling clients.
+    tick_rate : float
+        Encoder ticks per second of the simulated dome.
+    trace_capacity : int
+        Finished trace spans the dome keeps.
+    seed : int
+        Random seed.
+    command_timeout : float
+        Time in seconds to poll a command for before counting it as an
+        error.
+
+    """
+
+    def __init__(self, clients=3, log_dir=None, gotos_per_hour=6,
+                 polls_per_hour=240, tick_rate=1000.0, trace_capacity=100,
+                 seed=None, command_timeout=300.0):
+        logger = set_up_logger('soak', 'soak_server.log',
+                               log_file_level='NOTICE',
+                               log_stderr_level='ERROR')
+        self.server, self.servicer, address = start_server(
+            degrees_per_tick=0.5, monitor_interval=0.001, logger=logger,
+            trace_capacity=trace_capacity)
+        self.dome = self.servicer.dome
+        self.servicer.diagnostics.log_dir = log_dir
+        self.plant = BacklashPlant(self.dome, backlash=0, tick_rate=tick_rate,
+                                   ticks_per_rotation=720, start=-20)
+        # the plant provides the ticks from here on
+        self.dome.testing = False
+        self.metrics = MetricsServer(self.dome, self.servicer.stats, port=0)
+        self.metrics.start()
+        self.channels = [grpc.insecure_channel(address)
+                         for _ in range(clients)]
+        self.stubs = [hx2dome_pb2_grpc.HX2DomeStub(channel)
+                      for channel in self.channels]
+        self.pollers = futures.ThreadPoolExecutor(max(clients - 1, 1),
+                                                  thread_name_prefix='poller')
+        # thread pools start threads as they are needed, up to a limit
+        self.pools = {'grpc-worker_N': 10, 'poller_N': max(clients - 1, 1)}
+        self.gotos_per_hour = gotos_per_hour
+        self.polls_per_hour = polls_per_hour
+        self.rng = random.Random(seed)
+        self.command_timeout = command_timeout
+        self.phase = 'goto'
+        self.errors = Counter()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.pollers.shutdown()
+        for channel in self.channels:
+            channel.close()
+        self.metrics.stop()
+        self.server.stop(0)
+        self.plant.close()
+
+    def _call(self, stub, method, request=None):
+        if request is None:
+            request = hx2dome_pb2.Empty()
+        with self._lock:
+            self.calls += 1
+        try:
+            return getattr(stub, method)(request, timeout=30)
+        except grpc.RpcError as e:
+            with self._lock:
+                self.errors[(method, e.code().name)] += 1
+            return None
+
+    def _command(self, command, method, request=None):
+        """Send a command and poll it to completion."""
+        stub = self.stubs[0]
+        self.phase = command
+        if self._call(stub, method, request) is None:
+            return
+        start = time.monotonic()
+        while True:
+            self._call(stub, 'dapiGetAzEl')
+            reply = self._call(stub, POLL_METHODS[command])
+            if reply is None or reply.is_complete:
+                return
+            if time.monotonic() - start > self.command_timeout:
+                with self._lock:
+                    self.errors[(method, 'COMMAND_TIMEOUT')] += 1
+                return
+            time.sleep(0.002)
+
+    def _target(self, offset):
+        reply = self._call(self.stubs[0], 'dapiGetAzEl')
+        az = (reply.az if reply is not None else 0) + offset
+        return hx2dome_pb2.AzEl(az=az % 360, el=45)
+
+    def _poll(self, stub, count):
+        for _ in range(count):
+            self._call(stub, 'dapiGetAzEl')
+            self._call(stub, POLL_METHODS[self.phase])
+
+    def run_hour(self, hour):
+        """Run the load of one virtual hour."""
+        pollers = self.stubs[1:] or self.stubs
+        polls = [self.pollers.submit(self._poll, stub,
+                                     self.polls_per_hour // len(pollers))
+                 for stub in pollers]
+        hour_of_day = hour % 24
+        night = hour_of_day >= 18 or hour_of_day < 6
+        if hour_of_day == 18:
+            self._command('unpark', 'dapiUnpark')
+            self._command('find_home', 'dapiFindHome')
+        if night:
+            for _ in range(self.gotos_per_hour):
+                self._command('goto', 'dapiGotoAzEl',
+                              self._target(self.rng.uniform(-45, 45)))
+        if hour_of_day == 0:
+            self._call(self.stubs[0], 'dapiGotoAzEl', self._target(180))
+            time.sleep(0.01)
+            self._call(self.stubs[0], 'dapiAbort')
+        if hour_of_day == 5:
+            self._command('park', 'dapiPark')
+        stub = self.stubs[-1]
+        self._call(stub, 'GetServerStats')
+        self._call(stub, 'GetTraces', hx2dome_pb2.TraceQuery(limit=50))
+        with urllib.request.urlopen(
+                f'http://localhost:{self.metrics.port}/metrics') as response:
+            response.read()
+        if hour_of_day == 12:
+            self._call(stub, 'DumpThreads')
+        for poll in polls:
+            poll.result()
+
+
+def _top_growth(baseline, final, top):
+    """Top allocation sites by growth between two tracemalloc snapshots."""
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap>')]
+    stats = final.filter_traces(filters).compare_to(
+        baseline.filter_traces(filters), 'lineno')
+    return [stat for stat in stats if stat.size_diff > 0][:top]
+
+
+def run(days=7, snapshot_hours=12, clients=3, gotos_per_hour=6,
+        polls_per_hour=240, tick_rate=1000.0, trace_capacity=100,
+        log_dir=None, frames=1, keep_pin_history=False, seed=None,
+        command_timeout=300.0, report=print):
+    """
+    Run the soak test.
+
+    Parameters
+    ----------
+    days : float
+        Virtual days to run for.
+    snapshot_hours : int
+        Virtual hours between snapshots, the last hour is always
+        snapshotted too.
+    clients : int
+        Number of clients.
+    gotos_per_hour : int
+        Gotos per night hour.
+    polls_per_hour : int
+        Polls per hour, shared between the polling clients.
+    tick_rate : float
+        Encoder ticks per second of the simulated dome.
+    trace_capacity : int
+        Finished trace spans the dome keeps.
+    log_dir : str
+        Directory for the server logs, a temporary directory if None.
+    frames : int
+        Stack frames tracemalloc keeps per allocation.
+    keep_pin_history : bool
+        Don't clear the mock pin state history at each snapshot.
+    seed : int
+        Random seed.
+    command_timeout : float
+        Time in seconds to poll a command for before counting it as an
+        error.
+    report : callable
+        Called with a line of text for each snapshot.
+
+    Returns
+    -------
+    dict
+        The snapshots, the baseline and final tracemalloc snapshots, the
+        number of calls and the RPC errors, including the commands that
+        timed out.
+
+    """
+    temp_dir = None
+    if log_dir is None:
+        log_dir = temp_dir = tempfile.mkdtemp(prefix='dome-soak-')
+    # the loggers write to $PANLOG
+    panlog = os.environ.get('PANLOG')
+    os.environ['PANLOG'] = log_dir
+    tracemalloc.start(frames)
+    start = time.monotonic()
+    soak = None
+    snapshots = []
+    baseline = None
+    try:
+        soak = Soak(clients, log_dir, gotos_per_hour, polls_per_hour,
+                    tick_rate, trace_capacity, seed, command_timeout)
+        hours = round(24 * days)
+        for hour in range(1, hours + 1):
+            soak.run_hour(hour)
+            if hour % snapshot_hours and hour != hours:
+                continue
+            snapshots.append(snapshot(hour, start, not keep_pin_history))
+            s = snapshots[-1]
+            report(f'{hour:>5} {s["wall"]:>7.1f} {s["memory"] / 1024:>10.0f} '
+                   f'{s["threads"]:>8} {s["fds"]:>5} {s["loggers"]:>8} '
+                   f'{s["handlers"]:>9} {s["pin_history"]:>12} '
+                   f'{soak.calls:>9}')
+            if baseline is None and hour >= 24:
+                # the first snapshot from the end of the first day on, as
+                # growth() uses
+                baseline = tracemalloc.take_snapshot()
+        final = tracemalloc.take_snapshot()
+    finally:
+        if soak is not None:
+            soak.close()
+        tracemalloc.stop()
+        if panlog is None:
+            del os.environ['PANLOG']
+        else:
+            os.environ['PANLOG'] = panlog
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    return dict(snapshots=snapshots, baseline=baseline, final=final,
+                calls=soak.calls, errors=soak.errors, pools=soak.pools)
+
+
+def growth(result, memory_threshold=512.0):
+    """
+    Growth from the end of the first day to the end of the run. Threads of
+    a thread pool only count once there are more than the pool's limit.
+
+    Parameters
+    ----------
+    result : dict
+        Result of run().
+    memory_threshold : float
+        Allowed memory growth in KiB per virtual day.
+
+    Returns
+    -------
+    list
+        Descriptions of the growth found, empty if none.
+
+    """
+    snapshots = result['snapshots']
+    first = next(s for s in snapshots if s['hour'] >= 24)
+    last = snapshots[-1]
+    days = (last['hour'] - first['hour']) / 24
+    leaks = []
+    for key in ('fds', 'loggers', 'handlers'):
+        if first[key] is not None and last[key] > first[key]:
+            leaks.append(f'{key}: {first[key]} -> {last[key]}')
+    names = last['thread_names'] - first['thread_names']
+    new = [f'{name} +{count}' for name, count in names.items()
+           if last['thread_names'][name] > result['pools'].get(name, 0)]
+    if new:
+        leaks.append(f'threads: {first["threads"]} -> {last["threads"]} '
+                     f'({", ".join(new)})')
+    memory = (last['memory'] - first['memory']) / 1024
+    if days and memory / days > memory_threshold:
+        leaks.append(f'memory: +{memory:.0f} KiB ({memory / days:.0f} KiB '
+                     f'per day)')
+    return leaks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Soak test of the dome RPC server over a virtual week.")
+    parser.add_argument('--days', type=float, default=7,
+                        help='Virtual days to run for.')
+    parser.add_argument('--snapshot-hours', type=int, default=12,
+                        help='Virtual hours between snapshots.')
+    parser.add_argument('--clients', type=int, default=3,
+                        help='Clients, each with its own channel.')
+    parser.add_argument('--gotos-per-hour', type=int, default=6,
+                        help='Gotos per night hour.')
+    parser.add_argument('--polls-per-hour', type=int, default=240,
+                        help='Polls per virtual hour.')
+    parser.add_argument('--tick-rate', type=float, default=1000,
+                        help='Encoder ticks per second.')
+    parser.add_argument('--trace-capacity', type=int, default=100,
+                        help='Finished trace spans the dome keeps.')
+    parser.add_argument('--log-dir',
+                        help=('Directory to keep the server logs in, by '
+                              'default a temporary directory.'))
+    parser.add_argument('--frames', type=int, default=1,
+                        help='Stack frames to keep per allocation.')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Allocation sites to list.')
+    parser.add_argument('--memory-threshold', type=float, default=512,
+                        help='Allowed memory growth (KiB per virtual day).')
+    parser.add_argument('--keep-pin-history', action='store_true',
+                        help="Don't clear the mock pins' state history.")
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    parser.add_argument('--command-timeout', type=float, default=300,
+                        help=('Time in seconds to poll a command for before '
+                              'counting it as an error.'))
+    args = parser.parse_args()
+
+    print(f'{"hour":>5} {"wall (s)":>7} {"mem (KiB)":>10} {"threads":>8} '
+          f'{"fds":>5} {"loggers":>8} {"handlers":>9} {"pin history":>12} '
+          f'{"calls":>9}')
+    result = run(args.days, args.snapshot_hours, args.clients,
+                 args.gotos_per_hour, args.polls_per_hour, args.tick_rate,
+                 args.trace_capacity, args.log_dir, args.frames,
+                 args.keep_pin_history, args.seed, args.command_timeout)
+    errors = sum(result['errors'].values())
+    print(f'\n{result["calls"]} calls, {errors} errors')
+    for (method, code), count in sorted(result['errors'].items()):
+        print(f'  {method} {code}: {count}')
+    if result['baseline'] is None:
+        print('Run for more than a day to check for growth.')
+        return
+    leaks = growth(result, args.memory_threshold)
+    print('\nTop allocation sites by growth since the end of day 1:')
+    for stat in _top_growth(result['baseline'], result['final'], args.top):
+        print(f'  {stat}')
+    if leaks:
+        print('\nGrowth found:')
+        for leak in leaks:
+            print(f'  {leak}')
+        raise SystemExit(1)
+    print('\nNo growth found.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark relay cycles and tracking error when following sidereal targets.
+
+Targets at a range of declinations are followed from the Huntsman site at
+Siding Spring for several hours in virtual time (`tracking.simulate_tracking`)
+with two policies:
+
+- periodic: a goto onto the target every --interval seconds, which is what
+  TheSkyX sending periodic dapiGotoAzEl amounts to.
+- hysteresis: `tracking.TrackingController`, moving only when the target is
+  about to leave the window and then leading it.
+
+Run with `python -m domehunter.benchmarks.tracking`.
+"""
+
+
+import argparse
+import warnings
+
+import astropy.units as u
+from astropy.coordinates import EarthLocation, SkyCoord
+from astropy.time import Time
+from astropy.utils import iers
+
+from domehunter.tracking import (PeriodicGotoController, TrackingController,
+                                 Trajectory, simulate_tracking)
+
+SITE = EarthLocation(lat=-31.2733 * u.deg, lon=149.0617 * u.deg,
+                     height=1165 * u.m)
+
+
+def run(declinations, start_time, hours=4.0, tolerance=2.0, interval=30.0,
+        look_ahead=10.0, slew_rate=3.0):
+    """Run the benchmark.
+
+    Parameters
+    ----------
+    declinations : list
+        Target declinations in degrees, each target starts 1 hour east of
+        the meridian.
+    start_time : astropy.time.Time
+        Start of the simulation.
+    hours : float
+        Length of the simulation in hours.
+    tolerance : float
+        Tracking window half width in degrees.
+    interval : float
+        Time between gotos for the periodic policy, in seconds.
+    look_ahead : float
+        Look ahead time for the hysteresis policy, in seconds.
+    slew_rate : float
+        Dome rotation rate in degrees per second.
+
+    Returns
+    -------
+    list
+        List of dictionaries of results, one per target/policy.
+
+    """
+    duration = hours * 3600
+    lst = start_time.sidereal_time('mean', longitude=SITE.lon)
+    results = []
+    for dec in declinations:
+        coord = SkyCoord(ra=lst + 15 * u.deg, dec=dec * u.deg)
+        trajectory = Trajectory.sidereal(coord, SITE, start_time, duration)
+        start = start_time.unix
+        policies = {
+            'periodic': PeriodicGotoController(interval=interval,
+                                               tolerance=tolerance),
+            'hysteresis': TrackingController(tolerance=tolerance,
+                                             look_ahead=look_ahead),
+        }
+        for name, controller in policies.items():
+            result = simulate_tracking(trajectory, controller, start,
+                                       duration, slew_rate=slew_rate)
+            results.append(dict(dec=dec, policy=name, **result))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Relay cycles and tracking error for sidereal targets.")
+    parser.add_argument('--dec', type=float, nargs='+',
+                        default=[-80, -60, -31, 0, 20],
+                        help='Target declinations (degrees).')
+    parser.add_argument('--start', default='2024-04-15 10:00',
+                        help='Start time (UTC).')
+    parser.add_argument('--hours', type=float, default=4.0,
+                        help='Hours to track for.')
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help='Tracking window half width (degrees).')
+    parser.add_argument('--interval', type=float, default=30.0,
+                        help='Seconds between periodic gotos.')
+    args = parser.parse_args()
+
+    # arcsecond accuracy isn't needed, so don't fetch IERS tables
+    iers.conf.auto_download = False
+    iers.conf.iers_degraded_accuracy = 'warn'
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results = run(args.dec, Time(args.start), hours=args.hours,
+                      tolerance=args.tolerance, interval=args.interval)
+    print(f'{"dec":>6} {"policy":>11} {"cycles/h":>9} {"out of tol":>11} '
+          f'{"max err":>8} {"motor s":>8}')
+    for r in results:
+        print(f'{r["dec"]:>6g} {r["policy"]:>11} {r["cycles_per_hour"]:>9.1f} '
+              f'{r["fraction_out_of_tolerance"]:>11.3%} '
+              f'{r["max_error"]:>8.2f} {r["motor_time"]:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""Encoder calibration tables for the dome."""
+
+
+import os
+
+import numpy as np
+import yaml
+
+
+def load_calibration(calibration_path):
+    """Load dome calibration information from a yaml file.
+
+    Parameters
+    ----------
+    calibration_path : str
+        File path of the calibration yaml file.
+
+    Returns
+    -------
+    dict
+        Dictionary of calibration sections, empty if the file does not exist.
+
+    """
+    if calibration_path is None or not os.path.isfile(calibration_path):
+        return dict()
+    with open(calibration_path, 'r') as f:
+        calibration = yaml.safe_load(f.read())
+    return calibration or dict()
+
+
+def save_calibration(calibration_path, **sections):
+    """Update sections of a dome calibration yaml file.
+
+    Sections that are not passed are preserved from the existing file.
+
+    Parameters
+    ----------
+    calibration_path : str
+        File path of the calibration yaml file.
+    **sections : dict
+        Calibration sections to write, eg `az_table=table.to_dict()`.
+
+    """
+    calibration = load_calibration(calibration_path)
+    calibration.update(sections)
+    with open(calibration_path, 'w') as f:
+        yaml.safe_dump(calibration, f, default_flow_style=None)
+
+
+class AzimuthTable(object):
+    """
+    Non-uniform mapping between encoder ticks and azimuth relative to home.
+
+    The dome drive ratio is not constant around the ring (wheel slip, track
+    joints), so the table stores a degrees per tick value for each of a set of
+    equal width azimuth bins. From these a cumulative tick/azimuth curve is
+    built and resampled onto uniform tick and azimuth grids, so that
+    conversions in either direction are a constant time index and a linear
+    interpolation.
+
+    Parameters
+    ----------
+    bin_degrees_per_tick : array_like
+        Degrees of azimuth per encoder tick for each azimuth bin, starting at
+        the home position and moving clockwise.
+    grid_size : int
+        Number of points used for the precomputed lookup grids.
+
+    """
+
+    def __init__(self, bin_degrees_per_tick, grid_size=3600):
+        self.bin_degrees_per_tick = np.asarray(bin_degrees_per_tick,
+                                               dtype=float)
+        if np.any(self.bin_degrees_per_tick <= 0):
+            raise ValueError('Degrees per tick must be positive in all bins.')
+        num_bins = len(self.bin_degrees_per_tick)
+        bin_width = 360 / num_bins
+        # cumulative ticks and azimuth at each bin edge
+        edge_az = np.linspace(0, 360, num_bins + 1)
+        edge_ticks = np.concatenate(
+            ([0], np.cumsum(bin_width / self.bin_degrees_per_tick)))
+        self.ticks_per_rotation = edge_ticks[-1]
+
+        self._grid_size = grid_size
+        self._tick_step = self.ticks_per_rotation / grid_size
+        self._az_step = 360 / grid_size
+        # uniform grids, so a lookup is an index calculation
+        self._az_at_tick = np.interp(
+            np.linspace(0, self.ticks_per_rotation, grid_size + 1),
+            edge_ticks, edge_az)
+        self._tick_at_az = np.interp(
+            np.linspace(0, 360, grid_size + 1), edge_az, edge_ticks)
+
+    @classmethod
+    def from_tick_times(cls, tick_times, home_times, num_bins=36, **kwargs):
+        """Build a table from encoder tick and home sensor timestamps.
+
+        The dome ring is assumed to turn at a constant rate over a rotation,
+        so the azimuth of each tick is estimated from the fraction of the
+        home-to-home period elapsed when it arrived. The cumulative tick count
+        at each bin edge is then averaged over all complete rotations.
+
+        Parameters
+        ----------
+        tick_times : array_like
+            Monotonic timestamps of encoder ticks, rotating clockwise.
+        home_times : array_like
+            Monotonic timestamps of consecutive home sensor activations.
+        num_bins : int
+            Number of azimuth bins in the table.
+
+        Returns
+        -------
+        AzimuthTable
+            Table built from the calibration rotations.
+
+        """
+        tick_times = np.asarray(tick_times, dtype=float)
+        home_times = np.asarray(home_times, dtype=float)
+        if len(home_times) < 2:
+            raise ValueError('At least one complete rotation is required.')
+        edges = np.linspace(0, 360, num_bins + 1)
+        edge_ticks = []
+        for start, end in zip(home_times[:-1], home_times[1:]):
+            in_rotation = (tick_times > start) & (tick_times <= end)
+            tick_az = 360 * (tick_times[in_rotation] - start) / (end - start)
+            tick_index = np.arange(1, len(tick_az) + 1)
+            edge_ticks.append(np.interp(edges,
+                                        np.concatenate(([0], tick_az)),
+                                        np.concatenate(([0], tick_index))))
+        ticks_per_bin = np.diff(np.mean(edge_ticks, axis=0))
+        if np.any(ticks_per_bin <= 0):
+            raise ValueError('Calibration recorded no ticks in some bins, '
+                             'use fewer azimuth bins.')
+        return cls((360 / num_bins) / ticks_per_bin, **kwargs)
+
+    @classmethod
+    def from_dict(cls, table_dict):
+        """Create a table from a dictionary loaded from a calibration file."""
+        return cls(table_dict['bin_degrees_per_tick'],
+                   grid_size=table_dict.get('grid_size', 3600))
+
+    def to_dict(self):
+        """Return the table as a dictionary for a calibration file."""
+        return {'ticks_per_rotation': float(self.ticks_per_rotation),
+                'grid_size': self._grid_size,
+                'bin_degrees_per_tick': [float(d) for d in
+                                         self.bin_degrees_per_tick]}
+
+    def ticks_to_degrees(self, ticks):
+        """Convert an encoder tick count to degrees clockwise from home.
+
+        Parameters
+        ----------
+        ticks : float
+            Encoder count relative to the home position, may be negative or
+            exceed a full rotation.
+
+        Returns
+        -------
+        float
+            Degrees clockwise from home, not wrapped.
+
+        """
+        rotations, rel_ticks = divmod(ticks, self.ticks_per_rotation)
+        index, frac = divmod(rel_ticks / self._tick_step, 1)
+        index = min(int(index), self._grid_size - 1)
+        az = self._az_at_tick[index]
+        az += frac * (self._az_at_tick[index + 1] - az)
+        return 360 * rotations + az
+
+    def degrees_to_ticks(self, degrees):
+        """Convert degrees clockwise from home to an encoder tick count.
+
+        Parameters
+        ----------
+        degrees : float
+            Azimuth relative to home, in degrees between 0 and 360.
+
+        Returns
+        -------
+        float
+            Encoder ticks from home, between 0 and ticks_per_rotation.
+
+        """
+        index, frac = divmod((degrees % 360) / self._az_step, 1)
+        index = min(int(index), self._grid_size - 1)
+        ticks = self._tick_at_az[index]
+        ticks += frac * (self._tick_at_az[index + 1] - ticks)
+        return ticks
+
+
+class BacklashModel(object):
+    """
+    Lost motion of the dome drive on a change of direction.
+
+    The encoder is on the motor, so when the drive reverses the first few
+    ticks take up slack in the drive train rather than turning the dome.
+    Positions are referenced to the dome having last turned clockwise (the
+    encoder is zeroed passing home clockwise), so after turning
+    anticlockwise the dome is `ccw_ticks` clockwise of where the encoder
+    count puts it, until the next clockwise move takes the slack up again.
+
+    Parameters
+    ----------
+    cw_ticks : float
+        Encoder ticks lost when the drive reverses to clockwise.
+    ccw_ticks : float
+        Encoder ticks lost when the drive reverses to anticlockwise.
+
+    """
+
+    def __init__(self, cw_ticks=0.0, ccw_ticks=0.0):
+        if cw_ticks < 0 or ccw_ticks < 0:
+            raise ValueError('Backlash must not be negative.')
+        self.cw_ticks = float(cw_ticks)
+        self.ccw_ticks = float(ccw_ticks)
+
+    def lost_ticks(self, direction):
+        """Return the ticks lost reversing into direction (+1 CW, -1 CCW)."""
+        return self.cw_ticks if direction > 0 else self.ccw_ticks
+
+    @classmethod
+    def from_home_passes(cls, passes):
+        """Measure the backlash from passes back and forth over home.
+
+        The centre of the home sensor (the mean encoder count of its
+        activation and deactivation) is independent of the sensor width, but
+        is seen a backlash later when passing anticlockwise than clockwise.
+        Edges are only seen at the first tick past them, so even without
+        backlash the centres passing each way are one tick apart, which is
+        subtracted.
+
+        Parameters
+        ----------
+        passes : list
+            List of (direction, centre) tuples for consecutive passes, where
+            direction is +1 (CW) or -1 (CCW) and centre the encoder count at
+            the centre of the home sensor. Each pass must start far enough
+            from home to take up the slack before reaching it.
+
+        Returns
+        -------
+        BacklashModel
+            Backlash averaged over all reversals in each direction.
+
+        """
+        lost = {1: [], -1: []}
+        for (previous, previous_centre), (direction, centre) in zip(
+                passes[:-1], passes[1:]):
+            if direction == previous:
+                continue
+            cw_centre, ccw_centre = ((centre, previous_centre)
+                                     if direction > 0 else
+                                     (previous_centre, centre))
+            lost[direction].append(cw_centre - ccw_centre - 1)
+        if not lost[1] and not lost[-1]:
+            raise ValueError('Backlash needs passes in both directions.')
+        return cls(*(max(float(np.mean(lost[d])), 0.0) if lost[d] else 0.0
+                     for d in (1, -1)))
+
+    @classmethod
+    def from_dict(cls, backlash_dict):
+        """Create a model from a dictionary loaded from a calibration file."""
+        return cls(backlash_dict.get('cw_ticks', 0.0),
+                   backlash_dict.get('ccw_ticks', 0.0))
+
+    def to_dict(self):
+        """Return the model as a dictionary for a calibration file."""
+        return {'cw_ticks': self.cw_ticks, 'ccw_ticks': self.ccw_ticks}
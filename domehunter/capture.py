@@ -0,0 +1,185 @@
+"""Encoder edge capture using pigpio daemon timestamps."""
+
+
+import threading
+import time
+from collections import deque
+
+try:
+    import pigpio
+except ImportError:  # pragma: no cover
+    pigpio = None
+
+# gpiozero pin factories that can be selected in the dome config
+PIN_FACTORIES = {
+    'mock': ('gpiozero.pins.mock', 'MockFactory'),
+    'rpigpio': ('gpiozero.pins.rpigpio', 'RPiGPIOFactory'),
+    'lgpio': ('gpiozero.pins.lgpio', 'LGPIOFactory'),
+    'pigpio': ('gpiozero.pins.pigpio', 'PiGPIOFactory'),
+    'native': ('gpiozero.pins.native', 'NativeFactory'),
+}
+
+
+def make_pin_factory(name, **kwargs):
+    """Create a gpiozero pin factory by name.
+
+    Parameters
+    ----------
+    name : str
+        One of the keys of PIN_FACTORIES.
+    **kwargs : dict
+        Keyword args for the factory, eg host and port for pigpio.
+
+    Returns
+    -------
+    gpiozero.Factory
+        The pin factory.
+
+    """
+    try:
+        module_name, class_name = PIN_FACTORIES[name]
+    except KeyError:
+        raise ValueError(f'Unknown pin factory [{name}], valid factories '
+                         f'are {list(PIN_FACTORIES)}.')
+    module = __import__(module_name, fromlist=[class_name])
+    return getattr(module, class_name)(**kwargs)
+
+
+class PigpioEdgeCapture(object):
+    """
+    Capture edges on a set of GPIOs with pigpio daemon timestamps.
+
+    The pigpio daemon samples the GPIOs and timestamps each level change with
+    its microsecond tick, independent of Python callback scheduling. Edges
+    are queued by the pigpio notification thread and drained in batches by a
+    separate thread, which passes them to `handler` with the ticks converted
+    to the time.monotonic() timebase. An exception from `handler` is logged
+    and the batch is counted as lost, the capture carries on.
+
+    Parameters
+    ----------
+    gpios : list
+        Broadcom GPIO numbers to capture.
+    handler : callable
+        Called with a list of (gpio, level, edge_time) tuples for each batch.
+    host : str
+        Host name of the pigpio daemon.
+    port : int
+        Port of the pigpio daemon.
+    drain_interval : float
+        Time in seconds between draining batches of edges.
+    resync_interval : float
+        Time in seconds between re-estimating the offset between daemon ticks
+        and time.monotonic().
+    logger : logbook.Logger
+        Logger to report handler errors to.
+
+    Attributes
+    ----------
+    batches, edges : int
+        Number of batches and edges passed to the handler.
+    lost_batches : int
+        Number of batches the handler raised an exception for.
+
+    """
+
+    def __init__(self,
+                 gpios,
+                 handler,
+                 host='localhost',
+                 port=8888,
+                 drain_interval=0.002,
+                 resync_interval=10.0,
+                 logger=None):
+        if pigpio is None:  # pragma: no cover
+            raise RuntimeError('pigpio is required for pigpio edge capture.')
+        self.pi = pigpio.pi(host, port)
+        if not self.pi.connected:
+            raise RuntimeError(
+                f'Could not connect to pigpio daemon at {host}:{port}.')
+        self.handler = handler
+        self.drain_interval = drain_interval
+        self.resync_interval = resync_interval
+        self.logger = logger
+        self.batches = 0
+        self.edges = 0
+        self.lost_batches = 0
+        self._edges = deque()
+        self._sync_clock()
+        self._callbacks = []
+        for gpio in gpios:
+            self.pi.set_mode(gpio, pigpio.INPUT)
+            self._callbacks.append(
+                self.pi.callback(gpio, pigpio.EITHER_EDGE, self._queue_edge))
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = threading.Thread(target=self._drain,
+                                        name='encoder-capture',
+                                        daemon=True)
+        self._thread.start()
+
+    def read(self, gpio):
+        """Return the current level of a GPIO."""
+        return self.pi.read(gpio)
+
+    def close(self):
+        """Stop capturing and disconnect from the daemon."""
+        self._running.clear()
+        self._thread.join()
+        for callback in self._callbacks:
+            callback.cancel()
+        self.pi.stop()
+
+    def _queue_edge(self, gpio, level, tick):
+        # runs in the pigpio notification thread, keep it minimal
+        self._edges.append((gpio, level, tick))
+
+    def _sync_clock(self):
+        """Read a daemon tick and the time.monotonic() time it was read at."""
+        best = None
+        for _ in range(3):
+            before = time.monotonic()
+            tick = self.pi.get_current_tick()
+            after = time.monotonic()
+            # assume the tick was read half way through the round trip
+            if best is None or after - before < best[0]:
+                best = (after - before, (before + after) / 2, tick)
+        round_trip, now, tick = best
+        self._sync_tick = tick
+        self._last_sync = now
+
+    def _edge_time(self, tick):
+        """Convert a daemon tick to the time.monotonic() timebase.
+
+        The 32 bit tick wraps every ~72 minutes, so it is taken relative to
+        the last sync tick, as the nearer of the wrapped differences. Edges
+        are well within half a wrap of the sync, which is repeated every
+        resync_interval, and queued edges from before a wrap stay before it
+        whether or not the sync after the wrap has been made.
+        """
+        delta = ((tick - self._sync_tick + (1 << 31)) & 0xFFFFFFFF) - (1 << 31)
+        return self._last_sync + delta * 1e-6
+
+    def _drain(self):
+        edges = self._edges
+        while self._running.is_set():
+            time.sleep(self.drain_interval)
+            if time.monotonic() - self._last_sync > self.resync_interval:
+                self._sync_clock()
+            if not edges:
+                continue
+            batch = []
+            for _ in range(len(edges)):
+                gpio, level, tick = edges.popleft()
+                batch.append((gpio, level, self._edge_time(tick)))
+            self.batches += 1
+            self.edges += len(batch)
+            try:
+                self.handler(batch)
+            except Exception:
+                # one bad batch mustn't stop the counting for good
+                self.lost_batches += 1
+                if self.logger is not None:
+                    self.logger.exception(
+                        f'Encoder edge handler failed, {len(batch)} edges '
+                        'lost.')
@@ -0,0 +1,319 @@
+"""On-demand diagnostics for the running dome server.
+
+`Diagnostics` writes two kinds of report to the log directory:
+
+- a thread dump, with the stack of every thread by name (movement
+  monitors, gpiozero callbacks, gRPC workers, ...) followed by the Dome
+  state;
+- a sampling profile, made by a `StackSampler` thread that reads the stack
+  of every other thread with `sys._current_frames()` every interval for the
+  requested duration, written as the most sampled functions followed by
+  the collapsed stacks (the input format of flamegraph.pl).
+
+They can be triggered by signals (`install_signal_handlers`, SIGUSR1 for a
+thread dump and SIGUSR2 for a profile by default) or by the DumpThreads and
+Profile RPCs. Nothing runs until a report is requested, so there is no
+overhead otherwise.
+"""
+
+
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)})'
+
+
+def dome_state(dome):
+    """
+    Snapshot of the Dome state for a diagnostics report.
+
+    Returns
+    -------
+    dict
+        State of the dome.
+
+    """
+    dome_az = dome.dome_az
+    return dict(dome_az=None if dome_az is None else dome_az.degree,
+                encoder_count=dome._encoder_count,
+                unhomed=dome._unhomed,
+                parked=dome._park_event.is_set(),
+                current_direction=dome.current_direction.name,
+                rotation_relay_on=dome._rotation_relay.is_active,
+                direction_relay_on=dome._direction_relay.is_active,
+                home_sensor_active=dome._home_sensor.is_active,
+                move_in_progress=dome._move_event.is_set(),
+                last_move_result=getattr(dome.last_move_result, 'name', None),
+                tick_interval=dome._tick_interval,
+                relay_cycles=dome.relay_cycles,
+                total_ticks=dome.total_ticks,
+                monitor_threads=[monitor.name for monitor
+                                 in dome._monitor_threads
+                                 if monitor.is_alive()],
+                tracking=dome.is_tracking,
+                has_plan=dome.has_plan)
+
+
+def thread_dump(dome=None):
+    """
+    Stacks of all threads, and the Dome state if given.
+
+    Returns
+    -------
+    str
+        The report.
+
+    """
+    frames = sys._current_frames()
+    lines = [f'Thread dump at {time.strftime("%Y-%m-%d %H:%M:%S")}, '
+             f'{threading.active_count()} threads', '']
+    for thread in threading.enumerate():
+        lines.append(f'Thread {thread.name!r} (ident {thread.ident}'
+                     f'{", daemon" if thread.daemon else ""}):')
+        frame = frames.get(thread.ident)
+        if frame is not None:
+            lines.extend(line.rstrip('\n')
+                         for line in traceback.format_stack(frame))
+        lines.append('')
+    if dome is not None:
+        lines.append('Dome state:')
+        lines.extend(f'  {key}: {value}'
+                     for key, value in dome_state(dome).items())
+        lines.append('')
+    return '\n'.join(lines)
+
+
+class StackSampler(object):
+    """
+    Sampling profiler of all threads.
+
+    Parameters
+    ----------
+    interval : float
+        Time in seconds between samples.
+
+    Attributes
+    ----------
+    counts : collections.Counter
+        Number of samples of each stack, keyed by the thread name and the
+        frames, outermost first, separated by ';'.
+    samples : int
+        Number of times the threads have been sampled.
+
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self.started = None
+        self.elapsed = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """True while sampling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start sampling in a daemon thread."""
+        self._stop.clear()
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self._run,
+                                        name='stack-sampler',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name
+                     for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[';'.join(reversed(stack))] += 1
+            self.samples += 1
+        self.elapsed = time.monotonic() - self.started
+
+    def report(self, top=30):
+        """
+        The profile as text.
+
+        Parameters
+        ----------
+        top : int
+            Number of functions to list by samples.
+
+        Returns
+        -------
+        str
+            Summary, the top functions by samples at the top of the stack
+            (self) and anywhere in the stack (total), then the collapsed
+            stacks.
+
+        """
+        own = Counter()
+        total = Counter()
+        for stack, count in self.counts.items():
+            frames = stack.split(';')
+            thread = frames[0]
+            if len(frames) > 1:
+                own[(thread, frames[-1])] += count
+            for frame in set(frames[1:]):
+                total[(thread, frame)] += count
+        lines = [f'Profile of {self.samples} samples every {self.interval}s '
+                 f'over {self.elapsed or 0:.1f}s', '',
+                 f'Top {top} functions by own samples:']
+        lines.extend(f'{count:>8} {100 * count / max(self.samples, 1):6.1f}%'
+                     f'  [{thread}] {frame}'
+                     for (thread, frame), count in own.most_common(top))
+        lines.extend(['', f'Top {top} functions by total samples:'])
+        lines.extend(f'{count:>8} {100 * count / max(self.samples, 1):6.1f}%'
+                     f'  [{thread}] {frame}'
+                     for (thread, frame), count in total.most_common(top))
+        lines.extend(['', 'Collapsed stacks:'])
+        lines.extend(f'{stack} {count}'
+                     for stack, count in self.counts.most_common())
+        lines.append('')
+        return '\n'.join(lines)
+
+
+class Diagnostics(object):
+    """
+    Thread dumps and profiles of the running server, written to files.
+
+    Parameters
+    ----------
+    dome : Dome
+        Dome to include the state of in thread dumps, or None.
+    logger : logbook.Logger
+        Logger to report the files written to.
+    log_dir : str
+        Directory to write to, defaults to the log directory ($PANLOG).
+    max_profile_duration : float
+        Longest profile in seconds, longer requests are shortened.
+
+    """
+
+    def __init__(self, dome=None, logger=None, log_dir=None,
+                 max_profile_duration=600.0):
+        self.dome = dome
+        self.logger = logger
+        if log_dir is None:
+            log_dir = os.getenv('PANLOG', '/var/huntsman/logs')
+        self.log_dir = log_dir
+        self.max_profile_duration = max_profile_duration
+        self._writer = None
+        self._lock = threading.Lock()
+
+    @property
+    def profiling(self):
+        """True while a profile is running or its file is being written."""
+        return self._writer is not None and self._writer.is_alive()
+
+    def _path(self, kind):
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return os.path.join(self.log_dir, f'dome-{kind}-{stamp}.txt')
+
+    def _notice(self, message):
+        if self.logger is not None:
+            self.logger.notice(message)
+
+    def dump_threads(self):
+        """
+        Write a thread dump with the Dome state.
+
+        Returns
+        -------
+        str
+            Path of the file written.
+
+        """
+        path = self._path('threads')
+        with open(path, 'w') as f:
+            f.write(thread_dump(self.dome))
+        self._notice(f'Thread dump written to {path}.')
+        return path
+
+    def profile(self, duration=30.0, interval=0.01):
+        """
+        Profile all threads for a time, in the background.
+
+        Parameters
+        ----------
+        duration : float
+            Time to profile for in seconds, at most max_profile_duration.
+        interval : float
+            Time between stack samples in seconds.
+
+        Returns
+        -------
+        str
+            Path the profile will be written to when it finishes, None if a
+            profile is already running.
+
+        """
+        duration = min(max(duration, 0.0), self.max_profile_duration)
+        with self._lock:
+            if self.profiling:
+                return None
+            sampler = StackSampler(interval)
+            sampler.start()
+            path = self._path('profile')
+            # profiling until the file is written
+            self._writer = threading.Thread(target=self._finish_profile,
+                                            args=(sampler, duration, path),
+                                            name='profile-writer',
+                                            daemon=True)
+            self._writer.start()
+        self._notice(f'Profiling for {duration:.0f}s to {path}.')
+        return path
+
+    def _finish_profile(self, sampler, duration, path):
+        time.sleep(duration)
+        sampler.stop()
+        with open(path, 'w') as f:
+            f.write(sampler.report())
+        self._notice(f'Profile written to {path}.')
+
+    def install_signal_handlers(self, dump_signal=signal.SIGUSR1,
+                                profile_signal=signal.SIGUSR2,
+                                profile_duration=30.0):
+        """
+        Dump the threads on dump_signal and start a profile on
+        profile_signal. Must be called from the main thread.
+
+        Returns
+        -------
+        dict
+            Previous handlers, keyed by signal.
+
+        """
+        previous = dict()
+        previous[dump_signal] = signal.signal(
+            dump_signal, lambda signum, frame: self.dump_threads())
+        previous[profile_signal] = signal.signal(
+            profile_signal,
+            lambda signum, frame: self.profile(profile_duration))
+        return previous
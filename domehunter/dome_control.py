@@ -13,8 +13,22 @@ from astropy.coordinates import Angle, Longitude
 from gpiozero import Device, DigitalInputDevice, DigitalOutputDevice
 from gpiozero.pins.mock import MockFactory
 
-from domehunter.enumerations import Direction, LED_Lights
+from domehunter.calibration import (AzimuthTable, BacklashModel,
+                                    load_calibration, save_calibration)
+from domehunter.capture import PigpioEdgeCapture, make_pin_factory
+from domehunter.encoder import (EdgeDebouncer, quadrature_sequence,
+                                quadrature_state, quadrature_step)
+from domehunter.enumerations import (QUADRATURE_EDGE, DomeCommand, Direction,
+                                     JournalEvent, LED_Lights, MoveResult)
+from domehunter.journal import Journal
+from domehunter.leds import LEDController
+from domehunter.geometry import slit_tolerance
 from domehunter.logging import set_up_logger, update_handler_level
+from domehunter.ordering import estimate_dome_time, order_targets
+from domehunter.planner import ObservationPlan, PrePositionPlanner
+from domehunter.sequence import Waypoint
+from domehunter.tracing import Tracer
+from domehunter.tracking import TrackingController
 
 # set up the logger with no logo to catch the import messages
 logger = set_up_logger(__name__,
@@ -37,6 +51,24 @@ except Exception:  # pragma: no cover
             "status lights unlikely to work.")
     logger.warn(wmsg)
 
+# integer LED masks, so encoder callbacks avoid LED_Lights flag arithmetic
+_INPUT_1 = LED_Lights.INPUT_1.value
+_INPUT_2 = LED_Lights.INPUT_2.value
+_INPUT_3 = LED_Lights.INPUT_3.value
+_RELAY_1_NO = LED_Lights.RELAY_1_NO.value
+_RELAY_1_NC = LED_Lights.RELAY_1_NC.value
+_RELAY_2_NO = LED_Lights.RELAY_2_NO.value
+_RELAY_2_NC = LED_Lights.RELAY_2_NC.value
+
+# journal command of each movement monitor trigger condition
+_MONITOR_COMMANDS = {
+    '_goto_az_complete': DomeCommand.GOTO,
+    '_approach_complete': DomeCommand.GOTO,
+    '_pre_rotation_complete': DomeCommand.GOTO,
+    '_find_home_complete': DomeCommand.FIND_HOME,
+    '_calibration_complete': DomeCommand.CALIBRATE,
+}
+
 # ----------------------------------------------------------------------------
 
 
@@ -70,6 +102,14 @@ def load_dome_config(config_path=None):
             config = yaml.load(f.read(), Loader=yaml.FullLoader)
     except Exception as e:
         warnings.warn(f'Error loading yaml config, {e}')
+    # a relative calibration file is kept with the logs, not in the package
+    calibration_file = config.pop('calibration_file', None)
+    calibration_dir = config.pop('calibration_dir', None)
+    if calibration_dir is None:
+        calibration_dir = os.getenv('PANLOG', '/var/huntsman/logs')
+    if calibration_file is not None:
+        config['calibration_path'] = os.path.join(calibration_dir,
+                                                  calibration_file)
     return config
 
 
@@ -103,11 +143,34 @@ class Dome(object):
                  az_position_tolerance=1.0,
                  degrees_per_tick=None,
                  encoder_pin_number=26,
+                 encoder_b_pin_number=None,
+                 encoder_dual_edge=False,
                  home_sensor_pin_number=20,
                  rotation_relay_pin_number=13,
                  direction_relay_pin_number=19,
                  bounce_time=0.001,
+                 debounce_interval=0.0,
+                 debounce_fraction=0.0,
                  led_brightness=0x10,
+                 led_refresh_rate=20.0,
+                 calibration_path=None,
+                 interpolate_az=False,
+                 pin_factory=None,
+                 pigpio_host='localhost',
+                 pigpio_port=8888,
+                 stall_factor=5.0,
+                 stall_min_time=2.0,
+                 move_deadline_factor=2.0,
+                 monitor_interval=0.1,
+                 slit_width=None,
+                 dome_radius=None,
+                 telescope_aperture=0.0,
+                 backlash_compensation=True,
+                 approach_direction=None,
+                 approach_overshoot=3.0,
+                 trace_capacity=1000,
+                 trace_path=None,
+                 journal_dir=None,
                  *args,
                  **kwargs):
         """
@@ -165,6 +228,15 @@ class Dome(object):
         encoder_pin_number : int
             The GPIO pin that corresponds to the encoder input on the
             automationHAT (input 1).
+        encoder_b_pin_number : int
+            The GPIO pin of the second channel of a quadrature encoder, eg 21
+            for input 3 on the automationHAT. If set, edges on both channels
+            are decoded, giving four counts per encoder cycle and the true
+            direction of rotation. Note degrees_per_tick is per count, so the
+            dome should be recalibrated after changing the encoder mode.
+        encoder_dual_edge : bool
+            If True, count both the activation and deactivation of a single
+            channel encoder, giving two counts per encoder cycle.
         home_sensor_pin_number : int
             The GPIO pin that corresponds to the home input on the
             automationHAT (input 2).
@@ -181,6 +253,84 @@ class Dome(object):
         bounce_time : float
             A buffer period (in seconds) where home/encoder input will ignore
             additional (de)activation.
+        debounce_interval : float
+            Minimum time (in seconds) between accepted encoder edges or home
+            sensor activations, applied in software to the edge timestamps.
+            Can be used instead of bounce_time, which may drop legitimate
+            edges at high speed.
+        debounce_fraction : float
+            Fraction of the measured interval between encoder edges used as a
+            speed adaptive debounce window (single channel encoders only, a
+            quadrature encoder is inherently bounce tolerant). Must be below
+            0.5 for a single edge encoder. 0 disables it.
+        led_refresh_rate : float
+            Maximum number of status LED updates written to the
+            AutomationHAT per second, updates in between are merged. If None
+            or 0, every LED change is written immediately.
+        calibration_path : str
+            Path of a yaml file holding the azimuth calibration table. If the
+            file contains a table, it is used for tick/azimuth conversions, and
+            calibrations run with build_az_table=True are saved to it.
+        interpolate_az : bool
+            If True, dome_az is interpolated between encoder ticks while the
+            dome is rotating, using the time since the last tick and the
+            measured tick interval. This allows an az_position_tolerance down
+            to 1 * degrees_per_tick rather than 1.5 * degrees_per_tick.
+        pin_factory : str
+            The gpiozero pin factory to use when not in testing mode, one of
+            'rpigpio', 'lgpio', 'pigpio', 'native' or 'mock'. None uses the
+            gpiozero default. With 'pigpio', encoder edges are captured with
+            the pigpio daemon's microsecond timestamps and processed in
+            batches, rather than timestamped in gpiozero callbacks.
+        pigpio_host : str
+            Host name of the pigpio daemon.
+        pigpio_port : int
+            Port of the pigpio daemon.
+        stall_factor : float
+            A move is stopped as stalled if no encoder tick arrives within
+            stall_factor times the measured tick interval (or stall_factor *
+            stall_min_time before the interval has been measured).
+        stall_min_time : float
+            Minimum stall time in seconds, which also allows for the motor
+            spinning up.
+        move_deadline_factor : float
+            A move is stopped as timed out if it takes longer than
+            move_deadline_factor times the time expected from its distance
+            and the measured tick interval, plus stall_min_time.
+        monitor_interval : float
+            Time in seconds between the checks of a movement monitor thread
+            for the end of a move. The dome can overshoot the target by the
+            distance it turns in this time. In testing mode the simulated
+            dome moves one encoder tick per interval.
+        slit_width : float
+            Width of the dome slit. If this and dome_radius are set, a goto
+            with an elevation is skipped if the telescope beam already
+            clears the slit (see goto_az).
+        dome_radius : float
+            Radius of the dome, in the same units as slit_width.
+        telescope_aperture : float
+            Diameter of the telescope beam at the slit, in the same units as
+            slit_width.
+        backlash_compensation : bool
+            Correct the dome azimuth for drive backlash after a change of
+            direction, using the backlash measured by
+            calibrate_dome_encoder_counts(measure_backlash=True).
+        approach_direction : str
+            'CW' or 'CCW' to always finish gotos turning in that direction,
+            overshooting and coming back if the shortest route is the other
+            way, so the drive slack is always taken up the same way. None to
+            take the shortest route.
+        approach_overshoot : float
+            Degrees to overshoot the target by before coming back, should
+            exceed the backlash.
+        trace_capacity : int
+            Number of finished command trace spans to keep in memory.
+        trace_path : str
+            JSON lines file to append finished trace spans to, None for none.
+        journal_dir : str
+            Directory to write a binary journal of the encoder and home
+            sensor edges, relay switches and commands to (see
+            journal.Journal), None for none.
 
         """
         self.logger = set_up_logger(__name__,
@@ -203,14 +353,27 @@ class Dome(object):
             # in testing mode we need to create a seperate pin object so we can
             # simulate the activation of our fake DIDs and DODs
             self._encoder_pin = Device.pin_factory.pin(encoder_pin_number)
+            self._encoder_b_pin = None
+            # optional simulation.EdgeNoise to add bounce to simulated ticks
+            self.simulated_noise = None
+            if encoder_b_pin_number is not None:
+                self._encoder_b_pin = Device.pin_factory.pin(
+                    encoder_b_pin_number)
             self._home_sensor_pin = Device.pin_factory.pin(
                 home_sensor_pin_number)
         else:
             # set the timeout length variable to 5 minutes (units of seconds)
             WAIT_TIMEOUT = 10 * 60
+            if pin_factory is not None:
+                self.logger.info(f'Using {pin_factory} pin factory.')
+                factory_kwargs = dict()
+                if pin_factory == 'pigpio':
+                    factory_kwargs = dict(host=pigpio_host, port=pigpio_port)
+                Device.pin_factory = make_pin_factory(pin_factory,
+                                                      **factory_kwargs)
 
         # set a wait time for testing mode that exceeds bounce_time
-        self.test_mode_delay_duration = bounce_time + 0.05
+        self.test_mode_delay_duration = (bounce_time or 0) + 0.05
         # set the timeout for wait_for_active()
         self.wait_timeout = WAIT_TIMEOUT
         self.logger.info(f'wait_timeout: {self.wait_timeout}')
@@ -228,57 +391,198 @@ class Dome(object):
         else:
             self._degrees_per_tick = Angle(degrees_per_tick * u.deg)
         self._az_position_tolerance = Angle(az_position_tolerance * u.deg)
+        self.interpolate_az = interpolate_az
+        # minimum tolerance, in units of degrees_per_tick
+        self._min_tolerance_ticks = 1.0 if interpolate_az else 1.5
+        # optional non-uniform tick/azimuth table from a previous calibration
+        self.calibration_path = calibration_path
+        self._az_table = None
+        calibration = load_calibration(calibration_path)
+        az_table = calibration.get('az_table')
+        if az_table is not None:
+            self.logger.info(f'Loading azimuth table from {calibration_path}.')
+            self._az_table = AzimuthTable.from_dict(az_table)
+            if self._degrees_per_tick is None:
+                self._degrees_per_tick = Angle(
+                    360 / self._az_table.ticks_per_rotation * u.deg)
+        # drive backlash, and the offset of the dome from the encoder count
+        # (in ticks) while slack is taken up after a reversal
+        self._backlash = BacklashModel()
+        if calibration.get('backlash') is not None:
+            self.logger.info(f'Loading backlash from {calibration_path}.')
+            self._backlash = BacklashModel.from_dict(calibration['backlash'])
+        self.backlash_compensation = backlash_compensation
+        self._backlash_offset = 0.0
+        self._backlash_remaining = 0.0
+        # the encoder is zeroed passing home clockwise, so assume the slack
+        # starts taken up clockwise
+        self._backlash_direction = Direction.CW
+        self._measure_backlash_after = False
+        self._measuring_backlash = False
+        self._home_edge_counts = []
+        if isinstance(approach_direction, str):
+            approach_direction = Direction[approach_direction.upper()]
+        self.approach_direction = approach_direction
+        self.approach_overshoot = Angle(approach_overshoot * u.deg)
+        self._approach_via = None
         self.home_az = Longitude(home_azimuth * u.deg)
         self.park_az = Longitude(park_azimuth * u.deg)
         # need something to let us know when dome is calibrating so home sensor
         # activation doesnt zero encoder counts
         self._calibrating = False
+        # tick and home timestamps recorded while building an azimuth table
+        self._building_az_table = False
+        self._cal_tick_times = []
+        self._cal_home_times = []
 
         # NOTE: this led setup needs to be done before setting any callback
         # functions
         # turn on the relay LEDs if we are debugging
-        # led_status is set with binary number, each zero/position sets the
+        # the LED state is a binary number, each zero/position sets the
         # state of an LED, where 0 is off and 1 is on
-        self.led_status = LED_Lights.RELAY_1_NC | LED_Lights.RELAY_2_NC
-        # the initial led_status is set to indicate the positions the relays
+        # the initial state is set to indicate the positions the relays
         # are initialised in (normally closed)
-        # use the LED_Lights enum.Flag class to pass binary integers masks to
-        # the _change_led_state() method.
-        if debug_lights:  # pragma: no cover
+        self._leds = None
+        if debug_lights:
             # Make sure LED brightness is turned up
             self.logger.info('Adjusting brightness for leds.')
             sn3218.output([led_brightness] * 18)
             # if we are actually using the debug lights we can enable them now
             self.logger.info('Setting relay LEDs to match initial state.')
-            self._change_led_state(1,
-                                   leds=[LED_Lights.RELAY_1_NC,
-                                         LED_Lights.RELAY_2_NC])
-            sn3218.enable_leds(self.led_status.value)
+            self._leds = LEDController(sn3218,
+                                       initial_mask=_RELAY_1_NC | _RELAY_2_NC,
+                                       refresh_rate=led_refresh_rate)
+            self._leds.flush()
             sn3218.enable()
 
         # create a instance variable to track the dome motor encoder ticks
         self._encoder_count = 0
+        # monotonic time of the last encoder tick and the measured (moving
+        # average) interval between ticks, used for sub-tick interpolation
+        self._last_tick_time = None
+        self._tick_interval = None
         # upon initialising, dome is unhomed so dome az is unknown
         self._unhomed = True
         self._dome_az = None
         # create a threading abort event, to use for aborting movement commands
         self._abort_event = threading.Event()
+        # movement monitor threads, the interval between their checks and the
+        # time between the last abort request and the relay switching off
+        self._monitor_threads = []
+        # monitors may be started from several threads at once
+        self._monitor_lock = threading.Lock()
+        self._monitor_interval = monitor_interval
+        self.last_abort_latency = None
+        # stall watchdog and move deadline settings
+        self.stall_factor = stall_factor
+        self.stall_min_time = stall_min_time
+        self.move_deadline_factor = move_deadline_factor
+        self._motor_start_time = None
+        # MoveResult of the last movement command
+        self.last_move_result = None
+        # number of times the rotation relay has been switched on, the
+        # seconds it has been on for and when it was last switched on
+        self.relay_cycles = 0
+        self.relay_on_time = 0.0
+        self._relay_on_since = None
+        # number of moves by MoveResult, the total number of encoder ticks
+        # and the number of (and last) encoder corrections passing home
+        self.move_results = {result: 0 for result in MoveResult}
+        self.total_ticks = 0
+        self.home_corrections = 0
+        self.last_home_correction = None
+        # slit geometry and the number of gotos skipped because the beam
+        # already cleared the slit
+        self.slit_width = slit_width
+        self.dome_radius = dome_radius
+        self.telescope_aperture = telescope_aperture
+        self.moves_avoided = 0
+        # tracking thread and the event used to stop it
+        self._tracking_thread = None
+        self._tracking_stop = threading.Event()
+        # observation plan pre-positioning thread, the event used to stop it,
+        # the goal of any pre-rotation in progress and the event used to cut
+        # it short when a goto arrives
+        self._planner_thread = None
+        self._planner_stop = threading.Event()
+        self._pre_rotation_goal = None
+        self._pre_rotation_cancel = threading.Event()
+        self.pre_rotations = 0
+        # waypoint sequence thread and the event used to stop it
+        self._sequence_thread = None
+        self._sequence_stop = threading.Event()
+        # command tracing, and the span of the movement in progress, which
+        # is ended by its monitor thread
+        self.tracer = Tracer(capacity=trace_capacity, path=trace_path)
+        # binary journal of the hardware events
+        self.journal = None
+        if journal_dir is not None:
+            self.journal = Journal(journal_dir, logger=self.logger)
+        self._move_span = None
         # creating a threading move event, to indicate when a move thread
         # is active
         self._move_event = threading.Event()
+        # moves are started from more than one thread, see _claim_move
+        self._move_lock = threading.Lock()
         # create a park event used to stop movement commands when dome is parked
         self._park_event = threading.Event()
         # creating a threading simulated_rotation event, to indicate when a
         # simulated rotation thread is running for testing mode calibration
         self._simulated_rotation_event = threading.Event()
+        # software debounce of the edge timestamps, disabled by default
+        self._encoder_debouncer = EdgeDebouncer(debounce_interval,
+                                                debounce_fraction)
+        self._home_debouncer = EdgeDebouncer(debounce_interval)
+        self._encoder_capture = None
         # bounce_time settings gives the time in seconds that the device will
         # ignore additional activation signals
         self.logger.info(f'Connecting encoder on pin {encoder_pin_number}.')
         self._encoder = DigitalInputDevice(
             encoder_pin_number, bounce_time=bounce_time)
-        # _increment_count function to run when encoder is triggered
-        self._encoder.when_activated = self._increment_count
-        self._encoder.when_deactivated = self._turn_off_input_1_led
+        self._encoder_b = None
+        # last decoded direction of a quadrature encoder
+        self.encoder_direction = Direction.NONE
+        self._quadrature_errors = 0
+        self._encoder_dual_edge = encoder_dual_edge
+        if encoder_b_pin_number is not None:
+            self.logger.info(
+                (f'Connecting encoder channel B on '
+                 f'pin {encoder_b_pin_number}.'))
+            self._encoder_b = DigitalInputDevice(
+                encoder_b_pin_number, bounce_time=bounce_time)
+            self._quadrature_state = quadrature_state(
+                self._encoder.is_active, self._encoder_b.is_active)
+        if pin_factory == 'pigpio':
+            # timestamp encoder edges in the pigpio daemon, the gpiozero
+            # devices are only used to read the encoder levels
+            self.logger.info('Capturing encoder edges with pigpio.')
+            encoder_gpios = [encoder_pin_number]
+            if encoder_b_pin_number is not None:
+                encoder_gpios.append(encoder_b_pin_number)
+            self._encoder_gpios = encoder_gpios
+            self._encoder_levels = {
+                encoder_pin_number: int(self._encoder.is_active)}
+            if encoder_b_pin_number is not None:
+                self._encoder_levels[encoder_b_pin_number] = int(
+                    self._encoder_b.is_active)
+            self._encoder_capture = PigpioEdgeCapture(
+                encoder_gpios,
+                self._process_encoder_edges,
+                host=pigpio_host,
+                port=pigpio_port,
+                logger=self.logger)
+        elif encoder_b_pin_number is not None:
+            # decode every edge on both channels
+            for channel in (self._encoder, self._encoder_b):
+                channel.when_activated = self._quadrature_edge
+                channel.when_deactivated = self._quadrature_edge
+        elif encoder_dual_edge:
+            self._encoder.when_activated = self._increment_count
+            self._encoder.when_deactivated = self._count_deactivation
+        else:
+            # _increment_count function to run when encoder is triggered
+            self._encoder.when_activated = self._increment_count
+            self._encoder.when_deactivated = self._turn_off_input_1_led
 
         # these two DODs control the relays that control the dome motor
         # the rotation relay is the on/off switch for dome rotation
@@ -324,12 +628,15 @@ class Dome(object):
         any active movements and release gpio pins.
         """
         with suppress(Exception):
-            self.abort()
+            self.close()
         with suppress(Exception):
             self._rotation_relay.off()
         with suppress(Exception):
             if self.debug_lights:
                 self._change_led_state(0, [led for led in LED_Lights])
+                self._leds.close()
+        with suppress(Exception):
+            self._encoder_capture.close()
         with suppress(Exception):
             Device.pin_factory.reset()
 
@@ -337,10 +644,20 @@ class Dome(object):
 # Properties
 ###############################################################################
 
+    @property
+    def led_status(self):
+        """LED_Lights flags of the status LEDs that are on."""
+        if self._leds is None:
+            return LED_Lights.RELAY_1_NC | LED_Lights.RELAY_2_NC
+        return LED_Lights(self._leds.mask)
+
     @property
     def dome_az(self):
         """Returns the dome azimuth in degrees."""
-        self._dome_az = self._ticks_to_az(self.encoder_count)
+        ticks = self.encoder_count
+        if self.interpolate_az:
+            ticks += self._sub_tick_offset()
+        self._dome_az = self._ticks_to_az(ticks)
         if self._dome_az is None or self._unhomed:
             self.logger.warning("Dome az unknown, please home the dome.")
         self.logger.debug(f'Dome azimuth: {self._dome_az}.')
@@ -370,6 +687,18 @@ class Dome(object):
         self.logger.debug(f'Dome in motion: {dome_motion}.')
         return dome_motion
 
+    @property
+    def is_tracking(self):
+        """Return True if the dome is tracking a trajectory."""
+        return (self._tracking_thread is not None
+                and self._tracking_thread.is_alive())
+
+    @property
+    def has_plan(self):
+        """Return True if the dome is pre-positioning for a plan."""
+        return (self._planner_thread is not None
+                and self._planner_thread.is_alive())
+
     @property
     def movement_thread_active(self):
         """Return True if a movement thread is running"""
@@ -388,22 +717,31 @@ class Dome(object):
         self.logger.debug(f'Degrees per tick: {self._degrees_per_tick:.2f}.')
         return self._degrees_per_tick
 
+    @property
+    def rotation_rate(self):
+        """Measured dome rotation rate in degrees per second, or None."""
+        if self._tick_interval is None or self._degrees_per_tick is None:
+            return None
+        return self._degrees_per_tick.degree / self._tick_interval
+
     @property
     def az_position_tolerance(self):
         """
         Returns the azimuth position tolerance (in degrees).
 
         If the tolerance set at initialisation is less than degrees_per_tick
-        use 1.5 * degrees_per_tick as the tolerance.
+        use 1.5 * degrees_per_tick as the tolerance (1 * degrees_per_tick if
+        interpolate_az is enabled).
         """
-        if self._az_position_tolerance < 1.5 * self.degrees_per_tick:
+        min_tolerance = self._min_tolerance_ticks * self.degrees_per_tick
+        if self._az_position_tolerance < min_tolerance:
             self.logger.warning(
                 (f'az_position_tolerance [{self._az_position_tolerance:.2f}] '
-                 f'is less than 1.5 times degrees_per_tick. Setting tolerance '
-                 f'to 1.5 * degrees_per_tick')
+                 f'is less than {self._min_tolerance_ticks} times '
+                 f'degrees_per_tick. Setting tolerance to '
+                 f'{self._min_tolerance_ticks} * degrees_per_tick')
             )
-        tolerance = max(self._az_position_tolerance,
-                        1.5 * self.degrees_per_tick)
+        tolerance = max(self._az_position_tolerance, min_tolerance)
         self._az_position_tolerance = tolerance
         return tolerance
 
@@ -413,22 +751,68 @@ class Dome(object):
 
     """These correspond to the AbstractMethods created by RPC."""
 
-    def abort(self):
+    def abort(self, timeout=5.0):
         """
         Stop everything by switching the dome motor on/off relay to off.
 
+        The relay is switched off before anything else, then the movement
+        monitor threads are woken and joined.
+
+        Parameters
+        ----------
+        timeout : float
+            Time in seconds to wait for the monitor threads to finish.
+
         """
         # TODO: consider another way to do this in case the relay fails/sticks
         # one way might be cut power to the automationHAT so the motor relays
         # will receive no voltage even if the relay is in the open position?
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.ABORT)
+        request_time = time.monotonic()
+        # stop tracking and planning first so they don't start another move
+        self._tracking_stop.set()
+        self._planner_stop.set()
+        self._rotation_relay.off()
+        self._journal_record(JournalEvent.ROTATION_RELAY, state=0,
+                             count=self._encoder_count)
+        self.last_abort_latency = time.monotonic() - request_time
+        self._add_relay_on_time()
+        span = self._move_span
+        if span is not None:
+            span.event('abort', latency=self.last_abort_latency)
         self.logger.warning('Aborting dome movement.')
-        # set the abort event thread flag
+        # set the abort event thread flag, this wakes the monitor threads
         self._abort_event.set()
-        # wait for threads to abort
-        while self.movement_thread_active:
-            time.sleep(0.1)
+        deadline = request_time + timeout
+        # any move the tracking thread starts now is stopped by the abort
+        # event, so join it before the monitors
+        for thread in (self._tracking_thread, self._planner_thread,
+                       self._sequence_thread):
+            if thread is not None:
+                thread.join(max(deadline - time.monotonic(), 0))
+        with self._monitor_lock:
+            monitors = list(self._monitor_threads)
+        for monitor in monitors:
+            monitor.join(max(deadline - time.monotonic(), 0))
+            if monitor.is_alive():
+                self.logger.error(
+                    f'Monitor thread {monitor.name} did not stop after abort.')
+        with self._monitor_lock:
+            self._monitor_threads = [
+                monitor for monitor in self._monitor_threads
+                if monitor.is_alive()]
         self._abort_event.clear()
 
+    def close(self):
+        """
+        Stop any movement and close the trace file and journal, eg when
+        the server shuts down.
+        """
+        self.abort()
+        self.tracer.close()
+        if self.journal is not None:
+            self.journal.close()
+
     def park(self):
         """
         Send dome to park position defined in the dome config.
@@ -438,17 +822,22 @@ class Dome(object):
             return 0
 
         self.logger.info('Parking Dome.')
-        # note goto_az requires a int/float not a Longitude
-        self.goto_az(self.park_az.value)
-        while self.movement_thread_active:
-            # wait for find_home() to finish
-            self.logger.info(
-                'Dome slewing to park position ({self.park_az}), current azimuth: {self.dome_az}')
-            time.sleep(1.0)
-        # note _goto_az_complete requires a Longitude
-        if self._goto_az_complete(self.park_az):
-            self._park_event.set()
-            time.sleep(0.2)
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.PARK,
+                             value=self.park_az.degree)
+        with self.tracer.span('park', park_az=self.park_az.degree) as span:
+            # note goto_az requires a int/float not a Longitude
+            self.goto_az(self.park_az.value)
+            while self.movement_thread_active:
+                # wait for find_home() to finish
+                self.logger.info(
+                    (f'Dome slewing to park position ({self.park_az}), '
+                     f'current azimuth: {self.dome_az}'))
+                time.sleep(1.0)
+            # note _goto_az_complete requires a Longitude
+            if self._goto_az_complete(self.park_az):
+                self._park_event.set()
+                time.sleep(0.2)
+            span.set(parked=self.is_parked)
 
         self.logger.info(f'Dome parking success: {self.is_parked}')
         # TheSkyX takes 0 as success and 1 as error
@@ -464,50 +853,379 @@ class Dome(object):
             return 0
 
         self._park_event.clear()
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.UNPARK)
         time.sleep(0.1)
 
         self.logger.info(f'Dome unpark success: {not self.is_parked}')
         # TheSkyX takes 0 as success and 1 as error
         return int(self.is_parked)
 
-    def goto_az(self, az):
+    def goto_az(self, az, el=None):
         """
         Send Dome to a requested Azimuth position.
 
+        If the target elevation is given and the slit geometry is configured,
+        the move is skipped when the telescope beam already clears the slit,
+        ie the dome is within the slit tolerance of the target azimuth (see
+        slit_az_tolerance). The slit is otherwise centred on the target to
+        within az_position_tolerance.
+
+        A pre-rotation started by the observation planner is stopped first.
+
+        The goto is traced by a 'goto_az' span (see tracer), which is ended
+        by the monitor thread when the move finishes.
+
         Parameters
         ----------
         az : float
             Desired dome azimuth position in degrees.
+        el : float
+            Elevation of the target in degrees.
 
         """
-        if self.dome_az is None:
+        self._goto_az(az, el)
+
+    def _goto_az(self, az, el=None, claimed=False):
+        """goto_az, for a caller that may have claimed the move already.
+
+        Parameters
+        ----------
+        claimed : bool
+            True if the caller holds the move claim (see _claim_move), which
+            is released if no move is started.
+
+        """
+        span = self.tracer.start_span('goto_az', az=az, el=el)
+        # the span is only left open once the monitor has the move
+        try:
+            if self.dome_az is None:
+                if claimed:
+                    self._move_event.clear()
+                # no move, so no result from an earlier move to report
+                self.last_move_result = None
+                span.end(outcome='unhomed')
+                return
+            if not claimed:
+                claimed = self._claim_move()
+                if not claimed and self._pre_rotation_goal is not None:
+                    # a goto takes over from a pre-rotation
+                    self._cancel_pre_rotation()
+                    claimed = self._claim_move()
+                if not claimed:
+                    self.logger.warning('Movement command in progress.')
+                    span.end(outcome='busy')
+                    return
+            if self.is_parked:
+                self.logger.warning(
+                    'Dome is currently parked, please unpark to move the '
+                    'dome.')
+                self._move_event.clear()
+                self.last_move_result = None
+                span.end(outcome='parked')
+                return
+
+            target_az = Longitude(az * u.deg)
+            self.logger.notice(f'Go to target azimuth [{target_az:.2f}].')
+
+            # calculate delta_az, wrapping at 180 to ensure we take shortest
+            # route
+            delta_az = (target_az - self.dome_az).wrap_at(180 * u.degree)
+            self.logger.info(f'Delta azimuth [{delta_az:.2f}].')
+
+            if el is not None:
+                tolerance = self.slit_az_tolerance(el)
+                if tolerance is not None and abs(delta_az) <= tolerance:
+                    self.logger.info(
+                        (f'Beam clears the slit (tolerance '
+                         f'[{tolerance:.2f}] at elevation {el:.1f}), '
+                         'skipping move.'))
+                    self.moves_avoided += 1
+                    self._move_event.clear()
+                    self.last_move_result = MoveResult.COMPLETE
+                    span.end(outcome='beam clears slit')
+                    return
+
+            direction = Direction.CW if delta_az > 0 else Direction.CCW
+            move = abs(delta_az)
+            if (self.approach_direction is not None
+                    and direction != self.approach_direction
+                    and move > self.az_position_tolerance):
+                # go past the target and come back the other way
+                self._approach_via = Longitude(
+                    target_az
+                    - self.approach_direction * self.approach_overshoot)
+                self.logger.info(
+                    (f'Approaching from {self.approach_direction.name} via '
+                     f'[{self._approach_via:.2f}].'))
+                move += 2 * self.approach_overshoot
+
+            span.event('validated', dome_az=self.dome_az.degree,
+                       delta_az=delta_az.degree, direction=direction.name,
+                       encoder_count=self._encoder_count)
+            self._journal_record(JournalEvent.COMMAND, code=DomeCommand.GOTO,
+                                 value=target_az.degree)
+            self._move_span = span
+            self._rotate_dome(direction)
+            # wait until encoder count matches desired delta az
+            self._start_monitor('goto-az-monitor', self._approach_complete,
+                                target_az,
+                                move_ticks=self._degrees_to_ticks(move))
+        except Exception:
+            if claimed:
+                if self._rotation_relay.is_active:
+                    self._stop_moving()
+                else:
+                    self._move_event.clear()
+            if self._move_span is span:
+                self._move_span = None
+            span.end(outcome='error')
+            raise
+
+    def track(self, trajectory, controller=None, update_interval=1.0):
+        """
+        Slave the dome to a target trajectory until stop_tracking() is called.
+
+        A thread checks the trajectory every update_interval seconds and,
+        when the dome isn't moving, asks the controller whether to move it.
+        With a TrackingController, the dome moves in a few long bursts that
+        lead the target, rather than following every small change.
+
+        Parameters
+        ----------
+        trajectory : callable
+            Target azimuth in degrees as a function of unix time, eg a
+            tracking.Trajectory.
+        controller : TrackingController
+            Tracking policy, defaults to a TrackingController with a window
+            of twice az_position_tolerance.
+        update_interval : float
+            Time in seconds between checks of the trajectory.
+
+        """
+        if self.is_tracking:
+            self.logger.warning('Dome is already tracking.')
             return
-        if self.movement_thread_active:
-            self.logger.warning('Movement command in progress.')
+        if self.is_parked:
+            self.logger.warning(
+                'Dome is currently parked, please unpark to track.')
             return
+        if controller is None:
+            controller = TrackingController(
+                tolerance=2 * self.az_position_tolerance.degree)
+        self.logger.notice('Starting dome tracking.')
+        self._tracking_stop.clear()
+        self._tracking_thread = threading.Thread(
+            target=self._track,
+            name='tracking',
+            args=(trajectory, controller, update_interval),
+            daemon=True)
+        self._tracking_thread.start()
+
+    def stop_tracking(self):
+        """
+        Stop tracking, letting any move in progress finish.
+        """
+        self._tracking_stop.set()
+        if self._tracking_thread is not None:
+            self._tracking_thread.join()
+        self.logger.notice(
+            f'Dome tracking stopped, relay cycles: {self.relay_cycles}.')
+
+    def run_sequence(self, waypoints, callback=None):
+        """
+        Step the dome through a list of waypoints in a thread.
+
+        Each waypoint is reached to within its tolerance and held for its
+        dwell time. If a waypoint has no dwell and the next one is further
+        on in the same direction, the motor is left running through it.
+        The sequence stops at the first waypoint that isn't reached (abort,
+        stall or timeout) or when stop_sequence() is called.
+
+        Parameters
+        ----------
+        waypoints : list
+            List of sequence.Waypoint, or (az, dwell, tolerance) tuples.
+        callback : callable
+            Called with a dictionary for each step once it is reached (and
+            before its dwell), with keys index, az, dome_az (degrees),
+            result (MoveResult), elapsed (seconds since the sequence
+            started) and motor_running.
+
+        Returns
+        -------
+        threading.Thread
+            The sequence thread, None if the dome can't move.
+
+        """
+        if self.dome_az is None:
+            self.last_move_result = None
+            return None
         if self.is_parked:
-            self.logger.warning('Dome is currently parked, please unpark to move the dome.')
+            self.logger.warning(
+                'Dome is currently parked, please unpark to move the dome.')
+            self.last_move_result = None
+            return None
+        waypoints = [waypoint if isinstance(waypoint, Waypoint)
+                     else Waypoint(*waypoint) for waypoint in waypoints]
+        if not self._claim_move():
+            self.logger.warning('Movement command in progress.')
+            return None
+        self.logger.notice(
+            f'Running a sequence of {len(waypoints)} waypoints.')
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.SEQUENCE,
+                             value=len(waypoints))
+        self._sequence_stop.clear()
+        self.last_move_result = MoveResult.IN_PROGRESS
+        self._sequence_thread = threading.Thread(
+            target=self._run_sequence,
+            name='sequence',
+            args=(waypoints, callback),
+            daemon=True)
+        self._sequence_thread.start()
+        return self._sequence_thread
+
+    def stop_sequence(self):
+        """
+        Stop a waypoint sequence, switching the motor off.
+        """
+        self._sequence_stop.set()
+        if self._sequence_thread is not None:
+            self._sequence_thread.join()
+
+    def submit_plan(self, targets, planner=None, update_interval=1.0):
+        """
+        Pre-position the dome for a list of upcoming targets.
+
+        A thread checks the plan every update_interval seconds and, when the
+        dome isn't moving, asks the planner whether to pre-rotate towards
+        the next target while the current one is still inside the slit
+        window (see planner.PrePositionPlanner). Gotos still have to be sent
+        for every target, they just have less far to go. Submitting a new
+        plan replaces the previous one.
+
+        Parameters
+        ----------
+        targets : list
+            List of planner.PlannedTarget, or an ObservationPlan. An empty
+            list clears the plan.
+        planner : PrePositionPlanner
+            Pre-positioning policy, defaults to PrePositionPlanner().
+        update_interval : float
+            Time in seconds between checks of the plan.
+
+        """
+        self.clear_plan()
+        if len(targets) == 0:
             return
+        if not isinstance(targets, ObservationPlan):
+            targets = ObservationPlan(targets)
+        if planner is None:
+            planner = PrePositionPlanner()
+        self.logger.notice(
+            f'Pre-positioning for a plan of {len(targets)} targets.')
+        self._planner_stop.clear()
+        self._planner_thread = threading.Thread(
+            target=self._run_plan,
+            name='planner',
+            args=(targets, planner, update_interval),
+            daemon=True)
+        self._planner_thread.start()
+
+    def clear_plan(self):
+        """
+        Stop pre-positioning, letting any pre-rotation in progress finish.
+        """
+        self._planner_stop.set()
+        if self._planner_thread is not None:
+            self._planner_thread.join()
+            self._planner_thread = None
+            self.logger.notice(
+                f'Observation plan cleared, pre-rotations: '
+                f'{self.pre_rotations}.')
+
+    def order_targets(self,
+                      targets,
+                      end_az=None,
+                      reversal_cost=2.0,
+                      allow_reversal=True,
+                      slew_rate=None):
+        """
+        Order a batch of targets to minimise the time the dome takes.
 
-        target_az = Longitude(az * u.deg)
-        self.logger.notice(f'Go to target azimuth [{target_az:.2f}].')
+        See ordering.order_targets, the dome starts at its current azimuth
+        and turns at the measured rotation rate.
 
-        # calculate delta_az, wrapping at 180 to ensure we take shortest route
-        delta_az = (target_az - self.dome_az).wrap_at(180 * u.degree)
-        self.logger.info(f'Delta azimuth [{delta_az:.2f}].')
+        Parameters
+        ----------
+        targets : list
+            Azimuths in degrees, or targets with an az attribute.
+        end_az : float
+            Azimuth to finish at, eg park_az, None for anywhere.
+        reversal_cost : float
+            Time in seconds lost to a change of direction.
+        allow_reversal : bool
+            If False the targets are visited in a single sweep.
+        slew_rate : float
+            Rotation rate in degrees per second, defaults to rotation_rate.
 
-        self._move_event.set()
-        if delta_az > 0:
-            self._rotate_dome(Direction.CW)
-        else:
-            self._rotate_dome(Direction.CCW)
-        # wait until encoder count matches desired delta az
-        goingto_az = threading.Thread(target=self._thread_condition,
-                                      args=(self._goto_az_complete,
-                                            target_az))
-        goingto_az.start()
+        Returns
+        -------
+        order, estimate
+            Indices into targets in the order to visit them, and the
+            estimated dome time as a dictionary (see
+            ordering.estimate_dome_time).
+
+        """
+        if self.dome_az is None:
+            raise ValueError('Dome azimuth unknown, home the dome first.')
+        if slew_rate is None:
+            slew_rate = self.rotation_rate
+        if slew_rate is None:
+            raise ValueError(
+                'Rotation rate not measured yet, slew_rate is required.')
+        start_az = self.dome_az.degree
+        order = order_targets(targets, start_az=start_az, end_az=end_az,
+                              slew_rate=slew_rate,
+                              reversal_cost=reversal_cost,
+                              allow_reversal=allow_reversal)
+        estimate = estimate_dome_time(
+            [targets[i] for i in order], start_az=start_az, end_az=end_az,
+            slew_rate=slew_rate, reversal_cost=reversal_cost,
+            position_tolerance=self.az_position_tolerance.degree)
+        self.logger.info(
+            (f'Ordered {len(order)} targets, estimated dome time '
+             f'{estimate["time"]:.0f}s, {estimate["reversals"]} reversals.'))
+        return order, estimate
 
-    def calibrate_dome_encoder_counts(self, num_cal_rotations=2):
+    def slit_az_tolerance(self, el):
+        """
+        Azimuth tolerance that keeps the telescope beam within the slit.
+
+        Parameters
+        ----------
+        el : float
+            Elevation of the target in degrees.
+
+        Returns
+        -------
+        Angle or None
+            The tolerance, which is never below az_position_tolerance, or
+            None if slit_width and dome_radius aren't configured.
+
+        """
+        if self.slit_width is None or self.dome_radius is None:
+            return None
+        tolerance = Angle(float(slit_tolerance(
+            el, self.slit_width, self.dome_radius,
+            self.telescope_aperture)) * u.deg)
+        return max(tolerance, self.az_position_tolerance)
+
+    def calibrate_dome_encoder_counts(self,
+                                      num_cal_rotations=2,
+                                      build_az_table=False,
+                                      num_az_bins=36,
+                                      measure_backlash=False,
+                                      backlash_clearance=10.0):
         """
         Calibrate the encoder (determine degrees per tick).
 
@@ -515,6 +1233,20 @@ class Dome(object):
         ----------
         num_cal_rotations : integer
             Number of rotations to perform to calibrate encoder.
+        build_az_table : bool
+            If True, also build an azimuth binned degrees per tick table from
+            the tick timestamps of the calibration rotations. The table is
+            used for tick/azimuth conversions and saved to calibration_path.
+        num_az_bins : integer
+            Number of azimuth bins in the table.
+        measure_backlash : bool
+            If True, after the calibration rotations pass back and forth
+            over home to measure the drive backlash in each direction (see
+            calibration.BacklashModel). The backlash is used to correct the
+            dome azimuth and saved to calibration_path.
+        backlash_clearance : float
+            Degrees to turn beyond the home sensor before each reversal,
+            should exceed the backlash.
 
         """
         if self.movement_thread_active:
@@ -522,6 +1254,7 @@ class Dome(object):
             return
         if self.is_parked:
             self.logger.warning('Dome is currently parked, please unpark to calibrate the dome.')
+            self.last_move_result = None
             return
         # rotate the dome until we hit home, to give reference point
         self.logger.notice('Finding Home.')
@@ -543,37 +1276,51 @@ class Dome(object):
             ('')
         )
         ('Starting calibration rotations.')
-        self._move_event.set()
+        self._building_az_table = build_az_table
+        self._num_az_bins = num_az_bins
+        self._measure_backlash_after = measure_backlash
+        self._backlash_clearance = backlash_clearance
+        # the dome starts the calibration at home
+        self._cal_home_times = [time.monotonic()]
+        self._cal_tick_times = []
+        if not self._claim_move():
+            self.logger.warning('Movement command in progress.')
+            return
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.CALIBRATE,
+                             value=num_cal_rotations)
         self._rotate_dome(Direction.CW)
         self._calibrating = True
 
-        cal_monitor = threading.Thread(target=self._thread_condition,
-                                       args=(self._calibration_complete,))
         if self.testing:
             calibrate_sim = threading.Thread(target=self._simulate_calibration)
             calibrate_sim.start()
-        cal_monitor.start()
+        # allow for up to a rotation to reach home the first time
+        self._start_monitor(
+            'calibration-monitor', self._calibration_complete,
+            move_ticks=self._degrees_to_ticks(360 * (num_cal_rotations + 1)))
 
     def find_home(self):
         """
         Move Dome to home position.
 
         """
-        if self.movement_thread_active:
-            self.logger.warning('Movement command in progress.')
-            return
         if self.is_parked:
             self.logger.warning('Dome is currently parked, please unpark to home the dome.')
+            self.last_move_result = None
             return
-        # iniate the movement and set the _move_event flag
+        if not self._claim_move():
+            self.logger.warning('Movement command in progress.')
+            return
+        # iniate the movement
         self.logger.notice('Finding Home.')
+        self._move_span = self.tracer.start_span('find_home')
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.FIND_HOME)
         self._unhomed = True
-        self._move_event.set()
+        self.last_move_result = MoveResult.IN_PROGRESS
         self._rotate_dome(Direction.CW)
         time.sleep(0.1)
-        homing = threading.Thread(target=self._thread_condition,
-                                  args=(self._find_home_complete,))
-        homing.start()
+        self._start_monitor('find-home-monitor', self._find_home_complete,
+                            move_ticks=self._degrees_to_ticks(360))
         if self.testing:
             # in testing mode need to "fake" the activation of the home pin
             home_pin_high = threading.Timer(0.5,
@@ -593,87 +1340,399 @@ class Dome(object):
         self.logger.notice(
             f'sync: syncing encoder counts to azimuth [{az:.2f}]')
         self._encoder_count = self._az_to_ticks(Longitude(az * u.deg))
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.SYNC,
+                             count=self._encoder_count, value=az)
         return
 
 ###############################################################################
 # Private Methods
 ###############################################################################
 
-    def _thread_condition(self, trigger_condition, *args, **kwargs):
+    def _start_monitor(self, name, trigger_condition, *args, move_ticks=None):
+        """Start a movement monitor thread running _thread_condition.
+
+        Parameters
+        ----------
+        name : str
+            Name of the thread.
+        trigger_condition : callable method
+            Callable method that returns a boolean value.
+        move_ticks : float
+            Expected length of the move in encoder ticks, used to set the
+            move deadline.
+
+        """
+        monitor = threading.Thread(target=self._thread_condition,
+                                   name=name,
+                                   args=(trigger_condition, *args),
+                                   kwargs=dict(move_ticks=move_ticks),
+                                   daemon=True)
+        with self._monitor_lock:
+            # forget monitors that have finished
+            self._monitor_threads = [
+                running for running in self._monitor_threads
+                if running.is_alive()]
+            self._monitor_threads.append(monitor)
+            # in progress from when the command returns, not when the
+            # thread gets to run
+            self.last_move_result = MoveResult.IN_PROGRESS
+            monitor.start()
+        return monitor
+
+    def _thread_condition(self, trigger_condition, *args, move_ticks=None,
+                          **kwargs):
         """Condition monitoring thread for movement commands.
 
         Will return when:
             - trigger_condition is True
             - abort event is triggered
-            - thread running time exceeds self.wait_timeout
+            - no encoder tick arrives within the stall time
+            - thread running time exceeds the move deadline or
+              self.wait_timeout
+
+        The outcome is stored in self.last_move_result, which
+        _start_monitor sets to IN_PROGRESS.
 
         Parameters
         ----------
         trigger_condition : callable method
             Callable method that returns a boolean value.
+        move_ticks : float
+            Expected length of the move in encoder ticks, used to set the
+            move deadline.
 
         """
-        calibration_success = False
-        # This will update to False, if while loop is terminated by
-        # trigger_condition()
-        # TODO: better system for flagging success/abort/timeout
         goingtoaz = False
-        if trigger_condition.__name__ == '_goto_az_complete':
+        if trigger_condition.__name__ in ('_goto_az_complete',
+                                          '_approach_complete',
+                                          '_pre_rotation_complete'):
             goingtoaz = True
+        approaching = trigger_condition.__name__ == '_approach_complete'
         start = time.monotonic()
+        deadline = self.wait_timeout
+        if move_ticks is not None and self._tick_interval is not None:
+            deadline = min(deadline, self.stall_min_time + (
+                self.move_deadline_factor * move_ticks * self._tick_interval))
+            self.logger.debug(f'Move deadline is {deadline:.1f}s.')
+        span = self._move_span
+        if span is not None:
+            span.event('monitor_started', deadline=deadline)
 
         while True:
             wait_time = time.monotonic() - start
+            if (approaching and self._approach_via is not None
+                    and self._goto_az_complete(self._approach_via)):
+                self._reverse_approach()
             if trigger_condition(*args, **kwargs):
                 self.logger.info(
                     (f'Monitor-thread triggered '
                      f'by {trigger_condition.__name__}.')
                 )
-                calibration_success = True
+                result = MoveResult.COMPLETE
                 break
             elif self._abort_event.is_set():
                 self.logger.info('Monitor-thread triggered by abort event.')
+                result = MoveResult.ABORTED
                 break
-            elif wait_time > self.wait_timeout:
-                self.logger.info(
+            elif self._stalled():
+                self.logger.error(
+                    (f'Monitor-thread triggered by stall, no encoder tick '
+                     f'for {self._stall_time():.1f}s.')
+                )
+                result = MoveResult.STALLED
+                break
+            elif wait_time > deadline:
+                self.logger.error(
                     (f'Monitor-thread triggered '
-                     f'by timeout [{self.wait_timeout}s].')
+                     f'by timeout [{deadline:.1f}s].')
                 )
+                result = MoveResult.TIMEOUT
                 break
             elif goingtoaz and self.testing is True:
                 # if testing simulate a tick for every cycle of while loop
                 self._simulate_ticks(num_ticks=1)
-            time.sleep(0.1)
+            # returns early on abort
+            self._abort_event.wait(self._monitor_interval)
 
         self.logger.info('Stopping dome movement.')
-        self._stop_moving()
+        if span is not None:
+            span.event('monitor_exit', result=result.name)
+        # the move is over once the monitor has finished with it
+        self._stop_moving(release=False)
 
+        calibration_success = result == MoveResult.COMPLETE
         if trigger_condition.__name__ == '_calibration_complete':
             # set the azimuth per encoder tick factor based on
             # how many ticks we counted over n rotations
-            self._degrees_per_tick = Angle(
-                360 / (self.encoder_count / self._rotation_count) * u.deg)
+            if calibration_success:
+                self._degrees_per_tick = Angle(
+                    360 / (self.encoder_count / self._rotation_count) * u.deg)
+            if calibration_success and self._building_az_table:
+                self._update_az_table()
+            if calibration_success and self._measure_backlash_after:
+                self._measure_backlash()
         # reset various dome state variables/events
+        self.last_move_result = result
+        self.move_results[result] += 1
+        self._journal_record(
+            JournalEvent.MOVE_END,
+            code=_MONITOR_COMMANDS.get(trigger_condition.__name__,
+                                       DomeCommand.NONE),
+            state=result.value, count=self._encoder_count,
+            value=self.dome_az.degree if self.dome_az is not None else 0.0)
+        if span is not None:
+            self._move_span = None
+            span.end(result=result.name, encoder_count=self._encoder_count)
+        self._pre_rotation_goal = None
+        self._approach_via = None
         self._move_event.clear()
         self._calibrating = False
         return
 
-    def _goto_az_complete(self, target_az):
+    def _track(self, trajectory, controller, update_interval):
+        """Tracking loop, run in a thread by track()."""
+        while not self._tracking_stop.is_set():
+            dome_az = self.dome_az
+            # the claim keeps other commands out until the goto has started
+            if dome_az is not None and self._claim_move():
+                goal = controller.update(time.time(), dome_az.degree,
+                                         trajectory)
+                if goal is None:
+                    self._move_event.clear()
+                else:
+                    self.logger.info(f'Tracking move to {goal:.2f}.')
+                    self._goto_az(goal, claimed=True)
+            self._tracking_stop.wait(update_interval)
+
+    def _run_plan(self, plan, planner, update_interval):
+        """Pre-positioning loop, run in a thread by submit_plan()."""
+        while not self._planner_stop.is_set():
+            dome_az = self.dome_az
+            if (dome_az is not None and not self.is_tracking
+                    and not self.is_parked and self._claim_move()):
+                goal = planner.update(time.time(), dome_az.degree, plan,
+                                      self._slit_window)
+                if goal is None:
+                    self._move_event.clear()
+                else:
+                    self._pre_rotate(goal)
+            self._planner_stop.wait(update_interval)
+
+    def _slit_window(self, el):
+        """Slit window half width in degrees for the planner."""
+        tolerance = None
+        if el is not None:
+            tolerance = self.slit_az_tolerance(el)
+        if tolerance is None:
+            tolerance = self.az_position_tolerance
+        return tolerance.degree
+
+    def _pre_rotate(self, az):
+        """
+        Start a planner move to az, which a goto can cut short. The caller
+        claims the move (see _claim_move).
+        """
+        target_az = Longitude(az * u.deg)
+        delta_az = (target_az - self.dome_az).wrap_at(180 * u.degree)
+        self.logger.info(f'Pre-rotating to {target_az:.2f}.')
+        self.pre_rotations += 1
+        self._journal_record(JournalEvent.COMMAND, code=DomeCommand.GOTO,
+                             state=1, value=target_az.degree)
+        self._pre_rotation_goal = target_az
+        self._pre_rotation_cancel.clear()
+        if delta_az > 0:
+            self._rotate_dome(Direction.CW)
+        else:
+            self._rotate_dome(Direction.CCW)
+        self._start_monitor('pre-rotation-monitor',
+                            self._pre_rotation_complete, target_az,
+                            move_ticks=self._degrees_to_ticks(abs(delta_az)))
+
+    def _pre_rotation_complete(self, target_az):
+        """Return True if a pre-rotation has arrived or been cancelled."""
+        if self._pre_rotation_cancel.is_set():
+            return True
+        return self._goto_az_complete(target_az)
+
+    def _cancel_pre_rotation(self):
+        """Stop a pre-rotation in progress and wait for its monitor."""
+        self.logger.info('Stopping pre-rotation for goto.')
+        self._pre_rotation_cancel.set()
+        # the monitor checks the cancel flag every _monitor_interval
+        deadline = time.monotonic() + 5 * self._monitor_interval + 1
+        while self.movement_thread_active and time.monotonic() < deadline:
+            time.sleep(self._monitor_interval / 10)
+
+    def _run_sequence(self, waypoints, callback):
+        """Waypoint sequence loop, run in a thread by run_sequence()."""
+        start = time.monotonic()
+        result = MoveResult.COMPLETE
+        try:
+            for index, waypoint in enumerate(waypoints):
+                result = self._sequence_step(waypoint)
+                next_direction = Direction.NONE
+                if (result == MoveResult.COMPLETE and waypoint.dwell == 0
+                        and index + 1 < len(waypoints)):
+                    next_delta = (Longitude(waypoints[index + 1].az * u.deg)
+                                  - self.dome_az).wrap_at(180 * u.degree)
+                    next_direction = (Direction.CW if next_delta > 0
+                                      else Direction.CCW)
+                motor_running = (self._rotation_relay.is_active
+                                 and next_direction == self.current_direction)
+                if not motor_running and self._rotation_relay.is_active:
+                    self._stop_moving(release=False)
+                if callback is not None:
+                    callback(dict(index=index,
+                                  az=waypoint.az,
+                                  dome_az=self.dome_az.degree,
+                                  result=result,
+                                  elapsed=time.monotonic() - start,
+                                  motor_running=motor_running))
+                if result != MoveResult.COMPLETE:
+                    break
+                if waypoint.dwell and self._sequence_wait(waypoint.dwell):
+                    result = MoveResult.ABORTED
+                    break
+        finally:
+            self._stop_moving()
+            self.last_move_result = result
+            self.move_results[result] += 1
+            self._move_event.clear()
+        self.logger.notice(
+            (f'Sequence finished ({result.name}) after '
+             f'{time.monotonic() - start:.1f}s.'))
+
+    def _sequence_wait(self, timeout):
+        """Wait, returning True early if the sequence is aborted."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._abort_event.is_set() or self._sequence_stop.is_set():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._abort_event.wait(min(remaining, self._monitor_interval))
+
+    def _sequence_step(self, waypoint):
+        """Move to a waypoint, leaving the motor running.
+
+        Returns
+        -------
+        MoveResult
+            COMPLETE once within tolerance of the waypoint, or how the move
+            ended.
+
+        """
+        target_az = Longitude(waypoint.az * u.deg)
+        tolerance = self.az_position_tolerance
+        if waypoint.tolerance is not None:
+            tolerance = max(Angle(waypoint.tolerance * u.deg), tolerance)
+        delta_az = (target_az - self.dome_az).wrap_at(180 * u.degree)
+        if abs(delta_az) <= tolerance:
+            return MoveResult.COMPLETE
+        direction = Direction.CW if delta_az > 0 else Direction.CCW
+        if not (self._rotation_relay.is_active
+                and self.current_direction == direction):
+            if self._rotation_relay.is_active:
+                self._stop_moving(release=False)
+            self._rotate_dome(direction)
+        start = time.monotonic()
+        deadline = self.wait_timeout
+        move_ticks = self._degrees_to_ticks(abs(delta_az))
+        if move_ticks is not None and self._tick_interval is not None:
+            deadline = min(deadline, self.stall_min_time + (
+                self.move_deadline_factor * move_ticks * self._tick_interval))
+        while True:
+            if self._goto_az_complete(target_az, tolerance):
+                return MoveResult.COMPLETE
+            if self._abort_event.is_set() or self._sequence_stop.is_set():
+                return MoveResult.ABORTED
+            if self._stalled():
+                self.logger.error('Sequence step stalled.')
+                return MoveResult.STALLED
+            if time.monotonic() - start > deadline:
+                self.logger.error('Sequence step timed out.')
+                return MoveResult.TIMEOUT
+            if self.testing:
+                self._simulate_ticks(num_ticks=1)
+            self._abort_event.wait(self._monitor_interval)
+
+    def _stall_time(self):
+        """Return the time in seconds allowed between encoder ticks."""
+        if self._tick_interval is None:
+            return self.stall_factor * self.stall_min_time
+        return max(self.stall_min_time,
+                   self.stall_factor * self._tick_interval)
+
+    def _stalled(self):
+        """Return True if the motor is on but the encoder isn't ticking."""
+        if not self._rotation_relay.is_active:
+            return False
+        last_activity = self._last_tick_time
+        if last_activity is None:
+            last_activity = self._motor_start_time
+        if last_activity is None:
+            return False
+        return time.monotonic() - last_activity > self._stall_time()
+
+    def _degrees_to_ticks(self, degrees):
+        """Return the approximate number of ticks in an angle, or None."""
+        if self._degrees_per_tick is None:
+            return None
+        return float(u.Quantity(degrees, u.deg) / self._degrees_per_tick)
+
+    def _goto_az_complete(self, target_az, tolerance=None):
         """Determines if current azimuth is within tolerance of target azimuth.
 
+        Parameters
+        ----------
+        target_az : astropy.coordinates.Longitude
+            Target azimuth.
+        tolerance : astropy.coordinates.Angle
+            Tolerance, defaults to az_position_tolerance.
+
         Returns
         -------
         bool
             Returns True if self.dome_az is within tolerance of target azimuth.
 
         """
+        if tolerance is None:
+            tolerance = self.az_position_tolerance
         raw_delta_az = (target_az - self.dome_az).wrap_at('180d')
         delta_az = self.current_direction * raw_delta_az
         self.logger.debug(
             (f'Delta_az is {delta_az:.2f}, '
-             f'tolerance window is {self.az_position_tolerance:.2f}.')
+             f'tolerance window is {tolerance:.2f}.')
         )
-        return delta_az <= self.az_position_tolerance
+        return delta_az <= tolerance
+
+    def _approach_complete(self, target_az):
+        """Return True once at the target, after any overshoot.
+
+        If the goto is approaching from one side (see approach_direction),
+        this is False until the monitor has reversed the motor at the
+        overshoot azimuth (see _reverse_approach).
+        """
+        if self._approach_via is not None:
+            return False
+        return self._goto_az_complete(target_az)
+
+    def _reverse_approach(self):
+        """Reverse the motor at the overshoot azimuth of a goto.
+
+        Called by the monitor thread. Like _pass_home, the dome is given a
+        monitor interval to stop before the direction relay is switched.
+        """
+        self.logger.debug('Reached overshoot, reversing.')
+        self._approach_via = None
+        self._rotation_relay.off()
+        self._journal_record(JournalEvent.ROTATION_RELAY, state=0,
+                             count=self._encoder_count)
+        # let the dome stop before reversing, returns early on abort
+        if self._abort_event.wait(self._monitor_interval):
+            return
+        self._rotate_dome(self.approach_direction)
 
     def _find_home_complete(self):
         """Return True if the dome is at home."""
@@ -700,7 +1759,6 @@ class Dome(object):
                  f'encoder_count [{self.encoder_count}]')
             )
             if not self._simulated_rotation_event.is_set():
-                time.sleep(1)
                 self.logger.debug(
                     ('Completion of simulated rotation detected, '
                      'simulating next rotation.')
@@ -715,21 +1773,47 @@ class Dome(object):
                 sim_rotation.start()
             time.sleep(1)
 
-    def _set_at_home(self):
+    def _set_at_home(self, edge_time=None):
         """
         Update home status to at home and debug LEDs (if enabled).
+
+        Parameters
+        ----------
+        edge_time : float
+            Monotonic timestamp of the edge, defaults to the current time.
+
         """
+        if edge_time is None:
+            edge_time = time.monotonic()
+        self._journal_record(JournalEvent.HOME_EDGE, edge_time, state=1,
+                             count=self._encoder_count)
+        if not self._home_debouncer.accept(edge_time):
+            return
         self.logger.notice('Home sensor activated.')
-        self._change_led_state(1, leds=[LED_Lights.INPUT_2])
+        self._set_leds(on=_INPUT_2)
+        was_homed = not self._unhomed
         self._unhomed = False
         # don't want to zero encoder while calibrating
         # note: because Direction.CW is +1 and Direction.CCW is -1, need to
         # add 1 to self.current_direction, to get CCW to evaluate to False
-        if not self._calibrating and bool(self.current_direction + 1):
+        if self._measuring_backlash:
+            self._home_edge_counts.append(self._encoder_count)
+        elif not self._calibrating and bool(self.current_direction + 1):
             self.logger.debug(
                 ('Passing home clockwise, zeroing encoder counts.')
             )
+            rotation_ticks = self._degrees_to_ticks(360)
+            if was_homed and rotation_ticks:
+                # how far the count had drifted from a whole rotation
+                rotations = round(self._encoder_count / rotation_ticks)
+                self.last_home_correction = \
+                    rotations * rotation_ticks - self._encoder_count
+                self.home_corrections += 1
+            self._journal_record(JournalEvent.HOME_ZERO, edge_time,
+                                 count=self._encoder_count,
+                                 value=self._encoder_count)
             self._encoder_count = 0
+            self._backlash_offset = 0.0
             self.logger.debug(
                 (f'Encoder: {self.encoder_count} Azimuth: {self.dome_az:.2f}')
             )
@@ -740,15 +1824,30 @@ class Dome(object):
                  'incrementing calibration rotation count.')
             )
             self._rotation_count += 1
+            self._cal_home_times.append(edge_time)
 
-    def _set_not_home(self):
+    def _set_not_home(self, edge_time=None):
         """
         Update home status to not at home and debug LEDs (if enabled).
+
+        Parameters
+        ----------
+        edge_time : float
+            Monotonic timestamp of the edge, defaults to the current time.
+
         """
+        if edge_time is None:
+            edge_time = time.monotonic()
+        self._journal_record(JournalEvent.HOME_EDGE, edge_time, state=0,
+                             count=self._encoder_count)
+        # deactivation isn't debounced but restarts the stability window
+        self._home_debouncer.accept(edge_time, count=False)
         self.logger.notice('Home sensor deactivated.')
-        self._change_led_state(0, leds=[LED_Lights.INPUT_2])
+        if self._measuring_backlash:
+            self._home_edge_counts.append(self._encoder_count)
+        self._set_leds(off=_INPUT_2)
 
-    def _increment_count(self):
+    def _increment_count(self, edge_time=None):
         """
         Private method used for callback function of the encoder DOD.
 
@@ -758,24 +1857,150 @@ class Dome(object):
 
         If the current dome direction cannot be determined, the last recorded
         direction is adopted.
+
+        Parameters
+        ----------
+        edge_time : float
+            Monotonic timestamp of the edge, defaults to the current time.
+
         """
+        if edge_time is None:
+            edge_time = time.monotonic()
+        self._journal_record(JournalEvent.ENCODER_EDGE, edge_time, state=1)
+        if not self._encoder_debouncer.accept(edge_time):
+            return
         self.logger.info("Encoder activated _increment_count.")
-        self._change_led_state(1, leds=[LED_Lights.INPUT_1])
+        self._set_leds(on=_INPUT_1)
+        self._count_step(self._inferred_direction(), edge_time)
 
+    def _count_deactivation(self, edge_time=None):
+        """
+        Callback function for encoder deactivation in dual edge mode.
+
+        Turns the encoder debug LED off and counts the falling edge in the
+        same way as _increment_count counts the rising edge.
+        """
+        if edge_time is None:
+            edge_time = time.monotonic()
+        self._journal_record(JournalEvent.ENCODER_EDGE, edge_time, state=0)
+        if not self._encoder_debouncer.accept(edge_time):
+            return
+        self.logger.info("Encoder deactivated _count_deactivation.")
+        self._set_leds(off=_INPUT_1)
+        self._count_step(self._inferred_direction(), edge_time)
+
+    def _quadrature_edge(self, state=None, edge_time=None):
+        """
+        Callback function for any edge on either quadrature encoder channel.
+
+        The direction of the count step is decoded from the change in the
+        levels of the two channels, so it is correct while the dome coasts or
+        is pushed by hand, regardless of current_direction.
+
+        Parameters
+        ----------
+        state : int
+            Quadrature state after the edge, read from the encoder devices
+            if not given.
+        edge_time : float
+            Monotonic timestamp of the edge, defaults to the current time.
+
+        """
+        if state is None:
+            state = quadrature_state(self._encoder.is_active,
+                                     self._encoder_b.is_active)
+        self._journal_record(JournalEvent.ENCODER_EDGE, edge_time, state=state,
+                             code=QUADRATURE_EDGE)
+        step = quadrature_step(self._quadrature_state, state)
+        self._quadrature_state = state
+        on = (_INPUT_1 if state & 0b10 else 0) | (_INPUT_3 if state & 1 else 0)
+        self._set_leds(on=on, off=(_INPUT_1 | _INPUT_3) & ~on)
+        if step == 0:
+            self._quadrature_errors += 1
+            self.logger.warning('Quadrature encoder edge missed.')
+            return
+        self.encoder_direction = Direction(step)
+        self._count_step(step, edge_time)
+
+    def _process_encoder_edges(self, edges):
+        """
+        Process a batch of encoder edges captured by the pigpio daemon.
+
+        Parameters
+        ----------
+        edges : list
+            List of (gpio, level, edge_time) tuples in the order they
+            occurred, where edge_time is the daemon timestamp converted to
+            the time.monotonic() timebase.
+
+        """
+        levels = self._encoder_levels
+        encoder_a, *encoder_b = self._encoder_gpios
+        for gpio, level, edge_time in edges:
+            if level > 1 or levels[gpio] == level:
+                # watchdog timeout or a repeated level
+                continue
+            levels[gpio] = level
+            if encoder_b:
+                self._quadrature_edge(
+                    state=quadrature_state(levels[encoder_a],
+                                           levels[encoder_b[0]]),
+                    edge_time=edge_time)
+            elif level:
+                self._increment_count(edge_time)
+            elif self._encoder_dual_edge:
+                self._count_deactivation(edge_time)
+            else:
+                self._turn_off_input_1_led(edge_time)
+
+    def _inferred_direction(self):
+        """
+        Return the direction to count a single channel encoder edge in.
+
+        Returns
+        -------
+        Direction
+            The current dome direction, or the last recorded direction if the
+            dome is not being driven.
+
+        """
         self.logger.debug(
             (f'Direction: Current {self.current_direction} '
              f'Last {self.last_direction}.')
         )
-        self.logger.debug(f'Encoder count before: {self.encoder_count}.')
         if self.current_direction != Direction.NONE:
-            self._encoder_count += self.current_direction
+            return self.current_direction
         elif self.last_direction != Direction.NONE:
-            self._encoder_count += self.last_direction
+            return self.last_direction
         else:
             raise RuntimeError(
                 ("No current or last direction, can't increment count.")
             )
 
+    def _count_step(self, step, edge_time=None):
+        """
+        Add a signed step to the encoder count.
+
+        Parameters
+        ----------
+        step : int
+            Number of counts to add, +1 clockwise and -1 counterclockwise.
+        edge_time : float
+            Monotonic timestamp of the edge, defaults to the current time.
+
+        """
+        if edge_time is None:
+            edge_time = time.monotonic()
+        self._update_tick_interval(edge_time)
+        self.total_ticks += 1
+        self.logger.debug(f'Encoder count before: {self.encoder_count}.')
+        self._take_up_backlash(step)
+        self._encoder_count += step
+        self._journal_record(JournalEvent.ENCODER_COUNT, edge_time,
+                             state=step, count=self._encoder_count)
+        if self._calibrating:
+            self._cal_tick_times.append(edge_time)
+
         # Set new dome azimuth
         # if dome is unhomed, _dome_az should remain as None
         if self._unhomed:
@@ -785,6 +2010,81 @@ class Dome(object):
                 (f'Encoder: {self.encoder_count} Azimuth: {self.dome_az:.2f}.')
             )
 
+    def _take_up_backlash(self, step):
+        """
+        Update the backlash offset for an encoder step.
+
+        After a reversal, steps don't move the dome until the slack is taken
+        up, so the offset of the dome from the encoder count changes by the
+        step instead. If the previous slack wasn't all taken up, only the
+        part that was has to be taken up again.
+
+        Parameters
+        ----------
+        step : int
+            Encoder step, +1 clockwise and -1 counterclockwise.
+
+        """
+        direction = 1 if step > 0 else -1
+        if direction != self._backlash_direction:
+            lost = self._backlash.lost_ticks(direction)
+            if self._backlash_remaining > 0:
+                previous = self._backlash.lost_ticks(-direction)
+                taken_up = previous - self._backlash_remaining
+                lost *= taken_up / previous
+            self._backlash_remaining = lost
+            self._backlash_direction = direction
+        if self._backlash_remaining <= 0:
+            return
+        taken_up = min(abs(step), self._backlash_remaining)
+        self._backlash_remaining -= taken_up
+        if self.backlash_compensation:
+            self._backlash_offset -= direction * taken_up
+
+    def _update_tick_interval(self, tick_time):
+        """
+        Record the time of an encoder tick and update the measured interval.
+
+        The first tick after the rotation relay is switched on only sets the
+        tick time, so motor spin up doesn't bias the measured interval. The
+        interval is an exponential moving average that persists between moves.
+
+        Parameters
+        ----------
+        tick_time : float
+            Monotonic timestamp of the encoder tick.
+
+        """
+        last_tick_time = self._last_tick_time
+        # set the time before the count is updated, so a concurrent dome_az
+        # read can only underestimate the interpolated position
+        self._last_tick_time = tick_time
+        if last_tick_time is None or not self._rotation_relay.is_active:
+            return
+        interval = tick_time - last_tick_time
+        if self._tick_interval is None:
+            self._tick_interval = interval
+        else:
+            self._tick_interval += 0.3 * (interval - self._tick_interval)
+
+    def _sub_tick_offset(self):
+        """
+        Estimate the fraction of a tick travelled since the last encoder tick.
+
+        Returns
+        -------
+        float
+            Signed offset in ticks, clamped to at most one tick. Zero if the
+            dome isn't rotating or no tick interval has been measured.
+
+        """
+        last_tick_time = self._last_tick_time
+        if (last_tick_time is None or self._tick_interval is None
+                or not self._rotation_relay.is_active):
+            return 0
+        elapsed = time.monotonic() - last_tick_time
+        return self.current_direction * min(elapsed / self._tick_interval, 1.0)
+
     def _az_to_ticks(self, az):
         """
         Convert degrees (azimuth) to equivalent in encoder tick count. Because
@@ -800,13 +2100,20 @@ class Dome(object):
         Returns
         -------
         float
-            Returns encoder tick count corresponding to dome azimuth.
+            Returns encoder tick count corresponding to dome azimuth, given
+            the current backlash offset.
 
         """
         self.logger.debug(f'Home Az: {self.home_az} Convert Az: {az:.2f}')
         az_rel_to_home = (az - self.home_az).wrap_at(360 * u.degree)
         self.logger.debug(f'Az relative to home: {az_rel_to_home}')
-        encoder_ticks = az_rel_to_home.degree / self.degrees_per_tick.degree
+        if self._az_table is not None:
+            encoder_ticks = self._az_table.degrees_to_ticks(
+                az_rel_to_home.degree)
+        else:
+            encoder_ticks = (az_rel_to_home.degree /
+                             self.degrees_per_tick.degree)
+        encoder_ticks -= self._backlash_offset
         self.logger.debug(f'Encoder ticks for requested Az: {encoder_ticks}')
         return encoder_ticks
 
@@ -826,12 +2133,124 @@ class Dome(object):
 
         """
         self.logger.debug(f'Home Az: {self.home_az} Convert ticks: {ticks}')
-        tick_to_deg = Longitude(ticks * self.degrees_per_tick)
+        # the dome position, allowing for backlash
+        ticks = ticks + self._backlash_offset
+        if self._az_table is not None:
+            tick_to_deg = Longitude(
+                self._az_table.ticks_to_degrees(ticks) * u.deg)
+        else:
+            tick_to_deg = Longitude(ticks * self.degrees_per_tick)
         self.logger.debug(f'Ticks to degrees: {tick_to_deg:.2f}')
         az = Longitude(self.home_az + tick_to_deg)
         self.logger.debug(f'Az for requested ticks: {az:.2f}')
         return az
 
+    def _measure_backlash(self):
+        """
+        Measure the drive backlash by passing back and forth over home.
+
+        Run by the calibration monitor once the dome has stopped at home.
+        The dome first moves clockwise clear of home, then passes over it
+        anticlockwise, clockwise and anticlockwise again, and the backlash
+        is measured from the encoder counts at the home sensor edges.
+        """
+        clearance = self._degrees_to_ticks(self._backlash_clearance)
+        self._measuring_backlash = True
+        passes = []
+        try:
+            for direction in (Direction.CW, Direction.CCW,
+                              Direction.CW, Direction.CCW):
+                edges = self._pass_home(direction, clearance)
+                if edges is None:
+                    self.logger.error('Backlash measurement failed.')
+                    return
+                if len(edges) == 2:
+                    passes.append((direction, sum(edges) / 2))
+        finally:
+            self._measuring_backlash = False
+        backlash = BacklashModel.from_home_passes(passes)
+        self._backlash = backlash
+        # the slack was last taken up anticlockwise
+        self._backlash_direction = Direction.CCW
+        self._backlash_remaining = 0.0
+        self._backlash_offset = (backlash.ccw_ticks
+                                 if self.backlash_compensation else 0.0)
+        self.logger.notice(
+            (f'Backlash measured, {backlash.cw_ticks:.2f} ticks reversing '
+             f'CW, {backlash.ccw_ticks:.2f} ticks reversing CCW.'))
+        if self.calibration_path is not None:
+            self.logger.info(f'Saving backlash to {self.calibration_path}.')
+            save_calibration(self.calibration_path,
+                             backlash=backlash.to_dict())
+
+    def _pass_home(self, direction, clearance):
+        """
+        Turn the dome over the home sensor and clearance ticks beyond it.
+
+        Parameters
+        ----------
+        direction : Direction
+            Direction to turn.
+        clearance : float
+            Encoder ticks to turn beyond the last home sensor edge.
+
+        Returns
+        -------
+        list or None
+            Encoder counts at the home sensor edges seen, or None if the
+            move was aborted, stalled or timed out.
+
+        """
+        self._home_edge_counts = []
+        # let the dome stop before reversing
+        self._abort_event.wait(self._monitor_interval)
+        self._rotate_dome(direction)
+        if self.testing and not self._home_edge_counts:
+            # simulate passing a home sensor two ticks wide, _rotate_dome
+            # has already left it if the dome was at home
+            self._simulate_ticks(2)
+            self._home_sensor_pin.drive_high()
+            self._simulate_ticks(2)
+            self._home_sensor_pin.drive_low()
+        start = time.monotonic()
+        edges = None
+        while True:
+            counts = self._home_edge_counts
+            if (counts and not self._home_sensor.is_active
+                    and abs(self._encoder_count - counts[-1]) >= clearance):
+                edges = list(counts)
+                break
+            if (self._abort_event.is_set() or self._stalled()
+                    or time.monotonic() - start > self.wait_timeout):
+                break
+            if self.testing:
+                self._simulate_ticks(num_ticks=1)
+            self._abort_event.wait(self._monitor_interval)
+        self._stop_moving(release=False)
+        return edges
+
+    def _update_az_table(self):
+        """
+        Build the azimuth table from the last calibration and save it.
+        """
+        try:
+            az_table = AzimuthTable.from_tick_times(self._cal_tick_times,
+                                                    self._cal_home_times,
+                                                    num_bins=self._num_az_bins)
+        except ValueError as e:
+            self.logger.error(f'Could not build azimuth table: {e}')
+            return
+        self._az_table = az_table
+        self.logger.notice(
+            (f'Azimuth table built, '
+             f'{az_table.ticks_per_rotation:.1f} ticks per rotation.')
+        )
+        if self.calibration_path is not None:
+            self.logger.info(
+                f'Saving azimuth table to {self.calibration_path}.')
+            save_calibration(self.calibration_path,
+                             az_table=az_table.to_dict())
+
     def _rotate_dome(self, direction):
         """
         Set dome to move clockwise.
@@ -858,36 +2277,96 @@ class Dome(object):
         if self.current_direction == Direction.CW:
             self.logger.debug('Turning direction relay on (CW)')
             self._direction_relay.on()
-            self._change_led_state(1, leds=[LED_Lights.RELAY_2_NO])
-            self._change_led_state(0, leds=[LED_Lights.RELAY_2_NC])
+            self._journal_record(JournalEvent.DIRECTION_RELAY,
+                                 state=Direction.CW)
+            self._set_leds(on=_RELAY_2_NO, off=_RELAY_2_NC)
         elif self.current_direction == Direction.CCW:
             self.logger.debug('Turning direction relay off (CCW).')
             self._direction_relay.off()
-            self._change_led_state(0, leds=[LED_Lights.RELAY_2_NO])
-            self._change_led_state(1, leds=[LED_Lights.RELAY_2_NC])
+            self._journal_record(JournalEvent.DIRECTION_RELAY,
+                                 state=Direction.CCW)
+            self._set_leds(on=_RELAY_2_NC, off=_RELAY_2_NO)
         # turn on rotation
         self.logger.debug('Turning on rotation relay.')
+        # don't measure a tick interval across the motor start
+        self._last_tick_time = None
+        self._motor_start_time = time.monotonic()
+        if self._relay_on_since is None:
+            self._relay_on_since = self._motor_start_time
+        self.relay_cycles += 1
+        self._encoder_debouncer.reset()
         self._rotation_relay.on()
+        self._journal_record(JournalEvent.ROTATION_RELAY, state=1,
+                             count=self._encoder_count)
+        span = self._move_span
+        if span is not None:
+            span.event('relay_on', direction=direction.name)
         # update the rotation relay debug LEDs
-        self._change_led_state(1, leds=[LED_Lights.RELAY_1_NO])
-        self._change_led_state(0, leds=[LED_Lights.RELAY_1_NC])
+        self._set_leds(on=_RELAY_1_NO, off=_RELAY_1_NC)
 
-    def _stop_moving(self):
+    def _claim_move(self):
+        """
+        Claim the dome for a move, ie set the move event.
+
+        Checking movement_thread_active and then setting the move event
+        races with the other threads that start moves, so the check and
+        set are made together. The claim is released by clearing the move
+        event, eg by _stop_moving().
+
+        Returns
+        -------
+        bool
+            False if another move holds the claim.
+
+        """
+        with self._move_lock:
+            if self._move_event.is_set():
+                return False
+            self._move_event.set()
+            return True
+
+    def _stop_moving(self, release=True):
         """
         Stop dome movement by switching the dome rotation relay off.
+
+        Parameters
+        ----------
+        release : bool
+            Whether to release the move claim (see _claim_move), False when
+            the caller releases it later.
+
         """
         self.logger.debug('Turning off rotation relay.')
         self._rotation_relay.off()
-        self._move_event.clear()
+        self._journal_record(JournalEvent.ROTATION_RELAY, state=0,
+                             count=self._encoder_count)
+        self._add_relay_on_time()
+        span = self._move_span
+        if span is not None:
+            span.event('relay_off', encoder_count=self._encoder_count)
+        if release:
+            self._move_event.clear()
         # update the debug LEDs
-        self._change_led_state(0, leds=[LED_Lights.RELAY_1_NO])
-        self._change_led_state(1, leds=[LED_Lights.RELAY_1_NC])
+        self._set_leds(on=_RELAY_1_NC, off=_RELAY_1_NO)
         # update last_direction with current_direction at time of method call
         self.logger.debug(f'Last direction set to {self.current_direction}.')
         self.last_direction = self.current_direction
         self.logger.debug('Current direction set to None.')
         self.current_direction = Direction.NONE
 
+    def _journal_record(self, kind, mono=None, **fields):
+        """Record an event in the journal, if there is one."""
+        if self.journal is not None:
+            self.journal.record(kind, mono, **fields)
+
+    def _add_relay_on_time(self):
+        """Add the time since the rotation relay was switched on to
+        relay_on_time."""
+        on_since = self._relay_on_since
+        if on_since is not None:
+            self._relay_on_since = None
+            self.relay_on_time += time.monotonic() - on_since
+
     def _simulate_ticks(self, num_ticks):
         """
         Method to simulate encoder ticks while in testing mode.
@@ -895,6 +2374,15 @@ class Dome(object):
         # repeat this loop of driving the mock pins low then high to simulate
         # an encoder tick. Continue until desired number of ticks is reached.
         for tick_count in range(num_ticks):
+            if self._encoder_b_pin is not None:
+                self._simulate_quadrature_cycle()
+                continue
+            if self.simulated_noise is not None:
+                self.simulated_noise.drive(self._encoder_pin, False)
+                time.sleep(self.test_mode_delay_duration)
+                self.simulated_noise.drive(self._encoder_pin, True)
+                time.sleep(self.test_mode_delay_duration)
+                continue
             self._encoder_pin.drive_low()
             # test_mode_delay_duration is set so that it will always exceed
             # the set bounce_time
@@ -903,6 +2391,21 @@ class Dome(object):
             self._encoder_pin.drive_high()
             time.sleep(self.test_mode_delay_duration)
 
+    def _simulate_quadrature_cycle(self):
+        """
+        Method to simulate one cycle of a quadrature encoder in testing mode.
+        """
+        direction = self.current_direction
+        if direction == Direction.NONE:
+            direction = self.last_direction
+        pins = {'A': self._encoder_pin, 'B': self._encoder_b_pin}
+        for channel, level in quadrature_sequence(direction):
+            if level:
+                pins[channel].drive_high()
+            else:
+                pins[channel].drive_low()
+            time.sleep(self.test_mode_delay_duration / 2)
+
     def _simulate_rotation(self, ticks_per_rotation=10):
         """
         Method to simulate a complete dome rotation while in testing mode.
@@ -917,7 +2420,7 @@ class Dome(object):
         self._home_sensor_pin.drive_high()
         self._simulated_rotation_event.clear()
 
-    def _change_led_state(self, desired_state, leds=[]):  # pragma: no cover
+    def _change_led_state(self, desired_state, leds=[]):
         """
         Method of turning a set of debugging LEDs on
 
@@ -930,24 +2433,42 @@ class Dome(object):
             List of LED_Lights enums to indicate which LEDs to turn on.
 
         """
-        # pass a list of strings of the leds to turn on
-        if not(self.debug_lights):
-            return
-        if leds is []:
-            # if leds is an empty list do nothing
-            return None
-
+        mask = 0
         for led in leds:
-            if desired_state == 1:
-                self.led_status |= led
-            elif desired_state == 0:
-                self.led_status &= ~led
-        # pass the new binary int to LED controller
-        sn3218.enable_leds(self.led_status.value)
+            mask |= led.value
+        if desired_state == 1:
+            self._set_leds(on=mask)
+        elif desired_state == 0:
+            self._set_leds(off=mask)
+
+    def _set_leds(self, on=0, off=0):
+        """
+        Update the debugging LEDs with integer bitmasks.
+
+        The update is merged into the LED state and written to the
+        AutomationHAT by the LED controller (at most led_refresh_rate times a
+        second), so it is cheap enough for the encoder callbacks.
+
+        Parameters
+        ----------
+        on : int
+            Bitmask of LEDs to turn on.
+        off : int
+            Bitmask of LEDs to turn off.
+
+        """
+        if self._leds is None:
+            return
+        self._leds.update(on, off)
 
-    def _turn_off_input_1_led(self):
+    def _turn_off_input_1_led(self, edge_time=None):
         """
         Call back function for encoder pin, turns the status led off when
         encoder pin is deactivated.
         """
-        self._change_led_state(0, leds=[LED_Lights.INPUT_1])
+        if edge_time is None:
+            edge_time = time.monotonic()
+        self._journal_record(JournalEvent.ENCODER_EDGE, edge_time, state=0)
+        # the deactivation isn't counted but restarts the stability window
+        self._encoder_debouncer.accept(edge_time, count=False)
+        self._set_leds(off=_INPUT_1)
@@ -0,0 +1,157 @@
+"""Decoding of dome encoder edges."""
+
+
+from collections import deque
+
+from domehunter.enumerations import Direction
+
+# Quadrature encoder states are (A << 1) | B. Rotating clockwise, channel A
+# leads channel B and the states follow the gray code sequence
+# 00 -> 10 -> 11 -> 01 -> 00.
+_CW_SEQUENCE = (0b00, 0b10, 0b11, 0b01)
+
+
+def _build_quadrature_table():
+    table = [0] * 16
+    for i, state in enumerate(_CW_SEQUENCE):
+        next_state = _CW_SEQUENCE[(i + 1) % 4]
+        table[state << 2 | next_state] = Direction.CW.value
+        table[next_state << 2 | state] = Direction.CCW.value
+    return tuple(table)
+
+
+# indexed by (previous_state << 2) | state, gives the signed count step
+QUADRATURE_TABLE = _build_quadrature_table()
+
+
+def quadrature_state(a_active, b_active):
+    """Return the quadrature state for the levels of channels A and B."""
+    return (int(a_active) << 1) | int(b_active)
+
+
+def quadrature_step(previous_state, state):
+    """Decode the count step between two quadrature states.
+
+    Parameters
+    ----------
+    previous_state : int
+        Quadrature state before the edge.
+    state : int
+        Quadrature state after the edge.
+
+    Returns
+    -------
+    int
+        +1 for a clockwise step, -1 for a counterclockwise step and 0 if the
+        state is unchanged or both channels changed (a missed edge).
+
+    """
+    return QUADRATURE_TABLE[previous_state << 2 | state]
+
+
+def quadrature_sequence(direction):
+    """Return the (channel, level) edges for one encoder cycle.
+
+    Parameters
+    ----------
+    direction : Direction
+        Direction of rotation to simulate.
+
+    Returns
+    -------
+    list
+        List of (channel, level) tuples, where channel is 'A' or 'B', that
+        take the encoder from state 00 through a full cycle back to 00.
+
+    """
+    if direction == Direction.CCW:
+        return [('B', True), ('A', True), ('B', False), ('A', False)]
+    return [('A', True), ('B', True), ('A', False), ('B', False)]
+
+
+class EdgeDebouncer(object):
+    """
+    Software debounce filter working on encoder edge timestamps.
+
+    A counted edge is only accepted if the input has been stable, ie there
+    has been no raw edge of either level, for the debounce window before it,
+    and it isn't within the window of the last counted edge. The window is
+    the larger of a fixed minimum interval and a fraction of the expected
+    interval between counted edges, the median of the last few accepted
+    intervals. The window therefore widens when the dome turns slowly
+    (rejecting more contact bounce) and narrows at high speed so legitimate
+    edges aren't dropped.
+
+    Parameters
+    ----------
+    min_interval : float
+        Minimum debounce window in seconds.
+    adaptive_fraction : float
+        Fraction of the expected interval between counted edges used as the
+        speed adaptive window, 0 disables it. With a single edge encoder the
+        input is only stable for half an interval, so this must be below 0.5.
+
+    """
+
+    def __init__(self, min_interval=0.0, adaptive_fraction=0.0):
+        self.min_interval = min_interval
+        self.adaptive_fraction = adaptive_fraction
+        self.accepted = 0
+        self.rejected = 0
+        self._last_raw_edge = None
+        self.reset()
+
+    def reset(self):
+        """Forget the counted edge history, eg when the motor is started."""
+        self._last_counted_edge = None
+        self._intervals = deque(maxlen=5)
+        self._expected_interval = None
+
+    @property
+    def window(self):
+        """The current debounce window in seconds."""
+        if not self.adaptive_fraction or self._expected_interval is None:
+            return self.min_interval
+        return max(self.min_interval,
+                   self.adaptive_fraction * self._expected_interval)
+
+    def accept(self, edge_time, count=True):
+        """Decide whether an edge should be counted.
+
+        Parameters
+        ----------
+        edge_time : float
+            Timestamp of the edge in seconds.
+        count : bool
+            False for edges that aren't counted (eg deactivation of a single
+            edge encoder), these only restart the stability window.
+
+        Returns
+        -------
+        bool
+            True if a counted edge is accepted, always False if count=False.
+
+        """
+        last_raw_edge = self._last_raw_edge
+        self._last_raw_edge = edge_time
+        if not count:
+            return False
+        window = self.window
+        last_counted_edge = self._last_counted_edge
+        if ((last_raw_edge is not None
+                and edge_time - last_raw_edge < window)
+                or (last_counted_edge is not None
+                    and edge_time - last_counted_edge < window)):
+            self.rejected += 1
+            return False
+        if last_counted_edge is not None:
+            intervals = self._intervals
+            intervals.append(edge_time - last_counted_edge)
+            if len(intervals) >= 3:
+                # the median isn't thrown off by an accepted bounce or a
+                # rejected legitimate edge
+                self._expected_interval = sorted(intervals)[
+                    len(intervals) // 2]
+        self._last_counted_edge = edge_time
+        self.accepted += 1
+        return True
@@ -99,3 +99,69 @@ class ReturnCode(Enum):
 
     # |Unknown command.|
     ERR_UNKNOWNCMD = 303
+
+
+class MoveResult(Enum):
+    # the dome movement monitor is still running
+    IN_PROGRESS = 0
+    # the dome reached the target
+    COMPLETE = 1
+    # the movement was aborted
+    ABORTED = 2
+    # no encoder tick within the stall time, the dome is jammed or the
+    # encoder isn't connected
+    STALLED = 3
+    # the movement took longer than its deadline or wait_timeout
+    TIMEOUT = 4
+
+    @property
+    def return_code(self):
+        """The ReturnCode to report to TheSkyX for this result."""
+        return _MOVE_RETURN_CODES[self]
+
+
+_MOVE_RETURN_CODES = {
+    MoveResult.IN_PROGRESS: ReturnCode.ERR_COMMANDINPROGRESS,
+    MoveResult.COMPLETE: ReturnCode.SB_OK,
+    MoveResult.ABORTED: ReturnCode.ERR_ABORTEDPROCESS,
+    MoveResult.STALLED: ReturnCode.ERR_NORESPONSE,
+    MoveResult.TIMEOUT: ReturnCode.ERR_RXTIMEOUT,
+}
+
+
+class JournalEvent(IntEnum):
+    # raw encoder edge before debouncing: state is the level, or the
+    # quadrature state with code QUADRATURE_EDGE for a quadrature encoder
+    ENCODER_EDGE = 1
+    # encoder step counted: state is the step, count the count after it
+    ENCODER_COUNT = 2
+    # raw home sensor edge before debouncing: state is the level
+    HOME_EDGE = 3
+    # encoder count zeroed passing home: value is the count before
+    HOME_ZERO = 4
+    # rotation relay switched: state 1 on, 0 off
+    ROTATION_RELAY = 5
+    # direction relay set: state is the Direction
+    DIRECTION_RELAY = 6
+    # command accepted: code is the DomeCommand, value its azimuth if any,
+    # state 1 for a planner pre-rotation
+    COMMAND = 7
+    # movement monitor finished: code is the DomeCommand, state the
+    # MoveResult value
+    MOVE_END = 8
+
+
+# JournalEvent.ENCODER_EDGE code of a quadrature encoder edge
+QUADRATURE_EDGE = 2
+
+
+class DomeCommand(IntEnum):
+    NONE = 0
+    GOTO = 1
+    FIND_HOME = 2
+    CALIBRATE = 3
+    PARK = 4
+    UNPARK = 5
+    ABORT = 6
+    SYNC = 7
+    SEQUENCE = 8
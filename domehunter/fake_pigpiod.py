@@ -0,0 +1,258 @@
+"""A minimal fake pigpio daemon, for testing pigpio code without a Pi.
+
+Implements enough of the pigpiod socket protocol for the `pigpio` Python
+module to connect, configure inputs, read levels and receive level change
+notifications. Levels are changed with `FakePigpioDaemon.set_level`, or the
+`FakePigpioPin` objects returned by `FakePigpioDaemon.pin`, which mimic the
+drive_high/drive_low interface of gpiozero mock pins. Like the real daemon,
+notification reports carry a microsecond tick and are sent in batches.
+"""
+
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+from contextlib import suppress
+
+# pigpiod command numbers, see pigpio.py
+_PI_CMD_MODES = 0
+_PI_CMD_MODEG = 1
+_PI_CMD_PUD = 2
+_PI_CMD_READ = 3
+_PI_CMD_WRITE = 4
+_PI_CMD_BR1 = 10
+_PI_CMD_TICK = 16
+_PI_CMD_HWVER = 17
+_PI_CMD_NB = 19
+_PI_CMD_NC = 21
+_PI_CMD_FG = 97
+_PI_CMD_NOIB = 99
+
+# a Raspberry Pi 3 Model B
+_HARDWARE_REVISION = 0xa02082
+
+_COMMAND = struct.Struct('IIII')
+_REPORT = struct.Struct('HHII')
+
+
+class _Notifier(object):
+    """A notification socket and the reports waiting to be sent on it."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.bits = 0
+        self.seq = 0
+        self.pending = []
+
+
+class _CommandHandler(socketserver.BaseRequestHandler):
+    """Handles the commands sent on one pigpio socket."""
+
+    def handle(self):
+        daemon = self.server.fake_daemon
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            data = _recv_exactly(sock, _COMMAND.size)
+            if data is None:
+                break
+            cmd, p1, p2, p3 = _COMMAND.unpack(data)
+            if cmd == _PI_CMD_NC and daemon.is_notifier(p1, sock):
+                # the notification thread closing itself, no reply expected
+                daemon.close_notifier(p1)
+                break
+            result = daemon.command(cmd, p1, p2, sock)
+            sock.sendall(_COMMAND.pack(cmd, p1, p2, result & 0xFFFFFFFF))
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        try:
+            chunk = sock.recv(size - len(data))
+        except OSError:
+            return None
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakePigpioPin(object):
+    """A GPIO on the fake daemon with a gpiozero MockPin style interface."""
+
+    def __init__(self, daemon, gpio):
+        self._daemon = daemon
+        self.gpio = gpio
+
+    @property
+    def state(self):
+        return self._daemon.read(self.gpio)
+
+    def drive_high(self):
+        self._daemon.set_level(self.gpio, 1)
+
+    def drive_low(self):
+        self._daemon.set_level(self.gpio, 0)
+
+
+class FakePigpioDaemon(object):
+    """
+    Fake pigpio daemon listening on a local TCP port.
+
+    Parameters
+    ----------
+    host : str
+        Address to bind to.
+    port : int
+        Port to listen on, 0 picks a free port (see the port attribute).
+    batch_interval : float
+        Interval in seconds between sending batches of notification reports.
+    start_tick : int
+        Daemon tick at the start, eg just before the tick wraps.
+
+    """
+
+    def __init__(self, host='localhost', port=0, batch_interval=0.001,
+                 start_tick=0):
+        self.batch_interval = batch_interval
+        self.start_tick = start_tick
+        self._server = _Server((host, port), _CommandHandler)
+        self._server.fake_daemon = self
+        self.host, self.port = self._server.server_address[:2]
+        self._lock = threading.Lock()
+        self._levels = 0
+        self._modes = dict()
+        self._notifiers = dict()
+        self._next_handle = 0
+        self._start = time.monotonic()
+        self._running = threading.Event()
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """Start serving and sending notifications."""
+        self._running.set()
+        for target, name in ((self._server.serve_forever, 'fake-pigpiod'),
+                             (self._send_reports, 'fake-pigpiod-notify')):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop the daemon and close all connections."""
+        self._running.clear()
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            for notifier in self._notifiers.values():
+                with suppress(OSError):
+                    notifier.sock.close()
+            self._notifiers.clear()
+        for thread in self._threads:
+            thread.join()
+
+    def tick(self):
+        """Return the current daemon tick in microseconds (wraps at 2**32)."""
+        return (self.start_tick
+                + int((time.monotonic() - self._start) * 1e6)) & 0xFFFFFFFF
+
+    def monotonic(self, tick):
+        """Convert a (recent) daemon tick to a time.monotonic() time."""
+        elapsed = (self.tick() - tick) & 0xFFFFFFFF
+        return time.monotonic() - elapsed * 1e-6
+
+    def pin(self, gpio):
+        """Return a FakePigpioPin for a GPIO."""
+        return FakePigpioPin(self, gpio)
+
+    def read(self, gpio):
+        """Return the level of a GPIO."""
+        return (self._levels >> gpio) & 1
+
+    def set_level(self, gpio, level):
+        """Set the level of a GPIO and queue notification reports.
+
+        Returns
+        -------
+        int
+            The daemon tick of the level change.
+
+        """
+        with self._lock:
+            tick = self.tick()
+            bit = 1 << gpio
+            levels = self._levels | bit if level else self._levels & ~bit
+            if levels == self._levels:
+                return tick
+            self._levels = levels
+            for notifier in self._notifiers.values():
+                if notifier.bits & bit:
+                    notifier.pending.append(
+                        _REPORT.pack(notifier.seq, 0, tick, levels))
+                    notifier.seq = (notifier.seq + 1) & 0xFFFF
+        return tick
+
+    def is_notifier(self, handle, sock):
+        notifier = self._notifiers.get(handle)
+        return notifier is not None and notifier.sock is sock
+
+    def close_notifier(self, handle):
+        with self._lock:
+            self._notifiers.pop(handle, None)
+
+    def command(self, cmd, p1, p2, sock):
+        """Run a pigpiod command, returning the result."""
+        if cmd == _PI_CMD_MODES:
+            self._modes[p1] = p2
+        elif cmd == _PI_CMD_MODEG:
+            return self._modes.get(p1, 0)
+        elif cmd == _PI_CMD_READ:
+            return self.read(p1)
+        elif cmd == _PI_CMD_WRITE:
+            self.set_level(p1, p2)
+        elif cmd == _PI_CMD_BR1:
+            return self._levels
+        elif cmd == _PI_CMD_TICK:
+            return self.tick()
+        elif cmd == _PI_CMD_HWVER:
+            return _HARDWARE_REVISION
+        elif cmd == _PI_CMD_NOIB:
+            with self._lock:
+                handle = self._next_handle
+                self._next_handle += 1
+                self._notifiers[handle] = _Notifier(sock)
+            return handle
+        elif cmd == _PI_CMD_NB:
+            with self._lock:
+                self._notifiers[p1].bits = p2
+        elif cmd == _PI_CMD_NC:
+            self.close_notifier(p1)
+        # pull up/down, glitch filter and anything else are accepted
+        return 0
+
+    def _send_reports(self):
+        while self._running.is_set():
+            time.sleep(self.batch_interval)
+            with self._lock:
+                batches = [(notifier.sock, b''.join(notifier.pending))
+                           for notifier in self._notifiers.values()
+                           if notifier.pending]
+                for notifier in self._notifiers.values():
+                    notifier.pending = []
+            for sock, batch in batches:
+                with suppress(OSError):
+                    sock.sendall(batch)
@@ -1,4 +1,6 @@
 import argparse
+import queue
+import signal
 import time
 import os.path
 from concurrent import futures
@@ -7,8 +9,13 @@ import grpc
 
 import hx2dome_pb2
 import hx2dome_pb2_grpc
+from domehunter.diagnostics import Diagnostics, thread_dump
 from domehunter.dome_control import Dome, load_dome_config
 from domehunter.logging import set_up_logger
+from domehunter.metrics import MetricsServer
+from domehunter.planner import PlannedTarget
+from domehunter.rpc_stats import RpcStats, StatsInterceptor
+from domehunter.sequence import Waypoint
 
 _ONE_DAY_IN_SECONDS = 60 * 60 * 24
 
@@ -28,6 +35,12 @@ _ONE_DAY_IN_SECONDS = 60 * 60 * 24
 # dapiIsUnparkComplete    (google.protobuf.Empty)   returns   (IsComplete) {};
 # dapiIsFindHomeComplete  (google.protobuf.Empty)   returns   (IsComplete) {};
 # dapiSync                (AzEl)                    returns   (ReturnCode) {};
+# SubmitPlan              (Plan)                    returns   (ReturnCode) {};
+# RunSequence             (Sequence)        returns   (stream SequenceStep) {};
+# GetServerStats          (Empty)                   returns   (ServerStats) {};
+# GetTraces               (TraceQuery)              returns   (TraceList)  {};
+# DumpThreads             (Empty)             returns   (DiagnosticsReport) {};
+# Profile                 (ProfileRequest)    returns   (DiagnosticsReport) {};
 
 
 class HX2DomeServer(hx2dome_pb2_grpc.HX2DomeServicer):
@@ -50,6 +63,10 @@ class HX2DomeServer(hx2dome_pb2_grpc.HX2DomeServicer):
         This the object that represents the Huntsman Dome as controlled via a
         raspberryPi and an automationHAT. It can also be initialised in a
         testing mode with simulated hardware.
+    stats : RpcStats
+        RPC latency statistics, recorded by a StatsInterceptor on the server.
+    diagnostics : Diagnostics
+        Writes thread dumps and profiles to the log directory.
 
     """
 
@@ -59,8 +76,30 @@ class HX2DomeServer(hx2dome_pb2_grpc.HX2DomeServicer):
         self.dome = Dome(home_az, **kwargs)
         self.logger = logger
         self.server_testing = kwargs['server_testing']
+        self.stats = RpcStats()
+        self.diagnostics = Diagnostics(self.dome, logger)
         self.logger.notice('Dome server initialised.')
 
+    def _move_return_code(self, is_complete):
+        """Return code for the last dome movement once it has finished.
+
+        Parameters
+        ----------
+        is_complete : bool
+            Whether the movement has finished.
+
+        Returns
+        -------
+        int
+            0 while the movement is in progress or if it succeeded, else the
+            ReturnCode value for the stall, timeout or abort that ended it.
+
+        """
+        result = self.dome.last_move_result
+        if not is_complete or result is None:
+            return 0
+        return result.return_code.value
+
     def dapiGetAzEl(self, request, context):
         """TheSkyX RPC to query the dome azimuth and slit position of the
         observatory.
@@ -136,7 +175,7 @@ class HX2DomeServer(hx2dome_pb2_grpc.HX2DomeServicer):
         else:
             return_code = 0
             try:
-                self.dome.goto_az(request.az)
+                self.dome.goto_az(request.az, el=request.el)
             except Exception:
                 # TODO: proper error handling
                 return_code = 1
@@ -349,7 +388,8 @@ class HX2DomeServer(hx2dome_pb2_grpc.HX2DomeServicer):
             # TODO: better method of determine command completion
             is_complete = not is_dome_moving
             response = hx2dome_pb2.IsComplete(
-                return_code=0, is_complete=is_complete)
+                return_code=self._move_return_code(is_complete),
+                is_complete=is_complete)
         return response
 
     def dapiIsOpenComplete(self, request, context):
@@ -488,8 +528,12 @@ class HX2DomeServer(hx2dome_pb2_grpc.HX2DomeServicer):
             # lets just consider the command complete
             # TODO: better method of determine command completion
             is_complete = not is_dome_moving and not self.dome._unhomed
+            return_code = self._move_return_code(not is_dome_moving)
+            if return_code:
+                # a stalled or timed out homing will never complete
+                is_complete = True
             response = hx2dome_pb2.IsComplete(
-                return_code=0, is_complete=is_complete)
+                return_code=return_code, is_complete=is_complete)
         return response
 
     def dapiSync(self, request, context):
@@ -529,27 +573,299 @@ class HX2DomeServer(hx2dome_pb2_grpc.HX2DomeServicer):
             )
         return response
 
+    def SubmitPlan(self, request, context):
+        """RPC to submit the upcoming targets, so the dome can be
+        pre-positioned for the next target during each exposure.
+
+        Parameters
+        ----------
+        request : Plan
+            Incoming rpc request, a message of type 'Plan' containing the
+            dome azimuth, elevation and expected start time of each target.
+            An empty plan clears the current plan.
+        context : Dunno
+            GRPC magic thingy.
+
+        Returns
+        -------
+        ReturnCode
+            rpc response, a message of type 'ReturnCode' that indicates the
+            success/failure of the rpc request.
+
+        """
+        self.logger.notice(
+            f'Receiving: SubmitPlan with {len(request.targets)} targets')
+        if self.server_testing:
+            response = hx2dome_pb2.ReturnCode(return_code=0)
+        else:
+            return_code = 0
+            try:
+                self.dome.submit_plan(
+                    [PlannedTarget(target.az, target.start_time,
+                                   el=target.el, name=target.name)
+                     for target in request.targets])
+            except Exception:
+                self.logger.exception('SubmitPlan failed.')
+                return_code = 1
+            response = hx2dome_pb2.ReturnCode(return_code=return_code)
+        self.logger.notice(f'Sending: SubmitPlan complete,'
+                           f' return code={response.return_code}\n')
+        return response
+
+    def RunSequence(self, request, context):
+        """RPC to run a waypoint sequence on the dome, eg for a dome flat
+        scan, streaming a message as each waypoint is reached.
+
+        Parameters
+        ----------
+        request : Sequence
+            Incoming rpc request, a message of type 'Sequence' containing the
+            azimuth, dwell time and tolerance of each waypoint.
+        context : Dunno
+            GRPC magic thingy.
+
+        Yields
+        ------
+        SequenceStep
+            rpc response stream, a message of type 'SequenceStep' for each
+            step of the sequence. The stream ends after the last waypoint or
+            the first step with a non-zero return code. Cancelling the rpc
+            stops the sequence.
+
+        """
+        self.logger.notice(
+            f'Receiving: RunSequence with {len(request.waypoints)} waypoints')
+        if self.server_testing:
+            for index, waypoint in enumerate(request.waypoints):
+                yield hx2dome_pb2.SequenceStep(index=index,
+                                               return_code=0,
+                                               az=waypoint.az,
+                                               dome_az=waypoint.az)
+            return
+        steps = queue.Queue()
+        waypoints = [Waypoint(waypoint.az, waypoint.dwell,
+                              waypoint.tolerance or None)
+                     for waypoint in request.waypoints]
+        try:
+            thread = self.dome.run_sequence(waypoints, callback=steps.put)
+        except Exception:
+            self.logger.exception('RunSequence failed to start.')
+            thread = None
+        if thread is None:
+            yield hx2dome_pb2.SequenceStep(index=-1, return_code=1)
+            return
+        try:
+            while thread.is_alive() or not steps.empty():
+                if not context.is_active():
+                    break
+                try:
+                    step = steps.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                response = hx2dome_pb2.SequenceStep(
+                    index=step['index'],
+                    return_code=step['result'].return_code.value,
+                    az=step['az'],
+                    dome_az=step['dome_az'],
+                    elapsed=step['elapsed'],
+                    motor_running=step['motor_running'])
+                self.logger.info(f'Sending: SequenceStep {response.index},'
+                                 f' return code={response.return_code}')
+                yield response
+        finally:
+            # the client has gone, or the sequence ended
+            if thread.is_alive():
+                self.logger.warning('RunSequence cancelled, stopping.')
+                self.dome.stop_sequence()
+        self.logger.notice('Sending: RunSequence complete\n')
+
+    def GetServerStats(self, request, context):
+        """RPC to request the latency statistics of each RPC.
 
-def serve(home_az, logger, **kwargs):
+        Parameters
+        ----------
+        request : Empty
+            Incoming rpc request, a message of type 'Empty'.
+        context : Dunno
+            GRPC magic thingy.
+
+        Returns
+        -------
+        ServerStats
+            rpc response, a message of type 'ServerStats' with the server
+            uptime and, for each RPC called so far, summaries of the time
+            calls waited for a worker thread and spent in the handler, and
+            the number of calls by return code.
+
+        """
+        self.logger.info('Receiving: GetServerStats request')
+        response = hx2dome_pb2.ServerStats(
+            uptime=time.time() - self.stats.started)
+        for method, stats in self.stats.summary().items():
+            rpc = response.rpcs.add(method=method)
+            for field in ('queue', 'handler'):
+                # empty histogram entries are None, sent as 0
+                getattr(rpc, field).CopyFrom(hx2dome_pb2.LatencySummary(
+                    **{key: value or 0
+                       for key, value in stats[field].items()}))
+            for return_code, count in stats['return_codes'].items():
+                if return_code is None:
+                    rpc.errors = count
+                else:
+                    rpc.return_codes[return_code] = count
+        return response
+
+    def GetTraces(self, request, context):
+        """RPC to request the trace spans of recent dome commands.
+
+        Parameters
+        ----------
+        request : TraceQuery
+            Incoming rpc request, a message of type 'TraceQuery' with an
+            optional trace id to select a single command and a limit on the
+            number of spans.
+        context : Dunno
+            GRPC magic thingy.
+
+        Returns
+        -------
+        TraceList
+            rpc response, a message of type 'TraceList' with the finished and
+            active spans, oldest first.
+
+        """
+        self.logger.info('Receiving: GetTraces request')
+        response = hx2dome_pb2.TraceList()
+        for span in self.dome.tracer.spans(trace_id=request.trace_id,
+                                           limit=request.limit):
+            message = response.spans.add(trace_id=span['trace_id'],
+                                         span_id=span['span_id'],
+                                         parent_id=span['parent_id'] or '',
+                                         name=span['name'],
+                                         start=span['start'],
+                                         end=span['end'] or 0,
+                                         wall_start=span['wall_start'])
+            for key, value in span['attributes'].items():
+                message.attributes[key] = str(value)
+            for event in span['events']:
+                event_message = message.events.add(name=event['name'],
+                                                   offset=event['offset'])
+                for key, value in event['attributes'].items():
+                    event_message.attributes[key] = str(value)
+        return response
+
+    def DumpThreads(self, request, context):
+        """RPC to write a dump of the stack of every thread and the dome
+        state to the log directory.
+
+        Parameters
+        ----------
+        request : Empty
+            Incoming rpc request, a message of type 'Empty'.
+        context : Dunno
+            GRPC magic thingy.
+
+        Returns
+        -------
+        DiagnosticsReport
+            rpc response, a message of type 'DiagnosticsReport' with the path
+            of the file written and the thread dump.
+
+        """
+        self.logger.notice('Receiving: DumpThreads request')
+        return_code = 0
+        path = ''
+        try:
+            path = self.diagnostics.dump_threads()
+            with open(path) as f:
+                report = f.read()
+        except Exception:
+            self.logger.exception('Writing the thread dump failed.')
+            return_code = 1
+            report = thread_dump(self.dome)
+        return hx2dome_pb2.DiagnosticsReport(return_code=return_code,
+                                             path=path,
+                                             report=report)
+
+    def Profile(self, request, context):
+        """RPC to profile the server by sampling the stacks of all threads
+        for a time, writing the profile to the log directory.
+
+        Parameters
+        ----------
+        request : ProfileRequest
+            Incoming rpc request, a message of type 'ProfileRequest' with the
+            time to profile for (at most 10 minutes) and the interval between
+            samples, in seconds.
+        context : Dunno
+            GRPC magic thingy.
+
+        Returns
+        -------
+        DiagnosticsReport
+            rpc response, a message of type 'DiagnosticsReport' with the path
+            the profile will be written to once it finishes. The return code
+            is 1 if a profile is already running.
+
+        """
+        self.logger.notice(
+            f'Receiving: Profile request for {request.duration:.0f}s')
+        path = self.diagnostics.profile(request.duration or 30.0,
+                                        request.interval or 0.01)
+        return hx2dome_pb2.DiagnosticsReport(return_code=int(path is None),
+                                             path=path or '')
+
+
+def serve(home_az, logger, stats_log_interval=600, metrics_port=9102,
+          **kwargs):
     """Set up the RPC server to run for a day or until interrupted.
 
     Parameters
     ----------
+    stats_log_interval : float
+        Interval in seconds between logging the RPC latency statistics,
+        None to not log them.
+    metrics_port : int
+        Port on localhost to serve Prometheus metrics on, None to disable.
     kwargs_dict : dict
         Dictionary of boolean keyword args to pass to rpc server object.
 
     """
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    hx2dome_pb2_grpc.add_HX2DomeServicer_to_server(
-        HX2DomeServer(home_az, logger, **kwargs), server)
+    servicer = HX2DomeServer(home_az, logger, **kwargs)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         interceptors=[StatsInterceptor(
+                             servicer.stats, tracer=servicer.dome.tracer)])
+    hx2dome_pb2_grpc.add_HX2DomeServicer_to_server(servicer, server)
     server.add_insecure_port('[::]:50051')
     server.start()
+    # SIGUSR1 dumps the threads and SIGUSR2 profiles the server
+    servicer.diagnostics.install_signal_handlers()
+    # SIGTERM shuts down as for a keyboard interrupt
+    signal.signal(signal.SIGTERM, _interrupt)
+    metrics = None
+    if metrics_port is not None:
+        metrics = MetricsServer(servicer.dome, servicer.stats,
+                                port=metrics_port)
+        metrics.start()
+        logger.notice(f'Serving metrics on localhost:{metrics.port}.')
     try:
         while True:
-            time.sleep(_ONE_DAY_IN_SECONDS)
+            if not stats_log_interval:
+                time.sleep(_ONE_DAY_IN_SECONDS)
+                continue
+            time.sleep(stats_log_interval)
+            servicer.stats.log_summary(logger)
     except KeyboardInterrupt:
         logger.critical('Keyboard Interrupt, closing up shop.')
+        if metrics is not None:
+            metrics.stop()
         server.stop(0)
+        servicer.dome.close()
+
+
+def _interrupt(signum, frame):
+    """Signal handler raising KeyboardInterrupt in the main thread."""
+    raise KeyboardInterrupt
 
 
 if __name__ == '__main__':
@@ -614,6 +930,8 @@ if __name__ == '__main__':
     # extract the logfile and stderr log levels from kwargs, default to 'DEBUG'
     server_log_file_level = kwargs.pop('server_log_file_level', 'DEBUG')
     server_log_stderr_level = kwargs.pop('server_log_stderr_level', 'DEBUG')
+    stats_log_interval = kwargs.pop('stats_log_interval', 600)
+    metrics_port = kwargs.pop('metrics_port', 9102)
     if home_az is None:
         raise ValueError(
             "Dome instance requires a home azimuth, none provided.")
@@ -624,4 +942,5 @@ if __name__ == '__main__':
                            log_stderr_level=server_log_stderr_level,
                            logo=False)
     logger.notice('Serving up some dome pi.')
-    serve(home_az, logger, **kwargs)
+    serve(home_az, logger, stats_log_interval=stats_log_interval,
+          metrics_port=metrics_port, **kwargs)
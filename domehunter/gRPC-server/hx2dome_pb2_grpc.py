@@ -1,369 +1,896 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
 import grpc
 
 import hx2dome_pb2 as hx2dome__pb2
 
 
 class HX2DomeStub(object):
-  # missing associated documentation comment in .proto file
-  pass
-
-  def __init__(self, channel):
-    """Constructor.
-
-    Args:
-      channel: A grpc.Channel.
-    """
-    self.dapiGetAzEl = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiGetAzEl',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.AzEl.FromString,
-        )
-    self.dapiGotoAzEl = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiGotoAzEl',
-        request_serializer=hx2dome__pb2.AzEl.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.dapiAbort = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiAbort',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.dapiOpen = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiOpen',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.dapiClose = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiClose',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.dapiPark = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiPark',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.dapiUnpark = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiUnpark',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.dapiFindHome = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiFindHome',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.dapiIsGotoComplete = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiIsGotoComplete',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.IsComplete.FromString,
-        )
-    self.dapiIsOpenComplete = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiIsOpenComplete',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.IsComplete.FromString,
-        )
-    self.dapiIsCloseComplete = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiIsCloseComplete',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.IsComplete.FromString,
-        )
-    self.dapiIsParkComplete = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiIsParkComplete',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.IsComplete.FromString,
-        )
-    self.dapiIsUnparkComplete = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiIsUnparkComplete',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.IsComplete.FromString,
-        )
-    self.dapiIsFindHomeComplete = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiIsFindHomeComplete',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.IsComplete.FromString,
-        )
-    self.dapiSync = channel.unary_unary(
-        '/hx2dome.HX2Dome/dapiSync',
-        request_serializer=hx2dome__pb2.AzEl.SerializeToString,
-        response_deserializer=hx2dome__pb2.ReturnCode.FromString,
-        )
-    self.deviceInfoNameShort = channel.unary_unary(
-        '/hx2dome.HX2Dome/deviceInfoNameShort',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.BasicString.FromString,
-        )
-    self.deviceInfoNameLong = channel.unary_unary(
-        '/hx2dome.HX2Dome/deviceInfoNameLong',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.BasicString.FromString,
-        )
-    self.deviceInfoDetailedDescription = channel.unary_unary(
-        '/hx2dome.HX2Dome/deviceInfoDetailedDescription',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.BasicString.FromString,
-        )
-    self.deviceInfoFirmwareVersion = channel.unary_unary(
-        '/hx2dome.HX2Dome/deviceInfoFirmwareVersion',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.BasicString.FromString,
-        )
-    self.deviceInfoModel = channel.unary_unary(
-        '/hx2dome.HX2Dome/deviceInfoModel',
-        request_serializer=hx2dome__pb2.Empty.SerializeToString,
-        response_deserializer=hx2dome__pb2.BasicString.FromString,
-        )
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.dapiGetAzEl = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiGetAzEl',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.AzEl.FromString,
+                )
+        self.dapiGotoAzEl = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiGotoAzEl',
+                request_serializer=hx2dome__pb2.AzEl.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.dapiAbort = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiAbort',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.dapiOpen = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiOpen',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.dapiClose = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiClose',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.dapiPark = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiPark',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.dapiUnpark = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiUnpark',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.dapiFindHome = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiFindHome',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.dapiIsGotoComplete = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiIsGotoComplete',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.IsComplete.FromString,
+                )
+        self.dapiIsOpenComplete = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiIsOpenComplete',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.IsComplete.FromString,
+                )
+        self.dapiIsCloseComplete = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiIsCloseComplete',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.IsComplete.FromString,
+                )
+        self.dapiIsParkComplete = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiIsParkComplete',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.IsComplete.FromString,
+                )
+        self.dapiIsUnparkComplete = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiIsUnparkComplete',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.IsComplete.FromString,
+                )
+        self.dapiIsFindHomeComplete = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiIsFindHomeComplete',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.IsComplete.FromString,
+                )
+        self.dapiSync = channel.unary_unary(
+                '/hx2dome.HX2Dome/dapiSync',
+                request_serializer=hx2dome__pb2.AzEl.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.deviceInfoNameShort = channel.unary_unary(
+                '/hx2dome.HX2Dome/deviceInfoNameShort',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.BasicString.FromString,
+                )
+        self.deviceInfoNameLong = channel.unary_unary(
+                '/hx2dome.HX2Dome/deviceInfoNameLong',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.BasicString.FromString,
+                )
+        self.deviceInfoDetailedDescription = channel.unary_unary(
+                '/hx2dome.HX2Dome/deviceInfoDetailedDescription',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.BasicString.FromString,
+                )
+        self.deviceInfoFirmwareVersion = channel.unary_unary(
+                '/hx2dome.HX2Dome/deviceInfoFirmwareVersion',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.BasicString.FromString,
+                )
+        self.deviceInfoModel = channel.unary_unary(
+                '/hx2dome.HX2Dome/deviceInfoModel',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.BasicString.FromString,
+                )
+        self.SubmitPlan = channel.unary_unary(
+                '/hx2dome.HX2Dome/SubmitPlan',
+                request_serializer=hx2dome__pb2.Plan.SerializeToString,
+                response_deserializer=hx2dome__pb2.ReturnCode.FromString,
+                )
+        self.RunSequence = channel.unary_stream(
+                '/hx2dome.HX2Dome/RunSequence',
+                request_serializer=hx2dome__pb2.Sequence.SerializeToString,
+                response_deserializer=hx2dome__pb2.SequenceStep.FromString,
+                )
+        self.GetServerStats = channel.unary_unary(
+                '/hx2dome.HX2Dome/GetServerStats',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.ServerStats.FromString,
+                )
+        self.GetTraces = channel.unary_unary(
+                '/hx2dome.HX2Dome/GetTraces',
+                request_serializer=hx2dome__pb2.TraceQuery.SerializeToString,
+                response_deserializer=hx2dome__pb2.TraceList.FromString,
+                )
+        self.DumpThreads = channel.unary_unary(
+                '/hx2dome.HX2Dome/DumpThreads',
+                request_serializer=hx2dome__pb2.Empty.SerializeToString,
+                response_deserializer=hx2dome__pb2.DiagnosticsReport.FromString,
+                )
+        self.Profile = channel.unary_unary(
+                '/hx2dome.HX2Dome/Profile',
+                request_serializer=hx2dome__pb2.ProfileRequest.SerializeToString,
+                response_deserializer=hx2dome__pb2.DiagnosticsReport.FromString,
+                )
 
 
 class HX2DomeServicer(object):
-  # missing associated documentation comment in .proto file
-  pass
-
-  def dapiGetAzEl(self, request, context):
-    """Dome API
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiGotoAzEl(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiAbort(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiOpen(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiClose(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiPark(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiUnpark(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiFindHome(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiIsGotoComplete(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiIsOpenComplete(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiIsCloseComplete(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiIsParkComplete(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiIsUnparkComplete(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiIsFindHomeComplete(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def dapiSync(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def deviceInfoNameShort(self, request, context):
-    """Hardware Info Interface
-    """
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def deviceInfoNameLong(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def deviceInfoDetailedDescription(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def deviceInfoFirmwareVersion(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
-
-  def deviceInfoModel(self, request, context):
-    # missing associated documentation comment in .proto file
-    pass
-    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
-    context.set_details('Method not implemented!')
-    raise NotImplementedError('Method not implemented!')
+    """Missing associated documentation comment in .proto file."""
+
+    def dapiGetAzEl(self, request, context):
+        """Dome API
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiGotoAzEl(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiAbort(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiOpen(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiClose(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiPark(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiUnpark(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiFindHome(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiIsGotoComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiIsOpenComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiIsCloseComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiIsParkComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiIsUnparkComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiIsFindHomeComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dapiSync(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def deviceInfoNameShort(self, request, context):
+        """Hardware Info Interface
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def deviceInfoNameLong(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def deviceInfoDetailedDescription(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def deviceInfoFirmwareVersion(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def deviceInfoModel(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SubmitPlan(self, request, context):
+        """Observation planning, not part of the X2 interface
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RunSequence(self, request, context):
+        """Waypoint sequences run by the dome, streaming each completed step
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetServerStats(self, request, context):
+        """Server diagnostics
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTraces(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DumpThreads(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Profile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
 
 
 def add_HX2DomeServicer_to_server(servicer, server):
-  rpc_method_handlers = {
-      'dapiGetAzEl': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiGetAzEl,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.AzEl.SerializeToString,
-      ),
-      'dapiGotoAzEl': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiGotoAzEl,
-          request_deserializer=hx2dome__pb2.AzEl.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'dapiAbort': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiAbort,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'dapiOpen': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiOpen,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'dapiClose': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiClose,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'dapiPark': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiPark,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'dapiUnpark': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiUnpark,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'dapiFindHome': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiFindHome,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'dapiIsGotoComplete': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiIsGotoComplete,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
-      ),
-      'dapiIsOpenComplete': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiIsOpenComplete,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
-      ),
-      'dapiIsCloseComplete': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiIsCloseComplete,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
-      ),
-      'dapiIsParkComplete': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiIsParkComplete,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
-      ),
-      'dapiIsUnparkComplete': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiIsUnparkComplete,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
-      ),
-      'dapiIsFindHomeComplete': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiIsFindHomeComplete,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
-      ),
-      'dapiSync': grpc.unary_unary_rpc_method_handler(
-          servicer.dapiSync,
-          request_deserializer=hx2dome__pb2.AzEl.FromString,
-          response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
-      ),
-      'deviceInfoNameShort': grpc.unary_unary_rpc_method_handler(
-          servicer.deviceInfoNameShort,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.BasicString.SerializeToString,
-      ),
-      'deviceInfoNameLong': grpc.unary_unary_rpc_method_handler(
-          servicer.deviceInfoNameLong,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.BasicString.SerializeToString,
-      ),
-      'deviceInfoDetailedDescription': grpc.unary_unary_rpc_method_handler(
-          servicer.deviceInfoDetailedDescription,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.BasicString.SerializeToString,
-      ),
-      'deviceInfoFirmwareVersion': grpc.unary_unary_rpc_method_handler(
-          servicer.deviceInfoFirmwareVersion,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.BasicString.SerializeToString,
-      ),
-      'deviceInfoModel': grpc.unary_unary_rpc_method_handler(
-          servicer.deviceInfoModel,
-          request_deserializer=hx2dome__pb2.Empty.FromString,
-          response_serializer=hx2dome__pb2.BasicString.SerializeToString,
-      ),
-  }
-  generic_handler = grpc.method_handlers_generic_handler(
-      'hx2dome.HX2Dome', rpc_method_handlers)
-  server.add_generic_rpc_handlers((generic_handler,))
+    rpc_method_handlers = {
+            'dapiGetAzEl': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiGetAzEl,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.AzEl.SerializeToString,
+            ),
+            'dapiGotoAzEl': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiGotoAzEl,
+                    request_deserializer=hx2dome__pb2.AzEl.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'dapiAbort': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiAbort,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'dapiOpen': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiOpen,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'dapiClose': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiClose,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'dapiPark': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiPark,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'dapiUnpark': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiUnpark,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'dapiFindHome': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiFindHome,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'dapiIsGotoComplete': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiIsGotoComplete,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
+            ),
+            'dapiIsOpenComplete': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiIsOpenComplete,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
+            ),
+            'dapiIsCloseComplete': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiIsCloseComplete,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
+            ),
+            'dapiIsParkComplete': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiIsParkComplete,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
+            ),
+            'dapiIsUnparkComplete': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiIsUnparkComplete,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
+            ),
+            'dapiIsFindHomeComplete': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiIsFindHomeComplete,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.IsComplete.SerializeToString,
+            ),
+            'dapiSync': grpc.unary_unary_rpc_method_handler(
+                    servicer.dapiSync,
+                    request_deserializer=hx2dome__pb2.AzEl.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'deviceInfoNameShort': grpc.unary_unary_rpc_method_handler(
+                    servicer.deviceInfoNameShort,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.BasicString.SerializeToString,
+            ),
+            'deviceInfoNameLong': grpc.unary_unary_rpc_method_handler(
+                    servicer.deviceInfoNameLong,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.BasicString.SerializeToString,
+            ),
+            'deviceInfoDetailedDescription': grpc.unary_unary_rpc_method_handler(
+                    servicer.deviceInfoDetailedDescription,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.BasicString.SerializeToString,
+            ),
+            'deviceInfoFirmwareVersion': grpc.unary_unary_rpc_method_handler(
+                    servicer.deviceInfoFirmwareVersion,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.BasicString.SerializeToString,
+            ),
+            'deviceInfoModel': grpc.unary_unary_rpc_method_handler(
+                    servicer.deviceInfoModel,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.BasicString.SerializeToString,
+            ),
+            'SubmitPlan': grpc.unary_unary_rpc_method_handler(
+                    servicer.SubmitPlan,
+                    request_deserializer=hx2dome__pb2.Plan.FromString,
+                    response_serializer=hx2dome__pb2.ReturnCode.SerializeToString,
+            ),
+            'RunSequence': grpc.unary_stream_rpc_method_handler(
+                    servicer.RunSequence,
+                    request_deserializer=hx2dome__pb2.Sequence.FromString,
+                    response_serializer=hx2dome__pb2.SequenceStep.SerializeToString,
+            ),
+            'GetServerStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetServerStats,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.ServerStats.SerializeToString,
+            ),
+            'GetTraces': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTraces,
+                    request_deserializer=hx2dome__pb2.TraceQuery.FromString,
+                    response_serializer=hx2dome__pb2.TraceList.SerializeToString,
+            ),
+            'DumpThreads': grpc.unary_unary_rpc_method_handler(
+                    servicer.DumpThreads,
+                    request_deserializer=hx2dome__pb2.Empty.FromString,
+                    response_serializer=hx2dome__pb2.DiagnosticsReport.SerializeToString,
+            ),
+            'Profile': grpc.unary_unary_rpc_method_handler(
+                    servicer.Profile,
+                    request_deserializer=hx2dome__pb2.ProfileRequest.FromString,
+                    response_serializer=hx2dome__pb2.DiagnosticsReport.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'hx2dome.HX2Dome', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class HX2Dome(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def dapiGetAzEl(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiGetAzEl',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.AzEl.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiGotoAzEl(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiGotoAzEl',
+            hx2dome__pb2.AzEl.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiAbort(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiAbort',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiOpen(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiOpen',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiClose(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiClose',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiPark(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiPark',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiUnpark(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiUnpark',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiFindHome(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiFindHome',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiIsGotoComplete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiIsGotoComplete',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.IsComplete.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiIsOpenComplete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiIsOpenComplete',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.IsComplete.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiIsCloseComplete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiIsCloseComplete',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.IsComplete.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiIsParkComplete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiIsParkComplete',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.IsComplete.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiIsUnparkComplete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiIsUnparkComplete',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.IsComplete.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiIsFindHomeComplete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiIsFindHomeComplete',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.IsComplete.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dapiSync(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/dapiSync',
+            hx2dome__pb2.AzEl.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def deviceInfoNameShort(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/deviceInfoNameShort',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.BasicString.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def deviceInfoNameLong(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/deviceInfoNameLong',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.BasicString.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def deviceInfoDetailedDescription(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/deviceInfoDetailedDescription',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.BasicString.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def deviceInfoFirmwareVersion(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/deviceInfoFirmwareVersion',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.BasicString.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def deviceInfoModel(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/deviceInfoModel',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.BasicString.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SubmitPlan(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/SubmitPlan',
+            hx2dome__pb2.Plan.SerializeToString,
+            hx2dome__pb2.ReturnCode.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def RunSequence(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/hx2dome.HX2Dome/RunSequence',
+            hx2dome__pb2.Sequence.SerializeToString,
+            hx2dome__pb2.SequenceStep.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetServerStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/GetServerStats',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.ServerStats.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetTraces(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/GetTraces',
+            hx2dome__pb2.TraceQuery.SerializeToString,
+            hx2dome__pb2.TraceList.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DumpThreads(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/DumpThreads',
+            hx2dome__pb2.Empty.SerializeToString,
+            hx2dome__pb2.DiagnosticsReport.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Profile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/hx2dome.HX2Dome/Profile',
+            hx2dome__pb2.ProfileRequest.SerializeToString,
+            hx2dome__pb2.DiagnosticsReport.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,303 @@
+"""Dome azimuth required for a telescope offset from the dome centre.
+
+The dome is modelled as a sphere of radius `dome_radius` centred on the
+origin of a local east, north, up frame. A German equatorial mount has its
+axes intersecting at `mount_offset` from the dome centre, and the optical
+axis is offset from the RA axis by `dec_axis_offset` along the declination
+axis, to one side or the other depending on the pier side. The required
+dome azimuth is the azimuth of the point where the optical axis leaves the
+dome sphere. All lengths are in the same units (eg metres) and all angles
+in degrees.
+"""
+
+
+import math
+
+import numpy as np
+
+
+def altaz_to_hadec(alt, az, latitude):
+    """Convert altitude/azimuth to hour angle/declination.
+
+    Parameters
+    ----------
+    alt, az : array_like
+        Altitude and azimuth (from north through east) in degrees.
+    latitude : float
+        Site latitude in degrees.
+
+    Returns
+    -------
+    ha, dec : numpy.ndarray
+        Hour angle (positive west) and declination in degrees.
+
+    """
+    alt, az, lat = np.deg2rad(alt), np.deg2rad(az), np.deg2rad(latitude)
+    sin_dec = (np.sin(lat) * np.sin(alt)
+               + np.cos(lat) * np.cos(alt) * np.cos(az))
+    ha = np.arctan2(-np.sin(az) * np.cos(alt),
+                    np.cos(lat) * np.sin(alt)
+                    - np.sin(lat) * np.cos(alt) * np.cos(az))
+    return np.rad2deg(ha), np.rad2deg(np.arcsin(np.clip(sin_dec, -1, 1)))
+
+
+def slit_tolerance(el, slit_width, dome_radius, aperture=0.0):
+    """Return the dome azimuth tolerance that keeps a beam in the slit.
+
+    The beam can move (slit_width - aperture) / 2 across the slit, which is
+    asin(((slit_width - aperture) / 2) / (dome_radius * cos(el))) in
+    azimuth, so the tolerance is narrowest at the horizon and widens towards
+    the zenith.
+
+    Parameters
+    ----------
+    el : array_like
+        Elevation of the beam on the dome in degrees.
+    slit_width : float
+        Width of the dome slit.
+    dome_radius : float
+        Radius of the dome, in the same units as slit_width.
+    aperture : float
+        Diameter of the telescope beam at the slit.
+
+    Returns
+    -------
+    numpy.ndarray
+        Azimuth tolerance in degrees, 180 where the whole circle of constant
+        elevation is within the slit.
+
+    """
+    slack = (slit_width - aperture) / 2
+    radius = dome_radius * np.cos(np.deg2rad(el))
+    with np.errstate(divide='ignore'):
+        ratio = np.clip(slack / radius, 0, 1)
+    return np.where(slack >= radius, 180.0, np.rad2deg(np.arcsin(ratio)))
+
+
+def _equatorial_vectors(ha, dec, lat):
+    """Unit vectors (east, north, up) to (ha, dec) and along the dec axis.
+
+    All angles are in radians. The dec axis vector points to the side of
+    the pier the optical axis is on for pier_side=+1 (counterweight down for
+    targets west of the meridian).
+    """
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    cos_ha, sin_ha = np.cos(ha), np.sin(ha)
+    cos_dec, sin_dec = np.cos(dec), np.sin(dec)
+    target = np.stack((-cos_dec * sin_ha,
+                       cos_lat * sin_dec - sin_lat * cos_dec * cos_ha,
+                       sin_lat * sin_dec + cos_lat * cos_dec * cos_ha))
+    # the point on the celestial equator at hour angle ha - 90 degrees
+    dec_axis = np.stack((cos_ha,
+                         -sin_lat * sin_ha,
+                         cos_lat * sin_ha))
+    return target, dec_axis
+
+
+class DomeGeometry(object):
+    """
+    Dome azimuth solver for a German equatorial mount in a dome.
+
+    Parameters
+    ----------
+    latitude : float
+        Site latitude in degrees.
+    dome_radius : float
+        Radius of the dome sphere.
+    mount_offset : tuple
+        (east, north, up) position of the intersection of the mount axes
+        relative to the dome centre.
+    dec_axis_offset : float
+        Distance from the RA axis to the optical axis along the dec axis.
+    slit_width : float
+        Width of the dome slit, None if unknown.
+    aperture : float
+        Diameter of the telescope beam at the slit.
+
+    """
+
+    def __init__(self,
+                 latitude,
+                 dome_radius,
+                 mount_offset=(0.0, 0.0, 0.0),
+                 dec_axis_offset=0.0,
+                 slit_width=None,
+                 aperture=0.0):
+        self.latitude = latitude
+        self.dome_radius = dome_radius
+        self.mount_offset = np.asarray(mount_offset, dtype=float)
+        self.dec_axis_offset = dec_axis_offset
+        self.slit_width = slit_width
+        self.aperture = aperture
+        self._grids = dict()
+
+    def dome_azimuth_hadec(self, ha, dec, pier_side=None):
+        """Return the dome azimuth and slit elevation for hour angle/dec.
+
+        Parameters
+        ----------
+        ha, dec : array_like
+            Hour angle (positive west) and declination in degrees.
+        pier_side : array_like
+            +1 if the optical axis is on the side of the pier that keeps the
+            counterweight down for targets west of the meridian, -1 for the
+            other side. Defaults to the counterweight down side for each
+            target (+1 for ha >= 0, -1 for ha < 0).
+
+        Returns
+        -------
+        az, el : numpy.ndarray
+            Azimuth (from north through east) and elevation in degrees of
+            the point on the dome where the optical axis leaves it.
+
+        """
+        ha = np.asarray(ha, dtype=float)
+        dec = np.asarray(dec, dtype=float)
+        if pier_side is None:
+            pier_side = np.where(ha >= 0, 1.0, -1.0)
+        target, dec_axis = _equatorial_vectors(
+            np.deg2rad(ha), np.deg2rad(dec), np.deg2rad(self.latitude))
+        # position of the optical axis at the dec axis, shape (3, ...)
+        origin = (self.mount_offset.reshape((3,) + (1,) * ha.ndim)
+                  + np.asarray(pier_side) * self.dec_axis_offset * dec_axis)
+        # solve |origin + distance * target| = dome_radius for distance > 0
+        b = np.sum(origin * target, axis=0)
+        c = np.sum(origin * origin, axis=0) - self.dome_radius ** 2
+        distance = -b + np.sqrt(b * b - c)
+        east, north, up = origin + distance * target
+        az = np.rad2deg(np.arctan2(east, north)) % 360
+        el = np.rad2deg(np.arcsin(np.clip(up / self.dome_radius, -1, 1)))
+        return az, el
+
+    def dome_azimuth_altaz(self, alt, az, pier_side=None):
+        """Return the dome azimuth and slit elevation for telescope alt/az.
+
+        Parameters
+        ----------
+        alt, az : array_like
+            Telescope altitude and azimuth in degrees.
+        pier_side : array_like
+            See dome_azimuth_hadec.
+
+        Returns
+        -------
+        az, el : numpy.ndarray
+            Dome azimuth and slit elevation in degrees.
+
+        """
+        ha, dec = altaz_to_hadec(alt, az, self.latitude)
+        return self.dome_azimuth_hadec(ha, dec, pier_side=pier_side)
+
+    def slit_tolerance(self, el):
+        """Return the dome azimuth tolerance that keeps the beam in the slit.
+
+        See `slit_tolerance`, el is the slit elevation in degrees.
+        """
+        if self.slit_width is None:
+            raise ValueError('slit_width is required for the slit tolerance.')
+        return slit_tolerance(el, self.slit_width, self.dome_radius,
+                              self.aperture)
+
+    def grid(self, step=1.0):
+        """Return a (cached) interpolation grid of dome azimuths.
+
+        Parameters
+        ----------
+        step : float
+            Grid spacing in hour angle and declination, in degrees.
+
+        Returns
+        -------
+        DomeAzimuthGrid
+            Grid that evaluates dome azimuths in constant time.
+
+        """
+        if step not in self._grids:
+            self._grids[step] = DomeAzimuthGrid(self, step)
+        return self._grids[step]
+
+
+class DomeAzimuthGrid(object):
+    """
+    Dome azimuth and slit elevation precomputed on an hour angle/dec grid.
+
+    Lookups use bilinear interpolation of the sine and cosine of the dome
+    azimuth (so it interpolates across 0/360) and of the slit elevation, so
+    the cost per request doesn't depend on the geometry.
+
+    Parameters
+    ----------
+    geometry : DomeGeometry
+        The dome geometry to tabulate.
+    step : float
+        Grid spacing in degrees.
+
+    """
+
+    def __init__(self, geometry, step=1.0):
+        self.step = step
+        self.ha = np.arange(-180, 180 + step, step)
+        self.dec = np.arange(-90, 90 + step, step)
+        ha, dec = np.meshgrid(self.ha, self.dec, indexing='ij')
+        # tables indexed by [pier_side > 0, ha index, dec index]
+        self._cos_az = np.empty((2,) + ha.shape)
+        self._sin_az = np.empty((2,) + ha.shape)
+        self._el = np.empty((2,) + ha.shape)
+        for side in (0, 1):
+            az, el = geometry.dome_azimuth_hadec(ha, dec,
+                                                 pier_side=2 * side - 1)
+            self._cos_az[side] = np.cos(np.deg2rad(az))
+            self._sin_az[side] = np.sin(np.deg2rad(az))
+            self._el[side] = el
+
+    def __call__(self, ha, dec, pier_side=None):
+        """Return interpolated dome azimuth and slit elevation in degrees.
+
+        Parameters are as for DomeGeometry.dome_azimuth_hadec.
+        """
+        if np.ndim(ha) == 0 and np.ndim(dec) == 0 and np.ndim(pier_side) == 0:
+            return self._lookup(float(ha), float(dec), pier_side)
+        ha = (np.asarray(ha, dtype=float) + 180) % 360 - 180
+        dec = np.asarray(dec, dtype=float)
+        if pier_side is None:
+            pier_side = np.where(ha >= 0, 1, -1)
+        side = (np.asarray(pier_side) > 0).astype(int)
+        x = (ha + 180) / self.step
+        y = (dec + 90) / self.step
+        i = np.clip(x.astype(int), 0, len(self.ha) - 2)
+        j = np.clip(y.astype(int), 0, len(self.dec) - 2)
+        fx = x - i
+        fy = y - j
+
+        def interpolate(table):
+            return ((1 - fx) * (1 - fy) * table[side, i, j]
+                    + fx * (1 - fy) * table[side, i + 1, j]
+                    + (1 - fx) * fy * table[side, i, j + 1]
+                    + fx * fy * table[side, i + 1, j + 1])
+
+        az = np.rad2deg(np.arctan2(interpolate(self._sin_az),
+                                   interpolate(self._cos_az))) % 360
+        return az, interpolate(self._el)
+
+    def _lookup(self, ha, dec, pier_side):
+        """Scalar version of __call__ avoiding numpy array overheads."""
+        ha = (ha + 180) % 360 - 180
+        if pier_side is None:
+            pier_side = 1 if ha >= 0 else -1
+        side = 1 if pier_side > 0 else 0
+        x = (ha + 180) / self.step
+        y = (dec + 90) / self.step
+        i = min(max(int(x), 0), len(self.ha) - 2)
+        j = min(max(int(y), 0), len(self.dec) - 2)
+        fx = x - i
+        fy = y - j
+        weights = ((1 - fx) * (1 - fy), fx * (1 - fy), (1 - fx) * fy, fx * fy)
+        values = []
+        for table in (self._sin_az, self._cos_az, self._el):
+            corners = table[side, i:i + 2, j:j + 2].tolist()
+            values.append(weights[0] * corners[0][0]
+                          + weights[1] * corners[1][0]
+                          + weights[2] * corners[0][1]
+                          + weights[3] * corners[1][1])
+        sin_az, cos_az, el = values
+        return math.degrees(math.atan2(sin_az, cos_az)) % 360, el
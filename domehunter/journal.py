@@ -0,0 +1,244 @@
+"""Binary journal of the dome hardware events.
+
+`Journal` appends a fixed size record for every encoder edge, home sensor
+edge, relay transition and command boundary (see
+`enumerations.JournalEvent`) to a file, so what the hardware did at any
+moment can be read back exactly rather than parsed out of the text logs.
+
+Recording an event only appends a tuple to a deque, so it is cheap enough
+for the encoder callbacks. A writer thread drains the deque every
+`flush_interval` seconds (or sooner once `batch_size` events are waiting),
+adds the wall clock times and writes the batch with one write. At most
+`max_pending` events wait, so if writes fail (eg the disk is full) the
+oldest are dropped and counted rather than filling the memory. Files are
+named by night, `<prefix>-YYYYMMDD.bin` for the date the night started,
+rotating at `rotate_hour` local time (noon by default) so that a night
+isn't split across two files.
+
+Each file is a 32 byte header followed by `RECORD_DTYPE` records, which
+`read_journal` memory maps as a NumPy structured array.
+"""
+
+
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+MAGIC = b'DOMEJNL\x00'
+VERSION = 1
+# magic, version, record size, wall time the file was created and the
+# difference between the wall and monotonic clocks then
+HEADER_FORMAT = '<8sIIdd'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+RECORD_DTYPE = np.dtype([('mono', '<f8'),    # time.monotonic() of the event
+                         ('wall', '<f8'),    # unix time of the event
+                         ('value', '<f8'),   # event value, eg an azimuth
+                         ('count', '<i4'),   # encoder count at the event
+                         ('kind', 'u1'),     # JournalEvent
+                         ('state', 'i1'),    # level, step, direction, ...
+                         ('code', '<u2')])   # channel or DomeCommand
+
+
+def read_journal(path):
+    """
+    Memory map a journal file as a structured array.
+
+    A partly written last record, left by a crash, is ignored.
+
+    Parameters
+    ----------
+    path : str
+        Path of the journal file.
+
+    Returns
+    -------
+    numpy.ndarray
+        Records with the fields of RECORD_DTYPE, read only.
+
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f'{path} is not a dome journal, no header.')
+    magic, version, record_size, _, _ = struct.unpack(HEADER_FORMAT, header)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a dome journal.')
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(
+            (f'{path} is journal version {version} with {record_size} byte '
+             f'records, expected version {VERSION}.'))
+    records = (os.path.getsize(path) - HEADER_SIZE) // record_size
+    if records == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE,
+                     shape=(records,))
+
+
+class Journal(object):
+    """
+    Append only binary journal of events, written by a background thread.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to write the journal files to, created if needed.
+    prefix : str
+        Start of the file names.
+    flush_interval : float
+        Longest time in seconds between writes.
+    batch_size : int
+        Number of waiting events that triggers a write straight away.
+    rotate_hour : int
+        Local hour a new file is started at.
+    max_pending : int
+        Most events kept waiting for the writer, older ones are dropped.
+    logger : logbook.Logger
+        Logger to report write errors to.
+
+    Attributes
+    ----------
+    records_written : int
+        Number of records written since the journal was opened.
+    dropped : int
+        Number of records dropped, because too many were waiting or their
+        write failed.
+
+    """
+
+    def __init__(self, directory, prefix='dome-journal', flush_interval=1.0,
+                 batch_size=4096, rotate_hour=12, max_pending=1000000,
+                 logger=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.rotate_hour = rotate_hour
+        self.logger = logger
+        self.records_written = 0
+        self.dropped = 0
+        self.path = None
+        self._pending = deque(maxlen=max_pending)
+        self._file = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name='journal-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def record(self, kind, mono=None, state=0, count=0, code=0, value=0.0):
+        """
+        Record an event.
+
+        Parameters
+        ----------
+        kind : JournalEvent
+            Type of event.
+        mono : float
+            time.monotonic() of the event, defaults to now.
+        state, count, code, value
+            Fields of the record, see RECORD_DTYPE and JournalEvent.
+
+        """
+        if mono is None:
+            mono = time.monotonic()
+        pending = self._pending
+        if len(pending) == pending.maxlen:
+            # the append drops the oldest
+            self.dropped += 1
+        # wall time is filled in by the writer
+        pending.append((mono, 0.0, value, count, kind, state, code))
+        if len(pending) >= self.batch_size:
+            self._wake.set()
+
+    def path_for(self, wall):
+        """Path of the journal file for a unix time."""
+        night = time.localtime(wall - 3600 * self.rotate_hour)
+        return os.path.join(self.directory,
+                            f'{self.prefix}-{time.strftime("%Y%m%d", night)}'
+                            '.bin')
+
+    def flush(self):
+        """
+        Write the waiting events now.
+
+        Raises
+        ------
+        OSError
+            If the write failed, the events are dropped.
+
+        """
+        with self._lock:
+            count = len(self._pending)
+            if not count:
+                return
+            pending = self._pending
+            batch = np.array([pending.popleft() for _ in range(count)],
+                             dtype=RECORD_DTYPE)
+            wall = time.time()
+            batch['wall'] = batch['mono'] + (wall - time.monotonic())
+            try:
+                self._open(wall).write(batch.tobytes())
+                self._file.flush()
+            except OSError:
+                self.dropped += count
+                # reopen on the next write
+                self._close_file()
+                raise
+            self.records_written += count
+
+    def close(self):
+        """Write the waiting events, stop the writer and close the file."""
+        self._closed.set()
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _open(self, wall):
+        """The file to write to at a unix time, rotating if needed."""
+        path = self.path_for(wall)
+        if path != self.path or self._file is None:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(path, 'ab')
+            size = self._file.tell()
+            if size < HEADER_SIZE:
+                self._file.truncate(0)
+                self._file.write(struct.pack(
+                    HEADER_FORMAT, MAGIC, VERSION, RECORD_DTYPE.itemsize,
+                    wall, wall - time.monotonic()))
+            else:
+                # drop a record left partly written by a failed write
+                partial = (size - HEADER_SIZE) % RECORD_DTYPE.itemsize
+                if partial:
+                    self._file.truncate(size - partial)
+            self.path = path
+        return self._file
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # keep writing, the disk may recover
+                if self.logger is not None:
+                    self.logger.exception('Journal write failed.')
@@ -0,0 +1,102 @@
+"""Coalescing writer for the AutomationHAT status LEDs."""
+
+
+import threading
+
+
+class LEDController(object):
+    """
+    Merges LED state updates and writes them to the LED driver in a thread.
+
+    Callers update the desired state with integer bitmasks, which only takes
+    a lock, and a writer thread sends the merged state to the driver at most
+    `refresh_rate` times per second. Updates that cancel out before the next
+    write (eg an encoder LED toggling on and off) and updates that leave the
+    state unchanged cost no driver writes.
+
+    Parameters
+    ----------
+    driver : module
+        The LED driver, eg the sn3218 module, providing enable_leds(mask).
+    initial_mask : int
+        Initial LED state, one bit per LED (see enumerations.LED_Lights).
+    refresh_rate : float
+        Maximum number of driver writes per second. If None or 0, every
+        update is written synchronously by the caller, as the Dome did before
+        the controller existed.
+
+    """
+
+    def __init__(self, driver, initial_mask=0, refresh_rate=20.0):
+        self.driver = driver
+        self.refresh_rate = refresh_rate
+        # number of calls to driver.enable_leds()
+        self.writes = 0
+        self._mask = initial_mask
+        self._written = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+        if refresh_rate:
+            self._thread = threading.Thread(target=self._run,
+                                            name='led-controller',
+                                            daemon=True)
+            self._thread.start()
+
+    @property
+    def mask(self):
+        """The desired LED state bitmask."""
+        return self._mask
+
+    def update(self, on_mask=0, off_mask=0):
+        """Turn the LEDs in on_mask on and those in off_mask off.
+
+        Parameters
+        ----------
+        on_mask : int
+            Bitmask of LEDs to turn on.
+        off_mask : int
+            Bitmask of LEDs to turn off.
+
+        """
+        with self._lock:
+            self._mask = (self._mask & ~off_mask) | on_mask
+        if self._thread is None:
+            self._write(force=True)
+        else:
+            self._pending.set()
+
+    def flush(self):
+        """Write any pending update now."""
+        self._write()
+
+    def close(self):
+        """Stop the writer thread, writing any pending update first."""
+        self._closed.set()
+        self._pending.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _write(self, force=False):
+        with self._write_lock:
+            mask = self._mask
+            if mask == self._written and not force:
+                return
+            self.driver.enable_leds(mask)
+            self._written = mask
+            self.writes += 1
+
+    def _run(self):
+        interval = 1 / self.refresh_rate
+        while True:
+            self._pending.wait()
+            if self._closed.is_set():
+                break
+            self._pending.clear()
+            self._write()
+            # rate limit, updates arriving meanwhile are merged
+            if self._closed.wait(interval):
+                break
@@ -0,0 +1,183 @@
+"""Prometheus text format metrics for the dome controller.
+
+`MetricsServer` serves `render_metrics` at http://localhost:<port>/metrics
+from a stdlib HTTP server in a daemon thread. The values are read straight
+from the Dome's counters (plain attributes updated by the encoder and relay
+code, so there is no locking on the tick path) and from the server's
+`rpc_stats.RpcStats`. Rendering doesn't use astropy or the Dome properties,
+which log every read, so a scrape costs tens of microseconds plus the RPC
+histogram percentiles.
+"""
+
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _metric(lines, name, kind, help, samples):
+    """Append a metric family, samples is a list of (labels, value)."""
+    lines.append(f'# HELP {name} {help}')
+    lines.append(f'# TYPE {name} {kind}')
+    for labels, value in samples:
+        if value is None:
+            continue
+        if labels:
+            label_str = ','.join(f'{key}="{label}"'
+                                 for key, label in labels.items())
+            lines.append(f'{name}{{{label_str}}} {value:.9g}')
+        else:
+            lines.append(f'{name} {value:.9g}')
+
+
+def render_metrics(dome, stats=None, quantiles=(0.5, 0.9, 0.99)):
+    """
+    Render the dome (and RPC) metrics in the Prometheus text format.
+
+    Parameters
+    ----------
+    dome : Dome
+        Dome to read the counters of.
+    stats : rpc_stats.RpcStats
+        RPC statistics to export as summaries, None for none.
+    quantiles : tuple
+        Quantiles of the RPC latency summaries.
+
+    Returns
+    -------
+    str
+        The metrics page.
+
+    """
+    lines = []
+    relay_on = dome._rotation_relay.is_active
+    tick_interval = dome._tick_interval
+    tick_rate = 0.0
+    if relay_on and tick_interval:
+        tick_rate = 1 / tick_interval
+    _metric(lines, 'dome_encoder_ticks_total', 'counter',
+            'Encoder ticks counted.', [({}, dome.total_ticks)])
+    _metric(lines, 'dome_encoder_count', 'gauge',
+            'Encoder count since the home position.',
+            [({}, dome._encoder_count)])
+    _metric(lines, 'dome_encoder_tick_rate', 'gauge',
+            'Measured encoder ticks per second while rotating.',
+            [({}, tick_rate)])
+    _metric(lines, 'dome_rotation_relay_on', 'gauge',
+            'Whether the rotation relay is on.', [({}, int(relay_on))])
+    on_since = dome._relay_on_since
+    on_time = dome.relay_on_time
+    if on_since is not None:
+        on_time += time.monotonic() - on_since
+    _metric(lines, 'dome_rotation_relay_on_seconds_total', 'counter',
+            'Time the rotation relay has been on.', [({}, on_time)])
+    _metric(lines, 'dome_rotation_relay_cycles_total', 'counter',
+            'Times the rotation relay has been switched on.',
+            [({}, dome.relay_cycles)])
+    _metric(lines, 'dome_moves_total', 'counter',
+            'Dome movements by outcome.',
+            [({'result': result.name.lower()}, count)
+             for result, count in list(dome.move_results.items())])
+    _metric(lines, 'dome_moves_avoided_total', 'counter',
+            'Gotos skipped as the telescope beam already cleared the slit.',
+            [({}, dome.moves_avoided)])
+    _metric(lines, 'dome_home_corrections_total', 'counter',
+            'Encoder count corrections on passing the home sensor.',
+            [({}, dome.home_corrections)])
+    _metric(lines, 'dome_last_home_correction_ticks', 'gauge',
+            'Encoder ticks corrected when last passing the home sensor.',
+            [({}, dome.last_home_correction)])
+    _metric(lines, 'dome_homed', 'gauge',
+            'Whether the dome has found home.',
+            [({}, int(not dome._unhomed))])
+    _metric(lines, 'dome_last_abort_latency_seconds', 'gauge',
+            'Time from the last abort request to the relay switching off.',
+            [({}, dome.last_abort_latency)])
+    if stats is not None:
+        percentiles = [100 * q for q in quantiles]
+        for name, help in (('handler', 'Time in the RPC handler.'),
+                           ('queue', 'Time RPCs waited for a worker.')):
+            metric = f'dome_rpc_{name}_seconds'
+            lines.append(f'# HELP {metric} {help}')
+            lines.append(f'# TYPE {metric} summary')
+            for method, histogram in stats.histograms(name).items():
+                values = histogram.percentiles(percentiles)
+                for q, value in zip(quantiles, values):
+                    lines.append(f'{metric}{{method="{method}",'
+                                 f'quantile="{q:g}"}} {value:.9g}')
+                lines.append(f'{metric}_sum{{method="{method}"}} '
+                             f'{histogram.total:.9g}')
+                lines.append(f'{metric}_count{{method="{method}"}} '
+                             f'{histogram.count}')
+        _metric(lines, 'dome_rpc_calls_total', 'counter',
+                'RPC calls by return code, "error" if the handler raised.',
+                [({'method': method, 'code': 'error' if code is None
+                   else code}, count)
+                 for method, codes in stats.return_codes().items()
+                 for code, count in codes.items()])
+    lines.append('')
+    return '\n'.join(lines)
+
+
+class MetricsServer(object):
+    """
+    HTTP server for the Prometheus metrics page, run in a daemon thread.
+
+    Parameters
+    ----------
+    dome : Dome
+        Dome to export the counters of.
+    stats : rpc_stats.RpcStats
+        RPC statistics to export, None for none.
+    host : str
+        Address to bind to, localhost by default.
+    port : int
+        Port to listen on, 0 to pick a free port.
+
+    """
+
+    def __init__(self, dome, stats=None, host='localhost', port=9102):
+        self.dome = dome
+        self.stats = stats
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = render_metrics(metrics.dome,
+                                      metrics.stats).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # scrapes would flood the log
+                pass
+
+        self._server = HTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def port(self):
+        """Port the server is listening on."""
+        return self._server.server_address[1]
+
+    def start(self):
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='metrics',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,159 @@
+"""Ordering of batches of dome targets to minimise dome time.
+
+For flat field sequences, survey tiles and the like the order of the
+targets is arbitrary, but the time the dome takes to visit them isn't.
+Visiting points on a circle is cheapest by sweeping round in one direction,
+or sweeping one way and then reversing once to pick up the rest, so rather
+than searching over orders `order_targets` evaluates every sweep with at
+most one reversal at once with numpy, which scales to many thousands of
+targets.
+"""
+
+
+import numpy as np
+
+from domehunter.tracking import wrap_180
+
+
+def _azimuths(targets):
+    """Return target azimuths in degrees from azimuths or targets."""
+    return np.array([getattr(target, 'az', target) for target in targets],
+                    dtype=float) % 360
+
+
+def estimate_dome_time(azimuths,
+                       start_az=None,
+                       end_az=None,
+                       slew_rate=3.0,
+                       spin_up=0.5,
+                       reversal_cost=2.0,
+                       position_tolerance=0.0):
+    """Estimate the time for the dome to visit azimuths in the given order.
+
+    Each move takes the shortest route, as Dome.goto_az does.
+
+    Parameters
+    ----------
+    azimuths : array_like
+        Azimuths to visit, in degrees, or targets with an az attribute.
+    start_az : float
+        Starting dome azimuth, defaults to the first azimuth.
+    end_az : float
+        Azimuth to finish at, eg the park position, None to finish at the
+        last target.
+    slew_rate : float
+        Dome rotation rate in degrees per second.
+    spin_up : float
+        Time in seconds from switching the motor on to the dome moving,
+        charged for every move.
+    reversal_cost : float
+        Extra time in seconds charged for each change of direction.
+    position_tolerance : float
+        Moves shorter than this, in degrees, are skipped.
+
+    Returns
+    -------
+    dict
+        time (seconds), rotation (total degrees turned), moves and
+        reversals.
+
+    """
+    azimuths = _azimuths(azimuths)
+    if start_az is None:
+        start_az = azimuths[0] if len(azimuths) else 0.0
+    path = np.concatenate(([start_az], azimuths))
+    if end_az is not None:
+        path = np.append(path, end_az)
+    steps = wrap_180(np.diff(path))
+    steps = steps[np.abs(steps) > position_tolerance]
+    directions = np.sign(steps)
+    reversals = int(np.count_nonzero(directions[1:] != directions[:-1]))
+    rotation = float(np.sum(np.abs(steps)))
+    return dict(time=(rotation / slew_rate + len(steps) * spin_up
+                      + reversals * reversal_cost),
+                rotation=rotation,
+                moves=len(steps),
+                reversals=reversals)
+
+
+def order_targets(targets,
+                  start_az=0.0,
+                  end_az=None,
+                  slew_rate=3.0,
+                  reversal_cost=2.0,
+                  allow_reversal=True):
+    """Return the order to visit targets in that minimises dome time.
+
+    The candidate orders are a sweep clockwise or anticlockwise from
+    start_az, and for every target, a sweep clockwise to it and then back
+    anticlockwise through start_az to the rest, and the same starting
+    anticlockwise. All candidates are costed at once as rotation / slew_rate
+    plus reversal_cost per reversal (plus the move to end_az, if given) and
+    the cheapest is returned. Without end_az this is the shortest route
+    round the circle.
+
+    Parameters
+    ----------
+    targets : array_like
+        Azimuths in degrees, or targets with an az attribute (eg
+        planner.PlannedTarget).
+    start_az : float
+        Dome azimuth in degrees before the first target.
+    end_az : float
+        Azimuth to finish at after the last target, None for anywhere.
+    slew_rate : float
+        Dome rotation rate in degrees per second.
+    reversal_cost : float
+        Time in seconds lost to a reversal (stopping the motor, switching
+        the direction relay, backlash).
+    allow_reversal : bool
+        If False only the one way sweeps are considered.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indices into targets in the order to visit them.
+
+    """
+    azimuths = _azimuths(targets)
+    if len(azimuths) == 0:
+        return np.array([], dtype=int)
+    # sort by clockwise offset from the start
+    offsets = (azimuths - start_az) % 360
+    by_offset = np.argsort(offsets, kind='stable')
+    d = offsets[by_offset]
+    n = len(d)
+    # candidate k visits d[:k] clockwise and d[k:] anticlockwise, either
+    # clockwise first or anticlockwise first. Targets at the start are
+    # always in the clockwise set, so k starts from the number of them.
+    k = np.arange(np.count_nonzero(d == 0), n + 1)
+    cw_extent = np.where(k > 0, d[np.maximum(k - 1, 0)], 0.0)
+    ccw_extent = np.where(k < n, 360 - d[np.minimum(k, n - 1)], 0.0)
+    reversals = ((cw_extent > 0) & (ccw_extent > 0)).astype(int)
+    # the far extent is only turned through once
+    cw_first = np.where(ccw_extent > 0, 2 * cw_extent + ccw_extent,
+                        cw_extent)
+    ccw_first = np.where(cw_extent > 0, 2 * ccw_extent + cw_extent,
+                         ccw_extent)
+    rotation = np.concatenate((cw_first, ccw_first))
+    num_reversals = np.concatenate((reversals, reversals))
+    if end_az is not None:
+        # finishing azimuths, as clockwise offsets from the start
+        ends = np.concatenate((
+            np.where(ccw_extent > 0, -ccw_extent, cw_extent),
+            np.where(cw_extent > 0, cw_extent, -ccw_extent)))
+        final = wrap_180(end_az - start_az - ends)
+        # direction of the last sweep
+        last = np.concatenate((np.where(ccw_extent > 0, -1, 1),
+                               np.where(cw_extent > 0, 1, -1)))
+        rotation = rotation + np.abs(final)
+        num_reversals = num_reversals + (np.sign(final) == -last)
+    cost = rotation / slew_rate + reversal_cost * num_reversals
+    if not allow_reversal:
+        cost = np.where(num_reversals > 0, np.inf, cost)
+    best = int(np.argmin(cost))
+    split = k[best % len(k)]
+    cw_set, ccw_set = by_offset[:split], by_offset[split:][::-1]
+    if best < len(k):
+        return np.concatenate((cw_set, ccw_set))
+    return np.concatenate((ccw_set, cw_set))
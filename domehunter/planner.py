@@ -0,0 +1,234 @@
+"""Pre-positioning of the dome from an observation plan.
+
+The dome normally only starts moving when a goto arrives for the next
+target, which is usually after the mount has started slewing, so the dome
+is on the critical path. Given the upcoming targets and the times they are
+expected to start, the dome can instead be moved towards the next target
+during the current exposure, as far as it can go while the current target
+stays inside the slit window.
+"""
+
+
+import numpy as np
+
+from domehunter.tracking import wrap_180
+
+
+class PlannedTarget(object):
+    """
+    A target in an observation plan.
+
+    Parameters
+    ----------
+    az : float
+        Dome azimuth required for the target in degrees.
+    start_time : float
+        Expected time the goto for the target arrives, in unix seconds.
+    el : float
+        Elevation of the target in degrees, None if unknown, in which case
+        the slit window is taken to be az_position_tolerance.
+    name : str
+        Name of the target, for logging.
+
+    """
+
+    def __init__(self, az, start_time, el=None, name=''):
+        self.az = float(az) % 360
+        self.start_time = float(start_time)
+        self.el = None if el is None else float(el)
+        self.name = name
+
+    def __repr__(self):
+        return (f'PlannedTarget(az={self.az:.2f}, '
+                f'start_time={self.start_time:.1f}, el={self.el}, '
+                f'name={self.name!r})')
+
+
+class ObservationPlan(object):
+    """
+    Upcoming targets, in order of start time.
+
+    Parameters
+    ----------
+    targets : list
+        List of PlannedTarget.
+
+    """
+
+    def __init__(self, targets):
+        self.targets = sorted(targets, key=lambda target: target.start_time)
+        self._start_times = np.array(
+            [target.start_time for target in self.targets])
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __getitem__(self, index):
+        return self.targets[index]
+
+    def index_at(self, t):
+        """Return the index of the target being observed at time t, or None.
+
+        The current target is the last one to have started by time t.
+        """
+        index = int(np.searchsorted(self._start_times, t, side='right')) - 1
+        if index < 0:
+            return None
+        return index
+
+
+class PrePositionPlanner(object):
+    """
+    Decides where to pre-rotate the dome during an exposure.
+
+    Once the dome has reached the current target and the next target is due
+    within lead_time, the dome is moved towards the next target until the
+    current target is `margin` from the edge of the slit window. The goto
+    for the next target then has that much less to turn, or is skipped if
+    the next target is already inside the window.
+
+    Parameters
+    ----------
+    lead_time : float
+        How long before the next target's start time to pre-rotate, in
+        seconds. Pre-rotating late leaves less time for the current target
+        to drift towards the edge of the window.
+    margin : float
+        Margin in degrees kept between the current target and the edge of the
+        slit window, to allow for drift of the target and dome overshoot.
+    min_move : float
+        Smallest pre-rotation in degrees worth switching the motor on for.
+
+    """
+
+    def __init__(self, lead_time=60.0, margin=0.5, min_move=1.0):
+        self.lead_time = lead_time
+        self.margin = margin
+        self.min_move = min_move
+
+    def update(self, t, dome_az, plan, tolerance):
+        """Return the azimuth to pre-rotate the dome to, or None.
+
+        Parameters
+        ----------
+        t : float
+            Current time in unix seconds.
+        dome_az : float
+            Current dome azimuth in degrees.
+        plan : ObservationPlan
+            The observation plan.
+        tolerance : callable
+            Function returning the slit window half width in degrees for a
+            target elevation (or None).
+
+        Returns
+        -------
+        float or None
+            Azimuth in degrees to move to, if the dome should move.
+
+        """
+        index = plan.index_at(t)
+        if index is None or index + 1 >= len(plan):
+            return None
+        current, upcoming = plan[index], plan[index + 1]
+        if upcoming.start_time - t > self.lead_time:
+            return None
+        window = max(tolerance(current.el) - self.margin, 0.0)
+        # leave the dome alone until it has reached the current target
+        if abs(float(wrap_180(current.az - dome_az))) > window + self.margin:
+            return None
+        offset = float(wrap_180(upcoming.az - current.az))
+        goal = current.az + np.sign(offset) * min(abs(offset), window)
+        if abs(float(wrap_180(goal - dome_az))) < self.min_move:
+            return None
+        return float(goal % 360)
+
+
+def simulate_plan(plan,
+                  planner,
+                  tolerance,
+                  slew_rate=3.0,
+                  spin_up=0.5,
+                  position_tolerance=1.0,
+                  dt=0.1):
+    """Simulate a night of gotos in virtual time, with or without a planner.
+
+    Each target's goto arrives at its start time. As in Dome.goto_az it is
+    skipped if the dome is already within the slit window of the target,
+    otherwise any pre-rotation in progress is stopped and the dome is turned
+    (after spin_up seconds) at slew_rate until it is within
+    position_tolerance of the target. The planner is only consulted while
+    the dome is still.
+
+    Parameters
+    ----------
+    plan : ObservationPlan
+        The observation plan, the dome starts on the first target.
+    planner : PrePositionPlanner
+        Pre-positioning policy, None for gotos only.
+    tolerance : callable
+        Function returning the slit window half width in degrees for a
+        target elevation.
+    slew_rate : float
+        Dome rotation rate in degrees per second.
+    spin_up : float
+        Time in seconds from switching the motor on to the dome moving.
+    position_tolerance : float
+        Tolerance in degrees for a move to be complete.
+    dt : float
+        Simulation time step in seconds.
+
+    Returns
+    -------
+    dict
+        overheads, the time in seconds from each target's start time until
+        the dome is ready (the first target is excluded), total_overhead,
+        relay_cycles and pre_rotations.
+
+    """
+    dome_az = plan[0].az
+    goal = None
+    motor_on_time = None
+    goto_target = None
+    overheads = []
+    relay_cycles = 0
+    pre_rotations = 0
+    next_index = 1
+    t = plan[0].start_time
+    end = plan[len(plan) - 1].start_time
+    while next_index < len(plan) or goto_target is not None:
+        if next_index < len(plan) and t >= plan[next_index].start_time:
+            target = plan[next_index]
+            next_index += 1
+            error = abs(float(wrap_180(target.az - dome_az)))
+            if error <= max(tolerance(target.el), position_tolerance):
+                overheads.append(0.0)
+                goal = None
+            else:
+                goal = target.az
+                goto_target = target
+                relay_cycles += 1
+                motor_on_time = t
+        elif goal is None and planner is not None:
+            goal = planner.update(t, dome_az, plan, tolerance)
+            if goal is not None:
+                relay_cycles += 1
+                pre_rotations += 1
+                motor_on_time = t
+        if goal is not None:
+            error = float(wrap_180(goal - dome_az))
+            if abs(error) <= position_tolerance:
+                goal = None
+                if goto_target is not None:
+                    overheads.append(t - goto_target.start_time)
+                    goto_target = None
+            elif t - motor_on_time >= spin_up:
+                step = min(slew_rate * dt, abs(error))
+                dome_az = (dome_az + np.sign(error) * step) % 360
+        t += dt
+        if t > end + 3600:
+            break
+    return dict(overheads=overheads,
+                total_overhead=sum(overheads),
+                relay_cycles=relay_cycles,
+                pre_rotations=pre_rotations)
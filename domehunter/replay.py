@@ -0,0 +1,583 @@
+"""Replay of recorded dome journals.
+
+`JournalReplay` feeds the encoder edges, home sensor edges and commands of
+a journal (see `journal.Journal`) into a Dome on the mock pin factory, and
+compares the decisions the dome makes (relay starts and stops, direction
+changes, encoder zeroing at home and move results) with the recorded ones.
+Replaying a night with a changed configuration or changed motion code
+shows where the dome would have behaved differently.
+
+Inputs are fed at the recorded times divided by `speed`, with the dome's
+time constants (monitor interval, stall time and debounce interval)
+divided by the same factor, or as fast as possible with `speed=None`. At
+each recorded decision the replay waits (up to `decision_timeout`) for the
+dome to make the same decision before feeding the next input, so a
+decision made by a monitor thread is made at the same point in the
+stream. Edges are timestamped with their replay times, like edges
+captured by the pigpio daemon.
+
+As fast as possible, the movement monitors check for the end of a move
+once per monitor interval of journal time rather than of real time (see
+`LockstepEvent`), and the edge timestamps keep the recorded spacing but
+run ahead of the clock. So the edge timing logic (debouncing, counting,
+stop positions) is checked but the stall watchdog, move deadlines and
+azimuth interpolation are not.
+
+Calibrations and waypoint sequences are not replayed, the replay stops at
+the first one.
+"""
+
+
+import difflib
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from domehunter.dome_control import Dome, load_dome_config
+from domehunter.enumerations import (QUADRATURE_EDGE, Direction, DomeCommand,
+                                     JournalEvent, MoveResult)
+from domehunter.journal import RECORD_DTYPE
+
+DECISIONS = (JournalEvent.ROTATION_RELAY, JournalEvent.DIRECTION_RELAY,
+             JournalEvent.HOME_ZERO, JournalEvent.MOVE_END)
+UNSUPPORTED = (DomeCommand.CALIBRATE, DomeCommand.SEQUENCE)
+# dome time constants scaled by the replay speed
+TIME_CONSTANTS = ('monitor_interval', 'stall_min_time', 'debounce_interval')
+# records that carry the encoder count
+_COUNTED = (JournalEvent.HOME_EDGE, JournalEvent.HOME_ZERO,
+            JournalEvent.ROTATION_RELAY, JournalEvent.MOVE_END)
+
+
+def describe_decision(record):
+    """Describe a decision record, eg 'stop at 123'."""
+    kind = record['kind']
+    count = record['count']
+    if kind == JournalEvent.ROTATION_RELAY:
+        return f'{"start" if record["state"] else "stop"} at {count}'
+    if kind == JournalEvent.DIRECTION_RELAY:
+        return f'direction {Direction(record["state"]).name}'
+    if kind == JournalEvent.HOME_ZERO:
+        return f'zero from {count}'
+    if kind == JournalEvent.MOVE_END:
+        return (f'{DomeCommand(record["code"]).name} '
+                f'{MoveResult(record["state"]).name} at {count}')
+    return JournalEvent(kind).name
+
+
+def compare_decisions(recorded, replayed, count_tolerance=0,
+                      rotation_ticks=None):
+    """
+    Align recorded and replayed decisions and return the differences.
+
+    Decisions are put in time order, so that decisions made on different
+    threads at the same moment (a stop and a zeroing at home) compare
+    equal whichever was made first, and aligned on their kind, state and
+    command. Aligned decisions differ if their encoder counts differ by
+    more than count_tolerance.
+
+    Parameters
+    ----------
+    recorded, replayed : numpy.ndarray
+        Decision records.
+    count_tolerance : int
+        Largest difference in encoder count that is a match.
+    rotation_ticks : int
+        Encoder ticks per rotation, if given counts a whole number of
+        rotations apart are equal (a count zeroed at home or not).
+
+    Returns
+    -------
+    list
+        (recorded, replayed) record pairs, either of which is None for a
+        decision made in only one of them.
+
+    """
+    def keys(records):
+        return list(zip(records['kind'].tolist(), records['state'].tolist(),
+                        records['code'].tolist()))
+
+    def difference(a, b):
+        difference = abs(int(a) - int(b))
+        if rotation_ticks:
+            difference %= rotation_ticks
+            difference = min(difference, rotation_ticks - difference)
+        return difference
+
+    recorded = recorded[np.argsort(recorded['mono'], kind='stable')]
+    replayed = replayed[np.argsort(replayed['mono'], kind='stable')]
+    matcher = difflib.SequenceMatcher(None, keys(recorded), keys(replayed),
+                                      autojunk=False)
+    mismatches = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                if difference(recorded[i]['count'],
+                              replayed[j]['count']) > count_tolerance:
+                    mismatches.append((recorded[i], replayed[j]))
+        else:
+            mismatches.extend((recorded[i], None) for i in range(i1, i2))
+            mismatches.extend((None, replayed[j]) for j in range(j1, j2))
+    mismatches.sort(key=lambda pair: (pair[0] if pair[1] is None
+                                      else pair[1])['mono'])
+    return mismatches
+
+
+class DecisionRecorder(object):
+    """
+    Stand-in for Dome.journal that keeps the dome's decisions in memory.
+
+    Decisions are timestamped with `clock()`, the journal time of the
+    input being replayed.
+
+    Parameters
+    ----------
+    clock : callable
+        Returns the current journal time.
+
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.decisions = []
+        # indices of the decisions not yet waited for, by (kind, state, code)
+        self._unclaimed = defaultdict(deque)
+        self._condition = threading.Condition()
+
+    def record(self, kind, mono=None, state=0, count=0, code=0, value=0.0):
+        if kind not in DECISIONS:
+            return
+        with self._condition:
+            self._unclaimed[(kind, state, code)].append(len(self.decisions))
+            self.decisions.append(
+                (self.clock(), 0.0, value, count, kind, state, code))
+            self._condition.notify_all()
+
+    def wait_for(self, key, timeout):
+        """
+        Wait for the dome to make a decision.
+
+        The first decision matching the key that hasn't already been waited
+        for is claimed, so decisions made in a different order from the
+        recorded ones don't hold the replay up.
+
+        Parameters
+        ----------
+        key : tuple
+            (kind, state, code) of the decision.
+        timeout : float
+            Longest time to wait in seconds.
+
+        Returns
+        -------
+        bool
+            True if the decision was made.
+
+        """
+        with self._condition:
+            unclaimed = self._unclaimed[key]
+            if not self._condition.wait_for(lambda: unclaimed, timeout):
+                return False
+            unclaimed.popleft()
+            return True
+
+    def array(self):
+        """The decisions so far as a record array."""
+        with self._condition:
+            return np.array(self.decisions, dtype=RECORD_DTYPE)
+
+    def close(self):
+        pass
+
+
+class LockstepEvent(threading.Event):
+    """
+    Abort event that lets the movement monitors check once per step.
+
+    The monitors wait on the dome's abort event between checks, with this
+    event the wait lasts until the next step() (or the event is set)
+    rather than the monitor interval, so the replay decides when they
+    check.
+
+    Parameters
+    ----------
+    active : callable
+        Returns True while a monitor may be checking.
+    timeout : float
+        Longest time in seconds a wait lasts without a step.
+
+    """
+
+    def __init__(self, active, timeout=1.0):
+        super().__init__()
+        self.active = active
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        self._steps = 0
+        self._waiting = 0
+        self._arrivals = 0
+
+    def wait(self, timeout=None):
+        with self._condition:
+            self._arrivals += 1
+            self._waiting += 1
+            self._condition.notify_all()
+            step = self._steps
+            self._condition.wait_for(
+                lambda: self._steps != step or self.is_set(), self.timeout)
+            self._waiting -= 1
+        return self.is_set()
+
+    def set(self):
+        super().set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def step(self, timeout=0.1):
+        """Let the waiting monitors check once, and wait until they have."""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._waiting or not self.active(), timeout)
+            if not self._waiting:
+                return
+            arrivals = self._arrivals + self._waiting
+            self._steps += 1
+            self._condition.notify_all()
+            self._condition.wait_for(
+                lambda: self._arrivals >= arrivals or not self.active(),
+                timeout)
+
+
+class ReplayResult(object):
+    """
+    Outcome of a journal replay.
+
+    Attributes
+    ----------
+    recorded, replayed : numpy.ndarray
+        Decision records of the journal and of the replay, up to where the
+        replay stopped. The replayed times are journal times.
+    mismatches : list
+        (recorded, replayed) pairs of differing decisions, see
+        compare_decisions.
+    inputs : int
+        Number of inputs (edges and commands) fed to the dome.
+    missed : int
+        Number of recorded decisions the dome didn't make in time.
+    elapsed : float
+        Replay time in seconds.
+    journal_time : float
+        Time in seconds covered by the replayed part of the journal.
+    stopped_at : str
+        Name of the unsupported command the replay stopped at, or None.
+
+    """
+
+    def __init__(self, recorded, replayed, mismatches, inputs, missed,
+                 elapsed, journal_time, stopped_at):
+        self.recorded = recorded
+        self.replayed = replayed
+        self.mismatches = mismatches
+        self.inputs = inputs
+        self.missed = missed
+        self.elapsed = elapsed
+        self.journal_time = journal_time
+        self.stopped_at = stopped_at
+
+    @property
+    def matches(self):
+        """True if the replay made the recorded decisions."""
+        return not self.mismatches
+
+    def counts(self):
+        """Return {decision: (recorded, replayed)} numbers of decisions."""
+        def count(records):
+            kinds = records['kind']
+            starts = kinds == JournalEvent.ROTATION_RELAY
+            return dict(starts=int(np.sum(starts & (records['state'] == 1))),
+                        stops=int(np.sum(starts & (records['state'] == 0))),
+                        zeroings=int(np.sum(kinds == JournalEvent.HOME_ZERO)),
+                        moves=int(np.sum(kinds == JournalEvent.MOVE_END)))
+
+        recorded = count(self.recorded)
+        replayed = count(self.replayed)
+        return {name: (recorded[name], replayed[name]) for name in recorded}
+
+
+class JournalReplay(object):
+    """
+    Replay a journal into a Dome on the mock pin factory.
+
+    Parameters
+    ----------
+    records : numpy.ndarray
+        Journal records, as from journal.read_journal.
+    config : dict
+        Dome configuration, as from load_dome_config, including
+        home_azimuth. Defaults to the configuration file.
+    speed : float
+        Replay speed, 1 for real time, more than 1 to accelerate and None
+        for as fast as possible.
+    count_tolerance : int
+        Largest difference in encoder count between a recorded and a
+        replayed decision that is a match. A monitor thread can stop the
+        dome in the middle of an encoder callback, a tick either side of
+        the count it would stop at in the replay.
+    decision_timeout : float
+        Longest time in seconds to wait for the dome to make a recorded
+        decision.
+    max_idle : float
+        Recorded gaps between inputs of more than this many seconds with
+        the motor off are shortened to it, None to keep them.
+
+    """
+
+    def __init__(self,
+                 records,
+                 config=None,
+                 speed=1.0,
+                 count_tolerance=1,
+                 decision_timeout=5.0,
+                 max_idle=None):
+        if config is None:
+            config = load_dome_config()
+        self.records = records
+        self.config = dict(config)
+        self.speed = speed
+        self.count_tolerance = count_tolerance
+        self.decision_timeout = decision_timeout
+        self.max_idle = max_idle
+        self.dome = None
+        self._journal_time = 0.0
+        self._edge_time = 0.0
+
+    def run(self):
+        """
+        Replay the journal.
+
+        Returns
+        -------
+        ReplayResult
+
+        """
+        records = self.records
+        if not len(records):
+            empty = np.empty(0, dtype=RECORD_DTYPE)
+            return ReplayResult(empty, empty, [], 0, 0, 0.0, 0.0, None)
+        dome = self.dome = self._make_dome()
+        self._set_initial_state(dome, records)
+        recorder = DecisionRecorder(lambda: self._journal_time)
+        dome.journal = recorder
+
+        start_time = records['mono'][0]
+        self._journal_time = start_time
+        start = time.monotonic()
+        # seconds the replay has fallen behind the recorded times, less the
+        # idle time skipped
+        lag = 0.0
+        inputs = 0
+        missed = 0
+        stopped_at = None
+        motor_on = False
+        parking = False
+        last_input = None
+        last_check = start_time
+        decisions = []
+        # commands are called in order on their own thread, as the server
+        # does, so a command that waits doesn't hold up the edges
+        commands = ThreadPoolExecutor(1, thread_name_prefix='replay-command')
+        calls = []
+        # plain tuples are much quicker to loop over than records
+        for record in records.tolist():
+            mono, _, value, _, kind, state, code = record
+            if kind in DECISIONS:
+                decisions.append(record)
+                if not self._wait_for_decision(recorder, (kind, state, code)):
+                    missed += 1
+                if kind == JournalEvent.ROTATION_RELAY:
+                    motor_on = bool(state)
+                    # a monitor starts checking as the dome starts
+                    last_check = mono
+                elif (kind == JournalEvent.MOVE_END and parking
+                      and code == DomeCommand.GOTO):
+                    # as park() does once its goto finishes
+                    parking = False
+                    if dome._goto_az_complete(dome.park_az):
+                        dome._park_event.set()
+                continue
+            if kind not in (JournalEvent.ENCODER_EDGE, JournalEvent.HOME_EDGE,
+                            JournalEvent.COMMAND):
+                continue
+            if kind == JournalEvent.COMMAND and code in UNSUPPORTED:
+                stopped_at = DomeCommand(code).name
+                break
+            if self.speed is None:
+                self._edge_time = start + (mono - start_time)
+                checks = (mono - last_check) // self._check_interval
+                if checks:
+                    # the monitors check once per monitor interval of
+                    # journal time
+                    self._lockstep.step()
+                    last_check += checks * self._check_interval
+            else:
+                if (self.max_idle is not None and last_input is not None
+                        and not motor_on
+                        and mono - last_input > self.max_idle):
+                    lag -= (mono - last_input - self.max_idle) / self.speed
+                edge_time = start + lag + (mono - start_time) / self.speed
+                delay = edge_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # behind, carry on from now so the edge spacing isn't
+                    # squeezed catching up
+                    lag -= delay
+                    edge_time -= delay
+                self._edge_time = edge_time
+            last_input = mono
+            self._journal_time = mono
+            inputs += 1
+            if kind == JournalEvent.COMMAND:
+                if code == DomeCommand.PARK:
+                    # the park goto is in the journal, the dome is parked
+                    # when it ends
+                    parking = True
+                else:
+                    calls.append(commands.submit(self._command, dome, code,
+                                                 state, value))
+            elif kind == JournalEvent.HOME_EDGE:
+                _drive(dome._home_sensor_pin, state)
+            elif code == QUADRATURE_EDGE:
+                # quadrature state, channel A in bit 1 and B in bit 0
+                _drive(dome._encoder_pin, state & 0b10)
+                _drive(dome._encoder_b_pin, state & 1)
+            else:
+                _drive(dome._encoder_pin, state)
+        commands.shutdown()
+        for call in calls:
+            # raise any exception from a command
+            call.result()
+        elapsed = time.monotonic() - start
+        replayed = recorder.array()
+        recorded = np.array(decisions, dtype=RECORD_DTYPE)
+        dome.journal = None
+        rotation_ticks = dome._degrees_to_ticks(360)
+        dome.abort()
+        return ReplayResult(
+            recorded, replayed,
+            compare_decisions(recorded, replayed, self.count_tolerance,
+                              rotation_ticks and round(rotation_ticks)),
+            inputs, missed, elapsed, self._journal_time - start_time,
+            stopped_at)
+
+    def _make_dome(self):
+        kwargs = dict(self.config)
+        home_azimuth = kwargs.pop('home_azimuth', 0)
+        self._check_interval = kwargs.get('monitor_interval', 0.1)
+        if self.speed is None:
+            # the edge timestamps run ahead of the clock
+            kwargs.update(stall_min_time=np.inf, interpolate_az=False)
+        else:
+            defaults = dict(monitor_interval=0.1, stall_min_time=2.0,
+                            debounce_interval=0.0)
+            for name in TIME_CONSTANTS:
+                kwargs[name] = kwargs.get(name, defaults[name]) / self.speed
+        # the edges are fed as recorded, after the gpiozero bounce filter
+        kwargs.update(testing=True, debug_lights=False, logo=False,
+                      pin_factory=None, bounce_time=None, journal_dir=None,
+                      log_file_level='WARNING', log_stderr_level='ERROR')
+        dome = Dome(home_azimuth, **kwargs)
+        self._lockstep = None
+        if self.speed is None:
+            # a monitor is started, or about to be, while the dome turns
+            self._lockstep = dome._abort_event = LockstepEvent(
+                lambda: dome._rotation_relay.is_active)
+        # the journal provides the edges, not the testing mode simulation
+        dome.testing = False
+        self._stamp_edges(dome)
+        return dome
+
+    def _wait_for_decision(self, recorder, key):
+        """Wait for the dome to make a recorded decision."""
+        if self._lockstep is None:
+            return recorder.wait_for(key, self.decision_timeout)
+        deadline = time.monotonic() + self.decision_timeout
+        while not recorder.wait_for(key, 0.001):
+            if time.monotonic() > deadline:
+                return False
+            # journal time stands still until the dome decides
+            self._lockstep.step()
+        return True
+
+    def _stamp_edges(self, dome):
+        """Pass the replay edge times to the dome's pin callbacks."""
+        def stamped(callback):
+            def callback_with_time():
+                callback(edge_time=self._edge_time)
+            return callback_with_time
+
+        if dome._encoder_b is not None:
+            for channel in (dome._encoder, dome._encoder_b):
+                channel.when_activated = stamped(dome._quadrature_edge)
+                channel.when_deactivated = stamped(dome._quadrature_edge)
+        elif dome._encoder_dual_edge:
+            dome._encoder.when_activated = stamped(dome._increment_count)
+            dome._encoder.when_deactivated = stamped(dome._count_deactivation)
+        else:
+            dome._encoder.when_activated = stamped(dome._increment_count)
+            dome._encoder.when_deactivated = stamped(
+                dome._turn_off_input_1_led)
+        dome._home_sensor.when_activated = stamped(dome._set_at_home)
+        dome._home_sensor.when_deactivated = stamped(dome._set_not_home)
+
+    def _set_initial_state(self, dome, records):
+        """Start the dome homed at the first recorded encoder count."""
+        count = 0
+        for record in records:
+            if record['kind'] == JournalEvent.ENCODER_COUNT:
+                count = int(record['count']) - int(record['state'])
+                break
+            if record['kind'] in _COUNTED:
+                count = int(record['count'])
+                break
+        home_edges = np.flatnonzero(records['kind'] == JournalEvent.HOME_EDGE)
+        if len(home_edges):
+            first = home_edges[0]
+            level = records[first]['state']
+            starts = np.flatnonzero(
+                (records['kind'] == JournalEvent.ROTATION_RELAY)
+                & (records['state'] == 1))
+            if len(starts) and starts[0] < first:
+                # a real edge, the sensor was at the other level before
+                level = not level
+            # otherwise the dome read the sensor as it started
+            _drive(dome._home_sensor_pin, level)
+        dome._unhomed = False
+        dome._encoder_count = count
+
+    def _command(self, dome, code, state, value):
+        """Call a recorded command."""
+        if code == DomeCommand.GOTO:
+            if state and dome.dome_az is not None:
+                dome._pre_rotate(value)
+            else:
+                dome.goto_az(value)
+        elif code == DomeCommand.FIND_HOME:
+            dome.find_home()
+        elif code == DomeCommand.UNPARK:
+            dome.unpark()
+        elif code == DomeCommand.ABORT:
+            dome.abort()
+        elif code == DomeCommand.SYNC:
+            dome.sync(value)
+
+
+def _drive(pin, level):
+    """Drive a mock pin to a level if it isn't there already."""
+    if bool(level) != bool(pin.state):
+        if level:
+            pin.drive_high()
+        else:
+            pin.drive_low()
@@ -0,0 +1,370 @@
+"""Latency statistics for the dome RPC server.
+
+`StatsInterceptor` is a gRPC server interceptor that times every call
+twice: the queue wait, from the call arriving (the interceptor runs on the
+server's polling thread) to a thread pool worker starting the handler, and
+the handler time. Each is recorded in a `LatencyHistogram` per RPC, along
+with a count of the return codes sent back.
+
+The histograms follow HdrHistogram: values are kept in microseconds in
+buckets that are linear up to `sub_bucket_count` and then double in width,
+with `sub_bucket_count` sub-buckets each, so recording is a few integer
+operations and the relative error of any percentile is bounded by the
+number of significant figures, independent of the number of calls.
+"""
+
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import suppress
+from itertools import accumulate
+
+import grpc
+
+# RPCs traced by default, the polling RPCs would flood the trace buffer
+TRACED_METHODS = ('dapiGotoAzEl', 'dapiAbort', 'dapiPark', 'dapiUnpark',
+                  'dapiFindHome', 'dapiSync', 'SubmitPlan', 'RunSequence')
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latencies with log-linear buckets (HdrHistogram style).
+
+    Parameters
+    ----------
+    highest : float
+        Highest latency to track in seconds, larger values are clamped.
+    significant_figures : int
+        Decimal significant figures of precision to keep.
+
+    """
+
+    def __init__(self, highest=3600.0, significant_figures=2):
+        sub_bucket_count = 2 * 10 ** significant_figures
+        self._sub_bits = math.ceil(math.log2(sub_bucket_count))
+        self._sub_count = 2 ** self._sub_bits
+        self._half_count = self._sub_count // 2
+        self._highest = int(highest * 1e6)
+        self._counts = [0] * (self._index(self._highest) + 1)
+        # highest bucket recorded to, percentile searches stop there, and
+        # the last percentiles calculated, reused until the count changes
+        self._max_index = 0
+        self._percentiles_cache = (None, None, None)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        """Bucket index of an integer value in microseconds."""
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self._sub_bits
+        return self._sub_count + (shift - 1) * self._half_count + \
+            (value >> shift) - self._half_count
+
+    def _value(self, index):
+        """Midpoint in microseconds of the bucket at index."""
+        if index < self._sub_count:
+            return index
+        shift, offset = divmod(index - self._sub_count, self._half_count)
+        shift += 1
+        return ((offset + self._half_count) << shift) + (1 << shift) / 2
+
+    def record(self, seconds):
+        """Record a latency in seconds."""
+        value = min(max(int(seconds * 1e6), 0), self._highest)
+        index = self._index(value)
+        with self._lock:
+            self._counts[index] += 1
+            if index > self._max_index:
+                self._max_index = index
+            self.count += 1
+            self.total += seconds
+            if self.min is None or seconds < self.min:
+                self.min = seconds
+            if self.max is None or seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q):
+        """
+        Latency at percentile q.
+
+        Parameters
+        ----------
+        q : float
+            Percentile, 0 to 100.
+
+        Returns
+        -------
+        float
+            Latency in seconds, None if nothing has been recorded.
+
+        """
+        return self.percentiles([q])[0]
+
+    def percentiles(self, qs):
+        """
+        Latencies at several percentiles, from one cumulative sum of the
+        buckets.
+
+        Parameters
+        ----------
+        qs : list
+            Percentiles, 0 to 100.
+
+        Returns
+        -------
+        list
+            Latencies in seconds, None if nothing has been recorded.
+
+        """
+        count = self.count
+        if not count:
+            return [None] * len(qs)
+        qs = tuple(qs)
+        cached_count, cached_qs, cached_values = self._percentiles_cache
+        if cached_count == count and cached_qs == qs:
+            return list(cached_values)
+        cumulative = list(accumulate(self._counts[:self._max_index + 1]))
+        values = []
+        for q in qs:
+            rank = max(math.ceil(q / 100 * count), 1)
+            index = bisect_left(cumulative, rank)
+            if index == len(cumulative):
+                values.append(self.max)
+                continue
+            values.append(min(max(self._value(index) / 1e6, self.min),
+                              self.max))
+        self._percentiles_cache = (count, qs, values)
+        return list(values)
+
+    @property
+    def mean(self):
+        """Mean latency in seconds, None if nothing has been recorded."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        """
+        Summary of the histogram.
+
+        Returns
+        -------
+        dict
+            count, min, mean, max and the percentiles (keyed as eg 'p99'),
+            in seconds.
+
+        """
+        summary = dict(count=self.count, min=self.min, mean=self.mean,
+                       max=self.max)
+        for q, value in zip(percentiles, self.percentiles(percentiles)):
+            summary[f'p{q:g}'.replace('.', '')] = value
+        return summary
+
+
+class RpcStats(object):
+    """
+    Queue wait and handler time histograms and return code counts per RPC.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._queue = dict()
+        self._handler = dict()
+        self._return_codes = dict()
+
+    def _method(self, method):
+        with self._lock:
+            if method not in self._handler:
+                self._queue[method] = LatencyHistogram()
+                self._handler[method] = LatencyHistogram()
+                self._return_codes[method] = Counter()
+
+    def record(self, method, queue_wait, handler_time, return_code):
+        """
+        Record a call.
+
+        Parameters
+        ----------
+        method : str
+            Name of the RPC.
+        queue_wait : float
+            Seconds the call waited for a worker thread.
+        handler_time : float
+            Seconds spent in the handler.
+        return_code : int
+            Return code sent back, None if the handler raised an exception.
+
+        """
+        if method not in self._handler:
+            self._method(method)
+        self._queue[method].record(queue_wait)
+        self._handler[method].record(handler_time)
+        with self._lock:
+            self._return_codes[method][return_code] += 1
+
+    def histograms(self, kind='handler'):
+        """
+        Latency histograms of each RPC.
+
+        Parameters
+        ----------
+        kind : str
+            'handler' for the handler time, 'queue' for the queue wait.
+
+        Returns
+        -------
+        dict
+            LatencyHistogram keyed by RPC.
+
+        """
+        with self._lock:
+            return dict(self._handler if kind == 'handler' else self._queue)
+
+    def return_codes(self):
+        """
+        Return code counts of each RPC.
+
+        Returns
+        -------
+        dict
+            Dictionary keyed by RPC of the counts keyed by return code (None
+            for exceptions).
+
+        """
+        with self._lock:
+            return {method: dict(counts) for method, counts
+                    in self._return_codes.items()}
+
+    def summary(self):
+        """
+        Summary of all RPCs.
+
+        Returns
+        -------
+        dict
+            Dictionary keyed by RPC of dictionaries with the queue and
+            handler histogram summaries and the return code counts (None
+            for exceptions).
+
+        """
+        return_codes = self.return_codes()
+        return {method: dict(queue=self._queue[method].summary(),
+                             handler=self._handler[method].summary(),
+                             return_codes=return_codes[method])
+                for method in return_codes}
+
+    def log_summary(self, logger):
+        """Log a line per RPC with its call count and latencies."""
+        for method, stats in self.summary().items():
+            queue, handler = stats['queue'], stats['handler']
+            codes = ', '.join(f'{code}: {count}' for code, count
+                              in stats['return_codes'].items())
+            logger.notice(
+                (f'RPC {method}: {handler["count"]} calls, handler '
+                 f'p50={handler["p50"] * 1e3:.2f}ms '
+                 f'p99={handler["p99"] * 1e3:.2f}ms '
+                 f'max={handler["max"] * 1e3:.2f}ms, queue '
+                 f'p50={queue["p50"] * 1e3:.2f}ms '
+                 f'p99={queue["p99"] * 1e3:.2f}ms, return codes {{{codes}}}'))
+
+
+class StatsInterceptor(grpc.ServerInterceptor):
+    """
+    gRPC server interceptor recording call latencies in an RpcStats.
+
+    Unary responses are timed to the handler returning. Streaming responses
+    are timed to the end of the stream and counted under the first non-zero
+    return code in the stream (or 0).
+
+    If a tracer is given, calls to traced_methods are traced with an
+    'rpc <method>' span from the call arriving, which is the current span
+    while the handler runs so the spans the handler starts are its children.
+
+    Parameters
+    ----------
+    stats : RpcStats
+        Statistics to record to, a new RpcStats by default.
+    tracer : tracing.Tracer
+        Tracer for the RPC spans, None to not trace.
+    traced_methods : tuple
+        Names of the RPCs to trace.
+
+    """
+
+    def __init__(self, stats=None, tracer=None,
+                 traced_methods=TRACED_METHODS):
+        self.stats = RpcStats() if stats is None else stats
+        self.tracer = tracer
+        self.traced_methods = traced_methods
+
+    def _span(self, method, arrival, start):
+        """Context manager for the span of a call, if it is traced."""
+        if self.tracer is None or method not in self.traced_methods:
+            return suppress()
+        return self.tracer.span(f'rpc {method}', start=arrival,
+                                queue_wait=start - arrival)
+
+    def intercept_service(self, continuation, handler_call_details):
+        arrival = time.monotonic()
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method.rsplit('/', 1)[-1]
+        stats = self.stats
+        if handler.unary_unary is not None:
+            behaviour = handler.unary_unary
+
+            def unary_unary(request, context):
+                start = time.monotonic()
+                return_code = None
+                try:
+                    with self._span(method, arrival, start) as span:
+                        response = behaviour(request, context)
+                        return_code = getattr(response, 'return_code', 0)
+                        if span is not None:
+                            span.set(return_code=return_code)
+                    return response
+                finally:
+                    stats.record(method, start - arrival,
+                                 time.monotonic() - start, return_code)
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer)
+        if handler.unary_stream is not None:
+            behaviour = handler.unary_stream
+
+            def unary_stream(request, context):
+                start = time.monotonic()
+                return_code = None
+                try:
+                    return_code = 0
+                    with self._span(method, arrival, start) as span:
+                        for response in behaviour(request, context):
+                            if not return_code:
+                                return_code = getattr(response,
+                                                      'return_code', 0)
+                            yield response
+                        if span is not None:
+                            span.set(return_code=return_code)
+                except Exception:
+                    return_code = None
+                    raise
+                finally:
+                    stats.record(method, start - arrival,
+                                 time.monotonic() - start, return_code)
+
+            return grpc.unary_stream_rpc_method_handler(
+                unary_stream,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer)
+        return handler
@@ -0,0 +1,29 @@
+"""Waypoint sequences run by the dome, eg for dome flat scans."""
+
+
+class Waypoint(object):
+    """
+    A step of a waypoint sequence.
+
+    Parameters
+    ----------
+    az : float
+        Dome azimuth in degrees.
+    dwell : float
+        Time in seconds to hold the dome at the waypoint. With no dwell the
+        dome passes through the waypoint without stopping if the next one is
+        further on in the same direction.
+    tolerance : float
+        Tolerance in degrees for reaching the waypoint, None for the dome's
+        az_position_tolerance.
+
+    """
+
+    def __init__(self, az, dwell=0.0, tolerance=None):
+        self.az = float(az) % 360
+        self.dwell = float(dwell)
+        self.tolerance = None if tolerance is None else float(tolerance)
+
+    def __repr__(self):
+        return (f'Waypoint(az={self.az:.2f}, dwell={self.dwell}, '
+                f'tolerance={self.tolerance})')
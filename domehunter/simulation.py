@@ -0,0 +1,293 @@
+"""Helpers for simulating dome hardware in testing mode."""
+
+
+import threading
+import time
+
+import numpy as np
+
+
+class EdgeNoise(object):
+    """
+    Contact bounce and glitch generator for simulated encoder edges.
+
+    Every clean edge is followed by a burst of bounce toggles within
+    `bounce_duration`, and short glitch pulses arrive at random times at
+    `glitch_rate` per second.
+
+    Parameters
+    ----------
+    bounce_count : int
+        Maximum number of extra (opposite, then repeated) toggle pairs
+        following each clean edge. The number for each edge is drawn
+        uniformly between 0 and bounce_count.
+    bounce_duration : float
+        Time in seconds over which the bounce toggles are spread.
+    glitch_rate : float
+        Mean rate of glitch pulses per second.
+    glitch_width : float
+        Duration of a glitch pulse in seconds.
+    seed : int
+        Seed for the random number generator.
+
+    """
+
+    def __init__(self,
+                 bounce_count=3,
+                 bounce_duration=0.0005,
+                 glitch_rate=0.0,
+                 glitch_width=0.00005,
+                 seed=None):
+        self.bounce_count = bounce_count
+        self.bounce_duration = bounce_duration
+        self.glitch_rate = glitch_rate
+        self.glitch_width = glitch_width
+        self._rng = np.random.default_rng(seed)
+
+    def bounce_offsets(self):
+        """Return sorted offsets (seconds) of the bounce toggles after an edge.
+
+        There is always an even number of toggles, alternating away from and
+        back to the level of the clean edge.
+        """
+        num_bounces = self._rng.integers(0, self.bounce_count + 1)
+        return np.sort(self._rng.uniform(0, self.bounce_duration,
+                                         2 * num_bounces))
+
+    def drive(self, pin, level):
+        """Drive a mock pin to a level with contact bounce.
+
+        Parameters
+        ----------
+        pin : gpiozero.pins.mock.MockPin
+            The mock pin to drive.
+        level : bool
+            The level to finish on.
+
+        """
+        if bool(pin.state) == level:
+            # no edge, so no bounce
+            return
+        drives = (pin.drive_high, pin.drive_low)
+        if not level:
+            drives = drives[::-1]
+        drives[0]()
+        start = time.monotonic()
+        for i, offset in enumerate(self.bounce_offsets()):
+            delay = start + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # odd toggles move away from the level, even ones return
+            drives[(i + 1) % 2]()
+
+    def glitch(self, pin, duration):
+        """Inject random glitch pulses on a mock pin over a period of time.
+
+        Parameters
+        ----------
+        pin : gpiozero.pins.mock.MockPin
+            The mock pin to glitch, it is returned to its original level.
+        duration : float
+            Period in seconds over which glitches may occur, the call sleeps
+            for at least this long.
+
+        """
+        start = time.monotonic()
+        num_glitches = self._rng.poisson(self.glitch_rate * duration)
+        for offset in np.sort(self._rng.uniform(0, duration, num_glitches)):
+            delay = start + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            level = pin.state
+            self.drive(pin, not level)
+            time.sleep(self.glitch_width)
+            self.drive(pin, level)
+        delay = start + duration - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def apply(self, edge_times, duration=None):
+        """Add bounce and glitches to a stream of clean rising edge times.
+
+        The signal is assumed to have a 50% duty cycle, so each rising edge
+        is followed by a falling edge half way to the next.
+
+        Parameters
+        ----------
+        edge_times : array_like
+            Times of the clean rising edges in seconds.
+        duration : float
+            Length of the stream in seconds, defaults to the last edge time.
+
+        Returns
+        -------
+        times : numpy.ndarray
+            Sorted times of all edges in the noisy signal.
+        levels : numpy.ndarray
+            Boolean level after each edge, True for a rising edge.
+
+        """
+        edge_times = np.asarray(edge_times, dtype=float)
+        if duration is None:
+            duration = edge_times[-1] if len(edge_times) else 0
+        half_periods = np.diff(edge_times, append=edge_times[-1:]) / 2
+        falling = (edge_times + half_periods)[:-1]
+        times = [edge_times, falling]
+        levels = [np.ones(len(edge_times), bool), np.zeros(len(falling), bool)]
+        for clean_edges, level in ((edge_times, True), (falling, False)):
+            for edge_time in clean_edges:
+                offsets = self.bounce_offsets()
+                times.append(edge_time + offsets)
+                # alternate away from and back to the clean level
+                levels.append(np.arange(len(offsets)) % 2 == int(level))
+        num_glitches = self._rng.poisson(self.glitch_rate * duration)
+        glitches = np.sort(self._rng.uniform(0, duration, num_glitches))
+        # level of the clean signal at each glitch
+        index = np.searchsorted(edge_times, glitches) - 1
+        glitch_levels = ((index >= 0) & (
+            glitches - edge_times[index] < half_periods[index]))
+        times.extend([glitches, glitches + self.glitch_width])
+        levels.extend([~glitch_levels, glitch_levels])
+        times = np.concatenate(times)
+        levels = np.concatenate(levels)
+        order = np.argsort(times, kind='stable')
+        return times[order], levels[order]
+
+
+class FakeSN3218(object):
+    """
+    Stand-in for the sn3218 LED driver module that counts I2C writes.
+
+    Parameters
+    ----------
+    write_time : float
+        Time in seconds each write blocks for, roughly 0.5 ms for the bytes
+        sent by enable_leds() on a 100 kHz I2C bus.
+
+    """
+
+    def __init__(self, write_time=0.0005):
+        self.write_time = write_time
+        self.writes = 0
+        self.mask = 0
+        self.enabled = False
+
+    def _i2c_write(self):
+        self.writes += 1
+        if self.write_time:
+            time.sleep(self.write_time)
+
+    def enable_leds(self, mask):
+        self.mask = mask
+        self._i2c_write()
+
+    def output(self, values):
+        self._i2c_write()
+
+    def enable(self):
+        self.enabled = True
+        self._i2c_write()
+
+    def disable(self):
+        self.enabled = False
+        self._i2c_write()
+
+
+class BacklashPlant(object):
+    """
+    Simulated dome drive with backlash, driving a Dome's mock pins.
+
+    A thread turns the motor one encoder tick every 1 / tick_rate seconds
+    while the rotation relay is on, in the direction set by the direction
+    relay, and pulses the encoder pin for each tick. The dome ring follows
+    the motor through a dead band: turning clockwise it lags the motor by
+    `backlash` ticks, turning anticlockwise it is level with it. The home
+    sensor pin is driven from the ring position, so the dome should be
+    created with testing=True and then have `testing` set to False, so that
+    it doesn't simulate ticks of its own.
+
+    Parameters
+    ----------
+    dome : Dome
+        Dome with mock pins to drive.
+    backlash : float
+        Lost motion of the drive in encoder ticks.
+    tick_rate : float
+        Encoder ticks per second while the motor is on.
+    ticks_per_rotation : int
+        Encoder ticks per rotation of the ring.
+    home_width : int
+        Width of the home sensor in ticks, starting at ring position 0.
+    start : float
+        Starting ring position in ticks.
+    spin_up : float
+        Time in seconds from the rotation relay switching on to the first
+        tick.
+
+    """
+
+    def __init__(self,
+                 dome,
+                 backlash=4.0,
+                 tick_rate=300.0,
+                 ticks_per_rotation=720,
+                 home_width=2,
+                 start=0.0,
+                 spin_up=0.0):
+        self.dome = dome
+        self.spin_up = spin_up
+        self.backlash = backlash
+        self.period = 1 / tick_rate
+        self.ticks_per_rotation = ticks_per_rotation
+        self.home_width = home_width
+        # the slack starts taken up clockwise
+        self.ring = float(start)
+        self.motor = self.ring + backlash
+        self._running = True
+        self._update_home()
+        self._thread = threading.Thread(target=self._run,
+                                        name='backlash-plant',
+                                        daemon=True)
+        self._thread.start()
+
+    def ring_degrees(self):
+        """Ring position in degrees clockwise from the home sensor."""
+        return 360 * (self.ring % self.ticks_per_rotation) / \
+            self.ticks_per_rotation
+
+    def close(self):
+        """Stop the plant thread."""
+        self._running = False
+        self._thread.join()
+
+    def _update_home(self):
+        at_home = self.ring % self.ticks_per_rotation < self.home_width
+        pin = self.dome._home_sensor_pin
+        if at_home and not pin.state:
+            pin.drive_high()
+        elif not at_home and pin.state:
+            pin.drive_low()
+
+    def _run(self):
+        relay = self.dome._rotation_relay
+        direction_relay = self.dome._direction_relay
+        pin = self.dome._encoder_pin
+        next_tick = None
+        while self._running:
+            now = time.monotonic()
+            if not relay.is_active:
+                next_tick = None
+            elif next_tick is None:
+                next_tick = now + self.spin_up + self.period
+            elif now >= next_tick:
+                if direction_relay.is_active:
+                    self.motor += 1
+                    self.ring = max(self.ring, self.motor - self.backlash)
+                else:
+                    self.motor -= 1
+                    self.ring = min(self.ring, self.motor)
+                pin.drive_high()
+                pin.drive_low()
+                self._update_home()
+                next_tick += self.period
+            time.sleep(self.period / 10)
@@ -0,0 +1,136 @@
+import time
+
+import numpy as np
+import pytest
+import astropy.units as u
+from astropy.coordinates import Longitude
+from domehunter.calibration import (AzimuthTable, BacklashModel,
+                                    load_calibration, save_calibration)
+from domehunter.dome_control import Dome, load_dome_config
+from domehunter.enumerations import Direction
+
+
+@pytest.fixture
+def non_uniform_table(scope='function'):
+    # slower drive ratio over the first half of the ring
+    return AzimuthTable([1.0] * 18 + [2.0] * 18)
+
+
+def test_uniform_table():
+    table = AzimuthTable([1.5] * 36)
+    assert table.ticks_per_rotation == pytest.approx(240)
+    assert table.ticks_to_degrees(10) == pytest.approx(15)
+    assert table.ticks_to_degrees(-10) == pytest.approx(-15)
+    assert table.degrees_to_ticks(15) == pytest.approx(10)
+
+
+def test_non_uniform_table(non_uniform_table):
+    assert non_uniform_table.ticks_per_rotation == pytest.approx(270)
+    assert non_uniform_table.ticks_to_degrees(180) == pytest.approx(180)
+    assert non_uniform_table.ticks_to_degrees(225) == pytest.approx(270)
+    for degrees in np.linspace(0, 359, 50):
+        ticks = non_uniform_table.degrees_to_ticks(degrees)
+        assert non_uniform_table.ticks_to_degrees(ticks) == pytest.approx(
+            degrees)
+
+
+def test_from_tick_times():
+    # two rotations at a constant rate, ticks twice as dense in the first half
+    tick_az = np.concatenate((np.arange(1, 181, 1.0),
+                              np.arange(182, 361, 2.0)))
+    tick_times = np.concatenate((tick_az, tick_az + 360))
+    table = AzimuthTable.from_tick_times(tick_times, [0, 360, 720],
+                                         num_bins=4)
+    assert table.bin_degrees_per_tick == pytest.approx([1, 1, 2, 2])
+
+
+def test_calibration_file(tmpdir, non_uniform_table):
+    calibration_path = str(tmpdir.join('dome_calibration.yml'))
+    assert load_calibration(calibration_path) == dict()
+    save_calibration(calibration_path, az_table=non_uniform_table.to_dict())
+    dome = Dome(0, testing=True, debug_lights=False,
+                calibration_path=calibration_path)
+    assert dome.degrees_per_tick.degree == pytest.approx(360 / 270)
+    assert dome._ticks_to_az(225) == Longitude(270 * u.deg)
+    assert dome._az_to_ticks(Longitude(270 * u.deg)) == pytest.approx(225)
+
+
+def test_calibration_path(tmpdir, monkeypatch):
+    config_path = str(tmpdir.join('config.yml'))
+    with open(config_path, 'w') as f:
+        f.write("calibration_file: 'dome_calibration.yml'\n")
+    # relative to the log directory by default
+    monkeypatch.setenv('PANLOG', str(tmpdir.join('logs')))
+    assert load_dome_config(config_path)['calibration_path'] == \
+        str(tmpdir.join('logs', 'dome_calibration.yml'))
+    with open(config_path, 'a') as f:
+        f.write(f"calibration_dir: '{tmpdir.join('data')}'\n")
+    assert load_dome_config(config_path)['calibration_path'] == \
+        str(tmpdir.join('data', 'dome_calibration.yml'))
+
+
+def test_backlash_from_home_passes():
+    # home centre at count 100 passing CW, 4 ticks lost each reversal and
+    # edges seen a tick late
+    passes = [(-1, 95), (1, 100), (-1, 95)]
+    backlash = BacklashModel.from_home_passes(passes)
+    assert backlash.cw_ticks == pytest.approx(4)
+    assert backlash.ccw_ticks == pytest.approx(4)
+    with pytest.raises(ValueError):
+        BacklashModel.from_home_passes([(1, 100), (1, 100)])
+
+
+def test_backlash_compensation(tmpdir):
+    calibration_path = str(tmpdir.join('dome_calibration.yml'))
+    save_calibration(calibration_path,
+                     backlash=BacklashModel(4, 4).to_dict())
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1,
+                calibration_path=calibration_path)
+    dome._unhomed = False
+    dome._encoder_count = 50
+    # reversing to CCW, the first 4 ticks don't move the dome
+    for _ in range(6):
+        dome._count_step(-1)
+    assert dome.encoder_count == 44
+    assert dome.dome_az.degree == pytest.approx(48)
+    assert dome._az_to_ticks(Longitude(48 * u.deg)) == pytest.approx(44)
+    # a partial reversal only has the slack taken up so far to take up
+    dome._count_step(1)
+    dome._count_step(1)
+    assert dome.dome_az.degree == pytest.approx(48)
+    for _ in range(4):
+        dome._count_step(-1)
+    assert dome.dome_az.degree == pytest.approx(46)
+
+
+def test_one_sided_approach():
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1,
+                approach_direction='CW', approach_overshoot=3)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(90 * u.deg)
+    dome._encoder_count = 90
+    stops = []
+    reversals = []
+    relay_off = dome._rotation_relay.off
+    rotate_dome = dome._rotate_dome
+
+    def record_stop():
+        stops.append(time.monotonic())
+        relay_off()
+
+    def record_rotation(direction):
+        if direction == Direction.CW:
+            reversals.append(time.monotonic())
+        rotate_dome(direction)
+
+    dome._rotation_relay.off = record_stop
+    dome._rotate_dome = record_rotation
+    dome.goto_az(80)
+    assert dome.current_direction < 0
+    while dome.movement_thread_active:
+        time.sleep(0.1)
+    # overshot to 77 and came back clockwise
+    assert dome.last_direction > 0
+    assert dome.dome_az.degree == pytest.approx(80, abs=1.5)
+    # the dome was given time to stop before the direction relay switched
+    assert reversals[0] - stops[0] >= dome._monitor_interval
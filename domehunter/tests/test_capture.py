@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from domehunter.capture import PigpioEdgeCapture, make_pin_factory
+from domehunter.dome_control import Dome
+from domehunter.enumerations import Direction
+from domehunter.fake_pigpiod import FakePigpioDaemon
+
+
+@pytest.fixture
+def fake_pigpiod(scope='function'):
+    with FakePigpioDaemon() as daemon:
+        yield daemon
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_make_pin_factory():
+    assert type(make_pin_factory('mock')).__name__ == 'MockFactory'
+    with pytest.raises(ValueError):
+        make_pin_factory('wiringpi')
+
+
+def test_edge_capture(fake_pigpiod):
+    batches = []
+    capture = PigpioEdgeCapture([26], batches.append, port=fake_pigpiod.port)
+    try:
+        pin = fake_pigpiod.pin(26)
+        times = []
+        for _ in range(5):
+            times.append(time.monotonic())
+            pin.drive_high()
+            pin.drive_low()
+            time.sleep(0.005)
+        assert wait_for(lambda: capture.edges == 10)
+    finally:
+        capture.close()
+    edges = [edge for batch in batches for edge in batch]
+    assert [level for gpio, level, edge_time in edges] == [1, 0] * 5
+    # daemon timestamps are converted to the time.monotonic() timebase
+    for (gpio, level, edge_time), drive_time in zip(edges[::2], times):
+        assert edge_time == pytest.approx(drive_time, abs=0.002)
+
+
+def test_edge_capture_handler_error(fake_pigpiod):
+    batches = []
+
+    def handler(batch):
+        batches.append(batch)
+        if len(batches) == 1:
+            raise RuntimeError('Cannot infer the direction.')
+
+    capture = PigpioEdgeCapture([26], handler, port=fake_pigpiod.port)
+    try:
+        pin = fake_pigpiod.pin(26)
+        pin.drive_high()
+        assert wait_for(lambda: capture.lost_batches == 1)
+        # the capture thread carries on after the handler raised
+        pin.drive_low()
+        assert wait_for(lambda: len(batches) == 2)
+    finally:
+        capture.close()
+    assert batches[1][0][1] == 0
+
+
+def test_edge_capture_tick_wrap():
+    # the daemon tick wraps half a second after the daemon starts
+    with FakePigpioDaemon(start_tick=(1 << 32) - 500000) as daemon:
+        batches = []
+        capture = PigpioEdgeCapture([26], batches.append, port=daemon.port,
+                                    drain_interval=1.0, resync_interval=0.0)
+        pin = daemon.pin(26)
+        times = []
+        try:
+            # queued before the wrap, drained after a resync past it
+            for drive in (pin.drive_high, pin.drive_low):
+                times.append(time.monotonic())
+                drive()
+            assert daemon.tick() > 1 << 31
+            time.sleep(1.5)
+            assert daemon.tick() < 1 << 31
+            for drive in (pin.drive_high, pin.drive_low):
+                times.append(time.monotonic())
+                drive()
+            assert wait_for(lambda: capture.edges == 4, timeout=3)
+        finally:
+            capture.close()
+    edge_times = [edge_time for batch in batches
+                  for gpio, level, edge_time in batch]
+    assert edge_times == pytest.approx(times, abs=0.005)
+
+
+def test_pigpio_dome(fake_pigpiod):
+    dome = Dome(0, degrees_per_tick=1, testing=True, debug_lights=False,
+                pin_factory='pigpio', pigpio_port=fake_pigpiod.port)
+    dome._encoder_pin = fake_pigpiod.pin(26)
+    dome.current_direction = Direction.CW
+    dome._simulate_ticks(5)
+    assert wait_for(lambda: dome.encoder_count == 5)
+    dome._encoder_capture.close()
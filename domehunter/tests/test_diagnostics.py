@@ -0,0 +1,75 @@
+import os
+import signal
+import threading
+import time
+
+from domehunter.diagnostics import Diagnostics, StackSampler, thread_dump
+from domehunter.dome_control import Dome
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_thread_dump():
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1)
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name='busy')
+    thread.start()
+    try:
+        dump = thread_dump(dome)
+    finally:
+        stop.set()
+        thread.join()
+    assert "Thread 'busy'" in dump
+    assert 'in busy_loop' in dump
+    assert 'Dome state:' in dump
+    assert 'rotation_relay_on: False' in dump
+
+
+def test_stack_sampler():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name='busy')
+    thread.start()
+    sampler = StackSampler(interval=0.005)
+    sampler.start()
+    time.sleep(0.3)
+    sampler.stop()
+    stop.set()
+    thread.join()
+    assert not sampler.running
+    assert sampler.samples > 10
+    busy = sum(count for stack, count in sampler.counts.items()
+               if stack.startswith('busy;') and 'busy_loop' in stack)
+    assert busy >= sampler.samples - 2
+    report = sampler.report()
+    assert '[busy] busy_loop (test_diagnostics.py)' in report
+
+
+def test_diagnostics(tmpdir):
+    diagnostics = Diagnostics(log_dir=str(tmpdir))
+    path = diagnostics.profile(duration=0.2, interval=0.01)
+    assert diagnostics.profiling
+    # only one profile at a time
+    assert diagnostics.profile(duration=0.2) is None
+    time.sleep(0.5)
+    assert not diagnostics.profiling
+    with open(path) as f:
+        assert f.read().startswith('Profile of')
+    # long profiles are shortened
+    diagnostics.max_profile_duration = 0.1
+    path = diagnostics.profile(duration=1e6)
+    time.sleep(0.5)
+    assert not diagnostics.profiling
+    assert os.path.exists(path)
+    previous = diagnostics.install_signal_handlers()
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+        time.sleep(0.1)
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    dumps = [name for name in os.listdir(str(tmpdir))
+             if name.startswith('dome-threads-')]
+    assert len(dumps) == 1
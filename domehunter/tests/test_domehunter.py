@@ -1,9 +1,10 @@
 import pytest
+import threading
 import time
 import astropy.units as u
 from astropy.coordinates import Angle, Longitude
 from domehunter.dome_control import Dome
-from domehunter.enumerations import Direction
+from domehunter.enumerations import Direction, MoveResult, ReturnCode
 
 
 @pytest.fixture
@@ -61,6 +62,79 @@ def test_abort(dome_az_90):
     assert not dome_az_90.dome_in_motion
 
 
+def test_abort_latency(dome_az_90):
+    dome_az_90.goto_az(300)
+    time.sleep(0.3)
+    # abort doesn't wait for the monitor's next wake to stop the motor
+    dome_az_90.abort()
+    assert dome_az_90.last_abort_latency < 0.01
+    assert not dome_az_90.dome_in_motion
+    assert not dome_az_90._monitor_threads
+
+
+def test_concurrent_monitors(testing_dome):
+    stop = threading.Event()
+    starters = [threading.Thread(target=testing_dome._start_monitor,
+                                 args=(f'monitor-{i}', stop.is_set))
+                for i in range(20)]
+    for starter in starters:
+        starter.start()
+    for starter in starters:
+        starter.join()
+    # none of the monitors started at once is lost, so abort joins them all
+    assert len(testing_dome._monitor_threads) == 20
+    testing_dome.abort()
+    assert not testing_dome._monitor_threads
+
+
+def test_concurrent_gotos(dome_az_90):
+    gotos = [threading.Thread(target=dome_az_90.goto_az, args=(300,))
+             for i in range(20)]
+    for goto in gotos:
+        goto.start()
+    for goto in gotos:
+        goto.join()
+    # only one of the gotos started at once claims the dome
+    assert dome_az_90.relay_cycles == 1
+    assert len(dome_az_90._monitor_threads) == 1
+    dome_az_90.abort()
+    assert not dome_az_90.movement_thread_active
+
+
+def test_stall(testing_dome):
+    testing_dome.stall_min_time = 0.1
+    testing_dome.stall_factor = 2
+    # the motor runs but the encoder never ticks
+    testing_dome._move_event.set()
+    testing_dome._rotate_dome(Direction.CW)
+    monitor = testing_dome._start_monitor('test-monitor',
+                                          testing_dome._find_home_complete)
+    monitor.join(2)
+    assert testing_dome.last_move_result == MoveResult.STALLED
+    assert testing_dome.last_move_result.return_code == \
+        ReturnCode.ERR_NORESPONSE
+    assert not testing_dome.dome_in_motion
+
+
+def test_move_deadline(dome_az_90):
+    dome_az_90.stall_min_time = 0.5
+    # measured tick interval much shorter than the simulated ticks
+    dome_az_90._tick_interval = 0.01
+    dome_az_90.goto_az(300)
+    assert dome_az_90.last_move_result == MoveResult.IN_PROGRESS
+    dome_az_90._monitor_threads[0].join(3)
+    assert dome_az_90.last_move_result == MoveResult.TIMEOUT
+    assert not dome_az_90.dome_in_motion
+
+
+def test_rejected_move_result(dome_az_90):
+    dome_az_90.park()
+    dome_az_90.last_move_result = MoveResult.STALLED
+    # a rejected goto doesn't report the result of the move before it
+    dome_az_90.goto_az(120)
+    assert dome_az_90.last_move_result is None
+
+
 def test_park(dome_az_90):
     assert not dome_az_90.is_parked
 
@@ -93,6 +167,7 @@ def test_goto_az(dome_az_90):
         time.sleep(1)
     assert dome_az_90.dome_az == Angle(310 * u.deg)
     assert dome_az_90.encoder_count == -5
+    assert dome_az_90.last_move_result == MoveResult.COMPLETE
     dome_az_90.goto_az(2)
     while dome_az_90.movement_thread_active:
         time.sleep(1)
@@ -100,6 +175,23 @@ def test_goto_az(dome_az_90):
     assert dome_az_90.encoder_count == -1
 
 
+def test_goto_az_slit_tolerance(dome_az_90):
+    dome_az_90.slit_width = 1.0
+    dome_az_90.dome_radius = 2.5
+    dome_az_90.telescope_aperture = 0.4
+    # the tolerance widens towards the zenith
+    assert dome_az_90.slit_az_tolerance(80) > Angle(40 * u.deg)
+    assert dome_az_90.slit_az_tolerance(10) == dome_az_90.az_position_tolerance
+    dome_az_90.goto_az(130, el=80)
+    assert not dome_az_90.movement_thread_active
+    assert dome_az_90.moves_avoided == 1
+    assert dome_az_90.dome_az == Angle(90 * u.deg)
+    dome_az_90.goto_az(130, el=10)
+    assert dome_az_90.movement_thread_active
+    dome_az_90.abort()
+    assert dome_az_90.moves_avoided == 1
+
+
 @pytest.mark.calibrate
 def test_calibrate_dome_encoder_counts(testing_dome):
     testing_dome.calibrate_dome_encoder_counts()
@@ -130,3 +222,19 @@ def test_increment_count(dome_az_90, current_dir, last_dir):
     dome_az_90.last_direction = last_dir
     dome_az_90._increment_count()
     assert dome_az_90.encoder_count == expected
+
+
+def test_interpolate_az(dome_az_90):
+    dome_az_90.interpolate_az = True
+    # not rotating, so no interpolation
+    dome_az_90._update_tick_interval(time.monotonic())
+    assert dome_az_90.dome_az == Longitude(90 * u.deg)
+    dome_az_90.current_direction = Direction.CW
+    dome_az_90._rotation_relay.on()
+    dome_az_90._tick_interval = 1.0
+    dome_az_90._last_tick_time = time.monotonic() - 0.5
+    assert 94 < dome_az_90.dome_az.degree < 96
+    # offset is clamped to one tick
+    dome_az_90._last_tick_time = time.monotonic() - 5
+    assert dome_az_90.dome_az == Longitude(100 * u.deg)
+    dome_az_90._rotation_relay.off()
@@ -0,0 +1,94 @@
+import pytest
+from domehunter.dome_control import Dome
+from domehunter.encoder import (EdgeDebouncer, quadrature_sequence,
+                                quadrature_state, quadrature_step)
+from domehunter.enumerations import Direction
+from domehunter.simulation import EdgeNoise
+
+
+@pytest.fixture
+def quadrature_dome(scope='function'):
+    dome = Dome(0, degrees_per_tick=1, testing=True, debug_lights=False,
+                encoder_b_pin_number=21)
+    return dome
+
+
+def drive_cycle(dome, direction):
+    pins = {'A': dome._encoder_pin, 'B': dome._encoder_b_pin}
+    for channel, level in quadrature_sequence(direction):
+        if level:
+            pins[channel].drive_high()
+        else:
+            pins[channel].drive_low()
+
+
+@pytest.mark.parametrize("direction", [Direction.CW, Direction.CCW])
+def test_quadrature_step(direction):
+    state = quadrature_state(False, False)
+    steps = []
+    a, b = False, False
+    for channel, level in quadrature_sequence(direction):
+        if channel == 'A':
+            a = level
+        else:
+            b = level
+        new_state = quadrature_state(a, b)
+        steps.append(quadrature_step(state, new_state))
+        state = new_state
+    assert steps == [direction.value] * 4
+    # both channels changing is a missed edge
+    assert quadrature_step(0b00, 0b11) == 0
+
+
+def test_quadrature_dome(quadrature_dome):
+    # direction comes from the encoder, not the direction relay
+    quadrature_dome.current_direction = Direction.NONE
+    quadrature_dome.last_direction = Direction.NONE
+    drive_cycle(quadrature_dome, Direction.CW)
+    assert quadrature_dome.encoder_count == 4
+    assert quadrature_dome.encoder_direction == Direction.CW
+    drive_cycle(quadrature_dome, Direction.CCW)
+    drive_cycle(quadrature_dome, Direction.CCW)
+    assert quadrature_dome.encoder_count == -4
+    assert quadrature_dome.encoder_direction == Direction.CCW
+
+
+def test_dual_edge_dome():
+    dome = Dome(0, degrees_per_tick=1, testing=True, debug_lights=False,
+                encoder_dual_edge=True)
+    dome.current_direction = Direction.CW
+    dome._encoder_pin.drive_high()
+    dome._encoder_pin.drive_low()
+    assert dome.encoder_count == 2
+
+
+def test_edge_debouncer():
+    debouncer = EdgeDebouncer(min_interval=0.001, adaptive_fraction=0.3)
+    edges = []
+    for tick in range(10):
+        # clean rising edge with bounce, then a clean falling edge
+        edges += [(tick, True), (tick + 0.0002, False), (tick + 0.0004, True),
+                  (tick + 0.5, False)]
+    counted = [debouncer.accept(t, count=level) for t, level in edges]
+    assert sum(counted) == 10
+    assert debouncer.rejected == 10
+    assert debouncer.window == pytest.approx(0.3)
+    # a glitch close to the last counted edge is rejected
+    assert not debouncer.accept(9.6)
+
+
+def test_debounced_simulated_ticks():
+    dome = Dome(0, degrees_per_tick=1, testing=True, debug_lights=False,
+                debounce_interval=0.002, bounce_time=None)
+    noise = EdgeNoise(bounce_count=3, bounce_duration=0.001, seed=1)
+    dome.current_direction = Direction.CW
+    # the edges carry the simulated times, so a sleep that overruns can't
+    # stretch a bounce past the debounce window
+    times, levels = noise.apply([0.02 * tick for tick in range(1, 6)])
+    for edge_time, level in zip(times, levels):
+        if level:
+            dome._increment_count(edge_time=edge_time)
+        else:
+            dome._turn_off_input_1_led(edge_time=edge_time)
+    assert dome.encoder_count == 5
+    assert dome._encoder_debouncer.rejected > 0
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from domehunter.geometry import DomeGeometry, altaz_to_hadec
+
+LATITUDE = -31.27
+
+
+@pytest.fixture
+def offset_geometry(scope='function'):
+    return DomeGeometry(LATITUDE, 3.0, mount_offset=(0.3, -0.2, 0.5),
+                        dec_axis_offset=0.4, slit_width=1.0, aperture=0.3)
+
+
+def test_centred_telescope():
+    geometry = DomeGeometry(LATITUDE, 3.0)
+    alt = np.array([20, 45, 70])
+    az = np.array([10, 190, 300])
+    dome_az, dome_el = geometry.dome_azimuth_altaz(alt, az)
+    assert dome_az == pytest.approx(az)
+    assert dome_el == pytest.approx(alt)
+
+
+def test_altaz_to_hadec():
+    # a target on the meridian, north of the zenith from the south
+    ha, dec = altaz_to_hadec(60, 0, LATITUDE)
+    assert ha == pytest.approx(0)
+    assert dec == pytest.approx(LATITUDE + 30)
+
+
+def test_pier_side(offset_geometry):
+    # on the meridian the dec axis is horizontal east-west, so the two pier
+    # sides move the slit to either side of the meridian
+    az_east, _ = offset_geometry.dome_azimuth_hadec(0, -60, pier_side=1)
+    az_west, _ = offset_geometry.dome_azimuth_hadec(0, -60, pier_side=-1)
+    assert 90 < az_east < 180
+    assert 180 < az_west < 270
+
+
+def test_vectorized(offset_geometry):
+    rng = np.random.default_rng(0)
+    ha = rng.uniform(-90, 90, (4, 5))
+    dec = rng.uniform(-80, 10, (4, 5))
+    az, el = offset_geometry.dome_azimuth_hadec(ha, dec)
+    assert az.shape == (4, 5)
+    assert az[2, 3] == pytest.approx(
+        offset_geometry.dome_azimuth_hadec(ha[2, 3], dec[2, 3])[0])
+
+
+def test_grid(offset_geometry):
+    rng = np.random.default_rng(1)
+    ha = rng.uniform(-90, 90, 500)
+    dec = rng.uniform(-80, 10, 500)
+    az, el = offset_geometry.dome_azimuth_hadec(ha, dec)
+    grid = offset_geometry.grid(step=1.0)
+    assert offset_geometry.grid(step=1.0) is grid
+    grid_az, grid_el = grid(ha, dec)
+    # away from the zenith, where the dome azimuth is ill defined
+    away = el < 80
+    az_error = (grid_az - az + 180) % 360 - 180
+    assert np.abs(az_error[away]).max() < 0.1
+    assert np.abs(grid_el - el).max() < 0.2
+
+
+def test_slit_tolerance(offset_geometry):
+    tolerance = offset_geometry.slit_tolerance([0, 60, 89.9])
+    assert tolerance[0] == pytest.approx(np.rad2deg(np.arcsin(0.35 / 3)))
+    # wider higher up the dome
+    assert tolerance[0] < tolerance[1] < tolerance[2]
+    assert tolerance[2] == 180
@@ -0,0 +1,136 @@
+import os
+import time
+
+import astropy.units as u
+import numpy as np
+import pytest
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome
+from domehunter.enumerations import (DomeCommand, Direction, JournalEvent,
+                                     MoveResult)
+from domehunter.journal import (HEADER_SIZE, RECORD_DTYPE, Journal,
+                                read_journal)
+
+
+def test_journal(tmpdir):
+    journal = Journal(str(tmpdir), flush_interval=60)
+    start = time.monotonic()
+    journal.record(JournalEvent.COMMAND, code=DomeCommand.GOTO, value=90.5)
+    journal.record(JournalEvent.ENCODER_COUNT, start + 1, state=-1, count=7)
+    journal.flush()
+    assert journal.records_written == 2
+    records = read_journal(journal.path)
+    assert records.dtype == RECORD_DTYPE
+    assert list(records['kind']) == [JournalEvent.COMMAND,
+                                     JournalEvent.ENCODER_COUNT]
+    assert records[0]['code'] == DomeCommand.GOTO
+    assert records[0]['value'] == 90.5
+    assert records[1]['mono'] == start + 1
+    assert (records[1]['state'], records[1]['count']) == (-1, 7)
+    assert abs(records[0]['wall'] - time.time()) < 5
+    # batches are appended, a partly written record is ignored
+    journal.record(JournalEvent.HOME_EDGE, state=1)
+    journal.close()
+    with open(journal.path, 'ab') as f:
+        f.write(b'\x00' * 10)
+    assert len(read_journal(journal.path)) == 3
+    assert os.path.getsize(journal.path) == \
+        HEADER_SIZE + 3 * RECORD_DTYPE.itemsize + 10
+
+
+def test_journal_write_errors(tmpdir):
+    journal = Journal(str(tmpdir), flush_interval=0.01, max_pending=3)
+    for _ in range(5):
+        journal.record(JournalEvent.HOME_EDGE, state=1)
+    assert journal.dropped == 2
+    journal.flush()
+    open_file = journal._open
+
+    def disk_full(wall):
+        raise OSError(28, 'No space left on device')
+
+    journal._open = disk_full
+    journal.record(JournalEvent.HOME_EDGE, state=0)
+    deadline = time.monotonic() + 2
+    while journal.dropped < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.dropped == 3
+    # the writer carries on once the disk recovers
+    assert journal._thread.is_alive()
+    journal._open = open_file
+    journal.record(JournalEvent.HOME_EDGE, state=1)
+    journal.close()
+    assert journal.records_written == 4
+    assert list(read_journal(journal.path)['state']) == [1, 1, 1, 1]
+    # a record partly written when a write failed is dropped on reopening
+    with open(journal.path, 'ab') as f:
+        f.write(b'\x00' * 10)
+    journal = Journal(str(tmpdir))
+    journal.record(JournalEvent.HOME_EDGE, state=0)
+    journal.close()
+    assert list(read_journal(journal.path)['state']) == [1, 1, 1, 1, 0]
+
+
+def test_journal_files(tmpdir):
+    journal = Journal(str(tmpdir), rotate_hour=12)
+    evening = time.mktime((2024, 3, 5, 22, 0, 0, 0, 0, -1))
+    morning = time.mktime((2024, 3, 6, 6, 0, 0, 0, 0, -1))
+    afternoon = time.mktime((2024, 3, 6, 13, 0, 0, 0, 0, -1))
+    # a night is in one file, named by the date it started
+    assert journal.path_for(evening) == journal.path_for(morning)
+    assert journal.path_for(morning).endswith('dome-journal-20240305.bin')
+    assert journal.path_for(afternoon).endswith('dome-journal-20240306.bin')
+    journal.close()
+    not_journal = tmpdir.join('other.bin')
+    not_journal.write(b'\x00' * 64)
+    with pytest.raises(ValueError):
+        read_journal(str(not_journal))
+
+
+def test_goto_journal(tmpdir):
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1,
+                monitor_interval=0.01, journal_dir=str(tmpdir))
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(10 * u.deg)
+    dome._encoder_count = 10
+    dome.goto_az(15)
+    while dome.movement_thread_active:
+        time.sleep(0.05)
+    dome.journal.close()
+    records = read_journal(dome.journal.path)
+    kinds = list(records['kind'])
+    goto = kinds.index(JournalEvent.COMMAND)
+    assert records[goto]['code'] == DomeCommand.GOTO
+    assert records[goto]['value'] == 15
+    # testing mode drives the home sensor low leaving home
+    assert kinds[goto + 1:goto + 4] == [JournalEvent.HOME_EDGE,
+                                        JournalEvent.DIRECTION_RELAY,
+                                        JournalEvent.ROTATION_RELAY]
+    assert records[goto + 2]['state'] == Direction.CW
+    assert records[goto + 3]['state'] == 1
+    counts = records[records['kind'] == JournalEvent.ENCODER_COUNT]
+    # stopped within the position tolerance
+    assert list(counts['count']) == list(range(11, 11 + len(counts)))
+    assert counts['count'][-1] >= 14
+    assert np.all(counts['state'] == 1)
+    assert len(records[records['kind'] == JournalEvent.ENCODER_EDGE]) >= \
+        len(counts)
+    end = records[-1]
+    assert end['kind'] == JournalEvent.MOVE_END
+    assert end['code'] == DomeCommand.GOTO
+    assert end['state'] == MoveResult.COMPLETE.value
+    assert end['count'] == counts['count'][-1]
+    relay_off = np.flatnonzero((records['kind'] == JournalEvent.ROTATION_RELAY)
+                               & (records['state'] == 0))
+    assert relay_off[-1] == len(records) - 2
+    assert np.all(np.diff(records['mono']) >= 0)
+
+
+def test_dome_close(tmpdir):
+    dome = Dome(0, testing=True, debug_lights=False, journal_dir=str(tmpdir))
+    dome.close()
+    # the abort is written out and the journal closed with the dome
+    assert not dome.journal._thread.is_alive()
+    records = read_journal(dome.journal.path)
+    commands = records[records['kind'] == JournalEvent.COMMAND]
+    assert list(commands['code']) == [DomeCommand.ABORT]
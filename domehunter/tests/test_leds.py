@@ -0,0 +1,53 @@
+import pytest
+from domehunter import dome_control
+from domehunter.dome_control import Dome
+from domehunter.enumerations import Direction, LED_Lights
+from domehunter.leds import LEDController
+from domehunter.simulation import FakeSN3218
+
+
+@pytest.fixture
+def fake_sn3218(monkeypatch):
+    driver = FakeSN3218(write_time=0)
+    monkeypatch.setattr(dome_control, 'sn3218', driver, raising=False)
+    return driver
+
+
+def test_synchronous_leds():
+    driver = FakeSN3218(write_time=0)
+    leds = LEDController(driver, refresh_rate=None)
+    for _ in range(5):
+        leds.update(on_mask=0b10)
+        leds.update(off_mask=0b10)
+    assert driver.writes == 10
+    assert driver.mask == 0
+
+
+def test_coalesced_leds():
+    driver = FakeSN3218(write_time=0)
+    # long refresh period so updates are merged
+    leds = LEDController(driver, initial_mask=0b1, refresh_rate=0.5)
+    leds.update(on_mask=0b10)
+    for _ in range(100):
+        leds.update(on_mask=0b100)
+        leds.update(off_mask=0b100)
+    leds.update(on_mask=0b1000, off_mask=0b1)
+    leds.close()
+    assert driver.writes <= 2
+    assert driver.mask == 0b1010
+    assert leds.mask == 0b1010
+
+
+def test_dome_leds(fake_sn3218):
+    dome = Dome(0, degrees_per_tick=1, testing=True, debug_lights=True,
+                led_refresh_rate=None)
+    assert fake_sn3218.mask == (LED_Lights.RELAY_1_NC |
+                                LED_Lights.RELAY_2_NC).value
+    dome._rotate_dome(Direction.CW)
+    assert dome.led_status == (LED_Lights.RELAY_1_NO |
+                               LED_Lights.RELAY_2_NO)
+    dome._simulate_ticks(1)
+    assert dome.led_status & LED_Lights.INPUT_1
+    dome._stop_moving()
+    assert fake_sn3218.mask == dome.led_status.value
+    assert dome.led_status & LED_Lights.RELAY_1_NC
@@ -0,0 +1,82 @@
+import time
+import urllib.error
+import urllib.request
+
+import astropy.units as u
+import pytest
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome, MoveResult
+from domehunter.metrics import MetricsServer, render_metrics
+from domehunter.rpc_stats import RpcStats
+
+
+@pytest.fixture
+def dome(scope='function'):
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(10 * u.deg)
+    dome._encoder_count = 10
+    return dome
+
+
+def parse(page):
+    samples = dict()
+    for line in page.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_dome_counters(dome):
+    dome.goto_az(20)
+    while dome.movement_thread_active:
+        time.sleep(0.05)
+    assert dome.total_ticks >= 9
+    assert dome.relay_cycles == 1
+    assert dome.relay_on_time > 0
+    assert dome.move_results[MoveResult.COMPLETE] == 1
+    # passing home clockwise 3 ticks short of a rotation
+    dome._encoder_count = 357
+    dome.current_direction = 1
+    dome._home_sensor_pin.drive_low()
+    dome._home_sensor_pin.drive_high()
+    assert dome.home_corrections == 1
+    assert dome.last_home_correction == pytest.approx(3)
+    assert dome._encoder_count == 0
+
+
+def test_render_metrics(dome):
+    stats = RpcStats()
+    stats.record('dapiGetAzEl', 1e-4, 2e-3, 0)
+    stats.record('dapiGetAzEl', 1e-4, 4e-3, None)
+    dome.relay_cycles = 3
+    dome.move_results[MoveResult.STALLED] = 2
+    samples = parse(render_metrics(dome, stats))
+    assert samples['dome_encoder_count'] == 10
+    assert samples['dome_rotation_relay_cycles_total'] == 3
+    assert samples['dome_moves_total{result="stalled"}'] == 2
+    assert samples['dome_homed'] == 1
+    # not set until the first abort
+    assert 'dome_last_abort_latency_seconds' not in samples
+    assert samples['dome_rpc_handler_seconds_count{method="dapiGetAzEl"}'] \
+        == 2
+    assert samples['dome_rpc_handler_seconds{method="dapiGetAzEl",'
+                   'quantile="0.99"}'] == pytest.approx(4e-3, rel=0.01)
+    assert samples['dome_rpc_calls_total{method="dapiGetAzEl",'
+                   'code="error"}'] == 1
+
+
+def test_metrics_server(dome):
+    server = MetricsServer(dome, port=0)
+    server.start()
+    try:
+        url = f'http://localhost:{server.port}'
+        with urllib.request.urlopen(f'{url}/metrics') as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            samples = parse(response.read().decode())
+        assert samples['dome_encoder_count'] == 10
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f'{url}/other')
+    finally:
+        server.stop()
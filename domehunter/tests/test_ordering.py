@@ -0,0 +1,62 @@
+import itertools
+
+import astropy.units as u
+import numpy as np
+import pytest
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome
+from domehunter.ordering import estimate_dome_time, order_targets
+from domehunter.planner import PlannedTarget
+
+
+def test_estimate_dome_time():
+    estimate = estimate_dome_time([20, 350, 340], start_az=10, slew_rate=2,
+                                  spin_up=0.5, reversal_cost=3)
+    assert estimate['rotation'] == pytest.approx(10 + 30 + 10)
+    assert estimate['reversals'] == 1
+    assert estimate['time'] == pytest.approx(50 / 2 + 3 * 0.5 + 3)
+
+
+@pytest.mark.parametrize('end_az', [None, 200.0])
+def test_order_targets_optimal(end_az):
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        azimuths = rng.uniform(0, 360, 6)
+        order = order_targets(azimuths, start_az=10, end_az=end_az)
+        assert sorted(order) == list(range(6))
+        best = min(
+            estimate_dome_time(azimuths[list(p)], start_az=10, end_az=end_az,
+                               spin_up=0)['time']
+            for p in itertools.permutations(range(6)))
+        assert estimate_dome_time(azimuths[order], start_az=10, end_az=end_az,
+                                  spin_up=0)['time'] == pytest.approx(best)
+
+
+def test_order_targets_constraints():
+    azimuths = [30, 340, 60, 320]
+    # the nearer side first then reverse for the other
+    assert list(order_targets(azimuths, start_az=0)) == [1, 3, 0, 2]
+    # a single sweep if reversals are too expensive or not allowed
+    assert list(order_targets(azimuths, start_az=0, reversal_cost=1000)) \
+        == [1, 3, 2, 0]
+    assert list(order_targets(azimuths, start_az=0,
+                              allow_reversal=False)) == [1, 3, 2, 0]
+    # finishing at 270 it is better to start clockwise
+    assert list(order_targets(azimuths, start_az=0, end_az=270)) \
+        == [0, 2, 1, 3]
+    targets = [PlannedTarget(az, 0) for az in azimuths]
+    assert list(order_targets(targets, start_az=0)) == [1, 3, 0, 2]
+
+
+def test_dome_order_targets():
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(0 * u.deg)
+    with pytest.raises(ValueError):
+        dome.order_targets([30, 340])
+    dome._tick_interval = 0.25
+    assert dome.rotation_rate == pytest.approx(4)
+    order, estimate = dome.order_targets([30, 340, 60, 320])
+    assert list(order) == [1, 3, 0, 2]
+    assert estimate['rotation'] == pytest.approx(40 + 40 + 60)
+    assert estimate['reversals'] == 1
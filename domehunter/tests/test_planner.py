@@ -0,0 +1,94 @@
+import time
+
+import astropy.units as u
+import pytest
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome
+from domehunter.planner import (ObservationPlan, PlannedTarget,
+                                PrePositionPlanner, simulate_plan)
+
+
+@pytest.fixture
+def plan(scope='function'):
+    return ObservationPlan([PlannedTarget(100, 0, el=60),
+                            PlannedTarget(350, 300, el=30),
+                            PlannedTarget(200, 600, el=45)])
+
+
+def window(el):
+    return 5.0
+
+
+def test_planner_update(plan):
+    planner = PrePositionPlanner(lead_time=60, margin=1, min_move=1)
+    assert plan.index_at(-1) is None
+    assert plan.index_at(300) == 1
+    # next target not due yet
+    assert planner.update(100, 100, plan, window) is None
+    # pre-rotate towards the next target (CCW through 0) within the window
+    assert planner.update(250, 100, plan, window) == pytest.approx(96)
+    # already pre-positioned
+    assert planner.update(260, 96, plan, window) is None
+    # dome hasn't reached the current target yet
+    assert planner.update(250, 120, plan, window) is None
+    # no target after the last one
+    assert planner.update(700, 200, plan, window) is None
+
+
+def test_simulate_plan(plan):
+    baseline = simulate_plan(plan, None, window)
+    planned = simulate_plan(plan, PrePositionPlanner(margin=1), window)
+    assert len(baseline['overheads']) == len(planned['overheads']) == 2
+    # pre-rotating 4 degrees (less the stopping tolerance) saves ~4 / 3
+    # seconds per target
+    for before, after in zip(baseline['overheads'], planned['overheads']):
+        assert before - after == pytest.approx(4 / 3, abs=0.35)
+    assert planned['pre_rotations'] == 2
+
+
+def test_dome_pre_rotation():
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1,
+                az_position_tolerance=1.5, slit_width=1.0, dome_radius=3.0)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(90 * u.deg)
+    dome._encoder_count = 90
+    now = time.time()
+    dome.submit_plan([PlannedTarget(90, now - 100, el=0),
+                      PlannedTarget(180, now + 10, el=0)],
+                     update_interval=0.1)
+    assert dome.has_plan
+    time.sleep(1)
+    assert dome.pre_rotations == 1
+    while dome.movement_thread_active:
+        time.sleep(0.1)
+    # the window at el=0 is ~9.6 degrees, less the default 0.5 margin
+    assert dome.dome_az.degree == pytest.approx(99, abs=1.5)
+    dome.clear_plan()
+    assert not dome.has_plan
+    # the planner may have corrected the stop before it was cleared
+    while dome.movement_thread_active:
+        time.sleep(0.1)
+    pre_rotations = dome.pre_rotations
+    # no pre-rotation while another move holds the dome
+    assert dome._claim_move()
+    dome.submit_plan([PlannedTarget(270, time.time() + 10, el=0)],
+                     update_interval=0.1)
+    time.sleep(0.5)
+    assert dome.pre_rotations == pre_rotations
+    dome.clear_plan()
+    dome._move_event.clear()
+
+
+def test_goto_stops_pre_rotation():
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(90 * u.deg)
+    dome._encoder_count = 90
+    assert dome._claim_move()
+    dome._pre_rotate(120)
+    assert dome.movement_thread_active
+    dome.goto_az(60)
+    assert dome.current_direction < 0
+    while dome.movement_thread_active:
+        time.sleep(0.1)
+    assert dome.dome_az.degree == pytest.approx(60, abs=1.5)
@@ -0,0 +1,105 @@
+import time
+
+import astropy.units as u
+import numpy as np
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome
+from domehunter.enumerations import (DomeCommand, Direction, JournalEvent,
+                                     MoveResult)
+from domehunter.journal import RECORD_DTYPE, Journal, read_journal
+from domehunter.replay import (DecisionRecorder, JournalReplay,
+                               compare_decisions, describe_decision)
+
+
+def _decisions(*decisions):
+    """(mono, kind, state, code, count) tuples to records."""
+    return np.array([(mono, 0.0, 0.0, count, kind, state, code)
+                     for mono, kind, state, code, count in decisions],
+                    dtype=RECORD_DTYPE)
+
+
+def test_compare_decisions():
+    recorded = _decisions(
+        (1.0, JournalEvent.DIRECTION_RELAY, Direction.CW, 0, 0),
+        (1.0, JournalEvent.ROTATION_RELAY, 1, 0, 0),
+        (2.1, JournalEvent.ROTATION_RELAY, 0, 0, 720),
+        (2.2, JournalEvent.MOVE_END, MoveResult.COMPLETE.value,
+         DomeCommand.FIND_HOME, 720),
+        # the zeroing was made first but recorded last
+        (2.0, JournalEvent.HOME_ZERO, 0, 0, 720),
+        (3.0, JournalEvent.ROTATION_RELAY, 1, 0, 0),
+        (4.0, JournalEvent.ROTATION_RELAY, 0, 0, 100))
+    replayed = _decisions(
+        (1.0, JournalEvent.DIRECTION_RELAY, Direction.CW, 0, 0),
+        (1.0, JournalEvent.ROTATION_RELAY, 1, 0, 0),
+        (2.0, JournalEvent.HOME_ZERO, 0, 0, 720),
+        (2.0, JournalEvent.ROTATION_RELAY, 0, 0, 0),
+        (2.0, JournalEvent.MOVE_END, MoveResult.COMPLETE.value,
+         DomeCommand.FIND_HOME, 0),
+        (3.0, JournalEvent.ROTATION_RELAY, 1, 0, 0),
+        (3.5, JournalEvent.ROTATION_RELAY, 0, 0, 98),
+        (3.6, JournalEvent.HOME_ZERO, 0, 0, 98))
+    # counts a rotation apart are the same place
+    assert compare_decisions(recorded[:5], replayed[:5],
+                             rotation_ticks=720) == []
+    mismatches = compare_decisions(recorded, replayed, count_tolerance=1,
+                                   rotation_ticks=720)
+    assert [(describe_decision(a) if a is not None else None,
+             describe_decision(b) if b is not None else None)
+            for a, b in mismatches] == \
+        [('stop at 100', 'stop at 98'), (None, 'zero from 98')]
+    assert len(compare_decisions(recorded, replayed, count_tolerance=2,
+                                 rotation_ticks=720)) == 1
+    assert len(compare_decisions(recorded, replayed, count_tolerance=2)) == 3
+
+
+def test_decision_recorder():
+    recorder = DecisionRecorder(lambda: 1.0)
+    recorder.record(JournalEvent.ROTATION_RELAY, state=1)
+    recorder.record(JournalEvent.HOME_ZERO)
+    recorder.record(JournalEvent.ROTATION_RELAY, state=1)
+    relay_on = (JournalEvent.ROTATION_RELAY, 1, 0)
+    # decisions are claimed once each, in any order between kinds
+    assert recorder.wait_for((JournalEvent.HOME_ZERO, 0, 0), 0)
+    assert recorder.wait_for(relay_on, 0)
+    assert recorder.wait_for(relay_on, 0)
+    assert not recorder.wait_for(relay_on, 0.01)
+    assert len(recorder.array()) == 3
+
+
+def test_replay(tmpdir):
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1,
+                monitor_interval=0.01)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(10 * u.deg)
+    dome._encoder_count = 10
+    dome.journal = Journal(str(tmpdir))
+    dome.goto_az(20)
+    while dome.movement_thread_active:
+        time.sleep(0.05)
+    dome.goto_az(12)
+    while dome.movement_thread_active:
+        time.sleep(0.05)
+    dome.journal.close()
+    records = np.array(read_journal(dome.journal.path))
+    del dome
+
+    config = dict(home_azimuth=0, degrees_per_tick=1, monitor_interval=0.01)
+    for speed in (None, 4):
+        result = JournalReplay(records, config, speed=speed).run()
+        assert result.matches, result.mismatches
+        assert result.missed == 0
+        assert result.stopped_at is None
+        assert result.counts() == dict(starts=(2, 2), stops=(2, 2),
+                                       zeroings=(0, 0), moves=(2, 2))
+        assert result.replayed['count'][-1] == records['count'][-1]
+    # a wider tolerance stops the dome short of the recorded stops
+    config['az_position_tolerance'] = 5
+    result = JournalReplay(records, config, speed=None,
+                           decision_timeout=0.5).run()
+    assert not result.matches
+    stops = [(recorded['count'], replayed['count'])
+             for recorded, replayed in result.mismatches
+             if recorded is not None
+             and recorded['kind'] == JournalEvent.ROTATION_RELAY]
+    assert stops[0][1] < stops[0][0]
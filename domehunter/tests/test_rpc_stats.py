@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+from domehunter.rpc_stats import LatencyHistogram, RpcStats, StatsInterceptor
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(significant_figures=2)
+    assert histogram.percentile(50) is None
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(np.log(2e-3), 1.5, 10000)
+    for value in values:
+        histogram.record(value)
+    assert histogram.count == len(values)
+    assert histogram.mean == pytest.approx(np.mean(values))
+    for q in (50, 90, 99, 99.9):
+        assert histogram.percentile(q) == pytest.approx(
+            np.percentile(values, q, method='inverted_cdf'), rel=0.01,
+            abs=1e-6)
+    assert histogram.percentile(100) == histogram.max == np.max(values)
+    summary = histogram.summary()
+    assert summary['p999'] == histogram.percentile(99.9)
+
+
+def test_rpc_stats():
+    stats = RpcStats()
+    stats.record('dapiPark', 1e-4, 0.01, 0)
+    stats.record('dapiPark', 2e-4, 0.02, 1)
+    stats.record('dapiPark', 3e-4, 0.03, None)
+    summary = stats.summary()['dapiPark']
+    assert summary['handler']['count'] == 3
+    assert summary['queue']['max'] == pytest.approx(3e-4)
+    assert summary['return_codes'] == {0: 1, 1: 1, None: 1}
+
+
+def test_stats_interceptor():
+    release = threading.Event()
+
+    class Response(object):
+        def __init__(self, return_code):
+            self.return_code = return_code
+
+    def slow(request, context):
+        release.wait(5)
+        return Response(0)
+
+    def fail(request, context):
+        raise RuntimeError
+
+    def stream(request, context):
+        for return_code in (0, 2, 0):
+            yield Response(return_code)
+
+    handler = grpc.method_handlers_generic_handler('test.Test', dict(
+        Slow=grpc.unary_unary_rpc_method_handler(
+            slow, response_serializer=lambda response: b''),
+        Fail=grpc.unary_unary_rpc_method_handler(fail),
+        Stream=grpc.unary_stream_rpc_method_handler(
+            stream, response_serializer=lambda response: b'')))
+    interceptor = StatsInterceptor()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1),
+                         handlers=[handler], interceptors=[interceptor])
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    try:
+        channel = grpc.insecure_channel(f'localhost:{port}')
+        slow_call = channel.unary_unary('/test.Test/Slow')
+        # the second call queues behind the first for the single worker
+        calls = [slow_call.future(b''), slow_call.future(b'')]
+        time.sleep(0.3)
+        release.set()
+        for call in calls:
+            call.result()
+        with pytest.raises(grpc.RpcError):
+            channel.unary_unary('/test.Test/Fail')(b'')
+        assert len(list(channel.unary_stream('/test.Test/Stream')(b''))) == 3
+    finally:
+        server.stop(0)
+    summary = interceptor.stats.summary()
+    assert summary['Slow']['handler']['count'] == 2
+    assert summary['Slow']['handler']['max'] >= 0.25
+    assert summary['Slow']['queue']['max'] >= 0.25
+    assert summary['Slow']['return_codes'] == {0: 2}
+    assert summary['Fail']['return_codes'] == {None: 1}
+    assert summary['Stream']['return_codes'] == {2: 1}
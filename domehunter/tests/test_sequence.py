@@ -0,0 +1,66 @@
+import time
+
+import astropy.units as u
+import pytest
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome, MoveResult
+from domehunter.sequence import Waypoint
+
+
+@pytest.fixture
+def dome(scope='function'):
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1,
+                az_position_tolerance=1.0)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(10 * u.deg)
+    dome._encoder_count = 10
+    return dome
+
+
+def wait_for_sequence(dome, timeout=20):
+    start = time.monotonic()
+    while dome.movement_thread_active and time.monotonic() - start < timeout:
+        time.sleep(0.05)
+    assert not dome.movement_thread_active
+
+
+def test_waypoint():
+    waypoint = Waypoint(-10, 0.5)
+    assert waypoint.az == pytest.approx(350)
+    assert waypoint.tolerance is None
+
+
+def test_run_sequence(dome):
+    steps = []
+    dome.run_sequence([Waypoint(15), Waypoint(20, dwell=0.2),
+                       (12, 0, 3.0), Waypoint(5)],
+                      callback=steps.append)
+    wait_for_sequence(dome)
+    assert [step['index'] for step in steps] == [0, 1, 2, 3]
+    assert all(step['result'] == MoveResult.COMPLETE for step in steps)
+    # the motor runs on through 15 to 20, then stops for the dwell
+    assert [step['motor_running'] for step in steps] == \
+        [True, False, True, False]
+    assert steps[0]['dome_az'] == pytest.approx(15, abs=1)
+    # the wider tolerance is reached sooner
+    assert steps[2]['dome_az'] == pytest.approx(15, abs=1)
+    assert dome.dome_az.degree == pytest.approx(5, abs=1)
+    # one start CW, one CCW after the dwell
+    assert dome.relay_cycles == 2
+    assert dome.last_move_result == MoveResult.COMPLETE
+    assert not dome._rotation_relay.is_active
+
+
+def test_stop_sequence(dome):
+    steps = []
+    dome.run_sequence([Waypoint(20, dwell=30), Waypoint(40)],
+                      callback=steps.append)
+    time.sleep(1)
+    # a goto can't take the dome from the sequence
+    relay_cycles = dome.relay_cycles
+    dome.goto_az(100)
+    assert dome.relay_cycles == relay_cycles
+    dome.stop_sequence()
+    assert not dome.movement_thread_active
+    assert len(steps) == 1
+    assert dome.last_move_result == MoveResult.ABORTED
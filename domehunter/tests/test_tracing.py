@@ -0,0 +1,78 @@
+import json
+import time
+
+import astropy.units as u
+import pytest
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome
+from domehunter.tracing import Tracer
+
+
+def test_tracer(tmpdir):
+    path = str(tmpdir.join('trace.jsonl'))
+    tracer = Tracer(capacity=3, path=path)
+    with tracer.span('rpc', method='goto') as rpc:
+        assert tracer.current() is rpc
+        child = tracer.start_span('goto_az', az=10)
+    assert tracer.current() is None
+    child.event('relay_on')
+    assert [span['name'] for span in tracer.spans()] == ['rpc', 'goto_az']
+    assert tracer.spans()[1]['end'] is None
+    child.end(result='COMPLETE')
+    child.end(result='ignored')
+    assert child.trace_id == rpc.trace_id
+    assert child.parent_id == rpc.span_id
+    assert rpc.parent_id is None
+    with pytest.raises(ValueError):
+        with tracer.span('fails'):
+            raise ValueError
+    tracer.start_span('other').end()
+    # only the last 3 finished spans are kept
+    spans = tracer.spans()
+    assert [span['name'] for span in spans] == ['goto_az', 'fails', 'other']
+    assert spans[1]['attributes']['error'] == 'ValueError()'
+    assert [span['name'] for span in tracer.spans(trace_id=rpc.trace_id)] \
+        == ['goto_az']
+    tracer.close()
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 4
+    assert lines[1]['attributes'] == dict(az=10, result='COMPLETE')
+    assert lines[1]['events'][0]['name'] == 'relay_on'
+
+
+def test_goto_trace():
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=1)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(10 * u.deg)
+    dome._encoder_count = 10
+    with dome.tracer.span('rpc dapiGotoAzEl') as rpc:
+        dome.goto_az(20)
+    while dome.movement_thread_active:
+        time.sleep(0.05)
+    # a goto while parked is traced with its outcome
+    dome._park_event.set()
+    dome.goto_az(30)
+    spans = dome.tracer.spans()
+    assert [span['name'] for span in spans] == \
+        ['rpc dapiGotoAzEl', 'goto_az', 'goto_az']
+    goto = spans[1]
+    assert goto['parent_id'] == rpc.span_id
+    assert goto['attributes']['result'] == 'COMPLETE'
+    assert [event['name'] for event in goto['events']] == \
+        ['validated', 'relay_on', 'monitor_started', 'monitor_exit',
+         'relay_off']
+    offsets = [event['offset'] for event in goto['events']]
+    assert offsets == sorted(offsets)
+    assert goto['duration'] >= offsets[-1]
+    assert spans[2]['attributes']['outcome'] == 'parked'
+    # a goto that raises ends its span and releases the dome
+    dome._park_event.clear()
+    dome._start_monitor = None
+    with pytest.raises(TypeError):
+        dome.goto_az(40)
+    assert dome.tracer.spans()[-1]['attributes']['outcome'] == 'error'
+    assert not dome.tracer._active
+    assert not dome.movement_thread_active
+    assert not dome.dome_in_motion
+    dome.close()
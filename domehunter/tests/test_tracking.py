@@ -0,0 +1,63 @@
+import time
+
+import astropy.units as u
+import pytest
+from astropy.coordinates import Longitude
+from domehunter.dome_control import Dome
+from domehunter.tracking import (PeriodicGotoController, TrackingController,
+                                 Trajectory, simulate_tracking, wrap_180)
+
+
+@pytest.fixture
+def drifting_trajectory(scope='function'):
+    # target drifting through 0/360 at roughly the sidereal rate
+    return Trajectory.from_function(lambda t: (350 + 0.004 * t) % 360,
+                                    0, 4 * 3600)
+
+
+def test_trajectory(drifting_trajectory):
+    assert drifting_trajectory(0) == pytest.approx(350)
+    # interpolates across the wrap rather than back round the circle
+    assert drifting_trajectory(2505) == pytest.approx(0.02)
+    assert drifting_trajectory.rate(1000) == pytest.approx(0.004)
+
+
+def test_tracking_controller(drifting_trajectory):
+    controller = TrackingController(tolerance=2, look_ahead=10,
+                                    lead_fraction=0.5)
+    assert controller.update(0, 351, drifting_trajectory) is None
+    goal = controller.update(0, 345, drifting_trajectory)
+    # leads the target in the direction it's moving
+    assert goal == pytest.approx(350.04 + 1)
+
+
+def test_simulate_tracking(drifting_trajectory):
+    tracking = simulate_tracking(drifting_trajectory,
+                                 TrackingController(tolerance=2),
+                                 0, 4 * 3600)
+    periodic = simulate_tracking(drifting_trajectory,
+                                 PeriodicGotoController(interval=60,
+                                                        tolerance=2),
+                                 0, 4 * 3600)
+    assert tracking['fraction_out_of_tolerance'] == 0
+    assert tracking['relay_cycles'] < periodic['relay_cycles'] / 10
+    assert tracking['cycles_per_hour'] < 10
+
+
+def test_dome_tracking():
+    dome = Dome(0, testing=True, debug_lights=False, degrees_per_tick=10)
+    dome._home_sensor_pin.drive_high()
+    dome._dome_az = Longitude(90 * u.deg)
+    dome._encoder_count = 9
+    now = time.time()
+    trajectory = Trajectory([now - 10, now + 600], [150, 150])
+    dome.track(trajectory, update_interval=0.1)
+    assert dome.is_tracking
+    time.sleep(4)
+    dome.stop_tracking()
+    while dome.movement_thread_active:
+        time.sleep(0.1)
+    assert not dome.is_tracking
+    # one move, which leads the target within the tracking window
+    assert dome.relay_cycles == 1
+    assert abs(wrap_180(dome.dome_az.degree - 150)) < 30
@@ -0,0 +1,226 @@
+"""Lightweight tracing of dome commands.
+
+A `Span` times one step of a command (an RPC, a goto, a find home) with
+monotonic timestamps, key attributes and timestamped events, and belongs to
+a trace: the tree of spans started by the same command. Spans started in a
+thread inside `Tracer.span` are children of that span; spans handed to
+another thread (eg a movement monitor) are passed explicitly.
+
+Finished spans are kept in a fixed size ring in memory, which can be
+queried with `Tracer.spans` (and the GetTraces RPC), and optionally written
+to a JSON lines file. A span costs a few microseconds, and spans are only
+started per command, never per encoder tick.
+"""
+
+
+import itertools
+import json
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Span(object):
+    """
+    A timed step of a traced command, created by Tracer.start_span.
+
+    Attributes
+    ----------
+    trace_id : str
+        Id of the trace the span belongs to.
+    span_id : str
+        Id of the span.
+    parent_id : str
+        Id of the parent span, None for the root span of a trace.
+    name : str
+        Name of the step.
+    start : float
+        Monotonic start time in seconds.
+    end_time : float
+        Monotonic end time, None until the span ends.
+    wall_start : float
+        Unix time of the start.
+    attributes : dict
+        Key attributes of the step.
+    events : list
+        (name, monotonic time, attributes) of events during the step.
+
+    """
+
+    def __init__(self, tracer, name, trace_id, parent_id, start, attributes):
+        self._tracer = tracer
+        self.name = name
+        self.span_id = f'{random.getrandbits(64):016x}'
+        self.trace_id = trace_id or self.span_id
+        self.parent_id = parent_id
+        self.start = time.monotonic() if start is None else start
+        self.wall_start = time.time() - (time.monotonic() - self.start)
+        self.end_time = None
+        self.attributes = attributes
+        self.events = []
+
+    @property
+    def duration(self):
+        """Duration in seconds, None until the span ends."""
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start
+
+    def set(self, **attributes):
+        """Set attributes of the span."""
+        self.attributes.update(attributes)
+
+    def event(self, name, **attributes):
+        """Record a timestamped event during the span."""
+        self.events.append((name, time.monotonic(), attributes))
+
+    def end(self, **attributes):
+        """End the span, setting any final attributes. Ending twice does
+        nothing."""
+        if self.end_time is not None:
+            return
+        self.attributes.update(attributes)
+        self.end_time = time.monotonic()
+        self._tracer._finish(self)
+
+    def to_dict(self):
+        """Dictionary of the span, with times relative to its start."""
+        return dict(trace_id=self.trace_id,
+                    span_id=self.span_id,
+                    parent_id=self.parent_id,
+                    name=self.name,
+                    start=self.start,
+                    end=self.end_time,
+                    duration=self.duration,
+                    wall_start=self.wall_start,
+                    attributes=dict(self.attributes),
+                    events=[dict(name=name, offset=event_time - self.start,
+                                 attributes=attributes)
+                            for name, event_time, attributes
+                            in list(self.events)])
+
+
+class Tracer(object):
+    """
+    Creates spans and keeps the finished ones.
+
+    Parameters
+    ----------
+    capacity : int
+        Number of finished spans to keep in memory.
+    path : str
+        JSON lines file to append finished spans to, None for none.
+
+    """
+
+    def __init__(self, capacity=1000, path=None):
+        self._finished = deque(maxlen=capacity)
+        self._active = dict()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.path = path
+        self._file = None
+        if path is not None:
+            self._file = open(path, 'a')
+
+    def current(self):
+        """The innermost span opened with span() in this thread, or None."""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def start_span(self, name, parent=None, start=None, **attributes):
+        """
+        Start a span, which must be ended with Span.end().
+
+        Parameters
+        ----------
+        name : str
+            Name of the step.
+        parent : Span
+            Parent span, defaults to the current span of this thread.
+        start : float
+            Monotonic start time, defaults to now.
+        attributes
+            Attributes of the span.
+
+        Returns
+        -------
+        Span
+            The new span.
+
+        """
+        if parent is None:
+            parent = self.current()
+        span = Span(self, name,
+                    parent.trace_id if parent is not None else None,
+                    parent.span_id if parent is not None else None,
+                    start, attributes)
+        with self._lock:
+            self._active[span.span_id] = span
+        return span
+
+    @contextmanager
+    def span(self, name, parent=None, start=None, **attributes):
+        """
+        Context manager for a span that is the current span of this thread
+        until the block exits. An exception is recorded in an 'error'
+        attribute.
+        """
+        span = self.start_span(name, parent, start, **attributes)
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=repr(e))
+            raise
+        finally:
+            stack.pop()
+            span.end()
+
+    def spans(self, trace_id=None, limit=None):
+        """
+        Finished and active spans, oldest first.
+
+        Parameters
+        ----------
+        trace_id : str
+            Only return the spans of this trace.
+        limit : int
+            Only return the most recent limit spans.
+
+        Returns
+        -------
+        list
+            Dictionaries of the spans (see Span.to_dict).
+
+        """
+        with self._lock:
+            spans = list(itertools.chain(self._finished,
+                                         list(self._active.values())))
+        if trace_id:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        spans.sort(key=lambda span: span.start)
+        if limit:
+            spans = spans[-limit:]
+        return [span.to_dict() for span in spans]
+
+    def close(self):
+        """Close the JSON lines file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _finish(self, span):
+        with self._lock:
+            self._active.pop(span.span_id, None)
+            self._finished.append(span)
+            if self._file is not None:
+                self._file.write(json.dumps(span.to_dict(), default=str)
+                                 + '\n')
+                self._file.flush()
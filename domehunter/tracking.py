@@ -0,0 +1,236 @@
+"""Dome tracking of a moving target, eg a sidereal telescope target."""
+
+
+import numpy as np
+
+
+def wrap_180(degrees):
+    """Wrap angles in degrees to the range [-180, 180)."""
+    return (np.asarray(degrees) + 180) % 360 - 180
+
+
+class Trajectory(object):
+    """
+    Target azimuth against time, linearly interpolated between samples.
+
+    Parameters
+    ----------
+    times : array_like
+        Sample times in seconds, eg unix time, in increasing order.
+    azimuths : array_like
+        Target azimuth in degrees at each sample time.
+
+    """
+
+    def __init__(self, times, azimuths):
+        self.times = np.asarray(times, dtype=float)
+        # unwrap so the interpolation doesn't sweep back across 0/360
+        self._unwrapped = np.rad2deg(np.unwrap(np.deg2rad(
+            np.asarray(azimuths, dtype=float))))
+
+    def __call__(self, t):
+        """Return the target azimuth in degrees at time(s) t."""
+        return np.interp(t, self.times, self._unwrapped) % 360
+
+    def rate(self, t, dt=1.0):
+        """Return the rate of change of target azimuth in degrees/second."""
+        return (np.interp(t + dt, self.times, self._unwrapped)
+                - np.interp(t, self.times, self._unwrapped)) / dt
+
+    @classmethod
+    def from_function(cls, az_function, start, duration, step=10.0):
+        """Sample a function az(t) from start to start + duration."""
+        times = np.arange(start, start + duration + step, step)
+        return cls(times, az_function(times))
+
+    @classmethod
+    def sidereal(cls, coord, location, start_time, duration, step=60.0):
+        """Trajectory of a celestial target seen from an observatory.
+
+        Parameters
+        ----------
+        coord : astropy.coordinates.SkyCoord
+            Coordinates of the target, eg RA/Dec.
+        location : astropy.coordinates.EarthLocation
+            Location of the observatory.
+        start_time : astropy.time.Time
+            Start of the trajectory.
+        duration : float
+            Length of the trajectory in seconds.
+        step : float
+            Time between samples in seconds.
+
+        Returns
+        -------
+        Trajectory
+            Trajectory with sample times in unix seconds.
+
+        """
+        import astropy.units as u
+        from astropy.coordinates import AltAz
+        offsets = np.arange(0, duration + step, step)
+        times = start_time + offsets * u.s
+        altaz = coord.transform_to(AltAz(obstime=times, location=location))
+        return cls(times.unix, altaz.az.degree)
+
+
+class TrackingController(object):
+    """
+    Decides when and where the dome should move to follow a trajectory.
+
+    The dome is left still while the target (looked ahead by the time a
+    move takes) is within `tolerance` of the dome azimuth. Once it drifts
+    outside, the dome moves past the target so that it leads it by
+    `lead_fraction` of the tolerance, and the target then drifts across
+    almost the whole window before the next move. Moves are therefore few
+    and long rather than many and short.
+
+    Parameters
+    ----------
+    tolerance : float
+        Half width in degrees of the window the target is kept within.
+    look_ahead : float
+        Time in seconds to look ahead along the trajectory, should cover
+        motor spin up and the length of a typical tracking move.
+    lead_fraction : float
+        Fraction of the tolerance the dome leads the target by after a move,
+        between 0 (stop on the target) and 1.
+
+    """
+
+    def __init__(self, tolerance=2.0, look_ahead=10.0, lead_fraction=0.8):
+        self.tolerance = tolerance
+        self.look_ahead = look_ahead
+        self.lead_fraction = lead_fraction
+
+    def update(self, t, dome_az, trajectory):
+        """Return the azimuth to move the dome to, or None to stay put.
+
+        Parameters
+        ----------
+        t : float
+            Current time, in the timebase of the trajectory.
+        dome_az : float
+            Current dome azimuth in degrees.
+        trajectory : Trajectory
+            Target trajectory.
+
+        Returns
+        -------
+        float or None
+            Azimuth in degrees to move to, if the dome should move.
+
+        """
+        target = trajectory(t + self.look_ahead)
+        error = wrap_180(target - dome_az)
+        if abs(error) <= self.tolerance:
+            return None
+        direction = np.sign(trajectory.rate(t)) or np.sign(error)
+        return float((target + direction * self.lead_fraction *
+                      self.tolerance) % 360)
+
+
+class PeriodicGotoController(object):
+    """
+    Moves the dome onto the target at fixed intervals.
+
+    This is how tracking works with TheSkyX sending periodic dapiGotoAzEl,
+    and is used as a baseline for TrackingController.
+
+    Parameters
+    ----------
+    interval : float
+        Time in seconds between goto requests.
+    tolerance : float
+        Half width in degrees of the tracking window, used to report time out
+        of tolerance.
+
+    """
+
+    def __init__(self, interval=30.0, tolerance=2.0):
+        self.interval = interval
+        self.tolerance = tolerance
+        self._last_goto = None
+
+    def update(self, t, dome_az, trajectory):
+        """Return the target azimuth every interval seconds, else None."""
+        if self._last_goto is not None and t - self._last_goto < self.interval:
+            return None
+        self._last_goto = t
+        return float(trajectory(t))
+
+
+def simulate_tracking(trajectory,
+                      controller,
+                      start,
+                      duration,
+                      slew_rate=3.0,
+                      spin_up=0.5,
+                      position_tolerance=1.0,
+                      dt=0.25):
+    """Simulate the dome following a trajectory in virtual time.
+
+    The dome is modelled as still until it is sent to an azimuth, then
+    (after spin_up seconds) turning at slew_rate along the shortest route
+    until it is within position_tolerance of the requested azimuth. As in
+    Dome.goto_az, every request switches the motor on, even if the dome is
+    already within position_tolerance.
+
+    Parameters
+    ----------
+    trajectory : Trajectory
+        Target trajectory.
+    controller : TrackingController or PeriodicGotoController
+        Tracking policy.
+    start : float
+        Start time in the timebase of the trajectory.
+    duration : float
+        Length of the simulation in seconds.
+    slew_rate : float
+        Dome rotation rate in degrees per second.
+    spin_up : float
+        Time in seconds from switching the motor on to the dome moving.
+    position_tolerance : float
+        Tolerance in degrees for a move to be complete.
+    dt : float
+        Simulation time step in seconds.
+
+    Returns
+    -------
+    dict
+        relay_cycles, cycles_per_hour, time_out_of_tolerance (seconds),
+        fraction_out_of_tolerance, max_error (degrees) and motor_time
+        (seconds).
+
+    """
+    dome_az = float(trajectory(start))
+    goal = None
+    motor_on_time = None
+    relay_cycles = 0
+    motor_time = 0.0
+    out_of_tolerance = 0.0
+    max_error = 0.0
+    for t in np.arange(start, start + duration, dt):
+        if goal is None:
+            goal = controller.update(t, dome_az, trajectory)
+            if goal is not None:
+                relay_cycles += 1
+                motor_on_time = t
+        if goal is not None:
+            motor_time += dt
+            error = float(wrap_180(goal - dome_az))
+            if abs(error) <= position_tolerance:
+                goal = None
+            elif t - motor_on_time >= spin_up:
+                step = min(slew_rate * dt, abs(error))
+                dome_az = (dome_az + np.sign(error) * step) % 360
+        tracking_error = abs(float(wrap_180(trajectory(t) - dome_az)))
+        max_error = max(max_error, tracking_error)
+        if tracking_error > controller.tolerance:
+            out_of_tolerance += dt
+    return dict(relay_cycles=relay_cycles,
+                cycles_per_hour=relay_cycles * 3600 / duration,
+                time_out_of_tolerance=out_of_tolerance,
+                fraction_out_of_tolerance=out_of_tolerance / duration,
+                max_error=max_error,
+                motor_time=motor_time)